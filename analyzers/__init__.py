@@ -1,3 +1,4 @@
 """분석 모듈"""
 from analyzers.margin_calculator import MarginCalculator
 from analyzers.bundle_generator import BundleGenerator
+from analyzers.margin_simulator import MarginSimulator, Scenario, build_grid
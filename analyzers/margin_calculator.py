@@ -6,14 +6,93 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from typing import Dict, List
+import numpy as np
+import pandas as pd
+from sqlalchemy import exists
 from app.database import SessionLocal
 from app.models import Publisher, Book, Product
+from app.constants import (
+    COUPANG_FEE_RATE, DEFAULT_SHIPPING_COST, SHIPPING_FEE_BRACKETS, margin_breakdown,
+)
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+PROFITABILITY_LEVELS = ['excellent', 'good', 'acceptable', 'poor']
+RECOMMENDATIONS = {
+    'excellent': '무료배송 단권 업로드 강력 권장',
+    'good': '무료배송 단권 업로드 권장',
+    'acceptable': '유료배송 단권 업로드 가능',
+    'poor': '묶음 SKU 필수 (단권 손실)',
+}
+
+
+def customer_shipping_fees(margin_rates, list_prices,
+                           shipping_cost: int = DEFAULT_SHIPPING_COST) -> np.ndarray:
+    """
+    determine_customer_shipping_fee()의 배열 버전 (같은 SHIPPING_FEE_BRACKETS 표 사용)
+
+    Args:
+        margin_rates: 매입률/공급률 배열 (정수 40~73)
+        list_prices: 정가 배열
+        shipping_cost: 실제 택배비 (구간 외 고객 부담 배송비)
+
+    Returns:
+        고객 부담 배송비 배열 (0=무료, 1000, 2000, shipping_cost)
+    """
+    r = np.asarray(margin_rates)
+    p = np.asarray(list_prices)
+
+    rate_conds, rate_fees = [], []
+    for max_rate, brackets in SHIPPING_FEE_BRACKETS:
+        price_conds = [
+            (p >= (low if low is not None else -np.inf)) & (p <= (high if high is not None else np.inf))
+            for low, high, _ in brackets
+        ]
+        rate_conds.append(r <= max_rate)
+        rate_fees.append(np.select(price_conds, [fee for _, _, fee in brackets], shipping_cost))
+
+    return np.select(rate_conds, rate_fees, default=shipping_cost).astype(np.int64)
+
+
+def calculate_margins(list_prices, supply_rates, margin_rates,
+                      fee_rate: float = COUPANG_FEE_RATE,
+                      shipping_cost: int = DEFAULT_SHIPPING_COST) -> Dict[str, np.ndarray]:
+    """
+    Publisher.calculate_margin()의 배열 버전 (도서 전체 일괄 계산)
+
+    계산식은 같은 margin_breakdown()을 배열에 적용 (int() 절사도 원소별로 동일).
+    fee_rate / shipping_cost를 바꿔 상수 변경 시뮬레이션에도 사용.
+
+    Returns:
+        calculate_margin()과 같은 키의 배열 dict
+    """
+    list_prices = np.asarray(list_prices, dtype=np.int64)
+    supply_rates = np.asarray(supply_rates, dtype=float)
+
+    customer_fee = customer_shipping_fees(margin_rates, list_prices, shipping_cost)
+    margin = margin_breakdown(list_prices, supply_rates, customer_fee,
+                              fee_rate=fee_rate, shipping_cost=shipping_cost)
+
+    return {
+        **margin,
+        'customer_shipping_fee': customer_fee,
+        'shipping_policy': np.where(customer_fee == 0, 'free', 'paid'),
+    }
+
+
+def profitability_levels(net_margins) -> np.ndarray:
+    """순마진 → 수익성 등급 배열 (analyze_book과 같은 구간)"""
+    net = np.asarray(net_margins)
+    return np.select(
+        [net >= 5000, net >= 2000, net >= 0],
+        PROFITABILITY_LEVELS[:3],
+        default='poor',
+    )
+
+
 class MarginCalculator:
     """
     마진 계산 및 수익성 분석기
@@ -137,6 +216,9 @@ class MarginCalculator:
         """
         다수 도서 일괄 분석
 
+        도서/출판사 공급률을 컬럼 단위로 한 번에 로드해 NumPy로 일괄 계산
+        (결과 dict는 analyze_book()과 동일)
+
         Args:
             book_ids: 분석할 Book ID 리스트 (없으면 미처리 전체)
 
@@ -162,22 +244,10 @@ class MarginCalculator:
                 }
             }
         """
-        # 도서 조회
-        query = self.db.query(Book)
-
-        if book_ids:
-            query = query.filter(Book.id.in_(book_ids))
-        else:
-            # Product가 없는 도서만 (미분석)
-            from sqlalchemy import exists
-            query = query.filter(
-                ~exists().where(Product.book_id == Book.id)
-            )
-
-        books = query.all()
+        df = self._load_book_frame(book_ids)
 
         results = {
-            'total': len(books),
+            'total': len(df),
             'analyzed': 0,
             'by_profitability': {
                 'excellent': [],
@@ -197,32 +267,117 @@ class MarginCalculator:
             }
         }
 
-        for book in books:
-            analysis = self.analyze_book(book)
+        missing = df['supply_rate'].isna()
+        for row in df[missing].itertuples():
+            logger.warning(f"출판사를 찾을 수 없습니다: book_id={row.book_id}, isbn={row.isbn}")
+        df = df[~missing]
+        if df.empty:
+            return results
 
-            if not analysis:
-                continue
-
-            results['analyzed'] += 1
+        analyses = self._analyze_frame(df)
+        results['analyzed'] = len(analyses)
 
+        for analysis in analyses:
             # 수익성별 분류
-            profitability = analysis['profitability']
-            results['by_profitability'][profitability].append(analysis)
-
+            results['by_profitability'][analysis['profitability']].append(analysis)
             # 배송정책별 분류
-            shipping = analysis['shipping_policy']
-            results['by_shipping'][shipping].append(analysis)
-
-            # 통계
-            if analysis['can_upload_single']:
-                results['summary']['uploadable_single'] += 1
-            else:
-                results['summary']['requires_bundle'] += 1
+            results['by_shipping'][analysis['shipping_policy']].append(analysis)
 
-            results['summary']['total_margin'] += analysis['net_margin']
+        # 통계
+        uploadable = sum(a['can_upload_single'] for a in analyses)
+        results['summary']['uploadable_single'] = uploadable
+        results['summary']['requires_bundle'] = len(analyses) - uploadable
+        results['summary']['total_margin'] = sum(a['net_margin'] for a in analyses)
 
         return results
 
+    def batch_create_products(self, book_ids: List[int] = None) -> List[Product]:
+        """
+        다수 도서 일괄 Product 생성 (Product.create_from_book과 같은 값)
+
+        Args:
+            book_ids: 대상 Book ID 리스트 (없으면 미처리 전체)
+
+        Returns:
+            Product 인스턴스 리스트 (세션에 추가하지 않음, 출판사 없는 도서 제외)
+        """
+        df = self._load_book_frame(book_ids)
+        df = df[df['supply_rate'].notna()]
+        if df.empty:
+            return []
+
+        products = []
+        for a, supply_rate in zip(self._analyze_frame(df), df['supply_rate'].tolist()):
+            product = Product(
+                book_id=a['book_id'],
+                isbn=a['isbn'],
+                list_price=a['list_price'],
+                sale_price=a['sale_price'],
+                supply_rate=supply_rate,
+                margin_per_unit=a['margin_per_unit'],
+                shipping_cost=a['shipping_cost'],
+                net_margin=a['net_margin'],
+                shipping_policy=a['shipping_policy'],
+                can_upload_single=a['can_upload_single'],
+                status='ready'
+            )
+            if not a['can_upload_single']:
+                product.status = 'excluded'
+                product.exclude_reason = f'순마진 부족 ({a["net_margin"]:,}원 < 0원). 묶음 SKU 필요.'
+            products.append(product)
+
+        return products
+
+    def _load_book_frame(self, book_ids: List[int] = None) -> pd.DataFrame:
+        """도서 + 출판사 공급률을 한 번에 컬럼 단위로 로드 (출판사 없으면 NaN)"""
+        query = self.db.query(
+            Book.id.label('book_id'),
+            Book.isbn,
+            Book.title,
+            Book.list_price,
+            Publisher.id.label('publisher_id'),
+            Publisher.name.label('publisher'),
+            Publisher.supply_rate,
+            Publisher.margin_rate,
+        ).outerjoin(Publisher, Book.publisher_id == Publisher.id)
+
+        if book_ids:
+            query = query.filter(Book.id.in_(book_ids))
+        else:
+            # Product가 없는 도서만 (미분석)
+            query = query.filter(
+                ~exists().where(Product.book_id == Book.id)
+            )
+
+        return pd.read_sql(query.order_by(Book.id).statement, self.db.connection())
+
+    @staticmethod
+    def _analyze_frame(df: pd.DataFrame) -> List[Dict]:
+        """_load_book_frame() 결과 → analyze_book()과 같은 dict 리스트 (NumPy 일괄 계산)"""
+        m = calculate_margins(df['list_price'], df['supply_rate'], df['margin_rate'])
+        profitability = profitability_levels(m['net_margin'])
+
+        columns = {
+            'book_id': df['book_id'].tolist(),
+            'isbn': df['isbn'].tolist(),
+            'title': df['title'].tolist(),
+            'publisher': df['publisher'].tolist(),
+            'publisher_id': df['publisher_id'].astype(int).tolist(),
+            'list_price': df['list_price'].tolist(),
+            'sale_price': m['sale_price'].tolist(),
+            'supply_cost': m['supply_cost'].tolist(),
+            'coupang_fee': m['coupang_fee'].tolist(),
+            'margin_per_unit': m['margin_per_unit'].tolist(),
+            'net_margin': m['net_margin'].tolist(),
+            'shipping_cost': m['shipping_cost'].tolist(),
+            'shipping_policy': m['shipping_policy'].tolist(),
+            'can_upload_single': (m['net_margin'] >= 0).tolist(),
+            'profitability': profitability.tolist(),
+            'recommendation': [RECOMMENDATIONS[p] for p in profitability.tolist()],
+        }
+        keys = list(columns)
+        return [dict(zip(keys, values)) for values in zip(*columns.values())]
+
     def get_profitability_report(self, analysis_results: Dict) -> str:
         """
         수익성 분석 리포트 생성
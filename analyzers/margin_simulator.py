@@ -0,0 +1,210 @@
+"""마진 What-if 시뮬레이션 모듈
+
+수수료율(COUPANG_FEE_RATE) / 택배비(DEFAULT_SHIPPING_COST) / 출판사 공급률이
+바뀌면 어떤 도서·리스팅이 순마진 음수로 전환되는지 카탈로그 전체를 한 번에 계산.
+
+계산식은 Publisher.calculate_margin() + determine_customer_shipping_fee()와 같고
+(analyzers.margin_calculator.calculate_margins), 시나리오마다 전체 카탈로그를 배열로 평가.
+"""
+import itertools
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from analyzers.margin_calculator import calculate_margins
+from app.constants import COUPANG_FEE_RATE, DEFAULT_SHIPPING_COST
+
+logger = logging.getLogger(__name__)
+
+GROUP_COLUMNS = {
+    "publisher": "publisher",
+    "account": "account_name",
+    "shipping_policy": "shipping_policy",
+}
+UNLISTED_ACCOUNT = "(미등록)"
+
+
+@dataclass
+class Scenario:
+    """시뮬레이션 파라미터 한 세트"""
+    fee_rate: float = COUPANG_FEE_RATE
+    shipping_cost: int = DEFAULT_SHIPPING_COST
+    supply_rate_delta: float = 0.0  # 전체 출판사 공급률 가감 (예: +0.02)
+    supply_rates: Dict[str, float] = field(default_factory=dict)  # 출판사명 → 공급률 (delta보다 우선)
+    name: str = ""
+
+    def label(self) -> str:
+        if self.name:
+            return self.name
+        parts = [f"수수료 {self.fee_rate * 100:g}%", f"택배비 {self.shipping_cost:,}"]
+        if self.supply_rate_delta:
+            parts.append(f"공급률 {self.supply_rate_delta:+g}")
+        for pub, rate in sorted(self.supply_rates.items()):
+            parts.append(f"{pub}={rate:g}")
+        return " / ".join(parts)
+
+
+def build_grid(fee_rates: List[float] = None, shipping_costs: List[int] = None,
+               supply_rate_deltas: List[float] = None,
+               supply_rates: Dict[str, float] = None) -> List[Scenario]:
+    """파라미터 그리드 → 시나리오 리스트 (각 목록의 곱집합)"""
+    return [
+        Scenario(fee_rate=fee, shipping_cost=ship, supply_rate_delta=delta,
+                 supply_rates=dict(supply_rates or {}))
+        for fee, ship, delta in itertools.product(
+            fee_rates or [COUPANG_FEE_RATE],
+            shipping_costs or [DEFAULT_SHIPPING_COST],
+            supply_rate_deltas or [0.0],
+        )
+    ]
+
+
+class MarginSimulator:
+    """
+    카탈로그 전체 마진 What-if 시뮬레이터
+
+    카탈로그 = 출판사가 있는 도서 × 연결된 리스팅 (리스팅 없는 도서는 '(미등록)' 계정 1행)
+    """
+
+    def __init__(self, engine: Engine, catalog: pd.DataFrame = None):
+        self.engine = engine
+        self._catalog = catalog
+        self._baseline = None
+
+    # ─── 데이터 로드 ───
+
+    @property
+    def catalog(self) -> pd.DataFrame:
+        if self._catalog is None:
+            self._catalog = self.load_catalog()
+        return self._catalog
+
+    def load_catalog(self) -> pd.DataFrame:
+        """도서 + 출판사 + 리스팅/계정 (1회 조회)"""
+        sql = """
+            SELECT
+                b.id as book_id,
+                b.isbn,
+                b.title,
+                b.list_price,
+                p.name as publisher,
+                p.supply_rate,
+                p.margin_rate,
+                l.id as listing_id,
+                a.account_name
+            FROM books b
+            JOIN publishers p ON b.publisher_id = p.id
+            LEFT JOIN products pr ON pr.book_id = b.id
+            LEFT JOIN listings l ON l.product_id = pr.id
+            LEFT JOIN accounts a ON l.account_id = a.id
+            WHERE b.list_price > 0
+            ORDER BY b.id, l.id
+        """
+        with self.engine.connect() as conn:
+            df = pd.read_sql(text(sql), conn)
+        df["account_name"] = df["account_name"].fillna(UNLISTED_ACCOUNT)
+        logger.info(f"시뮬레이션 카탈로그 로드: {len(df):,}행 (도서 {df['book_id'].nunique():,}개)")
+        return df
+
+    # ─── 계산 ───
+
+    def _evaluate(self, scenario: Scenario) -> Dict[str, np.ndarray]:
+        """시나리오 1개를 카탈로그 전체에 적용"""
+        df = self.catalog
+        supply = df["supply_rate"].to_numpy(dtype=float) + scenario.supply_rate_delta
+        if scenario.supply_rates:
+            override = df["publisher"].map(scenario.supply_rates).to_numpy(dtype=float)
+            supply = np.where(np.isnan(override), supply, override)
+
+        return calculate_margins(
+            df["list_price"].to_numpy(), supply, df["margin_rate"].to_numpy(),
+            fee_rate=scenario.fee_rate, shipping_cost=scenario.shipping_cost,
+        )
+
+    @property
+    def baseline(self) -> Dict[str, np.ndarray]:
+        """현재 상수/공급률 기준 마진"""
+        if self._baseline is None:
+            self._baseline = self._evaluate(Scenario(name="현재"))
+        return self._baseline
+
+    def simulate(self, scenarios: List[Scenario]) -> pd.DataFrame:
+        """
+        시나리오별 행 단위 결과 (long format)
+
+        Returns DataFrame:
+          scenario, book_id, isbn, title, publisher, account_name, listing_id,
+          shipping_policy(현재 기준), base_net_margin, net_margin, delta,
+          new_shipping_policy, flipped_negative, flipped_positive
+        """
+        base = self.baseline
+        keys = self.catalog[["book_id", "isbn", "title", "publisher", "account_name", "listing_id"]]
+        frames = []
+        for scenario in scenarios:
+            m = self._evaluate(scenario)
+            frame = keys.copy()
+            frame.insert(0, "scenario", scenario.label())
+            frame["shipping_policy"] = base["shipping_policy"]
+            frame["base_net_margin"] = base["net_margin"]
+            frame["net_margin"] = m["net_margin"]
+            frame["delta"] = m["net_margin"] - base["net_margin"]
+            frame["new_shipping_policy"] = m["shipping_policy"]
+            frame["flipped_negative"] = (base["net_margin"] >= 0) & (m["net_margin"] < 0)
+            frame["flipped_positive"] = (base["net_margin"] < 0) & (m["net_margin"] >= 0)
+            frames.append(frame)
+
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+
+    @staticmethod
+    def summarize(result: pd.DataFrame, by: str = "publisher") -> pd.DataFrame:
+        """
+        시나리오 × 그룹(publisher / account / shipping_policy)별 변화 요약
+        (시나리오는 simulate()에 넘긴 순서, 그 안에서 음수 전환 많은 순)
+
+        Returns DataFrame:
+          scenario, <그룹>, rows, base_margin, margin, delta,
+          negative, flipped_negative, flipped_positive
+        """
+        if by not in GROUP_COLUMNS:
+            raise ValueError(f"지원하지 않는 그룹: {by} (가능: {', '.join(GROUP_COLUMNS)})")
+        if result.empty:
+            return pd.DataFrame()
+
+        col = GROUP_COLUMNS[by]
+        summary = (
+            result.assign(negative=result["net_margin"] < 0)
+            .groupby(["scenario", col], sort=False)
+            .agg(
+                rows=("book_id", "size"),
+                base_margin=("base_net_margin", "sum"),
+                margin=("net_margin", "sum"),
+                delta=("delta", "sum"),
+                negative=("negative", "sum"),
+                flipped_negative=("flipped_negative", "sum"),
+                flipped_positive=("flipped_positive", "sum"),
+            )
+            .reset_index()
+        )
+        # 시나리오는 simulate() 입력(build_grid) 순서 유지 — 라벨 문자열 순 정렬 금지
+        order = {label: i for i, label in enumerate(pd.unique(result["scenario"]))}
+        return (summary.assign(_order=summary["scenario"].map(order))
+                .sort_values(["_order", "flipped_negative", "delta"],
+                             ascending=[True, False, True], kind="stable", ignore_index=True)
+                .drop(columns="_order"))
+
+    @staticmethod
+    def flipped_rows(result: pd.DataFrame, scenario: Optional[str] = None) -> pd.DataFrame:
+        """순마진 음수 전환 행만 (손실 큰 순)"""
+        if result.empty:
+            return result
+        df = result[result["flipped_negative"]]
+        if scenario is not None:
+            df = df[df["scenario"] == scenario]
+        return df.sort_values("net_margin").reset_index(drop=True)
@@ -10,6 +10,7 @@ HMAC-SHA256 인증, Rate Limit(10/sec) 준수, 주요 엔드포인트 지원
 """
 import time
 import hmac
+import threading
 import hashlib
 import urllib.parse
 from datetime import datetime, timezone
@@ -54,6 +55,7 @@ class CoupangWingClient:
         self.access_key = access_key
         self.secret_key = secret_key
         self._last_request_time = 0.0
+        self._throttle_lock = threading.Lock()
         self._session = requests.Session()
 
     def _generate_hmac(self, method: str, path: str, query: str = "") -> str:
@@ -78,12 +80,13 @@ class CoupangWingClient:
         return f"CEA algorithm=HmacSHA256, access-key={self.access_key}, signed-date={dt}, signature={signature}"
 
     def _throttle(self):
-        """Rate limit 준수: 요청 간 최소 0.1초 간격"""
-        now = time.time()
-        elapsed = now - self._last_request_time
-        if elapsed < self.RATE_LIMIT_INTERVAL:
-            time.sleep(self.RATE_LIMIT_INTERVAL - elapsed)
-        self._last_request_time = time.time()
+        """Rate limit 준수: 요청 간 최소 0.1초 간격 (여러 스레드가 같은 클라이언트를 써도 공유)"""
+        with self._throttle_lock:
+            now = time.time()
+            elapsed = now - self._last_request_time
+            if elapsed < self.RATE_LIMIT_INTERVAL:
+                time.sleep(self.RATE_LIMIT_INTERVAL - elapsed)
+            self._last_request_time = time.time()
 
     def _request(
         self,
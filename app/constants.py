@@ -128,11 +128,26 @@ PRICE_CONFIG = {
 }
 
 # ─────────────────────────────────────────────
-# 배송비 결정 함수 (공급률 + 정가 기준)
+# 배송비 구간표 (공급률 + 정가 기준)
 # ─────────────────────────────────────────────
-def determine_customer_shipping_fee(margin_rate: int, list_price: int) -> int:
+# (공급률 상한, [(정가 하한, 정가 상한, 고객 부담 배송비), ...]) — 위에서부터 처음 맞는 구간 적용.
+# 하한/상한 None = 제한 없음(양 끝 포함), 어느 구간에도 없으면 실제 택배비(DEFAULT_SHIPPING_COST).
+# determine_customer_shipping_fee()와 배열 버전(analyzers.margin_calculator.customer_shipping_fees)이
+# 모두 이 표를 읽는다.
+SHIPPING_FEE_BRACKETS = [
+    (55, [(15000, None, 0)]),                               # 15,000 이상 무료
+    (60, [(18000, None, 0)]),                               # 18,000 이상 무료
+    (62, [(18000, None, 0), (None, None, 2000)]),           # 18,000 이상 무료 / 미만 2,000
+    (65, [(20500, None, 0), (18000, 20000, 1000)]),         # 20,500 이상 무료 / 18,000~20,000 → 1,000
+    (70, [(18500, 29000, 1000), (15000, 18000, 2000)]),     # 18,500~29,000 → 1,000 / 15,000~18,000 → 2,000
+    # 73%+: 구간 없음 → 항상 실제 택배비 (조건부 60,000원 무료)
+]
+
+
+def determine_customer_shipping_fee(margin_rate: int, list_price: int,
+                                    shipping_cost: int = DEFAULT_SHIPPING_COST) -> int:
     """
-    공급률(매입률)과 정가 기준으로 고객 부담 배송비 결정
+    공급률(매입률)과 정가 기준으로 고객 부담 배송비 결정 (SHIPPING_FEE_BRACKETS)
 
     규칙:
       공급률 ~55%: 정가 ≥ 15,000 → 무료 / 미만 → 2,300
@@ -145,40 +160,53 @@ def determine_customer_shipping_fee(margin_rate: int, list_price: int) -> int:
     Args:
         margin_rate: 매입률/공급률 (정수 40~73)
         list_price: 정가 (원)
+        shipping_cost: 실제 택배비 (구간 외 고객 부담 배송비, 시뮬레이션용)
 
     Returns:
         고객 부담 배송비 (0=무료, 1000, 2000, 2300)
     """
-    if margin_rate <= 55:
-        # 공급률 ~55%: 15,000원 이상 무료배송
-        return 0 if list_price >= 15000 else DEFAULT_SHIPPING_COST
-
-    if margin_rate <= 60:
-        # 공급률 56~60%: 18,000원 이상 무료배송
-        return 0 if list_price >= 18000 else DEFAULT_SHIPPING_COST
-
-    if margin_rate <= 62:
-        # 공급률 61~62%: 18,000원 이상 무료 / 미만 → 2,000
-        return 0 if list_price >= 18000 else 2000
-
-    if margin_rate <= 65:
-        # 공급률 63~65%: 20,500 이상 무료 / 18,000~20,000 → 1,000
-        if list_price >= 20500:
-            return 0
-        if 18000 <= list_price <= 20000:
-            return 1000
-        return DEFAULT_SHIPPING_COST
-
-    if margin_rate <= 70:
-        # 공급률 66~70%: 18,500~29,000 → 1,000 / 15,000~18,000 → 2,000
-        if 18500 <= list_price <= 29000:
-            return 1000
-        if 15000 <= list_price <= 18000:
-            return 2000
-        return DEFAULT_SHIPPING_COST
-
-    # 공급률 73%+: 항상 2,300원 (조건부 60,000원 무료배송)
-    return DEFAULT_SHIPPING_COST
+    for max_rate, brackets in SHIPPING_FEE_BRACKETS:
+        if margin_rate <= max_rate:
+            for low, high, fee in brackets:
+                if (low is None or list_price >= low) and (high is None or list_price <= high):
+                    return fee
+            return shipping_cost
+    return shipping_cost
+
+
+# ─────────────────────────────────────────────
+# 마진 계산식 (단건 / 배열 공용)
+# ─────────────────────────────────────────────
+def _truncate(value):
+    """int() 절사 — NumPy 배열이면 원소별"""
+    return value.astype("int64") if hasattr(value, "astype") else int(value)
+
+
+def margin_breakdown(list_price, supply_rate, customer_shipping_fee,
+                     fee_rate: float = COUPANG_FEE_RATE,
+                     shipping_cost: int = DEFAULT_SHIPPING_COST) -> dict:
+    """
+    순마진 = 판매가 - 공급가 - 수수료 - 셀러부담배송비
+    셀러부담배송비 = 실제택배비 - 고객부담배송비
+
+    정수 또는 NumPy 배열 모두 받음 (Publisher.calculate_margin / margin_calculator.calculate_margins)
+
+    Returns:
+        {sale_price, supply_cost, coupang_fee, margin_per_unit, net_margin, shipping_cost}
+    """
+    sale_price = _truncate(list_price * BOOK_DISCOUNT_RATE)
+    supply_cost = _truncate(list_price * supply_rate)
+    coupang_fee = _truncate(sale_price * fee_rate)
+    margin_per_unit = sale_price - supply_cost - coupang_fee
+    seller_shipping_cost = shipping_cost - customer_shipping_fee
+    return {
+        'sale_price': sale_price,
+        'supply_cost': supply_cost,
+        'coupang_fee': coupang_fee,
+        'margin_per_unit': margin_per_unit,
+        'net_margin': margin_per_unit - seller_shipping_cost,
+        'shipping_cost': seller_shipping_cost,
+    }
 
 
 # ─────────────────────────────────────────────
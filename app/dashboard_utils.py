@@ -12,6 +12,7 @@ from st_aggrid import AgGrid, GridOptionsBuilder, GridUpdateMode
 from app.api.coupang_wing_client import CoupangWingClient, CoupangWingError
 from app.constants import WING_ACCOUNT_ENV_MAP
 from app.database import engine
+from app.services.trigram_search import has_trgm
 
 
 # ─── 데이터 접근 ───
@@ -36,6 +37,16 @@ def query_df_cached(sql: str, params: dict = None) -> pd.DataFrame:
         return pd.DataFrame()
 
 
+@st.cache_data(ttl=300)
+def trgm_available() -> bool:
+    """pg_trgm 확장 설치 여부 (미설치/확인 실패 시 False → 검색은 LIKE만 사용)"""
+    try:
+        with engine.connect() as conn:
+            return has_trgm(conn)
+    except Exception:
+        return False
+
+
 def run_sql(sql: str, params: dict = None):
     """INSERT/UPDATE/DELETE 실행"""
     with engine.connect() as conn:
@@ -6,6 +6,9 @@ from app.models.product import Product
 from app.models.bundle_sku import BundleSKU
 from app.models.bundle_item import BundleItem
 from app.models.listing import Listing
+from app.models.listing_isbn import ListingIsbn
+from app.models.isbn_resolution import IsbnResolution
+from app.models.isbn_coverage import IsbnCoverage
 from app.models.analysis_result import AnalysisResult
 
 from app.models.revenue_history import RevenueHistory
@@ -14,6 +17,9 @@ from app.models.ad_spend import AdSpend
 from app.models.order import Order
 from app.models.return_request import ReturnRequest
 from app.models.ad_performance import AdPerformance
+from app.models.listing_score import ListingScore
+from app.models.ingested_file import IngestedFile
+from app.models.crawl_watermark import CrawlWatermark
 
 __all__ = [
     "Account",
@@ -23,12 +29,18 @@ __all__ = [
     "BundleSKU",
     "BundleItem",
     "Listing",
+    "ListingIsbn",
+    "IsbnResolution",
+    "IsbnCoverage",
     "AnalysisResult",
 
     "RevenueHistory",
     "SettlementHistory",
     "AdSpend",
     "AdPerformance",
+    "ListingScore",
+    "IngestedFile",
+    "CrawlWatermark",
     "Order",
     "ReturnRequest",
 ]
@@ -0,0 +1,26 @@
+"""증분 크롤링 기준점 모델 (출판사/신간 목록별 마지막 수집 출간일)"""
+from sqlalchemy import Column, String, Date, DateTime
+from datetime import datetime
+from app.database import Base
+
+
+class CrawlWatermark(Base):
+    """
+    증분 크롤링 high-water mark
+
+    scope: "publisher"(key=출판사명) / "new_releases"(key=목록 종류)
+    다음 수집은 last_pub_date(- 여유 기간) 이후 출간분만 조회
+    (app.services.crawl_watermarks)
+    """
+
+    __tablename__ = "crawl_watermarks"
+
+    scope = Column(String(30), primary_key=True)
+    key = Column(String(100), primary_key=True)
+
+    last_pub_date = Column(Date)            # 지금까지 본 가장 최근 출간일 (오늘 이후는 오늘로)
+    last_isbn = Column(String(20))          # 그 출간일의 도서 ISBN
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<CrawlWatermark({self.scope}:{self.key} → {self.last_pub_date})>"
@@ -0,0 +1,29 @@
+"""파일 적재 원장 모델 (IngestionLedger 기록)"""
+from sqlalchemy import Column, Integer, BigInteger, String, Float, ForeignKey, DateTime
+from datetime import datetime
+from app.database import Base
+
+
+class IngestedFile(Base):
+    """적재 완료된 보고서 파일 (내용 해시 + 계정 + 보고서 종류 단위)"""
+
+    __tablename__ = "ingested_files"
+
+    file_hash = Column(String(64), primary_key=True)                              # SHA-256
+    account_id = Column(Integer, ForeignKey("accounts.id"), primary_key=True)
+    report_type = Column(String(30), primary_key=True)                            # ad_performance / ad_spend
+
+    file_name = Column(String(300))
+    file_size = Column(BigInteger, default=0)
+    rows_parsed = Column(Integer, default=0)
+    rows_saved = Column(Integer, default=0)
+    period = Column(String(50))
+
+    # 처리 시간 (초)
+    parse_seconds = Column(Float, default=0)
+    save_seconds = Column(Float, default=0)
+
+    ingested_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<IngestedFile({self.file_name}, account={self.account_id}, {self.report_type})>"
@@ -0,0 +1,27 @@
+"""계정별 ISBN 커버리지 스냅샷 모델"""
+from sqlalchemy import Column, Integer, Text, DateTime, ForeignKey
+from datetime import datetime
+from app.database import Base
+
+
+class IsbnCoverage(Base):
+    """
+    계정별 ISBN 커버리지 (계정당 1행, 채우기/동기화 실행 후 갱신)
+
+    대시보드/리포트는 listings 전체를 다시 세지 않고 이 표를 읽음.
+    strategy_filled: 전략별 누적 채움 수 JSON ({"wing": 120, "books": 30, ...})
+    (app.services.isbn_coverage)
+    """
+
+    __tablename__ = "isbn_coverage"
+
+    account_id = Column(Integer, ForeignKey("accounts.id", ondelete="CASCADE"), primary_key=True)
+    total = Column(Integer, default=0)              # 전체 리스팅
+    with_isbn = Column(Integer, default=0)          # ISBN 보유
+    set_listings = Column(Integer, default=0)       # ISBN 2개 이상 (세트)
+    needs_review = Column(Integer, default=0)       # 후보 신뢰도 미달 (isbn_resolutions.applied=false)
+    strategy_filled = Column(Text)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<IsbnCoverage(account={self.account_id}, {self.with_isbn}/{self.total})>"
@@ -0,0 +1,27 @@
+"""ISBN 후보 판정 결과 모델 (리스팅별 최고 후보 + 신뢰도)"""
+from sqlalchemy import Column, Integer, String, Text, Float, Boolean, DateTime, ForeignKey
+from datetime import datetime
+from app.database import Base
+
+
+class IsbnResolution(Base):
+    """
+    리스팅 ISBN 판정 결과 (리스팅당 1행, 재판정 시 덮어씀)
+
+    raw_json / WING / books / 알라딘 후보를 모아 점수화한 최고 후보.
+    applied=True면 listings.isbn에 반영됨 (신뢰도 미달은 기록만, 수동 검토용)
+    (app.services.isbn_resolver)
+    """
+
+    __tablename__ = "isbn_resolutions"
+
+    listing_id = Column(Integer, ForeignKey("listings.id", ondelete="CASCADE"), primary_key=True)
+    isbn = Column(Text, nullable=False)             # 세트는 쉼표 구분 (listings.isbn과 같은 Text)
+    confidence = Column(Float, nullable=False)      # 0~1
+    sources = Column(String(50))                    # 후보를 낸 소스 (쉼표 구분: raw_json,books,...)
+    candidates = Column(Integer, default=0)         # 비교한 후보 수
+    applied = Column(Boolean, default=False)
+    resolved_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<IsbnResolution(listing={self.listing_id} → {self.isbn}, {self.confidence:.2f})>"
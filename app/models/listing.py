@@ -70,6 +70,8 @@ class Listing(Base):
     revenue_history = relationship("RevenueHistory", back_populates="listing")
     return_requests = relationship("ReturnRequest", back_populates="listing")
     ad_performances = relationship("AdPerformance", back_populates="listing")
+    isbn_entries = relationship("ListingIsbn", back_populates="listing",
+                                order_by="ListingIsbn.position", passive_deletes=True)
 
     def __repr__(self):
         return f"<Listing(account={self.account_id}, pid={self.coupang_product_id}, status='{self.coupang_status}')>"
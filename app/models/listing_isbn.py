@@ -0,0 +1,27 @@
+"""리스팅 ISBN 정규화 모델 (listings.isbn 쉼표 구분 목록 → 행 단위)"""
+from sqlalchemy import Column, Integer, Text, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from app.database import Base
+
+
+class ListingIsbn(Base):
+    """
+    리스팅 구성 ISBN (단권 1행, 세트는 권수만큼)
+
+    listings.isbn에서 파생 — 상품 동기화 / ISBN 채우기 시 함께 갱신
+    (app.services.listing_isbns)
+    """
+
+    __tablename__ = "listing_isbns"
+    __table_args__ = (
+        Index("ix_listing_isbns_isbn", "isbn", "listing_id"),
+    )
+
+    listing_id = Column(Integer, ForeignKey("listings.id", ondelete="CASCADE"), primary_key=True)
+    position = Column(Integer, primary_key=True)   # listings.isbn 내 순서 (0부터)
+    isbn = Column(Text, nullable=False)             # listings.isbn 토큰 그대로 (길이 제한 없음)
+
+    listing = relationship("Listing", back_populates="isbn_entries")
+
+    def __repr__(self):
+        return f"<ListingIsbn(listing={self.listing_id}, {self.position}: {self.isbn})>"
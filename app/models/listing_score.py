@@ -0,0 +1,33 @@
+"""상품 노출 점수 캐시 모델 (ExposureStrategyEngine.refresh_scores 결과)"""
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Index
+from datetime import datetime
+from app.database import Base
+
+
+class ListingScore(Base):
+    """리스팅별 종합 점수 스냅샷 (계정 단위로 통째 갱신)"""
+
+    __tablename__ = "listing_scores"
+    __table_args__ = (
+        Index("ix_listing_scores_account", "account_id", "overall_score"),
+    )
+
+    listing_id = Column(Integer, ForeignKey("listings.id"), primary_key=True)
+    account_id = Column(Integer, ForeignKey("accounts.id"), nullable=False)
+    period_days = Column(Integer, nullable=False, default=14)
+
+    # 영역별 점수 (0-100)
+    sales_velocity_score = Column(Float, default=50)   # 판매 속도
+    ad_efficiency_score = Column(Float, default=50)    # 광고 효율
+    stock_health_score = Column(Float, default=50)     # 재고 건강도
+    shipping_score = Column(Float, default=50)         # 배송 경쟁력
+
+    # 종합
+    overall_score = Column(Float, default=0)
+    grade = Column(String(2))          # A/B/C/D/F
+    top_action = Column(String(50))    # 최우선 액션
+
+    computed_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<ListingScore(listing={self.listing_id}, score={self.overall_score}, grade={self.grade})>"
@@ -4,8 +4,7 @@ from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
 from app.constants import (
-    BOOK_DISCOUNT_RATE, COUPANG_FEE_RATE, DEFAULT_SHIPPING_COST,
-    FREE_SHIPPING_THRESHOLD, determine_customer_shipping_fee,
+    FREE_SHIPPING_THRESHOLD, determine_customer_shipping_fee, margin_breakdown,
 )
 
 
@@ -41,17 +40,9 @@ class Publisher(Base):
         순마진 = 판매가 - 공급가 - 수수료 - 셀러부담배송비
         셀러부담배송비 = 실제택배비(2,300) - 고객부담배송비
         """
-        sale_price = int(list_price * BOOK_DISCOUNT_RATE)
-        supply_cost = int(list_price * self.supply_rate)
-        coupang_fee = int(sale_price * COUPANG_FEE_RATE)
-        margin_per_unit = sale_price - supply_cost - coupang_fee
-
         # 고객 부담 배송비 결정 (공급률 + 정가 기반)
         customer_shipping_fee = determine_customer_shipping_fee(self.margin_rate, list_price)
-        seller_shipping_cost = DEFAULT_SHIPPING_COST - customer_shipping_fee
-
-        # 순마진 = 마진 - 셀러 부담 배송비
-        net_margin = margin_per_unit - seller_shipping_cost
+        margin = margin_breakdown(list_price, self.supply_rate, customer_shipping_fee)
 
         if customer_shipping_fee == 0:
             shipping_policy = 'free'
@@ -59,12 +50,7 @@ class Publisher(Base):
             shipping_policy = 'paid'
 
         return {
-            'sale_price': sale_price,
-            'supply_cost': supply_cost,
-            'coupang_fee': coupang_fee,
-            'margin_per_unit': margin_per_unit,
-            'net_margin': net_margin,
-            'shipping_cost': seller_shipping_cost,
+            **margin,
             'customer_shipping_fee': customer_shipping_fee,
             'shipping_policy': shipping_policy,
         }
@@ -22,6 +22,10 @@ from app.dashboard_utils import (
 logger = logging.getLogger(__name__)
 ROOT = Path(__file__).resolve().parent.parent.parent
 
+# 대시보드(Streamlit 서버 프로세스)에서는 파싱 프로세스 풀을 띄우지 않음
+# (업로드는 보통 몇 개 파일, 대량 폴더 적재는 CLI --workers 사용)
+DASHBOARD_WORKERS = 1
+
 
 def render(selected_account, accounts_df, account_names):
     """광고 페이지"""
@@ -121,25 +125,36 @@ def _render_upload(accounts_df, account_names):
     _render_account_status(acct_id, upload_account)
 
 
+def _save_uploads(files) -> list:
+    """업로드 파일을 data/reports에 저장 → 경로 리스트"""
+    paths = []
+    for f in files:
+        tmp_path = ROOT / "data" / "reports" / f.name
+        tmp_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_bytes(f.getvalue())
+        paths.append(str(tmp_path))
+    return paths
+
+
+def _progress_callback(progress):
+    """sync_files 진행 콜백 → st.progress 갱신"""
+    def update(done, total, result):
+        progress.progress(done / total, text=f"완료 ({done}/{total}): {result.get('file', '')}")
+    return update
+
+
 def _sync_performance(files, account_id):
-    """광고 성과 보고서 동기화"""
+    """광고 성과 보고서 동기화 (대시보드 프로세스 안에서 순차 파싱 + 단일 writer)"""
     from scripts.sync_ad_performance import AdPerformanceSync
 
     syncer = AdPerformanceSync()
-    results = []
-    progress = st.progress(0, text="동기화 준비 중...")
-
-    for i, f in enumerate(files):
-        progress.progress(i / len(files), text=f"처리 중: {f.name}")
-        tmp_path = ROOT / "data" / "reports" / f.name
-        tmp_path.parent.mkdir(parents=True, exist_ok=True)
-        tmp_path.write_bytes(f.getvalue())
+    progress = st.progress(0, text=f"파싱 중... ({len(files)}개 파일)")
 
-        try:
-            result = syncer.sync_file(str(tmp_path), account_id=account_id)
-            results.append(result)
-        except Exception as e:
-            results.append({"file": f.name, "error": str(e), "parsed": 0, "saved": 0})
+    try:
+        results = syncer.sync_files(_save_uploads(files), account_id=account_id,
+                                    workers=DASHBOARD_WORKERS, progress=_progress_callback(progress))
+    except Exception as e:
+        results = [{"file": f.name, "error": str(e), "parsed": 0, "saved": 0} for f in files]
 
     progress.progress(1.0, text="완료!")
     _show_sync_results("광고 성과", results)
@@ -147,24 +162,17 @@ def _sync_performance(files, account_id):
 
 
 def _sync_spend(files):
-    """광고비 정산 보고서 동기화"""
+    """광고비 정산 보고서 동기화 (대시보드 프로세스 안에서 순차 파싱 + 단일 writer)"""
     from scripts.sync_ad_spend import AdSpendSync
 
     syncer = AdSpendSync()
-    results = []
-    progress = st.progress(0, text="동기화 준비 중...")
+    progress = st.progress(0, text=f"파싱 중... ({len(files)}개 파일)")
 
-    for i, f in enumerate(files):
-        progress.progress(i / len(files), text=f"처리 중: {f.name}")
-        tmp_path = ROOT / "data" / "reports" / f.name
-        tmp_path.parent.mkdir(parents=True, exist_ok=True)
-        tmp_path.write_bytes(f.getvalue())
-
-        try:
-            result = syncer.sync_file(str(tmp_path))
-            results.append(result)
-        except Exception as e:
-            results.append({"file": f.name, "error": str(e), "parsed": 0, "saved": 0})
+    try:
+        results = syncer.sync_files(_save_uploads(files), workers=DASHBOARD_WORKERS,
+                                    progress=_progress_callback(progress))
+    except Exception as e:
+        results = [{"file": f.name, "error": str(e), "parsed": 0, "saved": 0} for f in files]
 
     progress.progress(1.0, text="완료!")
     _show_sync_results("광고비 정산", results)
@@ -176,7 +184,10 @@ def _show_sync_results(label: str, results: list):
     total_parsed = sum(r.get("parsed", 0) for r in results)
     total_saved = sum(r.get("saved", 0) for r in results)
     errors = [r for r in results if r.get("error")]
+    skipped = [r for r in results if r.get("skipped")]
 
+    if skipped:
+        st.info(f"{label}: {len(skipped)}개 파일은 이미 적재된 파일이라 건너뜀")
     if total_saved > 0:
         st.success(f"{label}: {len(results)}개 파일, 파싱 {total_parsed:,}건, 저장 {total_saved:,}건")
     elif not errors:
@@ -194,6 +205,8 @@ def _show_sync_results(label: str, results: list):
                 "기간": r.get("period", "-"),
                 "파싱": r.get("parsed", 0),
                 "저장": r.get("saved", 0),
+                "처리(초)": r.get("parse_sec", 0) + r.get("save_sec", 0),
+                "비고": "이미 적재됨" if r.get("skipped") else "",
                 "오류": r.get("error", ""),
             })
         st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
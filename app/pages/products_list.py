@@ -5,7 +5,7 @@ import streamlit as st
 from st_aggrid import AgGrid, GridOptionsBuilder
 
 from app.dashboard_utils import (
-    query_df, query_df_cached, run_sql, CoupangWingError,
+    query_df, query_df_cached, run_sql, trgm_available, CoupangWingError,
 )
 from app.constants import COUPANG_FEE_RATE, DEFAULT_SHIPPING_COST
 
@@ -39,8 +39,14 @@ def render_tab_list(account_id, selected_account, accounts_df, _wing_client):
         where_parts.append("l.coupang_status = :status")
         _lst_params["status"] = status_filter
     if search_q:
-        where_parts.append("(l.product_name LIKE :sq OR l.isbn LIKE :sq OR CAST(l.coupang_product_id AS TEXT) LIKE :sq)")
+        # 상품명: 부분일치 + 오타 허용(pg_trgm word_similarity, ix_listings_product_name_trgm 인덱스)
+        # pg_trgm 미설치 DB는 <% 연산자가 없어 전체 검색이 실패 → LIKE만 사용
+        _fuzzy = " OR :sq_raw <% l.product_name" if trgm_available() else ""
+        where_parts.append(f"(l.product_name LIKE :sq{_fuzzy}"
+                           " OR l.isbn LIKE :sq OR CAST(l.coupang_product_id AS TEXT) LIKE :sq)")
         _lst_params["sq"] = f"%{search_q}%"
+        if _fuzzy:
+            _lst_params["sq_raw"] = search_q
     where_sql = " AND ".join(where_parts)
 
     listings_df = query_df(f"""
@@ -12,6 +12,7 @@ from app.dashboard_utils import (
     engine, CoupangWingError,
 )
 from uploaders.coupang_api_uploader import CoupangAPIUploader, _build_book_notices, _build_book_attributes
+from app.services.listing_isbns import replace_listing_isbns
 from app.constants import (
     WING_ACCOUNT_ENV_MAP, BOOK_CATEGORY_MAP, BOOK_DISCOUNT_RATE,
     COUPANG_FEE_RATE, DEFAULT_SHIPPING_COST, DEFAULT_STOCK,
@@ -743,7 +744,7 @@ def render_tab_manual(account_id, selected_account, accounts_df, _wing_client):
                         _m_dct, _m_dc, _m_fsoa = determine_delivery_charge_type(_pub_margin, _m_list_price)
                         try:
                             with engine.connect() as conn:
-                                conn.execute(text("""
+                                _lid = conn.execute(text("""
                                     INSERT INTO listings
                                     (account_id, isbn, coupang_product_id,
                                      coupang_status, sale_price, original_price, product_name,
@@ -752,6 +753,7 @@ def render_tab_manual(account_id, selected_account, accounts_df, _wing_client):
                                     VALUES (:aid, :isbn, :cid, 'active', :sp, :op, :pn,
                                             :stock, :dct, :dc, :fsoa, :now)
                                     ON CONFLICT DO NOTHING
+                                    RETURNING id
                                 """), {
                                     "aid": int(_acc["id"]),
                                     "isbn": _m_isbn,
@@ -761,7 +763,9 @@ def render_tab_manual(account_id, selected_account, accounts_df, _wing_client):
                                     "pn": _m_title,
                                     "stock": DEFAULT_STOCK, "dct": _m_dct, "dc": _m_dc, "fsoa": _m_fsoa,
                                     "now": datetime.now().isoformat(),
-                                })
+                                }).scalar()
+                                if _lid:
+                                    replace_listing_isbns(conn, _lid, _m_isbn)
                                 conn.commit()
                         except Exception as _db_e:
                             logger.warning(f"DB 저장 실패 ({_acc_name}): {_db_e}")
@@ -13,6 +13,7 @@ from app.dashboard_utils import (
     product_to_upload_data, engine, CoupangWingError,
 )
 from uploaders.coupang_api_uploader import CoupangAPIUploader
+from app.services.listing_isbns import replace_listing_isbns
 from app.constants import (
     BOOK_DISCOUNT_RATE, COUPANG_FEE_RATE, DEFAULT_SHIPPING_COST,
     DEFAULT_STOCK,
@@ -447,7 +448,7 @@ def render_tab_register(account_id, selected_account, accounts_df, _wing_client)
                               _dct, _dc, _fsoa = determine_delivery_charge_type(_mr, _lp)
                               try:
                                   with engine.connect() as conn:
-                                      conn.execute(text("""
+                                      _lid = conn.execute(text("""
                                           INSERT INTO listings
                                           (account_id, product_id, isbn, coupang_product_id,
                                            coupang_status, sale_price, original_price, product_name,
@@ -456,6 +457,7 @@ def render_tab_register(account_id, selected_account, accounts_df, _wing_client)
                                           VALUES (:aid, :pid, :isbn, :cid, 'active', :sp, :op, :pn,
                                                   :stock, :dct, :dc, :fsoa, :now)
                                           ON CONFLICT DO NOTHING
+                                          RETURNING id
                                       """), {
                                           "aid": int(_acc["id"]), "pid": int(row["product_id"]),
                                           "isbn": pd_data["isbn"], "cid": sid,
@@ -463,7 +465,9 @@ def render_tab_register(account_id, selected_account, accounts_df, _wing_client)
                                           "pn": name,
                                           "stock": DEFAULT_STOCK, "dct": _dct, "dc": _dc, "fsoa": _fsoa,
                                           "now": datetime.now().isoformat(),
-                                      })
+                                      }).scalar()
+                                      if _lid:
+                                          replace_listing_isbns(conn, _lid, pd_data["isbn"])
                                       # 이번 등록 반영 → 전 계정 완료 여부 체크
                                       _row_listed.add(_acc_name)
                                       if len(_row_listed) >= _wing_account_cnt:
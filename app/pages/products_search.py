@@ -11,6 +11,7 @@ from app.dashboard_utils import (
     engine, CoupangWingError,
 )
 from uploaders.coupang_api_uploader import CoupangAPIUploader
+from app.services.listing_isbns import replace_listing_isbns
 from app.constants import (
     BOOK_DISCOUNT_RATE, COUPANG_FEE_RATE, DEFAULT_SHIPPING_COST,
     DEFAULT_STOCK,
@@ -292,7 +293,7 @@ def render_tab_search(account_id, selected_account, accounts_df, _wing_client):
                                 _b_dct, _b_dc, _b_fsoa = determine_delivery_charge_type(_b_mr, _b_lp)
                                 try:
                                     with engine.connect() as conn:
-                                        conn.execute(text("""
+                                        _lid = conn.execute(text("""
                                             INSERT INTO listings
                                             (account_id, isbn, coupang_product_id,
                                              coupang_status, sale_price, original_price, product_name,
@@ -301,6 +302,7 @@ def render_tab_search(account_id, selected_account, accounts_df, _wing_client):
                                             VALUES (:aid, :isbn, :cid, 'active', :sp, :op, :pn,
                                                     :stock, :dct, :dc, :fsoa, :now)
                                             ON CONFLICT DO NOTHING
+                                            RETURNING id
                                         """), {
                                             "aid": int(_acc["id"]),
                                             "isbn": _b_isbn,
@@ -311,7 +313,9 @@ def render_tab_search(account_id, selected_account, accounts_df, _wing_client):
                                             "stock": DEFAULT_STOCK,
                                             "dct": _b_dct, "dc": _b_dc, "fsoa": _b_fsoa,
                                             "now": datetime.now().isoformat(),
-                                        })
+                                        }).scalar()
+                                        if _lid:
+                                            replace_listing_isbns(conn, _lid, _b_isbn)
                                         conn.commit()
                                 except Exception as _db_e:
                                     pass  # DB 실패는 무시 (다음 sync에서 잡힘)
@@ -20,6 +20,7 @@ from app.dashboard_utils import (
     query_df,
     fmt_krw,
     fmt_money_df,
+    render_kpi_row,
     engine,
 )
 
@@ -146,7 +147,7 @@ def render(selected_account, accounts_df, account_names):
 
     st.title("매출 / 정산")
 
-    main_tab1, main_tab2 = st.tabs(["💰 순이익", "📋 정산"])
+    main_tab1, main_tab2, main_tab3 = st.tabs(["💰 순이익", "📋 정산", "🧮 마진 시뮬레이션"])
 
     with main_tab1:
         _render_profit_tab(accounts_df, account_names)
@@ -154,6 +155,9 @@ def render(selected_account, accounts_df, account_names):
     with main_tab2:
         _render_settlement_tab(accounts_df, account_names)
 
+    with main_tab3:
+        _render_margin_simulation_tab()
+
 
 # ─── 순이익 탭 ───
 
@@ -848,3 +852,80 @@ def _render_settlement_tab(accounts_df, account_names):
                     st.dataframe(fmt_money_df(_subj_detail), width="stretch", hide_index=True)
         else:
             st.info("정산 상태 데이터가 없습니다.")
+
+
+# ─── 마진 시뮬레이션 탭 ───
+
+@st.cache_data(ttl=300)
+def _load_margin_catalog():
+    """시뮬레이션 카탈로그 (도서 × 리스팅, 5분 캐시)"""
+    from analyzers.margin_simulator import MarginSimulator
+    return MarginSimulator(engine).load_catalog()
+
+
+def _render_margin_simulation_tab():
+    """수수료율/택배비/공급률 변경 시 순마진 변화 시뮬레이션"""
+    from analyzers.margin_simulator import MarginSimulator, Scenario, GROUP_COLUMNS
+    from app.constants import COUPANG_FEE_RATE, DEFAULT_SHIPPING_COST
+
+    try:
+        catalog = _load_margin_catalog()
+    except Exception as e:
+        st.error(f"카탈로그 로드 실패: {e}")
+        return
+    if catalog.empty:
+        st.info("출판사가 연결된 도서가 없습니다.")
+        return
+
+    c1, c2, c3, c4 = st.columns([2, 2, 2, 2])
+    with c1:
+        fee_pct = st.number_input("수수료율 (%)", 0.0, 30.0, COUPANG_FEE_RATE * 100, 0.5, key="sim_fee")
+    with c2:
+        ship_cost = st.number_input("택배비 (원)", 0, 10000, DEFAULT_SHIPPING_COST, 100, key="sim_ship")
+    with c3:
+        delta_pct = st.number_input("전체 공급률 가감 (%p)", -20.0, 20.0, 0.0, 0.5, key="sim_delta")
+    with c4:
+        group_label = {"publisher": "출판사별", "account": "계정별", "shipping_policy": "배송정책별"}
+        by = st.selectbox("집계 기준", list(GROUP_COLUMNS), format_func=group_label.get, key="sim_by")
+
+    publishers = sorted(catalog["publisher"].unique())
+    sim_pubs = st.multiselect("공급률 개별 지정 출판사", publishers, key="sim_pubs")
+    overrides = {}
+    if sim_pubs:
+        current = catalog.drop_duplicates("publisher").set_index("publisher")["supply_rate"]
+        cols = st.columns(min(len(sim_pubs), 4))
+        for i, pub in enumerate(sim_pubs):
+            with cols[i % len(cols)]:
+                overrides[pub] = st.number_input(
+                    f"{pub} 공급률", 0.0, 1.0, float(current[pub]), 0.01, key=f"sim_rate_{pub}")
+
+    scenario = Scenario(fee_rate=fee_pct / 100, shipping_cost=int(ship_cost),
+                        supply_rate_delta=delta_pct / 100, supply_rates=overrides)
+    simulator = MarginSimulator(engine, catalog=catalog)
+    result = simulator.simulate([scenario])
+
+    render_kpi_row([
+        ("대상", f"{len(result):,}행"),
+        ("순마진 합계", fmt_krw(int(result["net_margin"].sum())),
+         fmt_krw(int(result["delta"].sum()))),
+        ("음수 전환", f"{int(result['flipped_negative'].sum()):,}행"),
+        ("양수 전환", f"{int(result['flipped_positive'].sum()):,}행"),
+        ("음수 마진", f"{int((result['net_margin'] < 0).sum()):,}행"),
+    ])
+
+    summary = simulator.summarize(result, by=by).drop(columns="scenario").rename(columns={
+        GROUP_COLUMNS[by]: group_label[by].replace("별", ""),
+        "rows": "행수", "base_margin": "현재 순마진", "margin": "변경 순마진", "delta": "순마진 변화",
+        "negative": "음수", "flipped_negative": "음수 전환", "flipped_positive": "양수 전환",
+    })
+    st.dataframe(fmt_money_df(summary), width="stretch", hide_index=True)
+
+    flipped = simulator.flipped_rows(result)
+    if not flipped.empty:
+        st.warning(f"순마진 음수 전환 {len(flipped):,}행")
+        st.dataframe(fmt_money_df(flipped[[
+            "isbn", "title", "publisher", "account_name", "base_net_margin", "net_margin",
+        ]].rename(columns={
+            "title": "제목", "publisher": "출판사", "account_name": "계정",
+            "base_net_margin": "현재 순마진", "net_margin": "변경 순마진",
+        })), width="stretch", hide_index=True)
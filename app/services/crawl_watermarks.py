@@ -0,0 +1,98 @@
+"""
+증분 크롤링 기준점 (crawl_watermarks)
+=====================================
+출판사별(또는 신간 목록별)로 지금까지 수집한 가장 최근 출간일/ISBN을 기록하고,
+다음 수집은 그 날짜 - LOOKBACK_DAYS 이후 출간분만 조회 (최신순 검색은 기준일 도달 시 페이지 조회 중단).
+
+LOOKBACK_DAYS: 출간일보다 늦게 알라딘에 등록되는 도서를 놓치지 않기 위한 여유
+미래 출간일(예약판매)은 오늘 날짜로 잘라서 기록 → 그 사이 출간분을 건너뛰지 않음
+"""
+import logging
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+# 스크립트용 DDL (ORM 모델: app.models.crawl_watermark.CrawlWatermark)
+CREATE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS crawl_watermarks (
+    scope VARCHAR(30) NOT NULL,
+    key VARCHAR(100) NOT NULL,
+    last_pub_date DATE,
+    last_isbn VARCHAR(20),
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (scope, key)
+)
+"""
+
+SCOPE_PUBLISHER = "publisher"
+SCOPE_NEW_RELEASES = "new_releases"
+
+# 기준일에서 거슬러 올라가는 여유 기간 (일)
+LOOKBACK_DAYS = 7
+
+Mark = Tuple[date, Optional[str]]
+
+
+def ensure_table(conn):
+    """crawl_watermarks 테이블이 없으면 생성 (conn: Connection 또는 Session)"""
+    conn.execute(text(CREATE_TABLE_SQL))
+
+
+def _to_date(value) -> Optional[date]:
+    if value is None or isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])   # SQLite는 문자열로 반환
+
+
+def load_watermarks(conn, scope: str) -> Dict[str, Mark]:
+    """scope의 기준점 전체 {key: (last_pub_date, last_isbn)}"""
+    rows = conn.execute(text(
+        "SELECT key, last_pub_date, last_isbn FROM crawl_watermarks WHERE scope = :scope"
+    ), {"scope": scope}).fetchall()
+    return {r[0]: (_to_date(r[1]), r[2]) for r in rows if r[1] is not None}
+
+
+def since_date(mark: Optional[Mark], lookback_days: int = LOOKBACK_DAYS) -> Optional[date]:
+    """기준점 → 다음 수집 시작일 (기준점 없으면 None = 전체 수집)"""
+    if not mark:
+        return None
+    return mark[0] - timedelta(days=lookback_days)
+
+
+def newest_mark(items: Iterable[dict], today: date = None) -> Optional[Mark]:
+    """수집 결과(_parse_item 형식)에서 가장 최근 출간일/ISBN (미래 날짜는 오늘로)"""
+    today = today or date.today()
+    best: Optional[Mark] = None
+    for item in items:
+        pub = item.get("publish_date")
+        if not pub or not item.get("isbn"):
+            continue
+        pub = min(pub, today)
+        if best is None or pub > best[0]:
+            best = (pub, item["isbn"])
+    return best
+
+
+def save_watermark(conn, scope: str, key: str, mark: Optional[Mark],
+                   current: Optional[Mark] = None) -> bool:
+    """
+    기준점 저장 (기존보다 앞으로만 이동)
+
+    Returns:
+        저장했으면 True
+    """
+    if mark is None or (current and current[0] >= mark[0]):
+        return False
+    conn.execute(text("""
+        INSERT INTO crawl_watermarks (scope, key, last_pub_date, last_isbn, updated_at)
+        VALUES (:scope, :key, :pub, :isbn, :now)
+        ON CONFLICT (scope, key) DO UPDATE SET
+            last_pub_date = EXCLUDED.last_pub_date,
+            last_isbn = EXCLUDED.last_isbn,
+            updated_at = EXCLUDED.updated_at
+    """), {"scope": scope, "key": key, "pub": mark[0], "isbn": mark[1], "now": datetime.utcnow()})
+    logger.debug(f"수집 기준점 갱신: {scope}:{key} → {mark[0]} ({mark[1]})")
+    return True
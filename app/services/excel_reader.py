@@ -0,0 +1,184 @@
+"""
+대용량 Excel 스트리밍 리더
+==========================
+쿠팡 광고 보고서 / 광고비 정산 / WING 일괄 내보내기 xlsx를
+전체 로드하지 않고 행 단위로 읽음 (메모리 사용량이 파일 크기와 무관)
+
+- openpyxl read_only 모드 (기본)
+- python-calamine 설치 시 자동 사용 (Rust 파서, 더 빠름)
+
+iter_rows()   : 원시 행 튜플 스트림
+iter_frames() : 헤더 적용 DataFrame 청크 스트림 (pd.read_excel과 같은 컬럼명/결측 처리)
+read_frame()  : 청크를 합친 DataFrame (pd.read_excel 대체)
+"""
+import logging
+from itertools import islice
+from pathlib import Path
+from typing import Iterator, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 20_000
+
+SheetRef = Optional[Union[str, int]]
+
+
+def _has_calamine() -> bool:
+    try:
+        import python_calamine  # noqa: F401
+        return True
+    except Exception:
+        return False
+
+
+def _openpyxl_rows(path: Path, sheet: SheetRef) -> Iterator[tuple]:
+    import openpyxl
+
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        if sheet is None:
+            ws = wb.active
+        elif isinstance(sheet, int):
+            ws = wb.worksheets[sheet]
+        else:
+            ws = wb[sheet]
+        # read_only 모드의 셀 범위(dimension) 정보가 틀린 파일 대비
+        ws.reset_dimensions()
+        for row in ws.iter_rows(values_only=True):
+            yield row
+    finally:
+        wb.close()
+
+
+def _calamine_rows(path: Path, sheet: SheetRef) -> Iterator[tuple]:
+    from python_calamine import CalamineWorkbook
+
+    wb = CalamineWorkbook.from_path(str(path))
+    if sheet is None:
+        ws = wb.get_sheet_by_index(0)
+    elif isinstance(sheet, int):
+        ws = wb.get_sheet_by_index(sheet)
+    else:
+        ws = wb.get_sheet_by_name(sheet)
+
+    for row in ws.iter_rows():
+        # calamine은 빈 셀을 "", 정수도 float로 반환 → openpyxl과 같은 값으로 맞춤
+        yield tuple(
+            None if v == "" else int(v) if isinstance(v, float) and v.is_integer() else v
+            for v in row
+        )
+
+
+def iter_rows(path: Union[str, Path], sheet: SheetRef = None,
+              min_row: int = 1, backend: str = "auto") -> Iterator[tuple]:
+    """
+    시트 행을 값 튜플로 스트리밍
+
+    Args:
+        path: xlsx 경로
+        sheet: 시트명 또는 인덱스 (None=첫/활성 시트)
+        min_row: 시작 행 (1부터, Excel 행 번호 기준)
+        backend: "auto" | "openpyxl" | "calamine"
+
+    Yields:
+        (셀값, ...) — 빈 셀은 None, 행 길이는 시트마다 다를 수 있음
+    """
+    path = Path(path)
+    if backend == "auto":
+        backend = "calamine" if _has_calamine() else "openpyxl"
+
+    rows = _calamine_rows(path, sheet) if backend == "calamine" else _openpyxl_rows(path, sheet)
+    return islice(rows, min_row - 1, None)
+
+
+def _make_header(values: tuple) -> List[str]:
+    """pd.read_excel과 같은 컬럼명: 빈 헤더 → 'Unnamed: i', 중복 → 'x.1', 'x.2'"""
+    header = []
+    seen = {}
+    for i, v in enumerate(values):
+        name = f"Unnamed: {i}" if v is None or (isinstance(v, str) and not v.strip()) else v
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        header.append(name)
+    return header
+
+
+def _to_frame(rows: List[tuple], header: List[str]) -> pd.DataFrame:
+    width = len(header)
+    rows = [tuple(r[:width]) + (None,) * (width - len(r)) for r in rows]
+    df = pd.DataFrame.from_records(rows, columns=header)
+    # read_excel과 같이 빈 셀은 NaN (None 대신)
+    obj_cols = df.columns[df.dtypes == object]
+    if len(obj_cols):
+        df[obj_cols] = df[obj_cols].where(df[obj_cols].notna(), np.nan)
+    return df
+
+
+def iter_frames(path: Union[str, Path], sheet: SheetRef = None, header_row: int = 0,
+                chunk_size: int = DEFAULT_CHUNK_SIZE, backend: str = "auto") -> Iterator[pd.DataFrame]:
+    """
+    헤더를 적용한 DataFrame 청크 스트리밍
+
+    Args:
+        header_row: 헤더 행 (0부터, pd.read_excel의 header와 같은 의미)
+        chunk_size: 청크당 최대 행 수
+
+    Yields:
+        DataFrame — 시트 끝의 빈 행은 제외, 청크 간 인덱스는 연속
+        (인덱스 i = 헤더 다음 i번째 행, pd.read_excel과 동일)
+    """
+    rows = iter_rows(path, sheet, min_row=header_row + 1, backend=backend)
+    first = next(rows, None)
+    if first is None:
+        return
+
+    # 헤더 오른쪽의 빈 셀 제거 (서식만 있는 셀도 반환됨)
+    first = list(first)
+    while first and first[-1] is None:
+        first.pop()
+    header = _make_header(tuple(first))
+
+    offset = 0
+    buf = []
+    blank = 0  # 대기 중인 빈 행 수 (read_excel처럼 중간 빈 행은 유지, 끝쪽 빈 행만 제외)
+    for row in rows:
+        if all(v is None for v in row):
+            blank += 1
+            continue
+        buf.extend([()] * blank)
+        blank = 0
+        buf.append(row)
+
+        # 헤더보다 넓은 데이터 행 → 'Unnamed: i' 컬럼 추가 (read_excel과 동일)
+        if len(row) > len(header):
+            width = max(i for i, v in enumerate(row) if v is not None) + 1
+            header = header + [f"Unnamed: {i}" for i in range(len(header), width)]
+        if len(buf) >= chunk_size:
+            df = _to_frame(buf, header)
+            df.index = pd.RangeIndex(offset, offset + len(df))
+            offset += len(df)
+            buf = []
+            yield df
+
+    if buf or offset == 0:
+        df = _to_frame(buf, header)
+        df.index = pd.RangeIndex(offset, offset + len(df))
+        yield df
+
+
+def read_frame(path: Union[str, Path], sheet: SheetRef = None, header_row: int = 0,
+               backend: str = "auto") -> pd.DataFrame:
+    """시트 전체를 DataFrame으로 (read_only 스트리밍, pd.read_excel 대체)"""
+    frames = list(iter_frames(path, sheet, header_row, backend=backend))
+    if not frames:
+        return pd.DataFrame()
+    if len(frames) == 1:
+        return frames[0]
+    # 청크마다 추론된 dtype이 다를 수 있어 합친 뒤 재추론
+    return pd.concat(frames).infer_objects()
@@ -5,13 +5,23 @@
 
 점수 가중치:
   판매 속도 35% | 광고 효율 25% | 재고 건강도 20% | 배송 경쟁력 20%
+
+점수 캐시:
+  refresh_scores()로 listing_scores 테이블에 미리 계산해두고
+  get_cached_scores()로 조회 (매출/광고 동기화 직후 계정 단위 갱신)
+
+계정 일괄 처리:
+  *_batch(account_ids) 메서드는 계정별 쿼리를 반복하지 않고
+  account_id로 GROUP BY 한 쿼리 세트 한 번으로 {account_id: 결과}를 반환.
+  단일 계정 메서드는 batch 메서드의 래퍼.
 """
 import logging
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
 from typing import List, Dict, Optional
 
+import numpy as np
 import pandas as pd
-from sqlalchemy import text
+from sqlalchemy import text, bindparam
 from sqlalchemy.engine import Engine
 
 logger = logging.getLogger(__name__)
@@ -26,8 +36,57 @@ class ExposureStrategyEngine:
     WEIGHT_STOCK = 0.20
     WEIGHT_SHIPPING = 0.20
 
+    # 최저 점수 영역 → 추천 액션 (점수가 같으면 앞쪽 우선)
+    ACTION_BY_SCORE = [
+        ("재고 보충", "stock_health_score"),
+        ("배송 정책 개선", "shipping_score"),
+        ("광고 최적화", "ad_efficiency_score"),
+        ("판매 촉진", "sales_velocity_score"),
+    ]
+
+    SCORE_COLUMNS = [
+        "sales_velocity_score", "ad_efficiency_score",
+        "stock_health_score", "shipping_score",
+    ]
+
+    CREATE_SCORE_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS listing_scores (
+        listing_id INTEGER PRIMARY KEY REFERENCES listings(id),
+        account_id INTEGER NOT NULL REFERENCES accounts(id),
+        period_days INTEGER NOT NULL DEFAULT 14,
+        sales_velocity_score REAL DEFAULT 50,
+        ad_efficiency_score REAL DEFAULT 50,
+        stock_health_score REAL DEFAULT 50,
+        shipping_score REAL DEFAULT 50,
+        overall_score REAL DEFAULT 0,
+        grade VARCHAR(2),
+        top_action VARCHAR(50),
+        computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """
+
+    CREATE_SCORE_INDEXES_SQL = [
+        "CREATE INDEX IF NOT EXISTS ix_listing_scores_account ON listing_scores(account_id, overall_score)",
+    ]
+
     def __init__(self, engine: Engine):
         self.engine = engine
+        self._score_table_ready = False
+
+    @staticmethod
+    def _sql(sql: str):
+        """:aids 파라미터를 IN (...) 목록으로 펼치는 text()"""
+        return text(sql).bindparams(bindparam("aids", expanding=True))
+
+    @staticmethod
+    def _split_by_account(df: pd.DataFrame, account_ids: List[int]) -> Dict[int, pd.DataFrame]:
+        """account_id 컬럼 기준으로 계정별 DataFrame 분리 (데이터 없는 계정은 빈 DataFrame)"""
+        result = {aid: pd.DataFrame() for aid in account_ids}
+        if df.empty:
+            return result
+        for aid, group in df.groupby("account_id", sort=False):
+            result[int(aid)] = group.drop(columns="account_id").reset_index(drop=True)
+        return result
 
     # ══════════════════════════════════════
     # 상품 스코어링
@@ -42,29 +101,40 @@ class ExposureStrategyEngine:
           stock_health_score, shipping_score,
           overall_score, grade, top_action
         """
-        # 기본 리스팅 정보
-        listings = self._get_active_listings(account_id)
+        return self.get_product_scores_batch([account_id], period_days)[account_id]
+
+    def get_product_scores_batch(self, account_ids: List[int],
+                                 period_days: int = 14) -> Dict[int, pd.DataFrame]:
+        """
+        여러 계정의 상품별 종합 점수 (쿼리 3회로 전체 계정 처리)
+
+        Returns:
+            {account_id: get_product_scores()와 같은 DataFrame}
+        """
+        result = {aid: pd.DataFrame() for aid in account_ids}
+        if not account_ids:
+            return result
+
+        # 기본 리스팅 정보 (재고/배송 점수도 이 결과로 계산 → 재조회 없음)
+        listings = self._get_active_listings(account_ids)
         if listings.empty:
-            return pd.DataFrame()
+            return result
 
         # 각 점수 계산
-        sales = self._calc_sales_velocity(account_id, period_days)
-        ad_eff = self._calc_ad_efficiency(account_id, period_days)
-        stock = self._calc_stock_health(account_id)
-        shipping = self._calc_shipping_score(account_id)
+        sales = self._calc_sales_velocity(account_ids, period_days)
+        ad_eff = self._calc_ad_efficiency(account_ids, period_days)
 
-        # 병합
+        # 병합 (listing_id는 계정 간에도 유일)
         df = listings.copy()
-        for sub_df, col in [(sales, "sales_velocity_score"), (ad_eff, "ad_efficiency_score"),
-                            (stock, "stock_health_score"), (shipping, "shipping_score")]:
+        for sub_df, col in [(sales, "sales_velocity_score"), (ad_eff, "ad_efficiency_score")]:
             if not sub_df.empty and "listing_id" in sub_df.columns:
                 df = df.merge(sub_df[["listing_id", col]], on="listing_id", how="left")
+        df["stock_health_score"] = self._stock_scores(df["stock_quantity"])
+        df["shipping_score"] = self._shipping_scores(df["delivery_charge_type"])
 
         # 결측값 기본 점수
-        df["sales_velocity_score"] = df.get("sales_velocity_score", pd.Series(50)).fillna(50)
-        df["ad_efficiency_score"] = df.get("ad_efficiency_score", pd.Series(50)).fillna(50)
-        df["stock_health_score"] = df.get("stock_health_score", pd.Series(50)).fillna(50)
-        df["shipping_score"] = df.get("shipping_score", pd.Series(50)).fillna(50)
+        for col in self.SCORE_COLUMNS:
+            df[col] = df.get(col, pd.Series(50, index=df.index)).fillna(50)
 
         # 종합 점수
         df["overall_score"] = (
@@ -75,17 +145,24 @@ class ExposureStrategyEngine:
         ).round(1)
 
         # 등급
-        df["grade"] = df["overall_score"].apply(self._score_to_grade)
+        df["grade"] = self._scores_to_grades(df["overall_score"])
 
         # 최우선 액션
-        df["top_action"] = df.apply(self._determine_top_action, axis=1)
+        df["top_action"] = self._determine_top_actions(df)
 
-        return df.sort_values("overall_score", ascending=False).reset_index(drop=True)
+        # 점수 유무와 무관하게 컬럼 순서 고정
+        df = df[list(listings.columns) + self.SCORE_COLUMNS + ["overall_score", "grade", "top_action"]]
 
-    def _get_active_listings(self, account_id: int) -> pd.DataFrame:
+        for aid, group in self._split_by_account(df, account_ids).items():
+            if not group.empty:
+                result[aid] = group.sort_values("overall_score", ascending=False).reset_index(drop=True)
+        return result
+
+    def _get_active_listings(self, account_ids: List[int]) -> pd.DataFrame:
         """활성 리스팅 기본 정보"""
         sql = """
-            SELECT l.id as listing_id,
+            SELECT l.account_id,
+                   l.id as listing_id,
                    l.product_name,
                    l.isbn,
                    l.sale_price,
@@ -94,13 +171,13 @@ class ExposureStrategyEngine:
                    l.coupang_product_id,
                    l.vendor_item_id
             FROM listings l
-            WHERE l.account_id = :aid AND l.coupang_status = 'active'
+            WHERE l.account_id IN :aids AND l.coupang_status = 'active'
         """
         with self.engine.connect() as conn:
-            result = pd.read_sql(text(sql), conn, params={"aid": account_id})
+            result = pd.read_sql(self._sql(sql), conn, params={"aids": list(account_ids)})
         return result
 
-    def _calc_sales_velocity(self, account_id: int, period_days: int) -> pd.DataFrame:
+    def _calc_sales_velocity(self, account_ids: List[int], period_days: int) -> pd.DataFrame:
         """매출 속도 점수 (0-100)"""
         today = date.today()
         period_start = today - timedelta(days=period_days)
@@ -108,6 +185,7 @@ class ExposureStrategyEngine:
 
         sql = """
             SELECT
+                r.account_id,
                 r.listing_id,
                 SUM(CASE WHEN r.recognition_date >= :period_start AND r.sale_type = 'SALE'
                          THEN r.quantity ELSE 0 END) as current_qty,
@@ -122,14 +200,14 @@ class ExposureStrategyEngine:
                               AND r.sale_type = 'SALE'
                          THEN r.sale_amount ELSE 0 END) as prev_revenue
             FROM revenue_history r
-            WHERE r.account_id = :aid
+            WHERE r.account_id IN :aids
                 AND r.recognition_date >= :prev_start
                 AND r.listing_id IS NOT NULL
-            GROUP BY r.listing_id
+            GROUP BY r.account_id, r.listing_id
         """
         with self.engine.connect() as conn:
-            df = pd.read_sql(text(sql), conn, params={
-                "aid": account_id,
+            df = pd.read_sql(self._sql(sql), conn, params={
+                "aids": list(account_ids),
                 "period_start": period_start.isoformat(),
                 "prev_start": prev_start.isoformat(),
             })
@@ -137,37 +215,45 @@ class ExposureStrategyEngine:
         if df.empty:
             return pd.DataFrame(columns=["listing_id", "sales_velocity_score"])
 
-        # 성장률 계산
-        df["growth_rate"] = df.apply(
-            lambda r: ((r["current_qty"] - r["prev_qty"]) / r["prev_qty"] * 100)
-            if r["prev_qty"] > 0 else (100 if r["current_qty"] > 0 else 0),
-            axis=1,
-        )
+        df = self._score_sales_velocity(df)
+        return df[["account_id", "listing_id", "sales_velocity_score", "current_qty",
+                   "current_revenue", "prev_qty", "prev_revenue", "growth_rate"]]
 
-        # 판매량 기준 백분위 (상대 평가)
-        max_qty = df["current_qty"].max()
-        if max_qty > 0:
-            df["qty_percentile"] = (df["current_qty"] / max_qty * 60).clip(0, 60)
+    @staticmethod
+    def _score_sales_velocity(df: pd.DataFrame) -> pd.DataFrame:
+        """current_qty/prev_qty → growth_rate, sales_velocity_score 컬럼 추가"""
+        curr = df["current_qty"].to_numpy(dtype=float)
+        prev = df["prev_qty"].to_numpy(dtype=float)
+
+        # 성장률 계산 (이전 판매 없으면 신규 판매 100%, 판매 없음 0%)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            growth = np.where(prev > 0, (curr - prev) / prev * 100,
+                              np.where(curr > 0, 100.0, 0.0))
+        df["growth_rate"] = growth
+
+        # 판매량 기준 백분위 (계정 내 상대 평가)
+        if "account_id" in df.columns:
+            max_qty = df.groupby("account_id")["current_qty"].transform("max").to_numpy(dtype=float)
         else:
-            df["qty_percentile"] = 0
+            max_qty = np.full(len(df), float(df["current_qty"].max()))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pct = np.where(max_qty > 0, curr / max_qty * 60, 0.0)
+        df["qty_percentile"] = np.clip(pct, 0, 60)
 
         # 성장률 기준 점수 (최대 40점)
-        df["growth_score"] = df["growth_rate"].apply(
-            lambda g: min(40, max(0, 20 + g * 0.2))
-        )
+        df["growth_score"] = np.clip(20 + growth * 0.2, 0, 40)
 
         df["sales_velocity_score"] = (df["qty_percentile"] + df["growth_score"]).clip(0, 100).round(1)
+        return df
 
-        return df[["listing_id", "sales_velocity_score", "current_qty", "current_revenue",
-                    "prev_qty", "prev_revenue", "growth_rate"]]
-
-    def _calc_ad_efficiency(self, account_id: int, period_days: int) -> pd.DataFrame:
+    def _calc_ad_efficiency(self, account_ids: List[int], period_days: int) -> pd.DataFrame:
         """광고 효율 점수 (0-100)"""
         today = date.today()
         period_start = today - timedelta(days=period_days)
 
         sql = """
             SELECT
+                ap.account_id,
                 ap.listing_id,
                 SUM(ap.impressions) as total_impressions,
                 SUM(ap.clicks) as total_clicks,
@@ -175,15 +261,15 @@ class ExposureStrategyEngine:
                 SUM(ap.total_revenue) as total_revenue,
                 SUM(ap.total_orders) as total_orders
             FROM ad_performances ap
-            WHERE ap.account_id = :aid
+            WHERE ap.account_id IN :aids
                 AND ap.ad_date >= :period_start
                 AND ap.listing_id IS NOT NULL
-            GROUP BY ap.listing_id
+            GROUP BY ap.account_id, ap.listing_id
         """
         try:
             with self.engine.connect() as conn:
-                df = pd.read_sql(text(sql), conn, params={
-                    "aid": account_id,
+                df = pd.read_sql(self._sql(sql), conn, params={
+                    "aids": list(account_ids),
                     "period_start": period_start.isoformat(),
                 })
         except Exception:
@@ -193,181 +279,253 @@ class ExposureStrategyEngine:
         if df.empty:
             return pd.DataFrame(columns=["listing_id", "ad_efficiency_score"])
 
+        df = self._score_ad_efficiency(df)
+        return df[["account_id", "listing_id", "ad_efficiency_score"]]
+
+    @staticmethod
+    def _score_ad_efficiency(df: pd.DataFrame) -> pd.DataFrame:
+        """total_spend/total_revenue → roas_pct, ad_efficiency_score 컬럼 추가"""
+        spend = df["total_spend"].to_numpy(dtype=float)
+        revenue = np.nan_to_num(df["total_revenue"].to_numpy(dtype=float))
+
         # ROAS 기반 점수
-        df["roas_pct"] = df.apply(
-            lambda r: (r["total_revenue"] / r["total_spend"] * 100) if r["total_spend"] > 0 else 0,
-            axis=1,
-        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            roas = np.where(spend > 0, revenue / spend * 100, 0.0)
+        df["roas_pct"] = roas
 
         # ROAS → 점수 변환
         # 300%+ = 90~100, 200-300% = 70~90, 100-200% = 40~70, <100% = 0~40
-        def roas_to_score(roas):
-            if roas >= 300:
-                return min(100, 90 + (roas - 300) / 100 * 10)
-            elif roas >= 200:
-                return 70 + (roas - 200) / 100 * 20
-            elif roas >= 100:
-                return 40 + (roas - 100) / 100 * 30
-            else:
-                return max(0, roas / 100 * 40)
-
-        df["ad_efficiency_score"] = df["roas_pct"].apply(roas_to_score).round(1)
-
-        return df[["listing_id", "ad_efficiency_score"]]
-
-    def _calc_stock_health(self, account_id: int) -> pd.DataFrame:
-        """재고 건강도 점수 (0-100)"""
-        sql = """
-            SELECT id as listing_id, stock_quantity
-            FROM listings
-            WHERE account_id = :aid AND coupang_status = 'active'
-        """
-        with self.engine.connect() as conn:
-            df = pd.read_sql(text(sql), conn, params={"aid": account_id})
-
-        if df.empty:
-            return pd.DataFrame(columns=["listing_id", "stock_health_score"])
-
-        def stock_to_score(qty):
-            if qty is None:
-                qty = 0
-            if qty >= 10:
-                return 100
-            elif qty >= 5:
-                return 70
-            elif qty >= 1:
-                return 30
-            else:
-                return 0
-
-        df["stock_health_score"] = df["stock_quantity"].apply(stock_to_score)
-        return df[["listing_id", "stock_health_score"]]
-
-    def _calc_shipping_score(self, account_id: int) -> pd.DataFrame:
-        """배송 경쟁력 점수 (0-100)"""
-        sql = """
-            SELECT id as listing_id, delivery_charge_type
-            FROM listings
-            WHERE account_id = :aid AND coupang_status = 'active'
-        """
-        with self.engine.connect() as conn:
-            df = pd.read_sql(text(sql), conn, params={"aid": account_id})
+        score = np.select(
+            [roas >= 300, roas >= 200, roas >= 100],
+            [
+                np.minimum(100, 90 + (roas - 300) / 100 * 10),
+                70 + (roas - 200) / 100 * 20,
+                40 + (roas - 100) / 100 * 30,
+            ],
+            default=np.maximum(0, roas / 100 * 40),
+        )
+        df["ad_efficiency_score"] = pd.Series(score, index=df.index).round(1)
+        return df
 
-        if df.empty:
-            return pd.DataFrame(columns=["listing_id", "shipping_score"])
-
-        def shipping_to_score(charge_type):
-            if not charge_type:
-                return 50  # 정보 없음 → 중립
-            ct = str(charge_type).upper()
-            if ct == "FREE":
-                return 100
-            elif ct == "CONDITIONAL_FREE":
-                return 70
-            else:  # NOT_FREE 등
-                return 30
-
-        df["shipping_score"] = df["delivery_charge_type"].apply(shipping_to_score)
-        return df[["listing_id", "shipping_score"]]
+    @staticmethod
+    def _stock_scores(stock_quantity: pd.Series) -> np.ndarray:
+        """재고 수량 → 점수 (10+ = 100, 5~9 = 70, 1~4 = 30, 품절/NULL = 0)"""
+        qty = pd.to_numeric(stock_quantity, errors="coerce").fillna(0).to_numpy()
+        return np.select([qty >= 10, qty >= 5, qty >= 1], [100, 70, 30], default=0)
 
     @staticmethod
-    def _score_to_grade(score: float) -> str:
-        if score >= 80:
-            return "A"
-        elif score >= 60:
-            return "B"
-        elif score >= 40:
-            return "C"
-        elif score >= 20:
-            return "D"
-        return "F"
+    def _shipping_scores(delivery_charge_type: pd.Series) -> np.ndarray:
+        """배송비 유형 → 점수 (FREE = 100, CONDITIONAL_FREE = 70, 그 외 = 30, 정보 없음 = 50)"""
+        missing = delivery_charge_type.isna() | (delivery_charge_type.astype(str) == "")
+        ct = delivery_charge_type.astype(str).str.upper()
+        return np.select(
+            [missing.to_numpy(), (ct == "FREE").to_numpy(), (ct == "CONDITIONAL_FREE").to_numpy()],
+            [50, 100, 70],
+            default=30,  # NOT_FREE 등
+        )
 
     @staticmethod
-    def _determine_top_action(row) -> str:
-        """점수가 가장 낮은 영역의 액션 추천"""
-        scores = {
-            "재고 보충": row.get("stock_health_score", 50),
-            "배송 정책 개선": row.get("shipping_score", 50),
-            "광고 최적화": row.get("ad_efficiency_score", 50),
-            "판매 촉진": row.get("sales_velocity_score", 50),
-        }
-        weakest = min(scores, key=scores.get)
-        weakest_score = scores[weakest]
+    def _scores_to_grades(scores: pd.Series) -> np.ndarray:
+        """종합 점수 → 등급 (80+ A, 60+ B, 40+ C, 20+ D, 그 외 F)"""
+        s = scores.to_numpy(dtype=float)
+        return np.select([s >= 80, s >= 60, s >= 40, s >= 20],
+                         ["A", "B", "C", "D"], default="F")
+
+    @classmethod
+    def _determine_top_actions(cls, df: pd.DataFrame) -> np.ndarray:
+        """점수가 가장 낮은 영역의 액션 추천 (최저 점수 70 이상이면 현상 유지)"""
+        labels = np.array([label for label, _ in cls.ACTION_BY_SCORE], dtype=object)
+        scores = np.column_stack([
+            df[col].to_numpy(dtype=float) if col in df.columns else np.full(len(df), 50.0)
+            for _, col in cls.ACTION_BY_SCORE
+        ])
+        weakest = scores.argmin(axis=1)
+        weakest_score = scores.min(axis=1)
+        return np.where(weakest_score >= 70, "현상 유지", labels[weakest])
 
-        if weakest_score >= 70:
-            return "현상 유지"
-        return weakest
+    # ══════════════════════════════════════
+    # 점수 캐시 (listing_scores)
+    # ══════════════════════════════════════
+    def _ensure_score_table(self):
+        """listing_scores 테이블이 없으면 생성"""
+        if self._score_table_ready:
+            return
+        with self.engine.connect() as conn:
+            conn.execute(text(self.CREATE_SCORE_TABLE_SQL))
+            for idx_sql in self.CREATE_SCORE_INDEXES_SQL:
+                conn.execute(text(idx_sql))
+            conn.commit()
+        self._score_table_ready = True
+
+    def refresh_scores(self, account_ids: Optional[List[int]] = None,
+                       period_days: int = 14) -> Dict[int, int]:
+        """
+        상품 점수를 계산해 listing_scores에 저장 (계정 단위 교체)
+
+        Args:
+            account_ids: 갱신할 계정 ID 목록 (None=활성 계정 전체)
+            period_days: 판매/광고 집계 기간
+
+        Returns:
+            {account_id: 저장 건수}
+        """
+        self._ensure_score_table()
+
+        if account_ids is None:
+            with self.engine.connect() as conn:
+                account_ids = [r[0] for r in conn.execute(text(
+                    "SELECT id FROM accounts WHERE is_active = true ORDER BY id"
+                )).fetchall()]
+
+        insert_sql = text("""
+            INSERT INTO listing_scores
+                (listing_id, account_id, period_days,
+                 sales_velocity_score, ad_efficiency_score,
+                 stock_health_score, shipping_score,
+                 overall_score, grade, top_action, computed_at)
+            VALUES
+                (:listing_id, :account_id, :period_days,
+                 :sales_velocity_score, :ad_efficiency_score,
+                 :stock_health_score, :shipping_score,
+                 :overall_score, :grade, :top_action, :computed_at)
+        """)
+
+        scores = self.get_product_scores_batch(account_ids, period_days)
+        computed_at = datetime.utcnow()
+
+        saved = {}
+        for aid in account_ids:
+            df = scores[aid]
+            rows = []
+            if not df.empty:
+                for rec in df[["listing_id"] + self.SCORE_COLUMNS
+                              + ["overall_score", "grade", "top_action"]].to_dict("records"):
+                    rec["listing_id"] = int(rec["listing_id"])
+                    for col in self.SCORE_COLUMNS + ["overall_score"]:
+                        rec[col] = float(rec[col])
+                    rec.update(account_id=aid, period_days=period_days, computed_at=computed_at)
+                    rows.append(rec)
+
+            # 계정 단위로 통째 교체 (비활성화된 리스팅 점수 제거)
+            with self.engine.begin() as conn:
+                conn.execute(text("DELETE FROM listing_scores WHERE account_id = :aid"), {"aid": aid})
+                if rows:
+                    conn.execute(insert_sql, rows)
+
+            saved[aid] = len(rows)
+            logger.info(f"listing_scores 갱신: account_id={aid}, {len(rows)}건")
+
+        return saved
+
+    def get_cached_scores(self, account_id: Optional[int] = None) -> pd.DataFrame:
+        """
+        listing_scores에 저장된 점수 조회 (account_id=None이면 전체 계정)
+
+        Returns DataFrame: get_product_scores() 컬럼 + account_id, computed_at
+        """
+        sql = """
+            SELECT s.listing_id, s.account_id,
+                   l.product_name, l.isbn, l.sale_price,
+                   s.sales_velocity_score, s.ad_efficiency_score,
+                   s.stock_health_score, s.shipping_score,
+                   s.overall_score, s.grade, s.top_action, s.computed_at
+            FROM listing_scores s
+            JOIN listings l ON l.id = s.listing_id
+        """
+        params = {}
+        if account_id is not None:
+            sql += " WHERE s.account_id = :aid"
+            params["aid"] = account_id
+        sql += " ORDER BY s.account_id, s.overall_score DESC"
+
+        try:
+            with self.engine.connect() as conn:
+                return pd.read_sql(text(sql), conn, params=params)
+        except Exception:
+            # 아직 refresh_scores()가 한 번도 실행되지 않음
+            return pd.DataFrame()
 
     # ══════════════════════════════════════
     # 액션 아이템
     # ══════════════════════════════════════
     def get_action_items(self, account_id: int, period_days: int = 14) -> List[dict]:
         """우선순위 정렬된 액션 아이템"""
-        items = []
+        return self.get_action_items_batch([account_id], period_days)[account_id]
+
+    def get_action_items_batch(self, account_ids: List[int],
+                               period_days: int = 14) -> Dict[int, List[dict]]:
+        """여러 계정의 액션 아이템 → {account_id: 우선순위 정렬된 리스트}"""
+        items = {aid: [] for aid in account_ids}
+        if not account_ids:
+            return items
+
         today = date.today()
         period_start = today - timedelta(days=period_days)
         prev_start = period_start - timedelta(days=period_days)
+        aids = list(account_ids)
+
+        def _add(aid, **item):
+            items[int(aid)].append({"account_id": int(aid), **item})
 
         # ── 재고 기반 액션 ──
         with self.engine.connect() as conn:
-            stock_df = pd.read_sql(text("""
-                SELECT l.id as listing_id, l.product_name, l.stock_quantity, l.isbn
+            stock_df = pd.read_sql(self._sql("""
+                SELECT l.account_id, l.id as listing_id, l.product_name,
+                       l.stock_quantity, l.isbn, l.delivery_charge_type
                 FROM listings l
-                WHERE l.account_id = :aid AND l.coupang_status = 'active'
-            """), conn, params={"aid": account_id})
+                WHERE l.account_id IN :aids AND l.coupang_status = 'active'
+            """), conn, params={"aids": aids})
 
         # 최근 판매 있는 상품 확인
         with self.engine.connect() as conn:
-            recent_sales = pd.read_sql(text("""
+            recent_sales = pd.read_sql(self._sql("""
                 SELECT listing_id, SUM(quantity) as qty
                 FROM revenue_history
-                WHERE account_id = :aid AND sale_type = 'SALE'
+                WHERE account_id IN :aids AND sale_type = 'SALE'
                     AND recognition_date >= :start
                 GROUP BY listing_id
-            """), conn, params={"aid": account_id, "start": period_start.isoformat()})
+            """), conn, params={"aids": aids, "start": period_start.isoformat()})
 
         recent_selling = set(recent_sales["listing_id"].tolist()) if not recent_sales.empty else set()
 
-        for _, row in stock_df.iterrows():
+        for row in stock_df.to_dict("records"):
             stock = row["stock_quantity"] or 0
             lid = row["listing_id"]
             name = row["product_name"] or row.get("isbn", "")
 
             if stock == 0:
-                items.append({
-                    "priority": "critical",
-                    "icon": "🔴",
-                    "listing_id": lid,
-                    "product_name": name,
-                    "action": "즉시 재고 보충",
-                    "reason": "품절 상태 → 알고리즘 노출 중단",
-                    "metric": f"재고: {stock}개",
-                })
+                _add(row["account_id"],
+                     priority="critical",
+                     icon="🔴",
+                     listing_id=lid,
+                     product_name=name,
+                     action="즉시 재고 보충",
+                     reason="품절 상태 → 알고리즘 노출 중단",
+                     metric=f"재고: {stock}개")
             elif stock <= 3 and lid in recent_selling:
-                items.append({
-                    "priority": "critical",
-                    "icon": "🔴",
-                    "listing_id": lid,
-                    "product_name": name,
-                    "action": "재고 보충 긴급",
-                    "reason": "최근 판매 발생 + 재고 부족",
-                    "metric": f"재고: {stock}개",
-                })
+                _add(row["account_id"],
+                     priority="critical",
+                     icon="🔴",
+                     listing_id=lid,
+                     product_name=name,
+                     action="재고 보충 긴급",
+                     reason="최근 판매 발생 + 재고 부족",
+                     metric=f"재고: {stock}개")
             elif 4 <= stock <= 5:
-                items.append({
-                    "priority": "warning",
-                    "icon": "🟡",
-                    "listing_id": lid,
-                    "product_name": name,
-                    "action": "재고 부족 주의",
-                    "reason": "재고가 소진될 수 있음",
-                    "metric": f"재고: {stock}개",
-                })
+                _add(row["account_id"],
+                     priority="warning",
+                     icon="🟡",
+                     listing_id=lid,
+                     product_name=name,
+                     action="재고 부족 주의",
+                     reason="재고가 소진될 수 있음",
+                     metric=f"재고: {stock}개")
 
         # ── 매출 변동 액션 ──
         with self.engine.connect() as conn:
-            sales_comp = pd.read_sql(text("""
+            sales_comp = pd.read_sql(self._sql("""
                 SELECT
+                    r.account_id,
                     r.listing_id,
                     l.product_name,
                     SUM(CASE WHEN r.recognition_date >= :period_start AND r.sale_type = 'SALE'
@@ -378,51 +536,49 @@ class ExposureStrategyEngine:
                              THEN r.sale_amount ELSE 0 END) as prev_rev
                 FROM revenue_history r
                 JOIN listings l ON r.listing_id = l.id
-                WHERE r.account_id = :aid
+                WHERE r.account_id IN :aids
                     AND r.recognition_date >= :prev_start
                     AND r.listing_id IS NOT NULL
-                GROUP BY r.listing_id
+                GROUP BY r.account_id, r.listing_id, l.product_name
             """), conn, params={
-                "aid": account_id,
+                "aids": aids,
                 "period_start": period_start.isoformat(),
                 "prev_start": prev_start.isoformat(),
             })
 
-        if not sales_comp.empty:
-            for _, row in sales_comp.iterrows():
-                prev = row["prev_rev"] or 0
-                curr = row["current_rev"] or 0
-                name = row["product_name"] or ""
-
-                if prev > 0:
-                    change_pct = (curr - prev) / prev * 100
-
-                    if change_pct <= -50:
-                        items.append({
-                            "priority": "critical",
-                            "icon": "🔴",
-                            "listing_id": row["listing_id"],
-                            "product_name": name,
-                            "action": "매출 급감 원인 파악",
-                            "reason": f"전기간 대비 매출 {change_pct:.0f}% 감소",
-                            "metric": f"₩{int(prev):,} → ₩{int(curr):,}",
-                        })
-                    elif change_pct >= 30:
-                        items.append({
-                            "priority": "opportunity",
-                            "icon": "🟢",
-                            "listing_id": row["listing_id"],
-                            "product_name": name,
-                            "action": "광고 투자 확대 추천",
-                            "reason": f"매출 성장 추세 ({change_pct:.0f}%↑)",
-                            "metric": f"₩{int(prev):,} → ₩{int(curr):,}",
-                        })
+        for row in sales_comp.to_dict("records"):
+            prev = row["prev_rev"] or 0
+            curr = row["current_rev"] or 0
+            name = row["product_name"] or ""
+
+            if prev > 0:
+                change_pct = (curr - prev) / prev * 100
+
+                if change_pct <= -50:
+                    _add(row["account_id"],
+                         priority="critical",
+                         icon="🔴",
+                         listing_id=row["listing_id"],
+                         product_name=name,
+                         action="매출 급감 원인 파악",
+                         reason=f"전기간 대비 매출 {change_pct:.0f}% 감소",
+                         metric=f"₩{int(prev):,} → ₩{int(curr):,}")
+                elif change_pct >= 30:
+                    _add(row["account_id"],
+                         priority="opportunity",
+                         icon="🟢",
+                         listing_id=row["listing_id"],
+                         product_name=name,
+                         action="광고 투자 확대 추천",
+                         reason=f"매출 성장 추세 ({change_pct:.0f}%↑)",
+                         metric=f"₩{int(prev):,} → ₩{int(curr):,}")
 
         # ── 광고 효율 액션 ──
         try:
             with self.engine.connect() as conn:
-                ad_eff = pd.read_sql(text("""
+                ad_eff = pd.read_sql(self._sql("""
                     SELECT
+                        ap.account_id,
                         ap.listing_id,
                         l.product_name,
                         SUM(ap.ad_spend) as spend,
@@ -430,103 +586,97 @@ class ExposureStrategyEngine:
                         SUM(ap.total_orders) as orders
                     FROM ad_performances ap
                     JOIN listings l ON ap.listing_id = l.id
-                    WHERE ap.account_id = :aid
+                    WHERE ap.account_id IN :aids
                         AND ap.ad_date >= :start
                         AND ap.listing_id IS NOT NULL
-                    GROUP BY ap.listing_id
-                """), conn, params={"aid": account_id, "start": period_start.isoformat()})
+                    GROUP BY ap.account_id, ap.listing_id, l.product_name
+                """), conn, params={"aids": aids, "start": period_start.isoformat()})
 
-            for _, row in ad_eff.iterrows():
+            for row in ad_eff.to_dict("records"):
                 spend = row["spend"] or 0
                 revenue = row["revenue"] or 0
                 name = row["product_name"] or ""
                 roas = (revenue / spend * 100) if spend > 0 else 0
 
                 if spend > 0 and roas < 100:
-                    items.append({
-                        "priority": "warning",
-                        "icon": "🟡",
-                        "listing_id": row["listing_id"],
-                        "product_name": name,
-                        "action": "광고 효율 낮음, 키워드/예산 조정",
-                        "reason": f"ROAS {roas:.0f}% (손익분기 미달)",
-                        "metric": f"광고비 ₩{int(spend):,} → 매출 ₩{int(revenue):,}",
-                    })
+                    _add(row["account_id"],
+                         priority="warning",
+                         icon="🟡",
+                         listing_id=row["listing_id"],
+                         product_name=name,
+                         action="광고 효율 낮음, 키워드/예산 조정",
+                         reason=f"ROAS {roas:.0f}% (손익분기 미달)",
+                         metric=f"광고비 ₩{int(spend):,} → 매출 ₩{int(revenue):,}")
                 elif spend > 0 and roas >= 300:
-                    items.append({
-                        "priority": "opportunity",
-                        "icon": "🟢",
-                        "listing_id": row["listing_id"],
-                        "product_name": name,
-                        "action": "광고 예산 증액 추천",
-                        "reason": f"ROAS {roas:.0f}%로 높은 효율",
-                        "metric": f"광고비 ₩{int(spend):,} → 매출 ₩{int(revenue):,}",
-                    })
+                    _add(row["account_id"],
+                         priority="opportunity",
+                         icon="🟢",
+                         listing_id=row["listing_id"],
+                         product_name=name,
+                         action="광고 예산 증액 추천",
+                         reason=f"ROAS {roas:.0f}%로 높은 효율",
+                         metric=f"광고비 ₩{int(spend):,} → 매출 ₩{int(revenue):,}")
         except Exception:
             pass  # ad_performances 테이블 없으면 스킵
 
-        # ── 배송 정책 액션 ──
-        for _, row in stock_df.iterrows():
-            # delivery_charge_type 정보는 stock_df에 없으므로 별도 조회
-            pass
-
-        with self.engine.connect() as conn:
-            ship_df = pd.read_sql(text("""
-                SELECT id as listing_id, product_name, delivery_charge_type
-                FROM listings
-                WHERE account_id = :aid AND coupang_status = 'active'
-                    AND delivery_charge_type = 'NOT_FREE'
-            """), conn, params={"aid": account_id})
-
-        for _, row in ship_df.iterrows():
-            items.append({
-                "priority": "warning",
-                "icon": "🟡",
-                "listing_id": row["listing_id"],
-                "product_name": row["product_name"] or "",
-                "action": "무료배송 전환 검토",
-                "reason": "유료배송 → 노출 순위 불이익",
-                "metric": f"배송: {row['delivery_charge_type']}",
-            })
-
-        # ── 광고 없이 매출 발생 (기회) ──
+        # ── 배송 정책 액션 (재고 조회 결과 재사용) ──
+        ship_df = stock_df[stock_df["delivery_charge_type"] == "NOT_FREE"]
+        for row in ship_df.to_dict("records"):
+            _add(row["account_id"],
+                 priority="warning",
+                 icon="🟡",
+                 listing_id=row["listing_id"],
+                 product_name=row["product_name"] or "",
+                 action="무료배송 전환 검토",
+                 reason="유료배송 → 노출 순위 불이익",
+                 metric=f"배송: {row['delivery_charge_type']}")
+
+        # ── 광고 없이 매출 발생 (기회, 계정별 상위 10개) ──
         try:
             with self.engine.connect() as conn:
-                no_ad_sales = pd.read_sql(text("""
-                    SELECT r.listing_id, l.product_name,
-                           SUM(r.sale_amount) as revenue
-                    FROM revenue_history r
-                    JOIN listings l ON r.listing_id = l.id
-                    WHERE r.account_id = :aid
-                        AND r.sale_type = 'SALE'
-                        AND r.recognition_date >= :start
-                        AND r.listing_id IS NOT NULL
-                        AND r.listing_id NOT IN (
-                            SELECT DISTINCT listing_id FROM ad_performances
-                            WHERE account_id = :aid AND ad_date >= :start AND listing_id IS NOT NULL
-                        )
-                    GROUP BY r.listing_id
-                    HAVING SUM(r.sale_amount) > 0
-                    ORDER BY revenue DESC
-                    LIMIT 10
-                """), conn, params={"aid": account_id, "start": period_start.isoformat()})
-
-            for _, row in no_ad_sales.iterrows():
-                items.append({
-                    "priority": "opportunity",
-                    "icon": "🟢",
-                    "listing_id": row["listing_id"],
-                    "product_name": row["product_name"] or "",
-                    "action": "광고 시작 추천",
-                    "reason": "광고 없이 자연 매출 발생 중",
-                    "metric": f"매출 ₩{int(row['revenue']):,}",
-                })
+                no_ad_sales = pd.read_sql(self._sql("""
+                    SELECT account_id, listing_id, product_name, revenue
+                    FROM (
+                        SELECT r.account_id, r.listing_id, l.product_name,
+                               SUM(r.sale_amount) as revenue,
+                               ROW_NUMBER() OVER (
+                                   PARTITION BY r.account_id ORDER BY SUM(r.sale_amount) DESC
+                               ) as rn
+                        FROM revenue_history r
+                        JOIN listings l ON r.listing_id = l.id
+                        WHERE r.account_id IN :aids
+                            AND r.sale_type = 'SALE'
+                            AND r.recognition_date >= :start
+                            AND r.listing_id IS NOT NULL
+                            AND NOT EXISTS (
+                                SELECT 1 FROM ad_performances ap
+                                WHERE ap.account_id = r.account_id
+                                    AND ap.listing_id = r.listing_id
+                                    AND ap.ad_date >= :start
+                            )
+                        GROUP BY r.account_id, r.listing_id, l.product_name
+                        HAVING SUM(r.sale_amount) > 0
+                    ) ranked
+                    WHERE rn <= 10
+                    ORDER BY account_id, revenue DESC
+                """), conn, params={"aids": aids, "start": period_start.isoformat()})
+
+            for row in no_ad_sales.to_dict("records"):
+                _add(row["account_id"],
+                     priority="opportunity",
+                     icon="🟢",
+                     listing_id=row["listing_id"],
+                     product_name=row["product_name"] or "",
+                     action="광고 시작 추천",
+                     reason="광고 없이 자연 매출 발생 중",
+                     metric=f"매출 ₩{int(row['revenue']):,}")
         except Exception:
             pass
 
         # 우선순위 정렬: critical → warning → opportunity
         priority_order = {"critical": 0, "warning": 1, "opportunity": 2}
-        items.sort(key=lambda x: priority_order.get(x["priority"], 3))
+        for aid_items in items.values():
+            aid_items.sort(key=lambda x: priority_order.get(x["priority"], 3))
 
         return items
 
@@ -535,31 +685,41 @@ class ExposureStrategyEngine:
     # ══════════════════════════════════════
     def get_ad_summary(self, account_id: int, period_days: int = 30) -> dict:
         """광고 성과 요약"""
+        return self.get_ad_summary_batch([account_id], period_days)[account_id]
+
+    def get_ad_summary_batch(self, account_ids: List[int], period_days: int = 30) -> Dict[int, dict]:
+        """여러 계정의 광고 성과 요약 → {account_id: get_ad_summary() 결과}"""
+        summaries = {aid: self._empty_ad_summary() for aid in account_ids}
+        if not account_ids:
+            return summaries
+
         today = date.today()
         start = today - timedelta(days=period_days)
 
         try:
             with self.engine.connect() as conn:
-                row = conn.execute(text("""
+                rows = conn.execute(self._sql("""
                     SELECT
+                        account_id,
                         COALESCE(SUM(impressions), 0) as total_impressions,
                         COALESCE(SUM(clicks), 0) as total_clicks,
                         COALESCE(SUM(ad_spend), 0) as total_spend,
                         COALESCE(SUM(total_revenue), 0) as total_revenue,
                         COALESCE(SUM(total_orders), 0) as total_orders
                     FROM ad_performances
-                    WHERE account_id = :aid AND ad_date >= :start
-                """), {"aid": account_id, "start": start.isoformat()}).mappings().first()
-
-            if not row:
-                return self._empty_ad_summary()
+                    WHERE account_id IN :aids AND ad_date >= :start
+                    GROUP BY account_id
+                """), {"aids": list(account_ids), "start": start.isoformat()}).mappings().all()
+        except Exception:
+            return summaries
 
+        for row in rows:
             total_spend = row["total_spend"]
             total_rev = row["total_revenue"]
             total_clicks = row["total_clicks"]
             total_impressions = row["total_impressions"]
 
-            return {
+            summaries[int(row["account_id"])] = {
                 "total_impressions": total_impressions,
                 "total_clicks": total_clicks,
                 "avg_ctr": round(total_clicks / total_impressions * 100, 2) if total_impressions > 0 else 0,
@@ -569,8 +729,7 @@ class ExposureStrategyEngine:
                 "total_orders": row["total_orders"],
                 "has_data": True,
             }
-        except Exception:
-            return self._empty_ad_summary()
+        return summaries
 
     @staticmethod
     def _empty_ad_summary() -> dict:
@@ -582,15 +741,23 @@ class ExposureStrategyEngine:
 
     def get_ad_product_ranking(self, account_id: int, period_days: int = 30) -> pd.DataFrame:
         """상품별 광고 성과 랭킹"""
+        return self.get_ad_product_ranking_batch([account_id], period_days)[account_id]
+
+    def get_ad_product_ranking_batch(self, account_ids: List[int],
+                                     period_days: int = 30) -> Dict[int, pd.DataFrame]:
+        """여러 계정의 상품별 광고 성과 랭킹 → {account_id: DataFrame}"""
+        if not account_ids:
+            return {}
         today = date.today()
         start = today - timedelta(days=period_days)
 
         try:
             with self.engine.connect() as conn:
-                df = pd.read_sql(text("""
+                df = pd.read_sql(self._sql("""
                     SELECT
+                        ap.account_id,
                         ap.coupang_product_id as 상품ID,
-                        COALESCE(ap.product_name, l.product_name, '') as 상품명,
+                        MAX(COALESCE(ap.product_name, l.product_name, '')) as 상품명,
                         SUM(ap.impressions) as 노출수,
                         SUM(ap.clicks) as 클릭수,
                         CASE WHEN SUM(ap.impressions) > 0
@@ -604,24 +771,32 @@ class ExposureStrategyEngine:
                              ELSE 0 END as "ROAS(%)"
                     FROM ad_performances ap
                     LEFT JOIN listings l ON ap.listing_id = l.id
-                    WHERE ap.account_id = :aid AND ap.ad_date >= :start
+                    WHERE ap.account_id IN :aids AND ap.ad_date >= :start
                         AND ap.report_type = 'product'
-                    GROUP BY ap.coupang_product_id
-                    ORDER BY 매출 DESC
-                """), conn, params={"aid": account_id, "start": start.isoformat()})
-            return df
+                    GROUP BY ap.account_id, ap.coupang_product_id
+                    ORDER BY ap.account_id, 매출 DESC
+                """), conn, params={"aids": list(account_ids), "start": start.isoformat()})
+            return self._split_by_account(df, account_ids)
         except Exception:
-            return pd.DataFrame()
+            return {aid: pd.DataFrame() for aid in account_ids}
 
     def get_ad_keyword_ranking(self, account_id: int, period_days: int = 30) -> pd.DataFrame:
         """키워드별 광고 성과 랭킹"""
+        return self.get_ad_keyword_ranking_batch([account_id], period_days)[account_id]
+
+    def get_ad_keyword_ranking_batch(self, account_ids: List[int],
+                                     period_days: int = 30) -> Dict[int, pd.DataFrame]:
+        """여러 계정의 키워드별 광고 성과 랭킹 → {account_id: DataFrame}"""
+        if not account_ids:
+            return {}
         today = date.today()
         start = today - timedelta(days=period_days)
 
         try:
             with self.engine.connect() as conn:
-                df = pd.read_sql(text("""
+                df = pd.read_sql(self._sql("""
                     SELECT
+                        ap.account_id,
                         ap.keyword as 키워드,
                         ap.match_type as 매치유형,
                         SUM(ap.impressions) as 노출수,
@@ -636,30 +811,40 @@ class ExposureStrategyEngine:
                              THEN ROUND(SUM(ap.total_revenue) * 100.0 / SUM(ap.ad_spend), 1)
                              ELSE 0 END as "ROAS(%)"
                     FROM ad_performances ap
-                    WHERE ap.account_id = :aid AND ap.ad_date >= :start
+                    WHERE ap.account_id IN :aids AND ap.ad_date >= :start
                         AND ap.report_type = 'keyword'
                         AND ap.keyword != ''
-                    GROUP BY ap.keyword, ap.match_type
-                    ORDER BY 매출 DESC
-                """), conn, params={"aid": account_id, "start": start.isoformat()})
-            return df
+                    GROUP BY ap.account_id, ap.keyword, ap.match_type
+                    ORDER BY ap.account_id, 매출 DESC
+                """), conn, params={"aids": list(account_ids), "start": start.isoformat()})
+            return self._split_by_account(df, account_ids)
         except Exception:
-            return pd.DataFrame()
+            return {aid: pd.DataFrame() for aid in account_ids}
 
     # ══════════════════════════════════════
     # 인사이트
     # ══════════════════════════════════════
     def get_insights(self, account_id: int, period_days: int = 14) -> List[str]:
         """자연어 인사이트 문장 생성"""
-        insights = []
+        return self.get_insights_batch([account_id], period_days)[account_id]
+
+    def get_insights_batch(self, account_ids: List[int],
+                           period_days: int = 14) -> Dict[int, List[str]]:
+        """여러 계정의 인사이트 → {account_id: 문장 리스트}"""
+        insights = {aid: [] for aid in account_ids}
+        if not account_ids:
+            return insights
+
         today = date.today()
         period_start = today - timedelta(days=period_days)
         prev_start = period_start - timedelta(days=period_days)
+        aids = list(account_ids)
 
-        # 매출 트렌드
         with self.engine.connect() as conn:
-            rev = conn.execute(text("""
+            # 매출 트렌드
+            rev_rows = conn.execute(self._sql("""
                 SELECT
+                    account_id,
                     COALESCE(SUM(CASE WHEN recognition_date >= :ps AND sale_type='SALE'
                                       THEN sale_amount ELSE 0 END), 0) as curr,
                     COALESCE(SUM(CASE WHEN recognition_date < :ps
@@ -669,75 +854,79 @@ class ExposureStrategyEngine:
                     COALESCE(SUM(CASE WHEN recognition_date >= :ps AND sale_type='SALE'
                                       THEN quantity ELSE 0 END), 0) as curr_qty
                 FROM revenue_history
-                WHERE account_id = :aid AND recognition_date >= :pvs
+                WHERE account_id IN :aids AND recognition_date >= :pvs
+                GROUP BY account_id
             """), {
-                "aid": account_id,
+                "aids": aids,
                 "ps": period_start.isoformat(),
                 "pvs": prev_start.isoformat(),
-            }).mappings().first()
-
-        if rev:
-            curr_rev = rev["curr"]
-            prev_rev = rev["prev"]
-            curr_qty = rev["curr_qty"]
-
-            if curr_rev > 0:
-                if prev_rev > 0:
-                    change = (curr_rev - prev_rev) / prev_rev * 100
-                    direction = "성장" if change > 0 else "감소"
-                    insights.append(
-                        f"최근 {period_days}일간 매출 ₩{curr_rev:,} "
-                        f"(전기간 대비 {abs(change):.0f}% {direction})"
-                    )
-                else:
-                    insights.append(f"최근 {period_days}일간 매출 ₩{curr_rev:,} ({curr_qty}건 판매)")
-
-        # 재고 경고
-        with self.engine.connect() as conn:
-            stock_warn = conn.execute(text("""
+            }).mappings().all()
+
+            # 재고 경고 + 배송 정책 (리스팅 1회 집계)
+            listing_rows = conn.execute(self._sql("""
                 SELECT
+                    account_id,
                     SUM(CASE WHEN stock_quantity = 0 THEN 1 ELSE 0 END) as oos,
                     SUM(CASE WHEN stock_quantity BETWEEN 1 AND 5 THEN 1 ELSE 0 END) as low,
-                    COUNT(*) as total
-                FROM listings
-                WHERE account_id = :aid AND coupang_status = 'active'
-            """), {"aid": account_id}).mappings().first()
-
-        if stock_warn:
-            oos = stock_warn["oos"] or 0
-            low = stock_warn["low"] or 0
-            if oos > 0:
-                insights.append(f"품절 상품 {oos}개 — 즉시 재고 보충 필요 (알고리즘 페널티 발생)")
-            if low > 0:
-                insights.append(f"재고 부족(1~5개) 상품 {low}개 — 품절 전 보충 권장")
-
-        # 광고 요약
-        ad_summary = self.get_ad_summary(account_id, period_days)
-        if ad_summary["has_data"]:
-            roas = ad_summary["roas"]
-            spend = ad_summary["total_spend"]
-            insights.append(
-                f"광고 ROAS {roas:.0f}% — 광고비 ₩{spend:,} 투입, "
-                f"매출 ₩{ad_summary['total_revenue']:,} 발생"
-            )
-
-        # 배송 정책
-        with self.engine.connect() as conn:
-            ship = conn.execute(text("""
-                SELECT
                     SUM(CASE WHEN delivery_charge_type = 'FREE' THEN 1 ELSE 0 END) as free_cnt,
                     SUM(CASE WHEN delivery_charge_type = 'NOT_FREE' THEN 1 ELSE 0 END) as paid_cnt,
                     COUNT(*) as total
                 FROM listings
-                WHERE account_id = :aid AND coupang_status = 'active'
-            """), {"aid": account_id}).mappings().first()
-
-        if ship and (ship["paid_cnt"] or 0) > 0:
-            paid = ship["paid_cnt"]
-            total = ship["total"]
-            insights.append(f"유료배송 상품 {paid}/{total}개 — 무료배송 전환 시 노출 개선 기대")
-
-        if not insights:
-            insights.append("분석할 데이터가 충분하지 않습니다. 매출/광고 데이터가 쌓이면 인사이트가 생성됩니다.")
+                WHERE account_id IN :aids AND coupang_status = 'active'
+                GROUP BY account_id
+            """), {"aids": aids}).mappings().all()
+
+        rev_by_account = {int(r["account_id"]): r for r in rev_rows}
+        listing_by_account = {int(r["account_id"]): r for r in listing_rows}
+        ad_summaries = self.get_ad_summary_batch(aids, period_days)
+
+        for aid in aids:
+            lines = insights[aid]
+
+            rev = rev_by_account.get(aid)
+            if rev:
+                curr_rev = rev["curr"]
+                prev_rev = rev["prev"]
+                curr_qty = rev["curr_qty"]
+
+                if curr_rev > 0:
+                    if prev_rev > 0:
+                        change = (curr_rev - prev_rev) / prev_rev * 100
+                        direction = "성장" if change > 0 else "감소"
+                        lines.append(
+                            f"최근 {period_days}일간 매출 ₩{curr_rev:,} "
+                            f"(전기간 대비 {abs(change):.0f}% {direction})"
+                        )
+                    else:
+                        lines.append(f"최근 {period_days}일간 매출 ₩{curr_rev:,} ({curr_qty}건 판매)")
+
+            stock_warn = listing_by_account.get(aid)
+            if stock_warn:
+                oos = stock_warn["oos"] or 0
+                low = stock_warn["low"] or 0
+                if oos > 0:
+                    lines.append(f"품절 상품 {oos}개 — 즉시 재고 보충 필요 (알고리즘 페널티 발생)")
+                if low > 0:
+                    lines.append(f"재고 부족(1~5개) 상품 {low}개 — 품절 전 보충 권장")
+
+            # 광고 요약
+            ad_summary = ad_summaries[aid]
+            if ad_summary["has_data"]:
+                roas = ad_summary["roas"]
+                spend = ad_summary["total_spend"]
+                lines.append(
+                    f"광고 ROAS {roas:.0f}% — 광고비 ₩{spend:,} 투입, "
+                    f"매출 ₩{ad_summary['total_revenue']:,} 발생"
+                )
+
+            # 배송 정책
+            ship = listing_by_account.get(aid)
+            if ship and (ship["paid_cnt"] or 0) > 0:
+                paid = ship["paid_cnt"]
+                total = ship["total"]
+                lines.append(f"유료배송 상품 {paid}/{total}개 — 무료배송 전환 시 노출 개선 기대")
+
+            if not lines:
+                lines.append("분석할 데이터가 충분하지 않습니다. 매출/광고 데이터가 쌓이면 인사이트가 생성됩니다.")
 
         return insights
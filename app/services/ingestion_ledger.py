@@ -0,0 +1,129 @@
+"""
+파일 적재 원장 (ingested_files)
+===============================
+광고 보고서 Excel을 (파일 내용 해시, 계정, 보고서 종류) 단위로 기록해
+같은 파일을 다시 올렸을 때 파싱/UPSERT 없이 바로 건너뜀.
+
+파일명이 아니라 내용 해시 기준이라 이름만 바꾼 같은 파일도 중복으로 인식하고,
+같은 이름이라도 내용이 바뀐 재다운로드 파일은 새로 적재함.
+"""
+import hashlib
+import logging
+from pathlib import Path
+from typing import Optional, Union
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# 해시 계산 시 한 번에 읽는 크기
+HASH_BLOCK_SIZE = 1 << 20
+
+
+def file_hash(path: Union[str, Path]) -> str:
+    """파일 내용 SHA-256 (블록 단위로 읽어 메모리 일정)"""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class IngestionLedger:
+    """
+    파일 적재 원장
+
+    report_type은 적재 경로 구분 ("ad_performance" / "ad_spend")
+    """
+
+    CREATE_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS ingested_files (
+        file_hash VARCHAR(64) NOT NULL,
+        account_id INTEGER NOT NULL REFERENCES accounts(id),
+        report_type VARCHAR(30) NOT NULL,
+        file_name VARCHAR(300),
+        file_size BIGINT DEFAULT 0,
+        rows_parsed INTEGER DEFAULT 0,
+        rows_saved INTEGER DEFAULT 0,
+        period VARCHAR(50),
+        parse_seconds REAL DEFAULT 0,
+        save_seconds REAL DEFAULT 0,
+        ingested_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (file_hash, account_id, report_type)
+    )
+    """
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self._table_ready = False
+
+    def _ensure_table(self):
+        """ingested_files 테이블이 없으면 생성"""
+        if self._table_ready:
+            return
+        with self.engine.connect() as conn:
+            conn.execute(text(self.CREATE_TABLE_SQL))
+            conn.commit()
+        self._table_ready = True
+
+    def lookup(self, digest: str, account_id: int, report_type: str) -> Optional[dict]:
+        """이미 적재된 파일이면 원장 기록 반환, 아니면 None"""
+        self._ensure_table()
+        with self.engine.connect() as conn:
+            row = conn.execute(text("""
+                SELECT file_name, rows_parsed, rows_saved, period,
+                       parse_seconds, save_seconds, ingested_at
+                FROM ingested_files
+                WHERE file_hash = :h AND account_id = :aid AND report_type = :rt
+            """), {"h": digest, "aid": account_id, "rt": report_type}).mappings().fetchone()
+        return dict(row) if row else None
+
+    def record(self, digest: str, account_id: int, report_type: str, path: Union[str, Path],
+               rows_parsed: int, rows_saved: int, period: str = None,
+               parse_seconds: float = 0.0, save_seconds: float = 0.0):
+        """적재 완료 기록 (같은 키는 최신 결과로 갱신)"""
+        self._ensure_table()
+        path = Path(path)
+        with self.engine.connect() as conn:
+            conn.execute(text("""
+                INSERT INTO ingested_files
+                    (file_hash, account_id, report_type, file_name, file_size,
+                     rows_parsed, rows_saved, period, parse_seconds, save_seconds, ingested_at)
+                VALUES
+                    (:h, :aid, :rt, :name, :size,
+                     :parsed, :saved, :period, :parse_sec, :save_sec, CURRENT_TIMESTAMP)
+                ON CONFLICT (file_hash, account_id, report_type) DO UPDATE SET
+                    file_name = EXCLUDED.file_name,
+                    rows_parsed = EXCLUDED.rows_parsed,
+                    rows_saved = EXCLUDED.rows_saved,
+                    period = EXCLUDED.period,
+                    parse_seconds = EXCLUDED.parse_seconds,
+                    save_seconds = EXCLUDED.save_seconds,
+                    ingested_at = EXCLUDED.ingested_at
+            """), {
+                "h": digest, "aid": account_id, "rt": report_type,
+                "name": path.name, "size": path.stat().st_size if path.exists() else 0,
+                "parsed": int(rows_parsed), "saved": int(rows_saved), "period": period,
+                "parse_sec": round(parse_seconds, 3), "save_sec": round(save_seconds, 3),
+            })
+            conn.commit()
+        logger.info(
+            f"적재 원장 기록: {path.name} (계정 {account_id}, {report_type}) "
+            f"파싱 {parse_seconds:.2f}s / 저장 {save_seconds:.2f}s"
+        )
+
+    def skipped_result(self, entry: dict, path: Union[str, Path], account_id: int,
+                       account_name: str) -> dict:
+        """이미 적재된 파일의 sync_file 결과 (저장 0건, skipped=True)"""
+        logger.info(f"이미 적재된 파일 건너뜀: {Path(path).name} ({entry['ingested_at']})")
+        return {
+            "file": Path(path).name,
+            "account": account_name,
+            "account_id": account_id,
+            "period": entry.get("period") or "-",
+            "parsed": 0,
+            "saved": 0,
+            "skipped": True,
+            "ingested_at": str(entry["ingested_at"]),
+        }
@@ -0,0 +1,216 @@
+"""
+계정별 ISBN 커버리지 스냅샷 (isbn_coverage)
+==========================================
+계정별 전체/ISBN 보유/세트/검토 필요 수와 전략별 누적 채움 수를 한 행으로 유지.
+대시보드·리포트·CLI 통계는 get_coverage()로 이 표만 읽는다 (listings 재집계 없음).
+
+갱신 시점:
+  - ISBN 채우기 (ISBNFillerService.run) 후 — 전략별 채움 수는 전략 전후 ISBN 보유 수 차이
+  - 상품 동기화 (sync_coupang_products) 후 계정 단위
+  - raw_json 백필 / 타 계정 ISBN 복사 / fill_isbn_* 스크립트 실행 후
+  - 그 외 스크립트로 listings.isbn을 직접 고친 뒤: refresh_coverage()
+"""
+import json
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from sqlalchemy import bindparam, text
+
+from app.services.isbn_resolver import ensure_table as ensure_resolutions
+
+logger = logging.getLogger(__name__)
+
+# 스크립트용 DDL (ORM 모델: app.models.isbn_coverage.IsbnCoverage)
+CREATE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS isbn_coverage (
+    account_id INTEGER PRIMARY KEY REFERENCES accounts(id) ON DELETE CASCADE,
+    total INTEGER DEFAULT 0,
+    with_isbn INTEGER DEFAULT 0,
+    set_listings INTEGER DEFAULT 0,
+    needs_review INTEGER DEFAULT 0,
+    strategy_filled TEXT,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+
+class CoverageRow(NamedTuple):
+    account_id: int
+    account_name: str
+    total: int
+    with_isbn: int
+    set_listings: int
+    needs_review: int
+    strategy_filled: Dict[str, int]
+    updated_at: Optional[datetime]
+
+    @property
+    def pct(self) -> float:
+        return self.with_isbn / self.total * 100 if self.total else 0.0
+
+
+def ensure_table(conn):
+    """isbn_coverage 테이블이 없으면 생성"""
+    conn.execute(text(CREATE_TABLE_SQL))
+
+
+def _account_filter(account_ids: Optional[Iterable[int]], column: str):
+    """(WHERE 조각, bindparams) — account_ids가 None이면 전체"""
+    if account_ids is None:
+        return "", {}
+    return f"WHERE {column} IN :aids", {"aids": list(account_ids)}
+
+
+def compute_coverage(conn, account_ids: Optional[Iterable[int]] = None,
+                     with_review: bool = True) -> Dict[int, dict]:
+    """
+    listings 집계 (계정별 GROUP BY 한 번)
+
+    with_review=False면 isbn_resolutions(검토 필요 수)는 세지 않음
+
+    Returns:
+        {account_id: {total, with_isbn, set_listings, needs_review}}
+    """
+    where, params = _account_filter(account_ids, "l.account_id")
+    if params and not params["aids"]:
+        return {}
+    query = text(f"""
+        SELECT l.account_id,
+               COUNT(*) AS total,
+               SUM(CASE WHEN l.isbn IS NOT NULL AND l.isbn <> '' THEN 1 ELSE 0 END) AS with_isbn,
+               SUM(CASE WHEN l.isbn LIKE '%,%' THEN 1 ELSE 0 END) AS set_listings
+        FROM listings l
+        {where}
+        GROUP BY l.account_id
+    """)
+    review = text(f"""
+        SELECT l.account_id, COUNT(*)
+        FROM isbn_resolutions r
+        JOIN listings l ON l.id = r.listing_id
+        {where + ' AND' if where else 'WHERE'} r.applied = false AND l.isbn IS NULL
+        GROUP BY l.account_id
+    """)
+    if params:
+        query = query.bindparams(bindparam("aids", expanding=True))
+        review = review.bindparams(bindparam("aids", expanding=True))
+
+    stats = {
+        aid: {"total": total, "with_isbn": with_isbn or 0, "set_listings": sets or 0, "needs_review": 0}
+        for aid, total, with_isbn, sets in conn.execute(query, params)
+    }
+    if with_review:
+        for aid, n in conn.execute(review, params):
+            if aid in stats:
+                stats[aid]["needs_review"] = n
+    return stats
+
+
+def with_isbn_counts(conn, account_ids: Optional[Iterable[int]] = None) -> Dict[int, int]:
+    """계정별 ISBN 보유 수 (전략 전후 차이 계산용)"""
+    stats = compute_coverage(conn, account_ids, with_review=False)
+    return {aid: s["with_isbn"] for aid, s in stats.items()}
+
+
+def refresh_coverage(conn, account_ids: Optional[Iterable[int]] = None,
+                     strategy_filled: Optional[Dict[str, Dict[int, int]]] = None,
+                     strategy: Optional[str] = None,
+                     baseline: Optional[Dict[int, int]] = None) -> int:
+    """
+    스냅샷 갱신 (commit은 호출 측)
+
+    Args:
+        account_ids: 해당 계정만 (None=전체)
+        strategy_filled: {전략명: {account_id: 이번 실행 채움 수}} — 기존 누적값에 더함
+        strategy, baseline: 단일 전략 스크립트용 — 실행 전 with_isbn_counts() 결과를 넘기면
+                            지금과의 차이를 strategy 채움 수로 기록
+
+    Returns:
+        갱신한 계정 수
+    """
+    ensure_table(conn)
+    ensure_resolutions(conn)
+    if account_ids is not None:
+        account_ids = list(account_ids)
+    stats = compute_coverage(conn, account_ids)
+    if not stats:
+        return 0
+    if strategy and baseline is not None:
+        strategy_filled = dict(strategy_filled or {})
+        strategy_filled[strategy] = {aid: s["with_isbn"] - baseline.get(aid, 0) for aid, s in stats.items()}
+
+    previous = {}
+    if strategy_filled:
+        prev_sql = text(
+            "SELECT account_id, strategy_filled FROM isbn_coverage WHERE account_id IN :aids"
+        ).bindparams(bindparam("aids", expanding=True))
+        previous = {aid: json.loads(raw) if raw else {}
+                    for aid, raw in conn.execute(prev_sql, {"aids": list(stats)})}
+
+    now = datetime.utcnow()
+    rows = []
+    for aid, s in stats.items():
+        counts = dict(previous.get(aid, {}))
+        for name, per_account in (strategy_filled or {}).items():
+            if per_account.get(aid):
+                counts[name] = counts.get(name, 0) + per_account[aid]
+        rows.append(dict(s, account_id=aid, updated_at=now,
+                         strategy_filled=json.dumps(counts, ensure_ascii=False) if counts else None))
+
+    merge = ("COALESCE(EXCLUDED.strategy_filled, isbn_coverage.strategy_filled)"
+             if not strategy_filled else "EXCLUDED.strategy_filled")
+    conn.execute(text(f"""
+        INSERT INTO isbn_coverage
+            (account_id, total, with_isbn, set_listings, needs_review, strategy_filled, updated_at)
+        VALUES (:account_id, :total, :with_isbn, :set_listings, :needs_review, :strategy_filled, :updated_at)
+        ON CONFLICT (account_id) DO UPDATE SET
+            total = EXCLUDED.total,
+            with_isbn = EXCLUDED.with_isbn,
+            set_listings = EXCLUDED.set_listings,
+            needs_review = EXCLUDED.needs_review,
+            strategy_filled = {merge},
+            updated_at = EXCLUDED.updated_at
+    """), rows)
+    logger.info(f"isbn_coverage 갱신: {len(rows)}개 계정")
+    return len(rows)
+
+
+# ─── 조회 ───
+
+def get_coverage(conn, account_name: Optional[str] = None,
+                 active_only: bool = True) -> List[CoverageRow]:
+    """
+    계정별 스냅샷 (계정명 순)
+
+    conn: Connection 또는 Session
+    """
+    where = ["1 = 1"]
+    if active_only:
+        where.append("a.is_active = true")
+    if account_name:
+        where.append("a.account_name = :name")
+    rows = conn.execute(text(f"""
+        SELECT c.account_id, a.account_name, c.total, c.with_isbn, c.set_listings,
+               c.needs_review, c.strategy_filled, c.updated_at
+        FROM isbn_coverage c
+        JOIN accounts a ON a.id = c.account_id
+        WHERE {' AND '.join(where)}
+        ORDER BY a.account_name
+    """), {"name": account_name}).fetchall()
+    return [
+        CoverageRow(aid, name, total or 0, with_isbn or 0, sets or 0, review or 0,
+                    json.loads(filled) if filled else {}, updated_at)
+        for aid, name, total, with_isbn, sets, review, filled, updated_at in rows
+    ]
+
+
+def coverage_totals(rows: Iterable[CoverageRow]) -> dict:
+    """스냅샷 합계 {total, with_isbn, set_listings, needs_review, pct, strategy_filled}"""
+    totals = {"total": 0, "with_isbn": 0, "set_listings": 0, "needs_review": 0, "strategy_filled": {}}
+    for r in rows:
+        for key in ("total", "with_isbn", "set_listings", "needs_review"):
+            totals[key] += getattr(r, key)
+        for strategy, n in r.strategy_filled.items():
+            totals["strategy_filled"][strategy] = totals["strategy_filled"].get(strategy, 0) + n
+    totals["pct"] = totals["with_isbn"] / totals["total"] * 100 if totals["total"] else 0.0
+    return totals
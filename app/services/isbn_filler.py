@@ -1,10 +1,11 @@
 """
 ISBN 채우기 통합 서비스
 =====================
-3가지 전략으로 listings 테이블의 ISBN을 채운다:
-  1. WingAPIStrategy   — WING API get_product()에서 barcode/searchTags 추출
+4가지 전략으로 listings 테이블의 ISBN을 채운다:
+  1. WingAPIStrategy   — raw_json 캐시(로컬) → WING API get_product()에서 barcode/searchTags 추출
   2. BooksMatchStrategy — books 테이블 제목 매칭
   3. AladinAPIStrategy  — 알라딘 검색 API (연도/출판사 스마트 쿼리)
+  4. ResolverStrategy   — 위 소스의 후보를 모아 점수화, 최고 후보 + 신뢰도 기록 (isbn_resolutions)
 
 사용법 (서비스):
     from app.services.isbn_filler import ISBNFillerService
@@ -13,21 +14,52 @@ ISBN 채우기 통합 서비스
 
 사용법 (CLI):
     python scripts/fill_isbn.py --strategy wing,books,aladin --account 007-book --limit 100
+    python scripts/fill_isbn.py --strategy resolve --account 007-book
 """
 import os
 import re
+import json
 import time
 import logging
 from abc import ABC, abstractmethod
-from typing import Optional, List, Dict, Any
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from typing import Optional, List, Dict, Any, Tuple
 
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
 from sqlalchemy.engine import Engine
 
+from app.services.listing_isbns import (
+    ensure_table as ensure_listing_isbns, rebuild_listing_isbns, replace_listing_isbns,
+)
+from app.services.isbn_coverage import (
+    ensure_table as ensure_coverage, get_coverage, refresh_coverage, with_isbn_counts,
+)
+from app.services.isbn_resolver import (
+    ACCEPT_CONFIDENCE, MIN_CONFIDENCE, CandidateSet, ListingInfo,
+    ensure_table as ensure_resolutions, save_resolutions,
+)
+from app.services.raw_json_isbn import extract_isbn_map
+from app.services.title_index import TitleIndex
+from crawlers.aladin_key_pool import AladinKeyPool, QuotaExhausted
+from crawlers.http_cache import DAY
+
 logger = logging.getLogger(__name__)
 
 isbn_re = re.compile(r'97[89]\d{10}')
 
+# raw_json(상세 캐시)를 최신으로 보는 기간 — 이 안에서 ISBN이 없으면 API 재조회 생략
+DETAIL_MAX_AGE_HOURS = 24 * 7
+# raw_json 조회 배치 (IN 절 크기)
+RAW_JSON_BATCH = 1000
+# UPDATE ... FROM (VALUES ...) 한 문장당 행 수
+BULK_UPDATE_BATCH = 500
+# 계정별 WING API 동시 요청 수 (계정 클라이언트의 초당 10건 제한은 공유)
+PER_ACCOUNT_WORKERS = 4
+# 후보 점수화 전략의 알라딘 동시 검색 수 (키 풀 / HttpCache는 스레드 안전)
+ALADIN_WORKERS = 4
+
 
 # ─── 결과 데이터 ───
 
@@ -65,9 +97,72 @@ def _update_isbn(conn, listing_id: int, account_id: int, isbn_str: str) -> bool:
         text("UPDATE listings SET isbn=:isbn WHERE id=:lid"),
         {"isbn": isbn_str, "lid": listing_id},
     )
+    replace_listing_isbns(conn, listing_id, isbn_str)
     return True
 
 
+def _bulk_update_listings(conn, columns: List[str], rows: List[dict]) -> int:
+    """
+    listings 다건 UPDATE (rows: [{"id": ..., 컬럼: 값}])
+
+    PostgreSQL: UPDATE ... FROM (VALUES ...) 한 문장으로 BULK_UPDATE_BATCH건씩
+    그 외(SQLite 테스트): executemany
+    """
+    if not rows:
+        return 0
+    if conn.dialect.name != "postgresql":
+        sets = ", ".join(f"{c} = :{c}" for c in columns)
+        conn.execute(text(f"UPDATE listings SET {sets} WHERE id = :id"), rows)
+        return len(rows)
+
+    names = ["id", *columns]
+    sets = ", ".join(f"{c} = v.{c}" for c in columns)
+    for i in range(0, len(rows), BULK_UPDATE_BATCH):
+        params, values = {}, []
+        for j, row in enumerate(rows[i:i + BULK_UPDATE_BATCH]):
+            for c in names:
+                params[f"{c}_{j}"] = row[c]
+            values.append("(" + ", ".join(f":{c}_{j}" for c in names) + ")")
+        conn.execute(text(f"""
+            UPDATE listings AS l SET {sets}
+            FROM (VALUES {", ".join(values)}) AS v({", ".join(names)})
+            WHERE l.id = v.id
+        """), params)
+    return len(rows)
+
+
+def _bulk_update_isbns(conn, updates: List[Tuple[int, int, str]]) -> Tuple[int, int]:
+    """
+    ISBN 다건 업데이트 (_update_isbn의 일괄 버전, 같은 계정 중복 ISBN은 건너뜀)
+
+    Args:
+        updates: [(listing_id, account_id, ISBN 문자열)] — 같은 계정·ISBN이면 앞의 것만 반영
+
+    Returns:
+        (반영 건수, 중복으로 건너뛴 건수)
+    """
+    if not updates:
+        return 0, 0
+    taken = set()
+    isbns = list({u[2] for u in updates})
+    dup_sql = text(
+        "SELECT account_id, isbn FROM listings WHERE isbn IN :isbns"
+    ).bindparams(bindparam("isbns", expanding=True))
+    for i in range(0, len(isbns), RAW_JSON_BATCH):
+        taken.update(tuple(r) for r in conn.execute(dup_sql, {"isbns": isbns[i:i + RAW_JSON_BATCH]}))
+
+    rows = []
+    for lid, aid, isbn_str in updates:
+        if (aid, isbn_str) in taken:
+            continue
+        taken.add((aid, isbn_str))
+        rows.append({"id": lid, "isbn": isbn_str})
+
+    _bulk_update_listings(conn, ["isbn"], rows)
+    rebuild_listing_isbns(conn, listing_ids=[r["id"] for r in rows])
+    return len(rows), len(updates) - len(rows)
+
+
 def _get_candidates(conn, account_name: Optional[str] = None, limit: int = 0,
                     extra_filter: str = "") -> list:
     """ISBN이 NULL인 listings 조회"""
@@ -119,9 +214,26 @@ class BaseISBNStrategy(ABC):
 # ─── 전략 1: WING API ───
 
 class WingAPIStrategy(BaseISBNStrategy):
-    """WING API get_product()에서 barcode/externalVendorSku/searchTags로 ISBN 추출"""
+    """
+    listings.raw_json(상세 응답 캐시) → WING API get_product() 순서로 ISBN 추출
+
+    1) raw_json이 있으면 먼저 로컬에서 추출 (프로세스 풀, API 호출 없음)
+    2) 캐시가 최신(detail_max_age_hours 이내)인데 ISBN이 없으면 API도 같은 응답 → 조회 생략
+    3) 캐시가 없거나 오래된 리스팅만 API 조회, 받은 상세는 raw_json에 다시 저장
+
+    API 조회는 계정별 스레드 풀(per_account_workers)로 계정끼리 동시에 진행.
+    계정 안에서는 클라이언트 하나의 rate limit(초당 10건)을 워커들이 공유.
+    DB 쓰기는 메인 스레드에서 계정 단위 일괄 UPDATE.
+    """
     name = "wing"
 
+    def __init__(self, workers: Optional[int] = None,
+                 detail_max_age_hours: int = DETAIL_MAX_AGE_HOURS,
+                 per_account_workers: int = PER_ACCOUNT_WORKERS):
+        self.workers = workers
+        self.detail_max_age_hours = detail_max_age_hours
+        self.per_account_workers = per_account_workers
+
     @staticmethod
     def _extract_isbn(detail: dict) -> str:
         data = detail.get("data", {})
@@ -139,78 +251,154 @@ class WingAPIStrategy(BaseISBNStrategy):
                     isbn_set.add(m.group())
         return ",".join(sorted(isbn_set)) if isbn_set else ""
 
-    def fill(self, engine: Engine, account: Optional[str] = None,
-             limit: int = 0) -> FillResult:
+    def _extract_local(self, conn, rows) -> Tuple[Dict[int, str], set]:
+        """raw_json 추출 → ({listing_id: ISBN 문자열}, 캐시가 최신인 listing_id 집합)"""
+        cutoff = datetime.utcnow() - timedelta(hours=self.detail_max_age_hours)
+        ids = [r[0] for r in rows]
+        query = text(
+            "SELECT id, raw_json, detail_synced_at FROM listings WHERE id IN :ids"
+        ).bindparams(bindparam("ids", expanding=True))
+
+        raw_rows, fresh = [], set()
+        for i in range(0, len(ids), RAW_JSON_BATCH):
+            for lid, raw, synced_at in conn.execute(query, {"ids": ids[i:i + RAW_JSON_BATCH]}):
+                if not raw:
+                    continue
+                raw_rows.append((lid, raw))
+                if isinstance(synced_at, str):   # SQLite는 문자열로 반환
+                    synced_at = datetime.fromisoformat(synced_at)
+                if synced_at and synced_at >= cutoff:
+                    fresh.add(lid)
+
+        isbn_map = extract_isbn_map(raw_rows, workers=self.workers)
+        return {lid: ",".join(isbns) for lid, isbns in isbn_map.items() if isbns}, fresh
+
+    def _build_clients(self, conn, account: Optional[str]) -> Dict[int, tuple]:
         from app.api.coupang_wing_client import CoupangWingClient
         from app.constants import WING_ACCOUNT_ENV_MAP
 
-        result = FillResult(self.name)
-        print(f"\n=== Pass 1: WING API ISBN 추출 ===")
+        acct_filter = ""
+        if account:
+            acct_filter = f"AND account_name = '{account}'"
+        accounts = conn.execute(text(f"""
+            SELECT id, account_name, vendor_id, wing_access_key, wing_secret_key
+            FROM accounts WHERE is_active=true AND wing_api_enabled=true {acct_filter}
+        """)).fetchall()
+
+        clients = {}
+        for a in accounts:
+            aid, aname, vid, ak, sk = a
+            if not ak:
+                prefix = WING_ACCOUNT_ENV_MAP.get(aname, "")
+                if prefix:
+                    vid = os.getenv(f"{prefix}_VENDOR_ID", vid or "")
+                    ak = os.getenv(f"{prefix}_ACCESS_KEY", "")
+                    sk = os.getenv(f"{prefix}_SECRET_KEY", "")
+            if vid and ak and sk:
+                clients[aid] = (aname, CoupangWingClient(vid, ak, sk))
+        return clients
+
+    def _fetch_account(self, acct_name: str, client, rows) -> dict:
+        """
+        한 계정의 상세 조회 (워커 스레드에서 실행, DB 접근 없음)
 
-        with engine.connect() as conn:
-            acct_filter = ""
-            if account:
-                acct_filter = f"AND account_name = '{account}'"
-            accounts = conn.execute(text(f"""
-                SELECT id, account_name, vendor_id, wing_access_key, wing_secret_key
-                FROM accounts WHERE is_active=true AND wing_api_enabled=true {acct_filter}
-            """)).fetchall()
-
-            if not accounts:
-                print("  활성 WING API 계정 없음")
-                return result
+        Returns:
+            {"found": [(lid, aid, isbn)], "details": [{id, raw_json, detail_synced_at}],
+             "missing": ISBN 없음 건수, "errors": 오류 건수}
+        """
+        out = {"found": [], "details": [], "missing": 0, "errors": 0}
+        total = len(rows)
+        with ThreadPoolExecutor(max_workers=self.per_account_workers) as pool:
+            futures = {pool.submit(client.get_product, int(cpid)): (lid, aid, cpid)
+                       for lid, aid, _, cpid in rows}
+            for done, future in enumerate(as_completed(futures), 1):
+                lid, aid, cpid = futures[future]
+                try:
+                    detail = future.result()
+                except Exception as e:
+                    out["errors"] += 1
+                    if out["errors"] <= 3:
+                        print(f"  [{acct_name}] [에러] {cpid}: {str(e)[:80]}")
+                    continue
+                data = detail.get("data") if isinstance(detail, dict) else None
+                if isinstance(data, dict):
+                    out["details"].append({"id": lid, "raw_json": json.dumps(data, ensure_ascii=False),
+                                           "detail_synced_at": datetime.utcnow()})
+                isbn_str = self._extract_isbn(detail) if isinstance(detail, dict) else ""
+                if isbn_str:
+                    out["found"].append((lid, aid, isbn_str))
+                else:
+                    out["missing"] += 1
+                if done % 50 == 0 or done == total:
+                    print(f"  [{acct_name}] {done}/{total} found={len(out['found'])}, "
+                          f"errors={out['errors']}", flush=True)
+        return out
 
-            # 클라이언트 생성
-            clients = {}
-            for a in accounts:
-                aid, aname, vid, ak, sk = a
-                if not ak:
-                    prefix = WING_ACCOUNT_ENV_MAP.get(aname, "")
-                    if prefix:
-                        vid = os.getenv(f"{prefix}_VENDOR_ID", vid or "")
-                        ak = os.getenv(f"{prefix}_ACCESS_KEY", "")
-                        sk = os.getenv(f"{prefix}_SECRET_KEY", "")
-                if vid and ak and sk:
-                    clients[aid] = (aname, CoupangWingClient(vid, ak, sk))
+    def fill(self, engine: Engine, account: Optional[str] = None,
+             limit: int = 0) -> FillResult:
+        result = FillResult(self.name)
+        print(f"\n=== Pass 1: WING ISBN 추출 (raw_json → API) ===")
 
+        with engine.connect() as conn:
             rows = _get_candidates(
                 conn, account, limit,
                 extra_filter="AND coupang_product_id IS NOT NULL",
             )
             total = len(rows)
-            print(f"  처리 대상: {total}건 (계정: {len(clients)}개)")
+            print(f"  처리 대상: {total}건")
+            if not rows:
+                print(f"  Pass 1 완료: {result.to_dict()}")
+                return result
 
-            for i, row in enumerate(rows):
-                lid, aid, pname, cpid = row
-                if i % 50 == 0 and i > 0:
-                    print(f"  [{i}/{total}] filled={result.filled}, failed={result.failed}", flush=True)
+            # 1) raw_json 로컬 추출
+            local, fresh = self._extract_local(conn, rows)
+            api_rows = []
+            for lid, aid, pname, cpid in rows:
+                if lid not in local and lid not in fresh:
+                    api_rows.append((lid, aid, pname, cpid))
+            filled, dup = _bulk_update_isbns(
+                conn, [(lid, aid, local[lid]) for lid, aid, _, _ in rows if lid in local])
+            result.filled += filled
+            result.skipped += dup
+            result.failed += len(fresh - set(local))
+            conn.commit()
+            print(f"  raw_json 추출: {len(local)}건 (반영 {filled}, 중복 {dup}), "
+                  f"최신 캐시에 ISBN 없음: {len(fresh - set(local))}건, API 조회 대상: {len(api_rows)}건")
+            if not api_rows:
+                print(f"  Pass 1 완료: {result.to_dict()}")
+                return result
 
-                acct_name, client = clients.get(aid, ("?", None))
-                if not client:
+            # 2) 캐시가 없거나 오래된 것만 API 조회 (계정별 동시 진행)
+            clients = self._build_clients(conn, account)
+            by_account: Dict[int, list] = {}
+            for row in api_rows:
+                if row[1] in clients:
+                    by_account.setdefault(row[1], []).append(row)
+                else:
                     result.skipped += 1
-                    continue
-
-                try:
-                    detail = client.get_product(int(cpid))
-                    isbn_str = self._extract_isbn(detail)
-                    if isbn_str:
-                        if _update_isbn(conn, lid, aid, isbn_str):
-                            result.filled += 1
-                            if result.filled <= 5:
-                                print(f"  [성공] [{acct_name}] {cpid} → {isbn_str}")
-                            if result.filled % 50 == 0:
-                                conn.commit()
-                        else:
-                            result.skipped += 1
-                    else:
-                        result.failed += 1
-                    time.sleep(0.1)
-                except Exception as e:
-                    result.failed += 1
-                    if result.failed <= 3:
-                        print(f"  [에러] {cpid}: {str(e)[:80]}")
-
-            conn.commit()
+            if not by_account:
+                print("  활성 WING API 계정 없음")
+                print(f"  Pass 1 완료: {result.to_dict()}")
+                return result
+            print(f"  API 조회: {len(by_account)}개 계정 동시, 계정당 워커 {self.per_account_workers}개")
+
+            with ThreadPoolExecutor(max_workers=len(by_account)) as accounts_pool:
+                futures = {
+                    accounts_pool.submit(self._fetch_account, clients[aid][0], clients[aid][1], acct_rows): aid
+                    for aid, acct_rows in by_account.items()
+                }
+                # 계정이 끝나는 순서대로 메인 스레드에서 일괄 저장
+                for future in as_completed(futures):
+                    acct_name = clients[futures[future]][0]
+                    out = future.result()
+                    _bulk_update_listings(conn, ["raw_json", "detail_synced_at"], out["details"])
+                    filled, dup = _bulk_update_isbns(conn, out["found"])
+                    conn.commit()
+                    result.filled += filled
+                    result.skipped += dup
+                    result.failed += out["missing"] + out["errors"]
+                    print(f"  [{acct_name}] 완료: filled={filled}, 중복={dup}, "
+                          f"ISBN 없음={out['missing']}, 오류={out['errors']}")
 
         print(f"  Pass 1 완료: {result.to_dict()}")
         return result
@@ -219,7 +407,7 @@ class WingAPIStrategy(BaseISBNStrategy):
 # ─── 전략 2: books 테이블 매칭 ───
 
 class BooksMatchStrategy(BaseISBNStrategy):
-    """books 테이블 제목 LIKE 매칭으로 ISBN 추출"""
+    """books 테이블 제목 역색인(TitleIndex) 매칭으로 ISBN 추출"""
     name = "books"
 
     def fill(self, engine: Engine, account: Optional[str] = None,
@@ -231,31 +419,28 @@ class BooksMatchStrategy(BaseISBNStrategy):
             rows = _get_candidates(conn, account, limit)
             total = len(rows)
             print(f"  처리 대상: {total}건")
+            if not rows:
+                print(f"  Pass 2 완료: {result.to_dict()}")
+                return result
+
+            index = TitleIndex.from_books(conn)
+            print(f"  제목 색인: {len(index)}권")
 
             for i, row in enumerate(rows):
                 lid, aid, pname, _ = row
                 if i % 100 == 0 and i > 0:
                     print(f"  [{i}/{total}] filled={result.filled}, failed={result.failed}", flush=True)
 
-                clean = _clean_product_name(pname)
-                clean = clean.lower()
-                if len(clean) < 5:
+                if len(_clean_product_name(pname)) < 5:
                     result.failed += 1
                     continue
 
-                keyword = clean[:40]
-                matches = conn.execute(text("""
-                    SELECT DISTINCT isbn FROM books
-                    WHERE LOWER(title) LIKE :kw AND isbn IS NOT NULL
-                    LIMIT 3
-                """), {"kw": f"%{keyword}%"}).fetchall()
-
-                if matches:
-                    isbn_str = matches[0][0]  # 첫 번째 매칭만 사용
-                    if _update_isbn(conn, lid, aid, isbn_str):
+                match = index.best_match(pname)
+                if match:
+                    if _update_isbn(conn, lid, aid, match.isbn):
                         result.filled += 1
                         if result.filled <= 5:
-                            print(f"  [성공] {pname[:40]}... → {isbn_str}")
+                            print(f"  [성공] {pname[:40]}... → {match.isbn} ({match.score:.2f})")
                         if result.filled % 50 == 0:
                             conn.commit()
                     else:
@@ -336,6 +521,8 @@ class AladinAPIStrategy(BaseISBNStrategy):
             # 폴백: 첫 번째 결과
             return results[0].get("isbn13") or results[0].get("isbn")
 
+        except QuotaExhausted:
+            raise
         except Exception:
             return None
 
@@ -344,13 +531,15 @@ class AladinAPIStrategy(BaseISBNStrategy):
         result = FillResult(self.name)
         print(f"\n=== Pass 3: 알라딘 API 검색 ===")
 
-        ttb_key = os.getenv("ALADIN_TTB_KEY")
-        if not ttb_key:
-            print("  ALADIN_TTB_KEY 환경변수 없음. 건너뜁니다.")
-            return result
-
         from crawlers.aladin_api_crawler import AladinAPICrawler
-        crawler = AladinAPICrawler(ttb_key)
+
+        # 크롤링/CSV 생성과 같은 키 풀 공유 (한도 초과 키 자동 전환)
+        key_pool = AladinKeyPool.shared()
+        if not key_pool.available:
+            print("  ALADIN_TTB_KEY(S) 환경변수 없음 또는 모든 키 한도 초과. 건너뜁니다.")
+            return result
+        # 같은 상품명 재검색은 HttpCache에서 (7일)
+        crawler = AladinAPICrawler(key_pool=key_pool, search_ttl=7 * DAY)
 
         with engine.connect() as conn:
             rows = _get_candidates(conn, account, limit)
@@ -362,7 +551,11 @@ class AladinAPIStrategy(BaseISBNStrategy):
                 if i % 20 == 0 and i > 0:
                     print(f"  [{i}/{total}] filled={result.filled}, failed={result.failed}", flush=True)
 
-                isbn = self._search(crawler, pname)
+                try:
+                    isbn = self._search(crawler, pname)
+                except QuotaExhausted:
+                    print(f"  모든 TTBKey 한도 초과 → {i}/{total}건에서 중단")
+                    break
                 if isbn:
                     if _update_isbn(conn, lid, aid, isbn):
                         result.filled += 1
@@ -383,12 +576,201 @@ class AladinAPIStrategy(BaseISBNStrategy):
         return result
 
 
+# ─── 전략 4: 후보 점수화 (통합) ───
+
+class ResolverStrategy(BaseISBNStrategy):
+    """
+    모든 소스의 ISBN 후보를 모아 점수화 → 최고 후보를 신뢰도와 함께 기록 (isbn_resolutions)
+
+    1) 로컬 후보: raw_json 추출 + books 제목 색인 상위 후보 (외부 호출 없음)
+    2) 로컬 후보만으로 ACCEPT_CONFIDENCE 이상이면 확정
+    3) 나머지만 WING 상세 조회(계정별)와 알라딘 검색을 동시에 진행해 후보 추가
+    4) 재채점 → MIN_CONFIDENCE 이상만 listings.isbn 반영, 판정 결과는 전부 기록
+
+    점수 구성은 app.services.isbn_resolver 참고.
+    """
+    name = "resolve"
+
+    def __init__(self, workers: Optional[int] = None,
+                 aladin_workers: int = ALADIN_WORKERS,
+                 title_candidates: int = 3,
+                 crawler=None):
+        self.wing = WingAPIStrategy(workers=workers)
+        self.aladin_workers = aladin_workers
+        self.title_candidates = title_candidates
+        self.crawler = crawler      # 테스트/재사용용 주입 (None이면 키 풀로 생성)
+
+    def _aladin_crawler(self):
+        if self.crawler is not None:
+            return self.crawler
+        from crawlers.aladin_api_crawler import AladinAPICrawler
+        key_pool = AladinKeyPool.shared()
+        if not key_pool.available:
+            print("  ALADIN_TTB_KEY(S) 없음 또는 모든 키 한도 초과 → 알라딘 후보 생략")
+            return None
+        return AladinAPICrawler(key_pool=key_pool, search_ttl=7 * DAY)
+
+    @staticmethod
+    def _brands(conn, ids: List[int]) -> Dict[int, str]:
+        query = text(
+            "SELECT id, brand FROM listings WHERE id IN :ids AND brand IS NOT NULL"
+        ).bindparams(bindparam("ids", expanding=True))
+        brands = {}
+        for i in range(0, len(ids), RAW_JSON_BATCH):
+            brands.update(conn.execute(query, {"ids": ids[i:i + RAW_JSON_BATCH]}).fetchall())
+        return brands
+
+    def _fetch_wing(self, clients: Dict[int, tuple], by_account: Dict[int, list]) -> List[dict]:
+        """계정별 상세 조회를 동시에 (WingAPIStrategy._fetch_account 재사용)"""
+        with ThreadPoolExecutor(max_workers=len(by_account)) as pool:
+            futures = [pool.submit(self.wing._fetch_account, clients[aid][0], clients[aid][1], acct_rows)
+                       for aid, acct_rows in by_account.items()]
+            return [f.result() for f in futures]
+
+    def _fetch_aladin(self, crawler, rows) -> Dict[int, list]:
+        """상품명 검색 결과 {listing_id: [도서]} (키 한도 초과 시 남은 검색은 중단)"""
+        stop = threading.Event()
+
+        def search(pname):
+            if stop.is_set():
+                return []
+            keyword = ' '.join(_clean_product_name(pname).split()[:10])
+            if len(keyword) < 3:
+                return []
+            try:
+                return crawler.search_by_keyword(keyword=keyword, max_results=5, sort="Accuracy") or []
+            except QuotaExhausted:
+                stop.set()
+                return []
+            except Exception:
+                return []
+
+        with ThreadPoolExecutor(max_workers=self.aladin_workers) as pool:
+            futures = {pool.submit(search, pname): lid for lid, _, pname, _ in rows}
+            hits = {futures[f]: f.result() for f in as_completed(futures)}
+        if stop.is_set():
+            print("  모든 TTBKey 한도 초과 → 알라딘 검색 일부 생략")
+        return hits
+
+    def _applied_ids(self, conn, updates: List[Tuple[int, int, str]]) -> set:
+        """실제 반영된 listing_id (계정 내 중복으로 건너뛴 것 제외)"""
+        wanted = {lid: isbn_str for lid, _, isbn_str in updates}
+        ids = list(wanted)
+        query = text("SELECT id, isbn FROM listings WHERE id IN :ids").bindparams(
+            bindparam("ids", expanding=True))
+        applied = set()
+        for i in range(0, len(ids), RAW_JSON_BATCH):
+            for lid, isbn_str in conn.execute(query, {"ids": ids[i:i + RAW_JSON_BATCH]}):
+                if isbn_str == wanted[lid]:
+                    applied.add(lid)
+        return applied
+
+    def fill(self, engine: Engine, account: Optional[str] = None,
+             limit: int = 0) -> FillResult:
+        result = FillResult(self.name)
+        print(f"\n=== ISBN 후보 점수화 (raw_json/books → WING/알라딘) ===")
+
+        with engine.connect() as conn:
+            ensure_resolutions(conn)
+            rows = _get_candidates(conn, account, limit)
+            total = len(rows)
+            print(f"  처리 대상: {total}건")
+            if not rows:
+                conn.commit()
+                print(f"  완료: {result.to_dict()}")
+                return result
+
+            brands = self._brands(conn, [r[0] for r in rows])
+            sets = {lid: CandidateSet(ListingInfo.from_listing(pname, brands.get(lid)))
+                    for lid, _, pname, _ in rows}
+
+            # 1) 로컬 후보
+            local, fresh = self.wing._extract_local(conn, rows)
+            for lid, isbn_str in local.items():
+                sets[lid].add(isbn_str, "raw_json")
+            index = TitleIndex.from_books(conn)
+            for lid, _, pname, _ in rows:
+                if len(_clean_product_name(pname)) < 5:
+                    continue
+                for m in index.search(pname, limit=self.title_candidates):
+                    sets[lid].add(m.isbn, "books", title=m.title, title_score=m.score)
+
+            # 2) 확정 안 된 것만 외부 조회
+            pending = []
+            for row in rows:
+                best = sets[row[0]].best()
+                if not best or best[0] < ACCEPT_CONFIDENCE:
+                    pending.append(row)
+            print(f"  로컬 후보로 확정: {total - len(pending)}건 "
+                  f"(raw_json {len(local)}, 제목 색인 {len(index)}권), 외부 조회: {len(pending)}건")
+
+            clients, by_account = {}, {}
+            wing_rows = [r for r in pending if r[3] and r[0] not in local and r[0] not in fresh]
+            if wing_rows:
+                clients = self.wing._build_clients(conn, account)
+                for row in wing_rows:
+                    if row[1] in clients:
+                        by_account.setdefault(row[1], []).append(row)
+            crawler = self._aladin_crawler() if pending else None
+
+            # 3) WING / 알라딘 동시 조회 (DB 쓰기는 메인 스레드)
+            wing_outs, aladin_hits = [], {}
+            if by_account or crawler:
+                with ThreadPoolExecutor(max_workers=2) as pool:
+                    wing_future = pool.submit(self._fetch_wing, clients, by_account) if by_account else None
+                    aladin_future = pool.submit(self._fetch_aladin, crawler, pending) if crawler else None
+                    wing_outs = wing_future.result() if wing_future else []
+                    aladin_hits = aladin_future.result() if aladin_future else {}
+
+            for out in wing_outs:
+                _bulk_update_listings(conn, ["raw_json", "detail_synced_at"], out["details"])
+                for lid, _, isbn_str in out["found"]:
+                    sets[lid].add(isbn_str, "wing")
+            for lid, items in aladin_hits.items():
+                for item in items:
+                    sets[lid].add(item.get("isbn"), "aladin", title=item.get("title"),
+                                  publisher=item.get("publisher"), year=item.get("year"))
+
+            # 4) 재채점 → 반영 / 기록
+            updates, records = [], []
+            for lid, aid, pname, _ in rows:
+                best = sets[lid].best()
+                if not best:
+                    result.failed += 1
+                    continue
+                confidence, cand = best
+                records.append({
+                    "listing_id": lid, "isbn": cand.isbn, "confidence": confidence,
+                    "sources": ",".join(sorted(cand.sources)), "candidates": len(sets[lid]),
+                    "applied": False,
+                })
+                if confidence >= MIN_CONFIDENCE:
+                    updates.append((lid, aid, cand.isbn))
+                else:
+                    result.failed += 1
+
+            filled, dup = _bulk_update_isbns(conn, updates)
+            applied = self._applied_ids(conn, updates) if updates else set()
+            for rec in records:
+                rec["applied"] = rec["listing_id"] in applied
+            save_resolutions(conn, records)
+            conn.commit()
+            result.filled += filled
+            result.skipped += dup
+
+        print(f"  판정 기록: {len(records)}건 (반영 {filled}, 중복 {dup}, "
+              f"신뢰도 {MIN_CONFIDENCE} 미만 {len(records) - len(updates)})")
+        print(f"  완료: {result.to_dict()}")
+        return result
+
+
 # ─── 전략 레지스트리 ───
 
 STRATEGY_MAP: Dict[str, type] = {
     "wing": WingAPIStrategy,
     "books": BooksMatchStrategy,
     "aladin": AladinAPIStrategy,
+    "resolve": ResolverStrategy,
 }
 
 
@@ -420,13 +802,22 @@ class ISBNFillerService:
         if strategies is None:
             strategies = ["wing", "books", "aladin"]
 
+        with self.engine.begin() as conn:
+            ensure_listing_isbns(conn)
+            ensure_coverage(conn)
+            account_ids = self._account_ids(conn, account)
+            before = with_isbn_counts(conn, account_ids)
+            # 시작 커버리지도 현재 listings 기준 (스냅샷이 없거나 밀려 있을 수 있음, 전략 누적값은 유지)
+            refresh_coverage(conn, account_ids)
+
         print("=" * 60)
         print("통합 ISBN 채우기")
         print("=" * 60)
-        self._print_coverage()
+        self._print_coverage(account)
 
         results = {}
         total = FillResult("total")
+        strategy_filled = {}    # 전략 → {account_id: 채움 수} (전략 전후 ISBN 보유 수 차이)
 
         for name in strategies:
             cls = STRATEGY_MAP.get(name)
@@ -441,27 +832,36 @@ class ISBNFillerService:
             total.failed += r.failed
             total.skipped += r.skipped
 
+            with self.engine.connect() as conn:
+                after = with_isbn_counts(conn, account_ids)
+            strategy_filled[name] = {aid: n - before.get(aid, 0) for aid, n in after.items()}
+            before = after
+
+        with self.engine.begin() as conn:
+            refresh_coverage(conn, account_ids, strategy_filled=strategy_filled)
+
         print(f"\n=== 전체 결과 ===")
         print(f"  filled={total.filled}, failed={total.failed}, skipped={total.skipped}")
-        self._print_coverage()
+        self._print_coverage(account)
 
         results["total"] = total.to_dict()
         return results
 
-    def _print_coverage(self):
-        """계정별 ISBN 커버리지 출력"""
+    @staticmethod
+    def _account_ids(conn, account: Optional[str]) -> Optional[List[int]]:
+        """계정명 → [account_id] (None이면 전체)"""
+        if not account:
+            return None
+        return [r[0] for r in conn.execute(
+            text("SELECT id FROM accounts WHERE account_name = :name"), {"name": account})]
+
+    def _print_coverage(self, account: Optional[str] = None):
+        """계정별 ISBN 커버리지 출력 (isbn_coverage 스냅샷)"""
         with self.engine.connect() as conn:
-            stats = conn.execute(text("""
-                SELECT a.account_name,
-                       COUNT(*) as total,
-                       SUM(CASE WHEN l.isbn IS NOT NULL THEN 1 ELSE 0 END) as has_isbn
-                FROM listings l
-                JOIN accounts a ON l.account_id = a.id
-                WHERE a.is_active = true
-                GROUP BY a.account_name
-            """)).fetchall()
+            rows = get_coverage(conn, account_name=account)
 
         print("\n  ISBN 커버리지:")
-        for name, total, has in stats:
-            pct = (has / total * 100) if total > 0 else 0
-            print(f"    {name}: {has}/{total} ({pct:.1f}%)")
+        if not rows:
+            print("    (리스팅 없음)")
+        for r in rows:
+            print(f"    {r.account_name}: {r.with_isbn}/{r.total} ({r.pct:.1f}%)")
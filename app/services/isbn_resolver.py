@@ -0,0 +1,231 @@
+"""
+ISBN 후보 점수화 / 판정 결과 저장 (isbn_resolutions)
+====================================================
+리스팅 하나에 대해 여러 소스(raw_json, WING, books 제목 색인, 알라딘 검색)가 낸 ISBN 후보를
+모아 점수화하고, 최고 후보를 신뢰도(0~1)와 함께 기록.
+
+점수 구성 (score_candidate):
+  - 소스 기본점: 판매자 상세(raw_json/WING)의 바코드·태그는 SELLER_PRIOR, 제목 검색 후보는 0
+  - 제목 유사도 × TITLE_WEIGHT (상품명 vs 후보 도서 제목, 연도/태그 제거 후 bigram)
+  - 출판사 일치 +PUBLISHER_BONUS / 불일치 -PUBLISHER_PENALTY (양쪽 다 알 때만)
+  - 연도 일치 +YEAR_BONUS / 불일치 -YEAR_PENALTY (연도별 개정판은 ISBN이 다름)
+  - 세트 구성: 상품명이 세트인데 단권 후보 -SET_PENALTY, 권수까지 일치 +SET_BONUS
+  - 소스 합의: 같은 ISBN을 낸 소스가 하나 늘 때마다 +AGREEMENT_BONUS
+  - 1·2위 점수 차가 AMBIGUITY_MARGIN 미만이면 신뢰도 × AMBIGUITY_FACTOR (어느 판인지 모름)
+
+ResolverStrategy(app.services.isbn_filler)가 이 모듈로 후보를 판정함.
+"""
+import logging
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import text
+
+from app.models.book import Book
+from app.services.title_index import title_grams
+
+logger = logging.getLogger(__name__)
+
+# 스크립트용 DDL (ORM 모델: app.models.isbn_resolution.IsbnResolution)
+CREATE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS isbn_resolutions (
+    listing_id INTEGER PRIMARY KEY REFERENCES listings(id) ON DELETE CASCADE,
+    isbn TEXT NOT NULL,
+    confidence FLOAT NOT NULL,
+    sources VARCHAR(50),
+    candidates INTEGER DEFAULT 0,
+    applied BOOLEAN DEFAULT false,
+    resolved_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+SELLER_SOURCES = {"raw_json", "wing"}
+
+SELLER_PRIOR = 0.9
+TITLE_WEIGHT = 0.9
+PUBLISHER_BONUS = 0.1
+PUBLISHER_PENALTY = 0.1
+YEAR_BONUS = 0.05
+YEAR_PENALTY = 0.3
+SET_BONUS = 0.05
+SET_PENALTY = 0.2
+AGREEMENT_BONUS = 0.1
+AMBIGUITY_MARGIN = 0.05
+AMBIGUITY_FACTOR = 0.7
+
+# 이 이상이면 외부 조회(WING/알라딘) 없이 확정
+ACCEPT_CONFIDENCE = 0.85
+# 이 이상이면 listings.isbn에 반영 (미만은 기록만)
+MIN_CONFIDENCE = 0.6
+
+
+@dataclass
+class ListingInfo:
+    """상품명/브랜드에서 뽑은 판정용 정보"""
+    name: str
+    brand: Optional[str] = None
+    year: Optional[int] = None
+    set_size: Optional[int] = None     # 세트 권수 (세트인데 권수 모르면 0, 단권이면 None)
+    grams: Set[str] = field(default_factory=set)
+
+    @classmethod
+    def from_listing(cls, product_name: str, brand: Optional[str] = None) -> "ListingInfo":
+        from app.services.isbn_filler import _clean_product_name  # 순환 import 방지
+        return cls(
+            name=product_name,
+            brand=(brand or "").strip() or None,
+            year=Book.extract_year(product_name),
+            set_size=expected_set_size(product_name),
+            grams=title_grams(_clean_product_name(product_name)),
+        )
+
+
+@dataclass
+class Candidate:
+    """ISBN 후보 (같은 ISBN은 소스가 달라도 하나로 합침)"""
+    isbn: str
+    sources: Set[str] = field(default_factory=set)
+    title: Optional[str] = None
+    publisher: Optional[str] = None
+    year: Optional[int] = None
+    title_score: float = 0.0
+
+    @property
+    def components(self) -> int:
+        return len([p for p in self.isbn.split(",") if p.strip()])
+
+    def merge(self, source: str, title: str = None, publisher: str = None,
+              year: int = None, title_score: float = 0.0):
+        self.sources.add(source)
+        self.title = self.title or title
+        self.publisher = self.publisher or publisher
+        self.year = self.year or year or (Book.extract_year(title) if title else None)
+        self.title_score = max(self.title_score, title_score)
+
+
+class CandidateSet:
+    """리스팅 하나의 후보 모음"""
+
+    def __init__(self, info: ListingInfo):
+        self.info = info
+        self.by_isbn = {}
+
+    def __len__(self):
+        return len(self.by_isbn)
+
+    def add(self, isbn: str, source: str, title: str = None, publisher: str = None,
+            year: int = None, title_score: float = None):
+        """후보 추가 (title_score 없으면 제목으로 계산)"""
+        if not isbn:
+            return
+        if title_score is None:
+            title_score = title_similarity(self.info.grams, title) if title else 0.0
+        cand = self.by_isbn.setdefault(isbn, Candidate(isbn))
+        cand.merge(source, title, publisher, year, title_score)
+
+    def ranked(self) -> List[Tuple[float, Candidate]]:
+        scored = [(score_candidate(self.info, c), c) for c in self.by_isbn.values()]
+        scored.sort(key=lambda x: (-x[0], x[1].isbn))
+        return scored
+
+    def best(self) -> Optional[Tuple[float, Candidate]]:
+        """(신뢰도, 최고 후보) — 2위와 근소한 차이면 신뢰도 감점"""
+        ranked = self.ranked()
+        if not ranked:
+            return None
+        score, cand = ranked[0]
+        if len(ranked) > 1 and score - ranked[1][0] < AMBIGUITY_MARGIN:
+            score = round(score * AMBIGUITY_FACTOR, 4)
+        return score, cand
+
+
+def expected_set_size(name: str) -> Optional[int]:
+    """상품명 → 세트 권수 (전 N권 / N권 세트 / A+B), 세트인데 권수 모름 0, 단권 None"""
+    m = re.search(r'전\s*(\d+)\s*권', name) or re.search(r'(\d+)\s*권\s*세트', name)
+    if m:
+        return int(m.group(1))
+    plus = re.sub(r'\[[^\]]*\]|\([^)]*\)', '', name).count('+')
+    if plus:
+        return plus + 1
+    if '세트' in name:
+        return 0
+    return None
+
+
+def title_similarity(listing_grams: Set[str], title: str) -> float:
+    """상품명 bigram vs 도서 제목(연도 제거) bigram Dice 계수"""
+    if not listing_grams or not title:
+        return 0.0
+    grams = title_grams(Book.normalize_title(title, Book.extract_year(title)))
+    if not grams:
+        return 0.0
+    return 2 * len(listing_grams & grams) / (len(listing_grams) + len(grams))
+
+
+def _norm_pub(name: Optional[str]) -> str:
+    return re.sub(r'[^0-9a-z가-힣]', '', (name or "").lower())
+
+
+def score_candidate(info: ListingInfo, cand: Candidate) -> float:
+    """후보 신뢰도 (0~1)"""
+    score = SELLER_PRIOR if cand.sources & SELLER_SOURCES else 0.0
+    score += TITLE_WEIGHT * cand.title_score
+
+    pub_l, pub_c = _norm_pub(info.brand), _norm_pub(cand.publisher)
+    if pub_l and pub_c:
+        score += PUBLISHER_BONUS if (pub_l in pub_c or pub_c in pub_l) else -PUBLISHER_PENALTY
+
+    if info.year and cand.year:
+        score += YEAR_BONUS if info.year == cand.year else -YEAR_PENALTY
+
+    if info.set_size is not None:
+        if cand.components == 1:
+            score -= SET_PENALTY
+        elif info.set_size and cand.components == info.set_size:
+            score += SET_BONUS
+
+    score += AGREEMENT_BONUS * (len(cand.sources) - 1)
+    return round(max(0.0, min(1.0, score)), 4)
+
+
+# ─── 저장 ───
+
+def ensure_table(conn):
+    """isbn_resolutions 테이블이 없으면 생성 (PostgreSQL: 기존 VARCHAR(200) isbn → TEXT)"""
+    conn.execute(text(CREATE_TABLE_SQL))
+    if conn.dialect.name != "postgresql":
+        return
+    # 세트 후보(raw_json 쉼표 목록)는 200자를 넘을 수 있음 — listings.isbn과 같은 TEXT로
+    data_type = conn.execute(text(
+        "SELECT data_type FROM information_schema.columns "
+        "WHERE table_name = 'isbn_resolutions' AND column_name = 'isbn'"
+    )).scalar()
+    if data_type == "character varying":
+        conn.execute(text("ALTER TABLE isbn_resolutions ALTER COLUMN isbn TYPE TEXT"))
+
+
+def save_resolutions(conn, rows: Iterable[dict]) -> int:
+    """
+    판정 결과 upsert
+
+    rows: [{listing_id, isbn, confidence, sources, candidates, applied}]
+    """
+    now = datetime.utcnow()
+    rows = [dict(r, resolved_at=now) for r in rows]
+    if not rows:
+        return 0
+    conn.execute(text("""
+        INSERT INTO isbn_resolutions
+            (listing_id, isbn, confidence, sources, candidates, applied, resolved_at)
+        VALUES (:listing_id, :isbn, :confidence, :sources, :candidates, :applied, :resolved_at)
+        ON CONFLICT (listing_id) DO UPDATE SET
+            isbn = EXCLUDED.isbn,
+            confidence = EXCLUDED.confidence,
+            sources = EXCLUDED.sources,
+            candidates = EXCLUDED.candidates,
+            applied = EXCLUDED.applied,
+            resolved_at = EXCLUDED.resolved_at
+    """), rows)
+    return len(rows)
@@ -0,0 +1,185 @@
+"""
+리스팅 ISBN 정규화 (listing_isbns)
+==================================
+listings.isbn의 쉼표 구분 목록을 (listing_id, position, isbn) 행으로 펼쳐 유지.
+"이 ISBN이 들어간 리스팅(계정 무관)"을 isbn 인덱스 한 번으로 조회.
+
+갱신 시점:
+  - 상품 동기화 (sync_coupang_products) 후 계정 단위 재구성
+  - ISBN 채우기 (isbn_filler._update_isbn, fill_isbn_* / copy_isbn_* 스크립트) 시 리스팅 단위 교체
+  - 신규 등록 (FranchiseSync.upload_to_account, 대시보드 등록 탭, import_existing_products) 시
+    listings INSERT와 같은 트랜잭션에서 추가
+  - 그 외 스크립트로 listings.isbn을 직접 고친 뒤: rebuild_listing_isbns()
+"""
+import logging
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import bindparam, text
+
+logger = logging.getLogger(__name__)
+
+# 스크립트용 DDL (ORM 모델: app.models.listing_isbn.ListingIsbn)
+CREATE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS listing_isbns (
+    listing_id INTEGER NOT NULL REFERENCES listings(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    isbn TEXT NOT NULL,
+    PRIMARY KEY (listing_id, position)
+)
+"""
+
+CREATE_INDEXES_SQL = [
+    "CREATE INDEX IF NOT EXISTS ix_listing_isbns_isbn ON listing_isbns(isbn, listing_id)",
+]
+
+# 재구성 시 한 번에 처리하는 리스팅 수
+REBUILD_BATCH = 5000
+
+
+def split_isbns(isbn_str: Optional[str]) -> List[str]:
+    """'A, B,A' → ['A', 'B'] (공백 제거, 순서 유지 중복 제거)"""
+    if not isbn_str:
+        return []
+    seen = []
+    for part in str(isbn_str).split(","):
+        part = part.strip()
+        if part and part not in seen:
+            seen.append(part)
+    return seen
+
+
+# listings.isbn은 자유 형식 Text — 초기 VARCHAR(20) 테이블은 긴 토큰에서 INSERT 실패
+ALTER_ISBN_TEXT_SQL = "ALTER TABLE listing_isbns ALTER COLUMN isbn TYPE TEXT"
+
+
+def _widen_isbn_column(conn):
+    """PostgreSQL: 기존 VARCHAR isbn 컬럼 → TEXT (이미 TEXT면 ALTER 안 함)"""
+    if conn.dialect.name != "postgresql":
+        return
+    data_type = conn.execute(text(
+        "SELECT data_type FROM information_schema.columns "
+        "WHERE table_name = 'listing_isbns' AND column_name = 'isbn'"
+    )).scalar()
+    if data_type == "character varying":
+        conn.execute(text(ALTER_ISBN_TEXT_SQL))
+
+
+def ensure_table(conn):
+    """listing_isbns 테이블이 없으면 생성 (PostgreSQL: 기존 VARCHAR(20) isbn → TEXT)"""
+    conn.execute(text(CREATE_TABLE_SQL))
+    _widen_isbn_column(conn)
+    for idx_sql in CREATE_INDEXES_SQL:
+        conn.execute(text(idx_sql))
+
+
+def _insert_rows(conn, pairs: Iterable[tuple]) -> int:
+    """(listing_id, isbn 문자열) → listing_isbns INSERT"""
+    rows = [
+        {"lid": lid, "pos": pos, "isbn": isbn}
+        for lid, isbn_str in pairs
+        for pos, isbn in enumerate(split_isbns(isbn_str))
+    ]
+    if rows:
+        conn.execute(
+            text("INSERT INTO listing_isbns (listing_id, position, isbn) VALUES (:lid, :pos, :isbn)"),
+            rows,
+        )
+    return len(rows)
+
+
+def replace_listing_isbns(conn, listing_id: int, isbn_str: Optional[str]) -> int:
+    """리스팅 1건의 ISBN 행 교체 (listings.isbn UPDATE 직후 같은 트랜잭션에서 호출)"""
+    conn.execute(text("DELETE FROM listing_isbns WHERE listing_id = :lid"), {"lid": listing_id})
+    return _insert_rows(conn, [(listing_id, isbn_str)])
+
+
+def rebuild_listing_isbns(conn, account_id: Optional[int] = None,
+                          listing_ids: Optional[List[int]] = None) -> int:
+    """
+    listings.isbn → listing_isbns 재구성
+
+    Args:
+        account_id: 해당 계정 리스팅만 (None=전체)
+        listing_ids: 해당 리스팅만 (account_id보다 우선)
+
+    Returns:
+        저장된 ISBN 행 수
+    """
+    if listing_ids is not None:
+        ids = list(listing_ids)
+    else:
+        where = "WHERE account_id = :aid" if account_id is not None else ""
+        ids = [r[0] for r in conn.execute(
+            text(f"SELECT id FROM listings {where} ORDER BY id"),
+            {"aid": account_id} if account_id is not None else {},
+        ).fetchall()]
+
+    delete_sql = text("DELETE FROM listing_isbns WHERE listing_id IN :ids").bindparams(
+        bindparam("ids", expanding=True))
+    select_sql = text(
+        "SELECT id, isbn FROM listings WHERE id IN :ids AND isbn IS NOT NULL AND isbn <> ''"
+    ).bindparams(bindparam("ids", expanding=True))
+
+    saved = 0
+    for i in range(0, len(ids), REBUILD_BATCH):
+        chunk = ids[i:i + REBUILD_BATCH]
+        conn.execute(delete_sql, {"ids": chunk})
+        saved += _insert_rows(conn, conn.execute(select_sql, {"ids": chunk}).fetchall())
+
+    logger.info(f"listing_isbns 재구성: 리스팅 {len(ids):,}개 → ISBN {saved:,}행")
+    return saved
+
+
+# ─── 조회 ───
+
+def listings_for_isbn(conn, isbn: str, account_id: Optional[int] = None) -> List[dict]:
+    """
+    ISBN이 포함된 리스팅 (단권 + 세트, 계정 무관)
+
+    Returns:
+        [{listing_id, account_id, position, isbn_count}, ...]
+    """
+    acct_filter = "AND l.account_id = :aid" if account_id is not None else ""
+    rows = conn.execute(text(f"""
+        SELECT li.listing_id, l.account_id, li.position,
+               (SELECT COUNT(*) FROM listing_isbns x WHERE x.listing_id = li.listing_id) AS isbn_count
+        FROM listing_isbns li
+        JOIN listings l ON l.id = li.listing_id
+        WHERE li.isbn = :isbn {acct_filter}
+        ORDER BY l.account_id, li.listing_id
+    """), {"isbn": isbn, "aid": account_id}).mappings().fetchall()
+    return [dict(r) for r in rows]
+
+
+def listings_for_isbns(conn, isbns: Iterable[str],
+                       account_id: Optional[int] = None) -> Dict[str, List[dict]]:
+    """
+    여러 ISBN을 한 번에 조회
+
+    Returns:
+        {isbn: [{listing_id, account_id, position}, ...]} (없는 ISBN은 빈 리스트)
+    """
+    isbns = list(dict.fromkeys(isbns))
+    result = {isbn: [] for isbn in isbns}
+    if not isbns:
+        return result
+    acct_filter = "AND l.account_id = :aid" if account_id is not None else ""
+    sql = text(f"""
+        SELECT li.isbn, li.listing_id, l.account_id, li.position
+        FROM listing_isbns li
+        JOIN listings l ON l.id = li.listing_id
+        WHERE li.isbn IN :isbns {acct_filter}
+        ORDER BY li.isbn, l.account_id, li.listing_id
+    """).bindparams(bindparam("isbns", expanding=True))
+    for r in conn.execute(sql, {"isbns": isbns, "aid": account_id}).mappings():
+        result[r["isbn"]].append({"listing_id": r["listing_id"], "account_id": r["account_id"],
+                                  "position": r["position"]})
+    return result
+
+
+def isbns_for_listing(conn, listing_id: int) -> List[str]:
+    """리스팅의 구성 ISBN (position 순)"""
+    return [r[0] for r in conn.execute(
+        text("SELECT isbn FROM listing_isbns WHERE listing_id = :lid ORDER BY position"),
+        {"lid": listing_id},
+    ).fetchall()]
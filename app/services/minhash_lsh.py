@@ -0,0 +1,136 @@
+"""
+MinHash / LSH 후보 생성 (상품명 토큰 집합 Jaccard 근사)
+======================================================
+상품명 토큰 집합마다 MinHash 서명(num_perm개 최소 해시)을 만들고,
+서명 앞부분을 bands개 구간(구간당 rows개)으로 나눠 구간이 하나라도 같은 항목끼리만 후보로 묶음.
+→ 전체 쌍 비교(N×M) 없이 유사도 높은 쌍만 찾고, 정확한 Jaccard는 후보에만 계산.
+
+후보가 될 확률: P(J) = 1 - (1 - J^r)^b  (J: 실제 Jaccard, b: bands, r: rows)
+  16×8 : J=0.8 → 약 0.947, J=0.6 → 약 0.24 (임계점 (1/b)^(1/r) ≈ 0.71)
+  32×4 : J=0.8 → 약 1.000, J=0.6 → 약 0.988 (임계점 ≈ 0.42)
+판정 기준 유사도가 정해져 있으면 for_threshold()로 그 유사도에서 재현율이
+RECALL_TARGET 이상인 (b, r)을 고른다 (정확 비교 대비 놓치는 쌍을 RECALL_TARGET 밖으로 제한).
+
+사용법:
+    lsh = MinHashLSH.for_threshold(0.8)
+    for key, tokens in sources:
+        lsh.add(key, tokens)
+    candidates = lsh.query(tokens)   # key 집합
+"""
+import zlib
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+# 2^31 - 1 (a * x + b 가 uint64 안에서 넘치지 않도록)
+_PRIME = np.uint64((1 << 31) - 1)
+
+# for_threshold: 판정 기준 유사도에서 후보가 될 최소 확률
+RECALL_TARGET = 0.99
+
+
+def _token_hashes(tokens: Iterable[str]) -> np.ndarray:
+    return np.fromiter((zlib.crc32(t.encode("utf-8")) for t in set(tokens)), dtype=np.uint64)
+
+
+def candidate_probability(similarity: float, bands: int, rows: int) -> float:
+    """Jaccard가 similarity인 쌍이 한 band 이상 일치해 후보가 될 확률"""
+    return 1.0 - (1.0 - similarity ** rows) ** bands
+
+
+def choose_bands(threshold: float, num_perm: int = 128,
+                 recall: float = RECALL_TARGET) -> Tuple[int, int]:
+    """
+    threshold에서 후보 확률이 recall 이상인 (bands, rows)
+
+    rows가 클수록 비유사 쌍이 덜 섞이므로, bands × rows ≤ num_perm 안에서 가능한 가장 큰 rows를
+    고르고 남는 서명은 bands로 모두 사용. (예: 128 → 0.8: 21×6, 0.6: 42×3)
+    """
+    if not 0 < threshold <= 1:
+        raise ValueError(f"threshold({threshold})는 0 초과 1 이하여야 합니다")
+    for rows in range(num_perm, 0, -1):
+        bands = num_perm // rows
+        if candidate_probability(threshold, bands, rows) >= recall:
+            return bands, rows
+    return num_perm, 1
+
+
+class MinHashLSH:
+    """MinHash 서명 + band LSH 색인 (메모리)"""
+
+    def __init__(self, num_perm: int = 128, bands: int = 16, seed: int = 1,
+                 rows: Optional[int] = None):
+        if rows is None:
+            if num_perm % bands:
+                raise ValueError(f"num_perm({num_perm})은 bands({bands})로 나누어떨어져야 합니다")
+            rows = num_perm // bands
+        if bands * rows > num_perm:
+            raise ValueError(f"bands × rows({bands}×{rows})가 num_perm({num_perm})보다 큽니다")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = rows
+        rng = np.random.default_rng(seed)
+        # 서명은 band에 쓰이는 bands × rows개만 계산
+        used = bands * rows
+        self._a = rng.integers(1, int(_PRIME), size=num_perm, dtype=np.uint64)[:used]
+        self._b = rng.integers(0, int(_PRIME), size=num_perm, dtype=np.uint64)[:used]
+        self._buckets: List[Dict[bytes, List[Hashable]]] = [defaultdict(list) for _ in range(bands)]
+        self._size = 0
+
+    @classmethod
+    def for_threshold(cls, threshold: float, num_perm: int = 128,
+                      recall: float = RECALL_TARGET, seed: int = 1) -> "MinHashLSH":
+        """판정 기준 유사도(threshold)에서 재현율 recall 이상이 되도록 banding을 정한 색인"""
+        bands, rows = choose_bands(threshold, num_perm, recall)
+        return cls(num_perm, bands, seed=seed, rows=rows)
+
+    @property
+    def threshold(self) -> float:
+        """후보 확률 곡선의 변곡점 근사 (1/b)^(1/r)"""
+        return (1.0 / self.bands) ** (1.0 / self.rows)
+
+    def recall_at(self, similarity: float) -> float:
+        """Jaccard가 similarity인 쌍의 후보 확률"""
+        return candidate_probability(similarity, self.bands, self.rows)
+
+    def __len__(self):
+        return self._size
+
+    def signature(self, tokens: Iterable[str]) -> np.ndarray:
+        """토큰 집합 → MinHash 서명 (bands × rows개, 빈 집합이면 None)"""
+        hashes = _token_hashes(tokens) % _PRIME
+        if hashes.size == 0:
+            return None
+        perm = (self._a[:, None] * hashes[None, :] + self._b[:, None]) % _PRIME
+        return perm.min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, sig: np.ndarray) -> List[bytes]:
+        return [sig[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def add(self, key: Hashable, tokens: Iterable[str]) -> bool:
+        """항목 추가 (토큰이 없으면 추가하지 않고 False)"""
+        sig = self.signature(tokens)
+        if sig is None:
+            return False
+        for band, bkey in zip(self._buckets, self._band_keys(sig)):
+            band[bkey].append(key)
+        self._size += 1
+        return True
+
+    def query(self, tokens: Iterable[str]) -> Set[Hashable]:
+        """한 band라도 서명이 같은 항목 key 집합"""
+        sig = self.signature(tokens)
+        if sig is None:
+            return set()
+        found = set()
+        for band, bkey in zip(self._buckets, self._band_keys(sig)):
+            found.update(band.get(bkey, ()))
+        return found
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    """정확한 Jaccard 유사도"""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
@@ -0,0 +1,103 @@
+"""
+보고서 병렬 적재 파이프라인
+===========================
+여러 Excel 파일을 프로세스 풀에서 파싱(CPU)하고, 파싱이 끝나는 순서대로
+메인 프로세스의 단일 writer가 DB에 저장(I/O) → 파싱과 저장이 겹쳐서 진행.
+
+DB 연결은 메인 프로세스에만 있음 (워커는 파일만 읽음).
+parse_fn은 pickle 가능한 모듈 최상위 함수여야 함 (Windows spawn 대응).
+"""
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 진행 콜백: (완료 파일 수, 전체 파일 수, 방금 끝난 파일 결과)
+ProgressFn = Callable[[int, int, dict], None]
+
+# 이 파일 수 미만이면 프로세스 풀 없이 순차 파싱 (Windows spawn 기동 비용이 파싱보다 큼)
+MIN_PARALLEL_FILES = 4
+
+
+def default_workers(n_jobs: int) -> int:
+    """파일 수와 CPU 수 중 작은 값 (최대 8, MIN_PARALLEL_FILES 미만이면 1)"""
+    if n_jobs < MIN_PARALLEL_FILES:
+        return 1
+    return max(1, min(n_jobs, os.cpu_count() or 1, 8))
+
+
+def _timed(parse_fn: Callable, args: tuple) -> Tuple[Any, float]:
+    """워커에서 실행: 파싱 결과 + 소요 시간(초)"""
+    t0 = time.perf_counter()
+    parsed = parse_fn(*args)
+    return parsed, time.perf_counter() - t0
+
+
+def run_pipeline(jobs: Sequence[tuple], parse_fn: Callable,
+                 write_fn: Callable[[int, Any, float], dict],
+                 error_fn: Callable[[int, Exception], dict],
+                 workers: Optional[int] = None,
+                 progress: Optional[ProgressFn] = None,
+                 done: int = 0, total: Optional[int] = None) -> List[dict]:
+    """
+    파싱(프로세스 풀) → 저장(메인 프로세스, 순차) 파이프라인
+
+    Args:
+        jobs: 파일별 parse_fn 인자 튜플 목록
+        parse_fn: (*args) → 파싱 결과 (워커에서 실행)
+        write_fn: (job 인덱스, 파싱 결과, 파싱 초) → 결과 dict (메인에서 실행)
+        error_fn: (job 인덱스, 예외) → 오류 결과 dict
+        workers: 프로세스 수 (None=자동, 1=풀 없이 순차)
+        progress: 파일 하나가 끝날 때마다 호출
+        done/total: 진행 표시용 오프셋 (앞서 건너뛴 파일 포함 시)
+
+    Returns:
+        jobs 순서와 같은 결과 dict 리스트
+    """
+    total = total if total is not None else done + len(jobs)
+    results: List[Optional[dict]] = [None] * len(jobs)
+    if not jobs:
+        return []
+
+    def finish(i: int, result: dict):
+        nonlocal done
+        results[i] = result
+        done += 1
+        if progress:
+            progress(done, total, result)
+
+    def write(i: int, parsed: Any, parse_sec: float):
+        try:
+            finish(i, write_fn(i, parsed, parse_sec))
+        except Exception as e:
+            logger.error(f"저장 오류: {e}")
+            finish(i, error_fn(i, e))
+
+    workers = workers or default_workers(len(jobs))
+    if workers <= 1 or len(jobs) == 1:
+        for i, args in enumerate(jobs):
+            try:
+                parsed, parse_sec = _timed(parse_fn, args)
+            except Exception as e:
+                logger.error(f"파싱 오류: {e}")
+                finish(i, error_fn(i, e))
+                continue
+            write(i, parsed, parse_sec)
+        return results
+
+    logger.info(f"병렬 파싱: 파일 {len(jobs)}개, 워커 {workers}개")
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_timed, parse_fn, args): i for i, args in enumerate(jobs)}
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                parsed, parse_sec = future.result()
+            except Exception as e:
+                logger.error(f"파싱 오류: {e}")
+                finish(i, error_fn(i, e))
+                continue
+            write(i, parsed, parse_sec)
+    return results
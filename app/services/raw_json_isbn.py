@@ -0,0 +1,158 @@
+"""
+raw_json(상품 상세 응답 캐시)에서 ISBN 추출
+==========================================
+listings.raw_json에는 sync_coupang_products가 저장한 get_product() 상세 응답(data)이 들어있음.
+API를 다시 부르지 않고 여기서 ISBN을 뽑는다.
+
+- 모든 items 확인 (첫 번째만 X)
+- attributes, externalVendorSku, barcode, searchTags, vendorItemName 모두 검사
+- ISBN-13 체크섬 검증
+
+대량 처리(extract_isbn_map / iter_extracted)는 JSON 파싱 + 정규식이 CPU 작업이라 프로세스 풀로 분산.
+orjson이 설치되어 있으면 JSON 파싱에 사용 (없으면 표준 json).
+"""
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from sqlalchemy import text
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:     # 선택 의존성
+    orjson = None
+    _loads = json.loads
+
+isbn_pattern = re.compile(r'97[89]\d{10}')
+
+# 이보다 적으면 프로세스 풀 없이 현재 프로세스에서 처리 (풀 기동 비용이 더 큼)
+MIN_PARALLEL = 500
+# 스트리밍 시 서버 커서에서 한 번에 가져오는 행 수
+STREAM_CHUNK = 2000
+
+
+def validate_isbn13_checksum(isbn: str) -> bool:
+    """ISBN-13 체크섬 검증"""
+    if not isbn or len(isbn) != 13:
+        return False
+    if not isbn.isdigit():
+        return False
+    if not isbn.startswith(('978', '979')):
+        return False
+    try:
+        check_sum = sum(
+            int(isbn[i]) * (1 if i % 2 == 0 else 3)
+            for i in range(12)
+        )
+        calculated_check = (10 - (check_sum % 10)) % 10
+        return calculated_check == int(isbn[12])
+    except (ValueError, IndexError):
+        return False
+
+
+def _collect_texts(data: dict) -> List[str]:
+    """ISBN이 들어있을 수 있는 필드 값 목록 (attributes, barcode, externalVendorSku, searchTags, vendorItemName, 상품명)"""
+    texts = [str(data.get('sellerProductName', ''))]
+    for item in data.get('items') or []:
+        if not isinstance(item, dict):
+            continue
+        attributes = item.get('attributes', [])
+        if isinstance(attributes, list):
+            for attr in attributes:
+                attr_value = str(attr.get('attributeValueName', '') or '')
+                if attr.get('attributeTypeName', '') == 'ISBN' and attr_value:
+                    if any(skip in attr_value for skip in ['상세', '참조', '해당없음', '없음']):
+                        continue
+                    # 하이픈 등 구분자 포함 표기 (978-89-...) → 숫자만
+                    texts.append(re.sub(r'[^0-9]', '', attr_value))
+                texts.append(attr_value)
+        texts.append(str(item.get('barcode', '')))
+        texts.append(str(item.get('externalVendorSku', '')))
+        search_tags = item.get('searchTags', [])
+        if isinstance(search_tags, list):
+            texts.extend(str(tag) for tag in search_tags)
+        texts.append(str(item.get('vendorItemName', '')))
+    return texts
+
+
+def extract_all_isbns_from_raw_json(raw_json_str: Union[str, bytes]) -> List[str]:
+    """
+    raw_json에서 모든 ISBN 추출 (강화 버전)
+
+    모든 items 순회, 모든 필드 검사, ISBN-13 체크섬 검증, 중복 제거.
+    필드 값을 구분자로 이어 정규식 한 번으로 찾고, 중복 제거 후 체크섬은 후보당 한 번만 계산.
+    """
+    if not raw_json_str:
+        return []
+
+    try:
+        data = _loads(raw_json_str)
+    except ValueError:      # json.JSONDecodeError / orjson.JSONDecodeError 모두 ValueError
+        return []
+    if not isinstance(data, dict) or not data.get('items'):
+        return []
+
+    candidates = set(isbn_pattern.findall("\n".join(_collect_texts(data))))
+    return sorted(isbn for isbn in candidates if validate_isbn13_checksum(isbn))
+
+
+def _extract_row(row: Tuple[int, str]) -> Tuple[int, List[str]]:
+    return row[0], extract_all_isbns_from_raw_json(row[1])
+
+
+def extract_isbn_map(rows: Iterable[Tuple[int, str]],
+                     workers: Optional[int] = None) -> Dict[int, List[str]]:
+    """
+    (id, raw_json) 목록 → {id: [ISBN, ...]} (ISBN 없는 항목도 빈 리스트로 포함)
+
+    Args:
+        workers: 프로세스 수 (None이면 CPU 수, 1이면 현재 프로세스에서 처리)
+    """
+    rows = list(rows)
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(rows) < MIN_PARALLEL:
+        return dict(_extract_row(r) for r in rows)
+    chunksize = max(1, len(rows) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return dict(pool.map(_extract_row, rows, chunksize=chunksize))
+
+
+def _extract_batch(rows: List[Tuple[int, str]]) -> List[Tuple[int, List[str]]]:
+    return [_extract_row(r) for r in rows]
+
+
+def iter_extracted(conn, query: str, params: Optional[dict] = None,
+                   chunk_size: int = STREAM_CHUNK,
+                   workers: Optional[int] = None) -> Iterator[List[Tuple[int, List[str]]]]:
+    """
+    (id, raw_json)을 반환하는 쿼리를 서버 커서로 chunk_size씩 읽으며 프로세스 풀에서 추출
+
+    한 chunk를 워커들이 파싱하는 동안 다음 chunk를 DB에서 읽음.
+    쓰기는 호출 측에서 다른 연결로 (서버 커서가 열린 연결에서 commit하면 커서가 닫힘).
+
+    Yields:
+        chunk별 [(id, [ISBN, ...])] (읽은 순서 유지)
+    """
+    workers = workers or os.cpu_count() or 1
+    result = conn.execution_options(stream_results=True, yield_per=chunk_size).execute(
+        text(query), params or {})
+
+    if workers <= 1:
+        for part in result.partitions(chunk_size):
+            yield _extract_batch([tuple(r) for r in part])
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = None
+        for part in result.partitions(chunk_size):
+            rows = [tuple(r) for r in part]
+            step = max(1, -(-len(rows) // workers))
+            futures = [pool.submit(_extract_batch, rows[i:i + step]) for i in range(0, len(rows), step)]
+            if pending is not None:
+                yield [pair for f in pending for pair in f.result()]
+            pending = futures
+        if pending is not None:
+            yield [pair for f in pending for pair in f.result()]
@@ -0,0 +1,143 @@
+"""
+도서 제목 역색인 (상품명 → books 후보 순위)
+==========================================
+books 제목을 정규화(Book.normalize_title, 연도 제거)한 뒤 문자 bigram 단위로 역색인.
+상품명은 _clean_product_name으로 정제한 같은 방식의 bigram으로 조회하고,
+IDF 가중 Dice 유사도로 후보를 점수화.
+
+- 띄어쓰기 차이("수학의바이블" / "수학의 바이블")에 강함 (bigram은 토큰 안에서만 생성)
+- 흔한 bigram(문제집, 수학 등)은 가중치가 낮아 점수를 지배하지 못함
+- 연도가 양쪽에 있는데 다르면 감점 (연도별 개정판은 ISBN이 다름)
+- 1위와 2위가 다른 ISBN인데 점수 차가 작으면 모호한 것으로 보고 매칭하지 않음
+
+실행당 한 번 build → 리스팅 수만 건 조회도 메모리 안에서 처리.
+"""
+import math
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from app.models.book import Book
+
+_TOKEN_RE = re.compile(r"[0-9a-z가-힣]+")
+
+# 후보 생성에 쓰는 가장 드문 bigram 수 (나머지는 점수 계산에만 사용)
+CANDIDATE_GRAMS = 8
+# 매칭 인정 최소 점수 / 1·2위 최소 점수 차
+MIN_SCORE = 0.6
+MIN_MARGIN = 0.05
+# 연도 불일치 감점 배율
+YEAR_MISMATCH_PENALTY = 0.5
+
+
+class TitleMatch(NamedTuple):
+    isbn: str
+    title: str
+    score: float
+
+
+def title_grams(text: str) -> Set[str]:
+    """소문자 토큰별 문자 bigram (1글자 토큰은 그대로: 상/하/1/2 등)"""
+    grams = set()
+    for tok in _TOKEN_RE.findall(text.lower()):
+        if len(tok) == 1:
+            grams.add(tok)
+        else:
+            grams.update(tok[i:i + 2] for i in range(len(tok) - 1))
+    return grams
+
+
+class TitleIndex:
+    """books 제목 bigram 역색인"""
+
+    def __init__(self):
+        self._isbns: List[str] = []
+        self._titles: List[str] = []
+        self._years: List[Optional[int]] = []
+        self._grams: List[Set[str]] = []
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        self._idf: Dict[str, float] = {}
+        self._weights: List[float] = []
+
+    def __len__(self):
+        return len(self._isbns)
+
+    def add(self, isbn: str, title: str, year: Optional[int] = None):
+        """도서 1건 추가 (추가 후 finalize() 필요)"""
+        year = year or Book.extract_year(title)
+        grams = title_grams(Book.normalize_title(title, year))
+        if not grams:
+            return
+        doc = len(self._isbns)
+        self._isbns.append(isbn)
+        self._titles.append(title)
+        self._years.append(year)
+        self._grams.append(grams)
+        for g in grams:
+            self._postings[g].append(doc)
+
+    def finalize(self) -> "TitleIndex":
+        """IDF / 문서 가중치 계산"""
+        n = len(self._isbns)
+        self._idf = {g: math.log(1 + n / len(docs)) for g, docs in self._postings.items()}
+        self._weights = [sum(self._idf[g] for g in grams) for grams in self._grams]
+        return self
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[str, str, Optional[int]]]) -> "TitleIndex":
+        """(isbn, title, year) 목록으로 생성"""
+        index = cls()
+        for isbn, title, year in rows:
+            if isbn and title:
+                index.add(isbn, title, year)
+        return index.finalize()
+
+    @classmethod
+    def from_books(cls, conn) -> "TitleIndex":
+        """books 테이블 전체로 생성 (conn: Connection 또는 Session)"""
+        from sqlalchemy import text
+        rows = conn.execute(text(
+            "SELECT isbn, title, year FROM books WHERE isbn IS NOT NULL AND title IS NOT NULL"
+        )).fetchall()
+        return cls.from_rows(rows)
+
+    def search(self, product_name: str, limit: int = 5) -> List[TitleMatch]:
+        """상품명 → 점수순 후보 (점수 0~1)"""
+        # 순환 import 방지 (isbn_filler가 이 모듈을 사용)
+        from app.services.isbn_filler import _clean_product_name
+
+        year = Book.extract_year(product_name)
+        query = title_grams(_clean_product_name(product_name))
+        # 괄호 속 짧은 구분자(상/하/1/2 등)는 정제 시 사라지므로 따로 추가
+        for part in re.findall(r"\(([^)]{1,3})\)", product_name):
+            query |= title_grams(part)
+        query = {g for g in query if g in self._idf}
+        if not query:
+            return []
+
+        q_weight = sum(self._idf[g] for g in query)
+        rare = sorted(query, key=lambda g: len(self._postings[g]))[:CANDIDATE_GRAMS]
+        candidates = set()
+        for g in rare:
+            candidates.update(self._postings[g])
+
+        scored = []
+        for doc in candidates:
+            common = sum(self._idf[g] for g in query & self._grams[doc])
+            score = 2 * common / (q_weight + self._weights[doc])
+            if year and self._years[doc] and self._years[doc] != year:
+                score *= YEAR_MISMATCH_PENALTY
+            scored.append((score, doc))
+        scored.sort(key=lambda x: (-x[0], x[1]))
+        return [TitleMatch(self._isbns[d], self._titles[d], round(s, 4)) for s, d in scored[:limit]]
+
+    def best_match(self, product_name: str, min_score: float = MIN_SCORE,
+                   min_margin: float = MIN_MARGIN) -> Optional[TitleMatch]:
+        """확실한 1위만 반환 (점수 미달 / 다른 ISBN과 근소한 차이면 None)"""
+        matches = self.search(product_name, limit=2)
+        if not matches or matches[0].score < min_score:
+            return None
+        if len(matches) > 1 and matches[1].isbn != matches[0].isbn \
+                and matches[0].score - matches[1].score < min_margin:
+            return None
+        return matches[0]
@@ -0,0 +1,167 @@
+"""
+제목/상품명 trigram 유사도 검색 (pg_trgm)
+=========================================
+books.title / listings.product_name에 gin_trgm_ops 인덱스를 두고,
+유사도 상위 k건을 Postgres 안에서 인덱스로 조회.
+
+- `%` 연산자: pg_trgm.similarity_threshold 이상만 (인덱스 사용) → 쿼리마다 트랜잭션 단위로 설정
+- 같은 GIN 인덱스가 LIKE '%검색어%' 부분일치도 가속 (상품 목록 검색)
+- PostgreSQL이 아닌 DB(로컬 SQLite 테스트)는 같은 방식의 trigram 유사도를 Python에서 계산
+
+마이그레이션: scripts/supabase_add_trgm_indexes.sql (또는 ensure_trgm_indexes)
+"""
+import logging
+import re
+from typing import List, NamedTuple, Optional, Set
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+CREATE_EXTENSION_SQL = "CREATE EXTENSION IF NOT EXISTS pg_trgm"
+
+CREATE_INDEXES_SQL = [
+    "CREATE INDEX IF NOT EXISTS ix_books_title_trgm ON books USING gin (title gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_listings_product_name_trgm ON listings USING gin (product_name gin_trgm_ops)",
+]
+
+# 기본 유사도 하한 (pg_trgm 기본값과 동일)
+DEFAULT_THRESHOLD = 0.3
+
+_WORD_RE = re.compile(r"[0-9a-z가-힣]+")
+
+
+class SimilarRow(NamedTuple):
+    id: int
+    name: str
+    isbn: Optional[str]
+    account_id: Optional[int]
+    score: float
+
+
+def _is_postgres(conn) -> bool:
+    """Connection(.dialect) / Session(.get_bind()) 모두 지원"""
+    dialect = getattr(conn, "dialect", None) or conn.get_bind().dialect
+    return dialect.name == "postgresql"
+
+
+def has_trgm(conn) -> bool:
+    """pg_trgm 확장 설치 여부 (PostgreSQL이 아니면 False)"""
+    if not _is_postgres(conn):
+        return False
+    return conn.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")).first() is not None
+
+
+def ensure_trgm_indexes(conn) -> bool:
+    """pg_trgm 확장 + trigram 인덱스 생성 (PostgreSQL이 아니면 아무것도 안 함)"""
+    if not _is_postgres(conn):
+        return False
+    conn.execute(text(CREATE_EXTENSION_SQL))
+    for idx_sql in CREATE_INDEXES_SQL:
+        conn.execute(text(idx_sql))
+    return True
+
+
+def trigrams(value: str) -> Set[str]:
+    """pg_trgm show_trgm()과 같은 방식: 단어별 앞 공백 2개 + 뒤 공백 1개로 감싼 3-gram"""
+    grams = set()
+    for word in _WORD_RE.findall((value or "").lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def trigram_similarity(a: str, b: str) -> float:
+    """pg_trgm similarity()의 Python 구현 (공통 trigram / 전체 trigram)"""
+    ga, gb = trigrams(a), trigrams(b)
+    if not ga or not gb:
+        return 0.0
+    return len(ga & gb) / len(ga | gb)
+
+
+def _set_threshold(conn, threshold: float):
+    # set_config(..., true): 현재 트랜잭션에서만 적용
+    conn.execute(text("SELECT set_config('pg_trgm.similarity_threshold', :t, true)"),
+                 {"t": str(threshold)})
+
+
+def _python_top_k(rows, query: str, limit: int, threshold: float) -> List[SimilarRow]:
+    scored = []
+    for r in rows:
+        score = trigram_similarity(query, r[1])
+        if score >= threshold:
+            scored.append(SimilarRow(r[0], r[1], r[2], r[3], round(score, 4)))
+    scored.sort(key=lambda s: (-s.score, s.id))
+    return scored[:limit]
+
+
+def similar_books(conn, query: str, limit: int = 5,
+                  threshold: float = DEFAULT_THRESHOLD) -> List[SimilarRow]:
+    """
+    제목 유사도 상위 books (id, title, isbn, None, score)
+
+    Args:
+        conn: Connection 또는 Session
+        query: 검색할 상품명/제목
+        threshold: 유사도 하한 (0~1)
+    """
+    if not query:
+        return []
+    if not _is_postgres(conn):
+        rows = conn.execute(text(
+            "SELECT id, title, isbn, NULL FROM books WHERE title IS NOT NULL"
+        )).fetchall()
+        return _python_top_k(rows, query, limit, threshold)
+
+    _set_threshold(conn, threshold)
+    rows = conn.execute(text("""
+        SELECT id, title, isbn, NULL, similarity(title, :q) AS score
+        FROM books
+        WHERE title % :q
+        ORDER BY score DESC, id
+        LIMIT :limit
+    """), {"q": query, "limit": limit}).fetchall()
+    return [SimilarRow(r[0], r[1], r[2], r[3], round(float(r[4]), 4)) for r in rows]
+
+
+def similar_listings(conn, query: str, limit: int = 5,
+                     threshold: float = DEFAULT_THRESHOLD,
+                     account_id: Optional[int] = None,
+                     exclude_account_id: Optional[int] = None,
+                     with_isbn: bool = False) -> List[SimilarRow]:
+    """
+    상품명 유사도 상위 listings (id, product_name, isbn, account_id, score)
+
+    Args:
+        account_id: 해당 계정만
+        exclude_account_id: 해당 계정 제외 (다른 계정에서 ISBN 복사 등)
+        with_isbn: ISBN이 있는 리스팅만
+    """
+    if not query:
+        return []
+    where = ["product_name IS NOT NULL"]
+    params = {"q": query, "limit": limit}
+    if account_id is not None:
+        where.append("account_id = :aid")
+        params["aid"] = account_id
+    if exclude_account_id is not None:
+        where.append("account_id != :xaid")
+        params["xaid"] = exclude_account_id
+    if with_isbn:
+        where.append("isbn IS NOT NULL AND isbn != ''")
+
+    if not _is_postgres(conn):
+        rows = conn.execute(text(
+            f"SELECT id, product_name, isbn, account_id FROM listings WHERE {' AND '.join(where)}"
+        ), params).fetchall()
+        return _python_top_k(rows, query, limit, threshold)
+
+    _set_threshold(conn, threshold)
+    rows = conn.execute(text(f"""
+        SELECT id, product_name, isbn, account_id, similarity(product_name, :q) AS score
+        FROM listings
+        WHERE product_name % :q AND {' AND '.join(where)}
+        ORDER BY score DESC, id
+        LIMIT :limit
+    """), params).fetchall()
+    return [SimilarRow(r[0], r[1], r[2], r[3], round(float(r[4]), 4)) for r in rows]
@@ -13,6 +13,8 @@ from typing import List, Dict, Optional, Callable
 from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
+from app.services.trigram_search import similar_listings
+
 logger = logging.getLogger(__name__)
 
 # 프로젝트 루트
@@ -161,7 +163,8 @@ class WingSyncBase:
 
 
 def match_listing(conn, account_id: int, vendor_item_id=None,
-                  coupang_product_id=None, product_name: str = None) -> Optional[int]:
+                  coupang_product_id=None, product_name: str = None,
+                  fuzzy_threshold: Optional[float] = None) -> Optional[int]:
     """
     3-level listing 매칭: vendor_item_id → coupang_product_id → product_name
 
@@ -171,6 +174,8 @@ def match_listing(conn, account_id: int, vendor_item_id=None,
         vendor_item_id: WING vendor item ID (가장 정확)
         coupang_product_id: 쿠팡 상품 ID (seller_product_id)
         product_name: 상품명 (최후 수단)
+        fuzzy_threshold: 지정 시 상품명 정확 매칭 실패하면 trigram 유사도 매칭
+            (해당 계정 내 1위가 이 값 이상이고 2위와 동점이 아닐 때만)
 
     Returns:
         listings.id 또는 None
@@ -196,4 +201,10 @@ def match_listing(conn, account_id: int, vendor_item_id=None,
         ), {"aid": account_id, "name": product_name}).fetchone()
         if row:
             return row[0]
+        # 4차: 상품명 유사도 (pg_trgm 인덱스)
+        if fuzzy_threshold is not None:
+            similar = similar_listings(conn, product_name, limit=2,
+                                       threshold=fuzzy_threshold, account_id=account_id)
+            if similar and (len(similar) == 1 or similar[0].score > similar[1].score):
+                return similar[0].id
     return None
@@ -5,14 +5,18 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+import asyncio
+import httpx
 import requests
-from typing import List, Dict, Optional
-from datetime import datetime
+from typing import Iterable, List, Dict, Optional
+from datetime import date, datetime
 import logging
 from urllib.parse import quote
 
 # Book 모델의 유틸리티 메서드 사용
 from app.models.book import Book
+from crawlers.aladin_key_pool import AladinKeyPool, QuotaExhausted
+from crawlers.http_cache import DEFAULT_TTL, HttpCache
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -27,19 +31,165 @@ class AladinAPICrawler:
 
     BASE_URL = "http://www.aladin.co.kr/ttb/api/"
 
-    def __init__(self, ttb_key: str = None):
+    # ISBN 조회 결과 캐시 기간 (도서 메타데이터는 거의 바뀌지 않음)
+    LOOKUP_TTL = DEFAULT_TTL
+
+    def __init__(self, ttb_key: str = None, key_pool: AladinKeyPool = None,
+                 cache: HttpCache = None, search_ttl: float = 0):
         """
         Args:
             ttb_key: 알라딘 TTBKey (발급 필요)
                     발급: https://www.aladin.co.kr/ttb/wblog_manage.aspx
+            key_pool: 여러 키 + 속도 제한 공유 풀 (지정 시 ttb_key 대신 사용)
+            cache: 응답 디스크 캐시 (None이면 HttpCache.shared())
+            search_ttl: 키워드 검색 결과 캐시 기간(초). 0이면 캐시 안 함
+                        (신간/판매지수 수집은 항상 최신 결과가 필요해서 기본 0)
         """
-        self.ttb_key = ttb_key
+        # 단일 키는 속도 제한 없이 (호출 측 대기 방식 유지)
+        self.key_pool = key_pool or AladinKeyPool([ttb_key or ""], rate_per_key=0)
+        self.ttb_key = ttb_key or (self.key_pool.keys[0] if self.key_pool.keys else None)
+        self._cache = cache
+        self.search_ttl = search_ttl
 
         if not self.ttb_key:
             logger.warning("TTBKey가 없습니다. 발급받으세요: https://www.aladin.co.kr/ttb/wblog_manage.aspx")
 
         self.session = requests.Session()
 
+    @property
+    def cache(self) -> HttpCache:
+        if self._cache is None:
+            self._cache = HttpCache.shared()
+        return self._cache
+
+    def _cache_get(self, endpoint: str, params: Dict, ttl: float) -> Optional[Dict]:
+        if not ttl:
+            return None
+        hit, data = self.cache.get(f"aladin:{endpoint}", params)
+        return data if hit else None
+
+    def _cache_set(self, endpoint: str, params: Dict, data: Dict, ttl: float):
+        """정상 응답만 저장 (오류 응답 제외, 결과 없음은 negative 기간)"""
+        if not ttl or "errorCode" in data:
+            return
+        if not data.get("item"):
+            ttl = min(ttl, self.cache.negative_ttl)
+        self.cache.set(f"aladin:{endpoint}", params, data, ttl=ttl)
+
+    def _request(self, endpoint: str, params: Dict, ttl: float = 0) -> Dict:
+        """
+        API 호출 (풀에서 키 선택, 일일 한도 초과 시 다음 키로 재시도)
+
+        Args:
+            ttl: 캐시 기간(초). 0이면 캐시를 거치지 않음
+
+        Raises:
+            QuotaExhausted: 모든 키 한도 초과
+        """
+        cached = self._cache_get(endpoint, params, ttl)
+        if cached is not None:
+            return cached
+        while True:
+            key = self.key_pool.acquire()
+            response = self.session.get(
+                f"{self.BASE_URL}{endpoint}", params={**params, "ttbkey": key}, timeout=30,
+            )
+            response.raise_for_status()
+            data = response.json()
+            if self.key_pool.is_quota_error(data):
+                self.key_pool.mark_exhausted(key)
+                continue
+            self._cache_set(endpoint, params, data, ttl)
+            return data
+
+    async def _request_async(self, client: httpx.AsyncClient, endpoint: str, params: Dict,
+                             ttl: float = 0) -> Dict:
+        """_request()의 코루틴 버전"""
+        cached = self._cache_get(endpoint, params, ttl)
+        if cached is not None:
+            return cached
+        while True:
+            key = await self.key_pool.acquire_async()
+            response = await client.get(
+                f"{self.BASE_URL}{endpoint}", params={**params, "ttbkey": key}, timeout=30,
+            )
+            response.raise_for_status()
+            data = response.json()
+            if self.key_pool.is_quota_error(data):
+                self.key_pool.mark_exhausted(key)
+                continue
+            self._cache_set(endpoint, params, data, ttl)
+            return data
+
+    @staticmethod
+    def _lookup_params(isbn: str) -> Dict:
+        """ItemLookUp 파라미터 (search_by_isbn / lookup_items 공통 → 캐시 공유)"""
+        return {
+            "itemIdType": "ISBN",
+            "ItemId": isbn,
+            "Cover": "Big",
+            "output": "js",
+            "Version": "20131101",
+        }
+
+    async def _lookup_items_async(self, isbns: List[str], concurrency: int) -> Dict[str, Optional[Dict]]:
+        results: Dict[str, Optional[Dict]] = {}
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        quota_out = False
+
+        async def lookup(client: httpx.AsyncClient, isbn: str):
+            nonlocal quota_out
+            async with semaphore:
+                if quota_out:
+                    return
+                try:
+                    data = await self._request_async(
+                        client, "ItemLookUp.aspx", self._lookup_params(isbn), ttl=self.LOOKUP_TTL,
+                    )
+                except QuotaExhausted:
+                    quota_out = True
+                    return
+                except Exception as e:
+                    logger.warning(f"ISBN 조회 오류 ({isbn}): {e}")
+                    results[isbn] = None
+                    return
+                items = data.get("item") or []
+                results[isbn] = items[0] if items else None
+
+        async with httpx.AsyncClient() as client:
+            await asyncio.gather(*(lookup(client, isbn) for isbn in isbns))
+        if quota_out:
+            logger.warning(f"모든 TTBKey 한도 초과 → {len(isbns) - len(results)}건 미조회")
+        return results
+
+    def lookup_items(self, isbns: Iterable[str], concurrency: int = 8,
+                     cache_only: bool = False) -> Dict[str, Optional[Dict]]:
+        """
+        ISBN 여러 개를 동시에 조회 (캐시 우선, 나머지는 비동기 + 키 풀의 속도 제한)
+
+        Args:
+            isbns: 조회할 ISBN 목록
+            concurrency: 동시 요청 수
+            cache_only: True면 캐시에 있는 것만 반환 (API 호출 없음)
+
+        Returns:
+            {isbn: 알라딘 원본 item dict 또는 None(결과 없음/오류)}
+            모든 키가 한도 초과되면 조회하지 못한 ISBN은 결과에서 빠짐
+        """
+        isbns = list(dict.fromkeys(i for i in isbns if i))
+        results: Dict[str, Optional[Dict]] = {}
+        to_fetch = []
+        for isbn in isbns:
+            data = self._cache_get("ItemLookUp.aspx", self._lookup_params(isbn), self.LOOKUP_TTL)
+            if data is None:
+                to_fetch.append(isbn)
+            else:
+                items = data.get("item") or []
+                results[isbn] = items[0] if items else None
+        if to_fetch and not cache_only:
+            results.update(asyncio.run(self._lookup_items_async(to_fetch, concurrency)))
+        return results
+
     def search_by_keyword(
         self,
         keyword: str,
@@ -47,6 +197,9 @@ class AladinAPICrawler:
         search_target: str = "Book",
         sort: str = "PublishTime",
         year_filter: int = None,
+        query_type: str = "Keyword",
+        since: date = None,
+        raise_errors: bool = False,
     ) -> List[Dict]:
         """
         키워드로 도서 검색
@@ -57,6 +210,11 @@ class AladinAPICrawler:
             search_target: Book, Foreign, Music, DVD, Used, eBook
             sort: 정렬 기준 (PublishTime=최신순, Accuracy=관련도, SalesPoint=판매량)
             year_filter: 출간 연도 필터 (예: 2025 → 2025~현재만 수집, None이면 필터 없음)
+            query_type: Keyword(제목+저자), Title, Author, Publisher
+            since: 이 날짜 이전 출간 도서 제외 (증분 수집용 기준일).
+                   최신순(PublishTime)이면 도달 즉시 페이지 조회 중단
+            raise_errors: True면 요청 오류를 빈 결과로 바꾸지 않고 그대로 raise
+                          (호출 측이 "결과 없음"만 캐시할 때)
 
         Returns:
             도서 정보 리스트
@@ -69,14 +227,16 @@ class AladinAPICrawler:
         start = 1
         max_per_page = 50  # API 최대값
 
+        # 출간일 하한: 연도 필터와 증분 기준일 중 늦은 쪽
+        cutoff = date(year_filter, 1, 1) if year_filter else None
+        if since and (cutoff is None or since > cutoff):
+            cutoff = since
+
         while len(products) < max_results:
             try:
-                url = f"{self.BASE_URL}ItemSearch.aspx"
-
                 params = {
-                    "ttbkey": self.ttb_key,
                     "Query": keyword,
-                    "QueryType": "Keyword",
+                    "QueryType": query_type,
                     "SearchTarget": search_target,
                     "Sort": sort,
                     "Start": start,
@@ -88,10 +248,7 @@ class AladinAPICrawler:
 
                 logger.info(f"알라딘 API 요청: {keyword} (페이지 {start})")
 
-                response = self.session.get(url, params=params, timeout=30)
-                response.raise_for_status()
-
-                data = response.json()
+                data = self._request("ItemSearch.aspx", params, ttl=self.search_ttl)
 
                 if "item" not in data or not data["item"]:
                     logger.info("더 이상 결과가 없습니다.")
@@ -105,9 +262,9 @@ class AladinAPICrawler:
                     if not product:
                         continue
 
-                    # 연도 필터: publish_date가 있으면 기준 연도 이전이면 스킵
-                    if year_filter and product.get("publish_date"):
-                        if product["publish_date"].year < year_filter:
+                    # 출간일 필터: publish_date가 있으면 기준일 이전이면 스킵
+                    if cutoff and product.get("publish_date"):
+                        if product["publish_date"] < cutoff:
                             # 최신순 정렬이면 이후는 더 오래된 것만 → 조기 종료
                             if sort == "PublishTime":
                                 early_stop = True
@@ -118,7 +275,7 @@ class AladinAPICrawler:
                     logger.info(f"수집: {product['title'][:40]}")
 
                 if early_stop:
-                    logger.info(f"{year_filter}년 이전 도서 도달, 조기 종료")
+                    logger.info(f"{cutoff} 이전 도서 도달, 조기 종료")
                     break
 
                 if len(items) < max_per_page:
@@ -126,7 +283,11 @@ class AladinAPICrawler:
 
                 start += len(items)
 
+            except QuotaExhausted:
+                raise
             except Exception as e:
+                if raise_errors:
+                    raise
                 logger.error(f"API 요청 오류: {e}")
                 break
 
@@ -137,7 +298,8 @@ class AladinAPICrawler:
         self,
         category_id: int = 0,
         max_results: int = 200,
-        publisher_names: List[str] = None
+        publisher_names: List[str] = None,
+        since: date = None,
     ) -> List[Dict]:
         """
         알라딘 ItemList API로 신간 도서 수집
@@ -146,6 +308,8 @@ class AladinAPICrawler:
             category_id: 카테고리 ID (0=전체)
             max_results: 최대 수집 수 (API 한계: 1000)
             publisher_names: 필터링할 출판사 이름 리스트 (None이면 전체)
+            since: 이 날짜 이전 출간 도서 제외 (증분 수집용 기준일).
+                   한 페이지가 전부 기준일 이전이면 페이지 조회 중단
 
         Returns:
             출판사 필터링된 신간 도서 리스트
@@ -160,10 +324,7 @@ class AladinAPICrawler:
 
         while len(all_items) < max_results:
             try:
-                url = f"{self.BASE_URL}ItemList.aspx"
-
                 params = {
-                    "ttbkey": self.ttb_key,
                     "QueryType": "ItemNewAll",
                     "SearchTarget": "Book",
                     "Start": start,
@@ -177,22 +338,25 @@ class AladinAPICrawler:
 
                 logger.info(f"알라딘 신간 API 요청 (페이지 {start // max_per_page + 1})")
 
-                response = self.session.get(url, params=params, timeout=30)
-                response.raise_for_status()
-
-                data = response.json()
+                data = self._request("ItemList.aspx", params)
 
                 if "item" not in data or not data["item"]:
                     logger.info("더 이상 신간이 없습니다.")
                     break
 
                 items = data["item"]
+                page_has_recent = False
 
                 for item in items:
                     product = self._parse_item(item)
                     if not product:
                         continue
 
+                    # 증분 기준일 이전 출간 도서 제외
+                    if since and product.get("publish_date") and product["publish_date"] < since:
+                        continue
+                    page_has_recent = True
+
                     # 출판사 필터링
                     if publisher_names:
                         matched = any(
@@ -204,11 +368,17 @@ class AladinAPICrawler:
 
                     all_items.append(product)
 
+                if since and not page_has_recent:
+                    logger.info(f"{since} 이전 신간만 남음, 조기 종료")
+                    break
+
                 if len(items) < max_per_page:
                     break
 
                 start += len(items)
 
+            except QuotaExhausted:
+                raise
             except Exception as e:
                 logger.error(f"신간 API 요청 오류: {e}")
                 break
@@ -269,23 +439,9 @@ class AladinAPICrawler:
             return None
 
         try:
-            url = f"{self.BASE_URL}ItemLookUp.aspx"
-
-            params = {
-                "ttbkey": self.ttb_key,
-                "itemIdType": "ISBN",
-                "ItemId": isbn,
-                "Cover": "Big",
-                "output": "js",
-                "Version": "20131101"
-            }
-
             logger.info(f"알라딘 ISBN 검색: {isbn}")
 
-            response = self.session.get(url, params=params, timeout=30)
-            response.raise_for_status()
-
-            data = response.json()
+            data = self._request("ItemLookUp.aspx", self._lookup_params(isbn), ttl=self.LOOKUP_TTL)
 
             if "item" not in data or not data["item"]:
                 logger.warning(f"ISBN {isbn}을 찾을 수 없습니다.")
@@ -0,0 +1,154 @@
+"""알라딘 TTBKey 풀 + 요청 속도 제한
+
+여러 스레드/코루틴(또는 여러 크롤러)이 같은 풀을 공유하면
+- 키마다 초당 요청 수를 넘지 않도록 대기 (rate_per_key)
+- 키별 당일 호출 수를 세고, 일일 한도(daily_limit) 또는
+  한도 초과 응답(errorCode 10)이 나온 키는 그날 하루 제외 → 다음 키로 자동 전환
+- 날짜가 바뀌면 호출 수/제외 표시 자동 초기화
+
+키 목록: ALADIN_TTB_KEYS(쉼표 구분) → 없으면 ALADIN_TTB_KEY + 호출 측 기본 키
+한 프로세스 안에서는 AladinKeyPool.shared()로 크롤링/ISBN 채우기/CSV 생성이 같은 풀을 씀.
+"""
+import asyncio
+import os
+import threading
+import time
+import logging
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 알라딘 응답 errorCode: 일일 호출 한도 초과
+QUOTA_ERROR_CODE = 10
+
+# 키당 기본 초당 요청 수 (기존 순차 크롤링의 0.5초 간격과 같은 수준)
+DEFAULT_RATE_PER_KEY = 2.0
+
+# 알라딘 TTBKey 기본 일일 호출 한도
+DEFAULT_DAILY_LIMIT = 5000
+
+
+class QuotaExhausted(Exception):
+    """풀의 모든 키가 일일 한도 초과"""
+
+
+class AladinKeyPool:
+    """
+    스레드 안전한 TTBKey 풀
+
+    acquire()는 가장 빨리 쓸 수 있는 키를 골라 속도 제한만큼 대기 후 반환.
+    (코루틴에서는 acquire_async())
+    """
+
+    _shared: Optional["AladinKeyPool"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, keys: List[str], rate_per_key: float = DEFAULT_RATE_PER_KEY,
+                 daily_limit: Optional[int] = DEFAULT_DAILY_LIMIT):
+        keys = [k.strip() for k in keys if k and k.strip()]
+        self.keys = list(dict.fromkeys(keys))
+        self.interval = 1.0 / rate_per_key if rate_per_key > 0 else 0.0
+        self.daily_limit = daily_limit
+        self._next_at = {k: 0.0 for k in self.keys}   # 키별 다음 요청 가능 시각 (monotonic)
+        self._used = {k: 0 for k in self.keys}        # 키별 당일 호출 수
+        self._exhausted = set()
+        self._day = date.today()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, rate_per_key: float = DEFAULT_RATE_PER_KEY,
+                 fallback_keys: Sequence[str] = (), **kwargs) -> "AladinKeyPool":
+        """환경변수에서 키 목록 로드 (ALADIN_TTB_KEYS가 없으면 ALADIN_TTB_KEY + fallback_keys)"""
+        raw = os.getenv("ALADIN_TTB_KEYS", "")
+        keys = raw.split(",") if raw.strip() else []
+        if not keys:
+            keys = [os.getenv("ALADIN_TTB_KEY", ""), *fallback_keys]
+        return cls(keys, rate_per_key=rate_per_key, **kwargs)
+
+    @classmethod
+    def shared(cls) -> "AladinKeyPool":
+        """프로세스 공용 풀 (환경변수 기준, 처음 호출 시 생성)"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls.from_env()
+            return cls._shared
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _roll_day(self):
+        """날짜가 바뀌었으면 당일 호출 수/제외 표시 초기화 (lock 안에서 호출)"""
+        today = date.today()
+        if today != self._day:
+            self._day = today
+            self._used = {k: 0 for k in self.keys}
+            self._exhausted.clear()
+            logger.info("날짜 변경 → TTBKey 일일 한도 초기화")
+
+    def _live_keys(self) -> List[str]:
+        return [k for k in self.keys if k not in self._exhausted]
+
+    @property
+    def available(self) -> List[str]:
+        with self._lock:
+            self._roll_day()
+            return self._live_keys()
+
+    def usage(self) -> Dict[str, int]:
+        """키별 당일 호출 수"""
+        with self._lock:
+            self._roll_day()
+            return dict(self._used)
+
+    def _reserve(self) -> Tuple[str, float]:
+        """사용할 키와 대기 시간(초) 예약"""
+        with self._lock:
+            self._roll_day()
+            live = self._live_keys()
+            if not live:
+                raise QuotaExhausted("모든 TTBKey의 일일 한도가 초과되었습니다.")
+            key = min(live, key=self._next_at.__getitem__)
+            now = time.monotonic()
+            start = max(now, self._next_at[key])
+            self._next_at[key] = start + self.interval
+            self._used[key] += 1
+            if self.daily_limit and self._used[key] >= self.daily_limit:
+                # 이번 호출이 마지막 → 다음 요청부터 다른 키
+                self._exhausted.add(key)
+                logger.warning(f"TTBKey 당일 호출 {self._used[key]}회 도달 → 제외")
+        return key, start - now
+
+    def acquire(self) -> str:
+        """사용할 키 반환 (필요하면 속도 제한만큼 대기)"""
+        key, wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return key
+
+    async def acquire_async(self) -> str:
+        """acquire()의 코루틴 버전 (이벤트 루프를 막지 않고 대기)"""
+        key, wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return key
+
+    def mark_exhausted(self, key: str):
+        """일일 한도 초과 키 제외 (당일)"""
+        with self._lock:
+            self._roll_day()
+            if key in self._exhausted:
+                return
+            self._exhausted.add(key)
+            remaining = len(self.keys) - len(self._exhausted)
+        logger.warning(f"TTBKey 한도 초과 → 제외 (남은 키 {remaining}/{len(self.keys)})")
+
+    def reset(self):
+        """한도 초과 표시 초기화"""
+        with self._lock:
+            self._exhausted.clear()
+
+    @staticmethod
+    def is_quota_error(data) -> bool:
+        """알라딘 응답 JSON이 일일 한도 초과 오류인지"""
+        return isinstance(data, dict) and str(data.get("errorCode", "")) == str(QUOTA_ERROR_CODE)
@@ -0,0 +1,216 @@
+"""외부 조회(알라딘/교보) 응답 디스크 캐시
+
+SQLite 파일 하나에 (namespace, 정규화된 요청 파라미터) → JSON 응답을 저장.
+- TTL: 항목마다 만료 시각 저장, 만료된 항목은 없는 것으로 취급
+- 결과 없음(None)도 저장 (negative_ttl, 보통 더 짧게) → 없는 책을 매번 다시 조회하지 않음
+- 쓰기는 항목 단위 트랜잭션 (WAL) → 중간에 중단돼도 그때까지 조회한 결과는 남음
+- 요청 키에서 ttbkey 같은 인증값은 제외 → 어떤 키로 조회했든 같은 캐시
+
+기본 위치: data/cache/http_cache.sqlite3 (HTTP_CACHE_PATH 환경변수로 변경)
+
+사용법:
+    cache = HttpCache.shared()
+    hit, value = cache.get("aladin:ItemLookUp.aspx", {"ItemId": isbn})
+    cache.set("kyobo:search", {"keyword": kw}, isbn)          # isbn=None이면 negative
+    isbn = cache.get_or_fetch("kyobo:search", {"keyword": kw}, lambda: fetch(kw))
+    meta = cache.mapping("wing_csv:meta")                      # dict처럼 사용
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = Path(__file__).resolve().parent.parent / "data" / "cache" / "http_cache.sqlite3"
+
+DAY = 24 * 3600
+DEFAULT_TTL = 30 * DAY          # 도서 메타데이터는 거의 바뀌지 않음
+DEFAULT_NEGATIVE_TTL = 3 * DAY  # 결과 없음은 짧게 (신간 등록 반영)
+
+# 요청 키에서 제외할 파라미터 (인증/출력 형식)
+IGNORED_PARAMS = {"ttbkey", "output", "version"}
+
+
+def normalize_params(params: Dict[str, Any]) -> str:
+    """요청 파라미터 → 정규화된 문자열 (키 소문자 정렬, 값 공백 정리, 인증값 제외)"""
+    norm = {}
+    for k, v in params.items():
+        key = str(k).lower()
+        if key in IGNORED_PARAMS or v is None:
+            continue
+        norm[key] = " ".join(str(v).split())
+    return json.dumps(norm, ensure_ascii=False, sort_keys=True)
+
+
+class HttpCache:
+    """SQLite 기반 응답 캐시 (스레드 안전)"""
+
+    _shared: Optional["HttpCache"] = None
+    _shared_lock = threading.Lock()
+
+    CREATE_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS http_cache (
+        cache_key TEXT PRIMARY KEY,
+        namespace TEXT NOT NULL,
+        request TEXT NOT NULL,
+        value TEXT,
+        expires_at REAL NOT NULL,
+        created_at REAL NOT NULL
+    )
+    """
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_PATH,
+                 ttl: float = DEFAULT_TTL, negative_ttl: float = DEFAULT_NEGATIVE_TTL):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(self.CREATE_TABLE_SQL)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def shared(cls) -> "HttpCache":
+        """프로세스 공용 캐시 (처음 호출 시 생성)"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(os.getenv("HTTP_CACHE_PATH") or DEFAULT_PATH)
+            return cls._shared
+
+    @staticmethod
+    def make_key(namespace: str, params: Dict[str, Any]) -> Tuple[str, str]:
+        """(캐시 키 해시, 정규화된 요청 문자열)"""
+        request = normalize_params(params)
+        digest = hashlib.sha1(f"{namespace}\n{request}".encode("utf-8")).hexdigest()
+        return digest, request
+
+    def get(self, namespace: str, params: Dict[str, Any]) -> Tuple[bool, Any]:
+        """(적중 여부, 값) — 값 None은 negative 캐시"""
+        key, _ = self.make_key(namespace, params)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM http_cache WHERE cache_key = ?", (key,)
+            ).fetchone()
+        if row is None or row[1] < time.time():
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        return True, (json.loads(row[0]) if row[0] is not None else None)
+
+    def set(self, namespace: str, params: Dict[str, Any], value: Any, ttl: float = None):
+        """값 저장 (None이면 negative_ttl 적용)"""
+        if ttl is None:
+            ttl = self.ttl if value is not None else self.negative_ttl
+        if ttl <= 0:
+            return
+        key, request = self.make_key(namespace, params)
+        now = time.time()
+        payload = json.dumps(value, ensure_ascii=False, default=str) if value is not None else None
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO http_cache "
+                "(cache_key, namespace, request, value, expires_at, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, namespace, request, payload, now + ttl, now),
+            )
+
+    def set_many(self, namespace: str, items: Iterable[Tuple[Dict[str, Any], Any]],
+                 ttl: float = None) -> int:
+        """여러 항목을 한 트랜잭션으로 저장, 저장 건수 반환"""
+        now = time.time()
+        rows = []
+        for params, value in items:
+            item_ttl = ttl if ttl is not None else (self.ttl if value is not None else self.negative_ttl)
+            if item_ttl <= 0:
+                continue
+            key, request = self.make_key(namespace, params)
+            payload = json.dumps(value, ensure_ascii=False, default=str) if value is not None else None
+            rows.append((key, namespace, request, payload, now + item_ttl, now))
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO http_cache "
+                    "(cache_key, namespace, request, value, expires_at, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def mapping(self, namespace: str, ttl: float = None) -> "CacheMapping":
+        """namespace 하나를 문자열 키 dict처럼 쓰는 뷰"""
+        return CacheMapping(self, namespace, ttl)
+
+    def get_or_fetch(self, namespace: str, params: Dict[str, Any],
+                     fetch: Callable[[], Any], ttl: float = None) -> Any:
+        """
+        캐시에 있으면 반환, 없으면 fetch() 결과를 저장 후 반환
+
+        fetch()가 예외를 던지면 저장하지 않음 (네트워크 오류를 negative로 남기지 않도록)
+        """
+        hit, value = self.get(namespace, params)
+        if hit:
+            return value
+        value = fetch()
+        self.set(namespace, params, value, ttl=ttl)
+        return value
+
+    def purge_expired(self) -> int:
+        """만료 항목 삭제, 삭제 건수 반환"""
+        with self._lock:
+            cur = self._conn.execute("DELETE FROM http_cache WHERE expires_at < ?", (time.time(),))
+        return cur.rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class CacheMapping:
+    """
+    HttpCache namespace의 dict 뷰 (키: 문자열, 값: JSON 직렬화 가능 값 또는 None)
+
+    기존 JSON 파일 캐시(dict)를 쓰던 코드를 그대로 두고 저장소만 바꿀 때 사용.
+    값을 넣을 때마다 바로 디스크에 기록되므로 별도 save 호출이 필요 없음.
+    """
+
+    def __init__(self, cache: HttpCache, namespace: str, ttl: float = None):
+        self.cache = cache
+        self.namespace = namespace
+        self.ttl = ttl
+
+    def __contains__(self, key: str) -> bool:
+        return self.cache.get(self.namespace, {"key": key})[0]
+
+    def __getitem__(self, key: str) -> Any:
+        hit, value = self.cache.get(self.namespace, {"key": key})
+        if not hit:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any):
+        self.cache.set(self.namespace, {"key": key}, value, ttl=self.ttl)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        hit, value = self.cache.get(self.namespace, {"key": key})
+        return value if hit else default
+
+    def update(self, items: Dict[str, Any]) -> int:
+        """여러 항목 일괄 저장 (한 트랜잭션)"""
+        return self.cache.set_many(
+            self.namespace, (({"key": k}, v) for k, v in items.items()), ttl=self.ttl,
+        )
@@ -0,0 +1,59 @@
+"""교보문고 검색 → ISBN (검색 페이지 data-bid)
+
+알라딘에서 못 찾은 상품명의 fallback 용도.
+결과(없음 포함)는 HttpCache에 저장 → 같은 키워드는 다시 요청하지 않음.
+실제 요청 사이에만 MIN_INTERVAL 간격 유지 (캐시 적중은 대기 없음).
+"""
+import re
+import threading
+import time
+from typing import Optional
+from urllib.parse import quote
+
+import requests
+
+from crawlers.http_cache import HttpCache
+
+SEARCH_URL = "https://search.kyobobook.co.kr/search?keyword={keyword}&target=total"
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "ko-KR,ko;q=0.9,en;q=0.8",
+}
+ISBN_PATTERN = re.compile(r"^97[89]\d{10}$")
+CACHE_NAMESPACE = "kyobo:search"
+MIN_INTERVAL = 0.5  # 교보 rate limit (초)
+
+_lock = threading.Lock()
+_last_request = 0.0
+
+
+def _throttle():
+    global _last_request
+    with _lock:
+        wait = _last_request + MIN_INTERVAL - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        _last_request = time.monotonic()
+
+
+def fetch_isbn(keyword: str) -> Optional[str]:
+    """교보 검색 페이지 첫 결과 ISBN (네트워크 오류는 예외 그대로)"""
+    _throttle()
+    r = requests.get(SEARCH_URL.format(keyword=quote(keyword)), headers=HEADERS, timeout=15)
+    r.raise_for_status()
+    m = re.search(r'data-bid="(\d{13})"', r.text)
+    if m and ISBN_PATTERN.match(m.group(1)):
+        return m.group(1)
+    return None
+
+
+def search_isbn(keyword: str, cache: HttpCache = None, raise_errors: bool = False) -> Optional[str]:
+    """교보문고 검색 → ISBN (캐시 우선, 오류 시 None — raise_errors=True면 예외 그대로)"""
+    cache = cache or HttpCache.shared()
+    try:
+        return cache.get_or_fetch(CACHE_NAMESPACE, {"keyword": keyword}, lambda: fetch_isbn(keyword))
+    except Exception:
+        if raise_errors:
+            raise
+        return None
@@ -8,6 +8,7 @@
     python scripts/auto_crawl.py          # 데몬 모드 (새벽 3시 자동 실행)
     python scripts/auto_crawl.py --now    # 즉시 실행 (테스트용)
     python scripts/auto_crawl.py --hour 4 # 새벽 4시로 변경
+    python scripts/auto_crawl.py --now --full  # 기준점 무시하고 전체 재검색
 """
 import sys
 import os
@@ -47,6 +48,7 @@ logger.addHandler(console_handler)
 CRAWL_HOUR = 3          # 기본 실행 시각 (새벽 3시)
 MAX_PER_PUBLISHER = 50   # 출판사당 최대 검색 수
 YEAR_FILTER = 2025       # 2025년 이후 도서만
+FULL_CRAWL_WEEKDAY = 6   # 전체 재검색 요일 (일요일, 판매지수 갱신) — 그 외 요일은 증분 수집
 CHECK_INTERVAL = 30      # 시간 체크 간격 (초)
 
 # 안전장치 - CLI에서 재정의 가능
@@ -86,8 +88,12 @@ def log_to_obsidian(message: str, title: str = "자동 크롤링"):
             f.write(header + entry)
 
 
-def run_crawl():
-    """크롤링 + 마진 분석 실행"""
+def run_crawl(full: bool = None):
+    """크롤링 + 마진 분석 실행
+
+    Args:
+        full: True면 전체 재검색, False면 증분 수집 (None이면 FULL_CRAWL_WEEKDAY 기준)
+    """
     from sqlalchemy.orm import sessionmaker
     from app.database import engine as _default_engine, init_db
     from scripts.franchise_sync import FranchiseSync
@@ -105,12 +111,17 @@ def run_crawl():
 
     sync = FranchiseSync(db=db)
 
+    if full is None:
+        full = start_time.weekday() == FULL_CRAWL_WEEKDAY
+
     try:
         # Step 1: 출판사별 키워드 검색 크롤링
-        logger.info("[1/5] 출판사별 크롤링 (year_filter=%d, max=%d/출판사)", YEAR_FILTER, MAX_PER_PUBLISHER)
+        logger.info("[1/5] 출판사별 크롤링 (year_filter=%d, max=%d/출판사, %s)",
+                    YEAR_FILTER, MAX_PER_PUBLISHER, "전체" if full else "증분")
         crawl_result = sync.crawl_by_publisher(
             max_per_publisher=MAX_PER_PUBLISHER,
             year_filter=YEAR_FILTER,
+            incremental=not full,
         )
         logger.info(
             "크롤링 결과: 검색 %d개, 신규 %d개, 스킵 %d개",
@@ -127,7 +138,7 @@ def run_crawl():
 
         # Step 3: 갭 분석 (계정별 미등록 도서)
         logger.info("[3/5] 갭 분석...")
-        gaps = sync.find_gaps()
+        gaps = sync.find_gaps(load_products=False)
         total_missing = sum(g["missing"] for g in gaps.values())
         logger.info("갭 분석: %d개 계정, 총 미등록 %d개", len(gaps), total_missing)
 
@@ -238,6 +249,7 @@ def main():
     parser.add_argument("--now", action="store_true", help="즉시 실행 (테스트용)")
     parser.add_argument("--hour", type=int, default=CRAWL_HOUR, help=f"실행 시각 (기본: {CRAWL_HOUR}시)")
     parser.add_argument("--confirm", action="store_true", help="안전장치: 실행 전 확인 (데몬 모드용)")
+    parser.add_argument("--full", action="store_true", help="증분 기준점 무시하고 전체 재검색 (--now와 함께)")
     parser.add_argument("--max-items", type=int, default=MAX_ITEMS_SAFETY,
                         help=f"1회 최대 처리 아이템 (기본: {MAX_ITEMS_SAFETY}, 0=무제한)")
     args = parser.parse_args()
@@ -257,7 +269,7 @@ def main():
 
     if args.now:
         logger.info("즉시 실행 모드")
-        result = run_crawl()
+        result = run_crawl(full=True if args.full else None)
         if result["success"]:
             print(f"\n자동 크롤링+등록 완료!")
             print(f"  검색: {result['searched']}개")
@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
-"""ISBN 통계 확인"""
+"""ISBN 통계 확인 (isbn_coverage 스냅샷, --refresh면 listings 재집계 후 출력)"""
 import sys
 import io
+import argparse
 from pathlib import Path
 
 # Windows cp949 인코딩 대응
@@ -14,15 +15,30 @@ project_root = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(project_root))
 
 from app.database import engine
-from sqlalchemy import text
+from app.services.isbn_coverage import coverage_totals, get_coverage, refresh_coverage
 
-conn = engine.connect()
+parser = argparse.ArgumentParser(description="ISBN 통계 확인")
+parser.add_argument("--refresh", action="store_true", help="스냅샷을 listings에서 다시 집계")
+args = parser.parse_args()
 
-total = conn.execute(text('SELECT COUNT(*) FROM listings')).scalar()
-with_isbn = conn.execute(text("SELECT COUNT(*) FROM listings WHERE isbn IS NOT NULL AND isbn != ''")).scalar()
+if args.refresh:
+    with engine.begin() as conn:
+        refresh_coverage(conn)
 
-print(f'총 상품: {total:,}개')
-print(f'ISBN 보유: {with_isbn:,}개 ({with_isbn/total*100:.2f}%)')
-print(f'ISBN 없음: {total-with_isbn:,}개')
+with engine.connect() as conn:
+    rows = get_coverage(conn, active_only=False)
 
-conn.close()
+if not rows:
+    print("커버리지 스냅샷이 없습니다. --refresh로 생성하세요.")
+    sys.exit(0)
+
+t = coverage_totals(rows)
+print(f'총 상품: {t["total"]:,}개')
+print(f'ISBN 보유: {t["with_isbn"]:,}개 ({t["pct"]:.2f}%)')
+print(f'ISBN 없음: {t["total"] - t["with_isbn"]:,}개')
+print(f'세트(복수 ISBN): {t["set_listings"]:,}개 / 검토 필요: {t["needs_review"]:,}개')
+if t["strategy_filled"]:
+    print("전략별 누적 채움: " + ", ".join(f"{k}={v:,}" for k, v in sorted(t["strategy_filled"].items())))
+updated = [r.updated_at for r in rows if r.updated_at]
+if updated:
+    print(f"기준 시각: {max(updated)}")
@@ -3,7 +3,11 @@
 
 같은 상품을 판매하는 다른 계정의 ISBN을 복사합니다.
 - 상품명 기반 매칭 (정규화 후 비교)
-- Jaccard 유사도 기반 (기본 80% 이상)
+- 후보 생성 (--engine)
+    lsh  : ISBN 보유 리스팅 전체를 MinHash/LSH로 색인 → 거의 선형 시간 (기본, 전체 실행용)
+           banding은 --similarity에서 후보 재현율 99% 이상이 되도록 자동 결정
+    trgm : 리스팅마다 pg_trgm 인덱스로 다른 계정 유사 상품명 상위 N건 (소량/특정 계정용)
+- 판정: 후보에만 정확한 Jaccard 유사도 (기본 80% 이상)
 """
 import sys
 import io
@@ -22,6 +26,14 @@ sys.path.insert(0, str(project_root))
 
 from sqlalchemy import text
 from app.database import get_db
+from app.services.isbn_coverage import refresh_coverage, with_isbn_counts
+from app.services.listing_isbns import replace_listing_isbns
+from app.services.minhash_lsh import MinHashLSH, jaccard
+from app.services.trigram_search import similar_listings
+
+# trigram 후보 조회 (Jaccard 판정 전 1차 필터, 느슨하게)
+CANDIDATE_LIMIT = 10
+CANDIDATE_THRESHOLD = 0.4
 
 
 def normalize_product_name(name: str) -> str:
@@ -44,28 +56,79 @@ def normalize_product_name(name: str) -> str:
     return normalized.strip()
 
 
+def name_tokens(name: str) -> set:
+    """상품명 → 정규화된 단어 집합"""
+    return set(normalize_product_name(name).split()) if name else set()
+
+
 def calculate_similarity(name1: str, name2: str) -> float:
     """두 상품명의 Jaccard 유사도 (0.0 ~ 1.0)"""
-    if not name1 or not name2:
-        return 0.0
+    return jaccard(name_tokens(name1), name_tokens(name2))
 
-    words1 = set(normalize_product_name(name1).split())
-    words2 = set(normalize_product_name(name2).split())
 
-    if not words1 or not words2:
-        return 0.0
+def similarity_bucket(similarity: float) -> str:
+    """유사도 → 5% 구간 라벨 ('80-85%', ..., '95-100%')"""
+    lo = min(int(similarity * 100) // 5 * 5, 95)
+    return f"{lo}-{lo + 5}%"
 
-    intersection = len(words1 & words2)
-    union = len(words1 | words2)
 
-    return intersection / union if union > 0 else 0.0
+def build_source_index(db, lsh: MinHashLSH = None, min_similarity: float = 0.8):
+    """
+    ISBN 보유 리스팅 전체 → (LSH 색인, {id: (토큰, 상품명, isbn, account_id)})
+
+    LSH banding은 min_similarity에서 후보 재현율이 RECALL_TARGET 이상이 되도록 결정
+    """
+    lsh = lsh or MinHashLSH.for_threshold(min_similarity)
+    sources = {}
+    rows = db.execute(text("""
+        SELECT id, product_name, isbn, account_id
+        FROM listings
+        WHERE isbn IS NOT NULL AND isbn != ''
+          AND product_name IS NOT NULL
+    """))
+    for sid, name, isbn, acc_id in rows:
+        tokens = name_tokens(name)
+        if lsh.add(sid, tokens):
+            sources[sid] = (tokens, name, isbn, acc_id)
+    return lsh, sources
+
+
+def find_best_lsh(lsh: MinHashLSH, sources: dict, product_name: str, acc_id: int,
+                  min_similarity: float):
+    """LSH 후보 중 다른 계정 + 최소 유사도 이상인 최고 유사 (유사도, 상품명, isbn, 후보 수)"""
+    tokens = name_tokens(product_name)
+    keys = lsh.query(tokens)
+    best = (0.0, None, None)
+    for sid in keys:
+        src_tokens, src_name, src_isbn, src_acc = sources[sid]
+        if src_acc == acc_id:
+            continue
+        similarity = jaccard(tokens, src_tokens)
+        if similarity > best[0] and similarity >= min_similarity:
+            best = (similarity, src_name, src_isbn)
+    return best + (len(keys),)
+
+
+def find_best_trgm(db, product_name: str, acc_id: int, min_similarity: float):
+    """pg_trgm 후보 중 다른 계정 + 최소 유사도 이상인 최고 유사 (유사도, 상품명, isbn, 후보 수)"""
+    sources = similar_listings(
+        db, product_name, limit=CANDIDATE_LIMIT, threshold=CANDIDATE_THRESHOLD,
+        exclude_account_id=acc_id, with_isbn=True,
+    )
+    best = (0.0, None, None)
+    for source in sources:
+        similarity = calculate_similarity(product_name, source.name)
+        if similarity > best[0] and similarity >= min_similarity:
+            best = (similarity, source.name, source.isbn)
+    return best + (len(sources),)
 
 
 def copy_isbn_from_other_accounts(
     dry_run: bool = False,
     limit: int = None,
     account_id: int = None,
-    min_similarity: float = 0.8
+    min_similarity: float = 0.8,
+    engine: str = "lsh",
 ):
     """다른 계정에서 ISBN 복사 (PostgreSQL 전용)"""
     db = next(get_db())
@@ -76,22 +139,13 @@ def copy_isbn_from_other_accounts(
     print(f"시작 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"모드: {'DRY RUN' if dry_run else 'LIVE'}")
     print(f"최소 유사도: {min_similarity * 100:.0f}%")
+    print(f"후보 생성: {engine}")
     if limit:
         print(f"제한: {limit}개")
     if account_id:
         print(f"계정: ID {account_id}")
     print()
 
-    # ISBN 있는 상품 전부 메모리에 로드 (비교용)
-    source_result = db.execute(text("""
-        SELECT product_name, isbn, account_id
-        FROM listings
-        WHERE isbn IS NOT NULL AND isbn != ''
-          AND product_name IS NOT NULL
-    """))
-    source_listings = source_result.fetchall()
-    print(f"참조 소스: {len(source_listings):,}개 (ISBN 보유)")
-
     # ISBN 없는 상품 조회
     query = """
         SELECT id, account_id, product_name
@@ -119,15 +173,23 @@ def copy_isbn_from_other_accounts(
         'total': len(candidates),
         'success': 0,
         'failed': 0,
-        'by_similarity': {
-            '80-85%': 0, '85-90%': 0, '90-95%': 0, '95-100%': 0
-        }
+        'candidates_checked': 0,
+        'by_similarity': {},
     }
 
     if stats['total'] == 0:
         print("ISBN이 없는 레코드가 없습니다.")
         return stats
 
+    account_ids = [account_id] if account_id else None
+    baseline = with_isbn_counts(db, account_ids)
+
+    if engine == "lsh":
+        lsh, sources = build_source_index(db, min_similarity=min_similarity)
+        print(f"참조 소스: {len(sources):,}개 (ISBN 보유, LSH 색인 {lsh.bands}×{lsh.rows}, "
+              f"{min_similarity * 100:.0f}% 후보 재현율 {lsh.recall_at(min_similarity) * 100:.2f}%)")
+        print()
+
     updated_listings = []
 
     for idx, row in enumerate(candidates, 1):
@@ -136,29 +198,17 @@ def copy_isbn_from_other_accounts(
         product_name = row[2]
 
         # 다른 계정에서 유사한 상품 찾기
-        best_isbn = None
-        best_similarity = 0.0
-        best_source_name = None
-
-        for source_name, source_isbn, source_acc_id in source_listings:
-            if source_acc_id == acc_id:
-                continue
-
-            similarity = calculate_similarity(product_name, source_name)
-            if similarity > best_similarity and similarity >= min_similarity:
-                best_similarity = similarity
-                best_isbn = source_isbn
-                best_source_name = source_name
+        if engine == "lsh":
+            best_similarity, best_source_name, best_isbn, checked = find_best_lsh(
+                lsh, sources, product_name, acc_id, min_similarity)
+        else:
+            best_similarity, best_source_name, best_isbn, checked = find_best_trgm(
+                db, product_name, acc_id, min_similarity)
+        stats['candidates_checked'] += checked
 
         if best_isbn:
-            if best_similarity >= 0.95:
-                stats['by_similarity']['95-100%'] += 1
-            elif best_similarity >= 0.90:
-                stats['by_similarity']['90-95%'] += 1
-            elif best_similarity >= 0.85:
-                stats['by_similarity']['85-90%'] += 1
-            else:
-                stats['by_similarity']['80-85%'] += 1
+            bucket = similarity_bucket(best_similarity)
+            stats['by_similarity'][bucket] = stats['by_similarity'].get(bucket, 0) + 1
 
             stats['success'] += 1
             updated_listings.append((listing_id, best_isbn, product_name, best_source_name, best_similarity))
@@ -180,11 +230,13 @@ def copy_isbn_from_other_accounts(
     print(f"총 처리: {stats['total']:,}개")
     print(f"성공: {stats['success']:,}개 ({stats['success']/stats['total']*100:.1f}%)")
     print(f"실패: {stats['failed']:,}개")
+    print(f"유사도 계산: {stats['candidates_checked']:,}쌍 (후보만)")
     print()
 
     if stats['success'] > 0:
         print("유사도 분포:")
-        for range_name, count in sorted(stats['by_similarity'].items(), reverse=True):
+        for range_name, count in sorted(stats['by_similarity'].items(),
+                                        key=lambda kv: int(kv[0].split('-')[0]), reverse=True):
             if count > 0:
                 print(f"   {range_name}: {count:4d}개 ({count/stats['success']*100:.1f}%)")
         print()
@@ -199,6 +251,7 @@ def copy_isbn_from_other_accounts(
                     text("UPDATE listings SET isbn = :isbn WHERE id = :id"),
                     {"isbn": isbn, "id": listing_id}
                 )
+                replace_listing_isbns(db, listing_id, isbn)
                 update_count += 1
 
                 if update_count % 100 == 0:
@@ -211,6 +264,10 @@ def copy_isbn_from_other_accounts(
 
         db.commit()
         print(f"완료: {update_count:,}개")
+
+        # 계정별 커버리지 스냅샷 갱신 (채움 수는 copy 전략으로 누적)
+        refresh_coverage(db, account_ids, strategy="copy", baseline=baseline)
+        db.commit()
     else:
         print("DRY RUN")
 
@@ -229,6 +286,8 @@ if __name__ == '__main__':
     parser.add_argument('--limit', type=int)
     parser.add_argument('--account', type=int)
     parser.add_argument('--similarity', type=float, default=0.8, help='최소 유사도 (0.0~1.0)')
+    parser.add_argument('--engine', choices=['lsh', 'trgm'], default='lsh',
+                        help='후보 생성 방식 (lsh: 전체 일괄, trgm: 리스팅별 pg_trgm 조회)')
 
     args = parser.parse_args()
 
@@ -237,7 +296,8 @@ if __name__ == '__main__':
             dry_run=args.dry_run,
             limit=args.limit,
             account_id=args.account,
-            min_similarity=args.similarity
+            min_similarity=args.similarity,
+            engine=args.engine,
         )
 
         if stats['total'] > 0:
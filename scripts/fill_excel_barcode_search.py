@@ -17,7 +17,6 @@
 import os
 import re
 import sys
-import time
 import io
 from pathlib import Path
 
@@ -35,6 +34,11 @@ load_dotenv()
 
 from sqlalchemy import text, create_engine
 
+from app.services.excel_reader import read_frame
+from crawlers.aladin_key_pool import AladinKeyPool, QuotaExhausted
+from crawlers.http_cache import DAY
+from crawlers import kyobo_search
+
 # ── 설정 ──
 EXCEL_FILES = {
     "007-book": "C:/Users/MSI/Desktop/Coupong/007-book.xlsx",
@@ -46,6 +50,7 @@ EXCEL_FILES = {
 SHEET = "Template"
 HEADER_ROW = 3
 ISBN_PATTERN = re.compile(r"^97[89]\d{10}$")
+SEARCH_TTL = 14 * DAY  # 알라딘 검색 응답 캐시 기간
 
 STOP_WORDS = {
     "세트", "set", "권", "원", "년", "판", "개정", "개정판", "최신", "신판",
@@ -80,12 +85,6 @@ NOISE_PATTERNS = [
     (r"//+.*$", ""),
 ]
 
-HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-    "Accept-Language": "ko-KR,ko;q=0.9,en;q=0.8",
-}
-
 
 # ════════════════════════════════════════
 # DB 로드
@@ -158,58 +157,34 @@ def clean_for_search(name: str) -> str:
     return s[:60]
 
 
-def search_aladin(keyword: str, ttb_key: str) -> str | None:
-    """알라딘 API로 ISBN 검색 (1회 호출)"""
-    import requests
-    try:
-        r = requests.get(
-            "http://www.aladin.co.kr/ttb/api/ItemSearch.aspx",
-            params={
-                "ttbkey": ttb_key, "Query": keyword, "QueryType": "Keyword",
-                "SearchTarget": "Book", "MaxResults": 3,
-                "output": "js", "Version": "20131101",
-            },
-            timeout=10,
-        )
-        data = r.json()
-        for item in data.get("item", []):
-            isbn = item.get("isbn13", "")
-            if ISBN_PATTERN.match(isbn):
-                return isbn
-    except Exception:
-        pass
+def search_aladin(keyword: str, crawler: "AladinAPICrawler") -> str | None:
+    """알라딘 API로 ISBN 검색 (1회 호출, HttpCache 적중 시 요청 없음)"""
+    for item in crawler.search_by_keyword(keyword, max_results=3, sort="Accuracy"):
+        isbn = item.get("isbn", "")
+        if ISBN_PATTERN.match(isbn):
+            return isbn
     return None
 
 
 def search_kyobo(keyword: str) -> str | None:
-    """교보문고 검색 → ISBN 추출 (검색 페이지 data-bid)"""
-    import requests
-    from urllib.parse import quote
-    try:
-        r = requests.get(
-            f"https://search.kyobobook.co.kr/search?keyword={quote(keyword)}&target=total",
-            headers=HEADERS, timeout=15,
-        )
-        r.raise_for_status()
-        # data-bid 에서 ISBN 추출 (첫 번째 결과)
-        m = re.search(r'data-bid="(\d{13})"', r.text)
-        if m and ISBN_PATTERN.match(m.group(1)):
-            return m.group(1)
-    except Exception:
-        pass
-    return None
+    """교보문고 검색 → ISBN 추출 (검색 페이지 data-bid, HttpCache 적중 시 요청 없음)"""
+    return kyobo_search.search_isbn(keyword)
 
 
 def crawl_missing_isbns(missing_names: list, name_isbn: dict) -> dict:
     """미발견 상품명에 대해 알라딘 → 교보 순서로 ISBN 검색"""
-    ttb_key = os.getenv("ALADIN_TTB_KEY", "")
+    # app.models(DATABASE_URL 필요)를 끌어오므로 크롤링 단계에서 import
+    from crawlers.aladin_api_crawler import AladinAPICrawler
+
+    key_pool = AladinKeyPool.shared()
+    crawler = AladinAPICrawler(key_pool=key_pool, search_ttl=SEARCH_TTL)
     found = {}
     total = len(missing_names)
 
     print(f"\n{'='*60}")
     print(f"  Phase 2: 크롤링 ({total}개 유니크 상품명)")
     print(f"{'='*60}")
-    if not ttb_key:
+    if not key_pool.available:
         print("  경고: ALADIN_TTB_KEY 없음 → 교보문고만 사용")
 
     aladin_ok, kyobo_ok, fail = 0, 0, 0
@@ -223,15 +198,17 @@ def crawl_missing_isbns(missing_names: list, name_isbn: dict) -> dict:
         isbn = None
 
         # 알라딘 먼저
-        if ttb_key:
-            isbn = search_aladin(search_q, ttb_key)
+        if key_pool.available:
+            try:
+                isbn = search_aladin(search_q, crawler)
+            except QuotaExhausted:
+                print("  알라딘 API 키 한도 초과 → 교보문고만 사용")
             if isbn:
                 aladin_ok += 1
 
         # 교보문고 fallback
         if not isbn:
             isbn = search_kyobo(search_q)
-            time.sleep(0.5)  # 교보 rate limit
             if isbn:
                 kyobo_ok += 1
 
@@ -313,7 +290,7 @@ def collect_missing_names(cpid_isbn, name_isbn):
     for acc, path in EXCEL_FILES.items():
         if not os.path.exists(path):
             continue
-        df = pd.read_excel(path, sheet_name=SHEET, header=HEADER_ROW)
+        df = read_frame(path, sheet=SHEET, header_row=HEADER_ROW)
         cols = df.columns.tolist()
         active = df[df[cols[9]] == "판매중"]
         for _, row in active.iterrows():
@@ -342,7 +319,7 @@ def fill_excel(account_name, excel_path, cpid_isbn, name_isbn, dry_run=False):
     print(f"  {account_name}")
     print(f"{'='*60}")
 
-    df = pd.read_excel(excel_path, sheet_name=SHEET, header=HEADER_ROW)
+    df = read_frame(excel_path, sheet=SHEET, header_row=HEADER_ROW)
     cols = df.columns.tolist()
     COL_CPID, COL_NAME, COL_BRAND = cols[0], cols[1], cols[5]
     COL_SEARCH, COL_STATUS = cols[6], cols[9]
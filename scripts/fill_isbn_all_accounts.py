@@ -9,6 +9,8 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from sqlalchemy import text, create_engine
+from app.services.isbn_coverage import coverage_totals, get_coverage, refresh_coverage, with_isbn_counts
+from app.services.listing_isbns import replace_listing_isbns
 from crawlers.aladin_api_crawler import AladinAPICrawler
 
 # 백업 DB 사용
@@ -126,6 +128,7 @@ def process_account(account_id, account_name, conn):
                 conn.execute(text(
                     'UPDATE listings SET isbn=:isbn WHERE id=:lid'
                 ), {'isbn': isbn_str, 'lid': lid})
+                replace_listing_isbns(conn, lid, isbn_str)
 
                 filled += 1
                 if filled % 100 == 0:
@@ -152,35 +155,27 @@ def main():
 
         print('=== 전체 계정 ISBN 채우기 (알라딘 API) ===')
         print(f'대상 계정: {len(accounts)}개\n')
+        baseline = with_isbn_counts(conn)
 
         for aid, aname in accounts:
             process_account(aid, aname, conn)
 
-        # 최종 통계
+        # 최종 통계 (커버리지 스냅샷 갱신 후 출력)
+        refresh_coverage(conn, strategy="aladin", baseline=baseline)
+        conn.commit()
+        rows = get_coverage(conn, active_only=False)
+
         print('\n' + '='*60)
         print('=== 최종 통계 ===\n')
 
-        result = conn.execute(text('''
-            SELECT a.account_name,
-                   COUNT(*) as total,
-                   SUM(CASE WHEN l.isbn IS NOT NULL THEN 1 ELSE 0 END) as has_isbn,
-                   SUM(CASE WHEN l.isbn IS NULL THEN 1 ELSE 0 END) as null_isbn
-            FROM listings l
-            JOIN accounts a ON l.account_id = a.id
-            GROUP BY a.account_name
-            ORDER BY a.account_name
-        ''')).fetchall()
-
-        for name, tot, has, null in result:
-            pct = has/tot*100 if tot > 0 else 0
-            print(f'{name:12s}: 전체 {tot:5,d}개 | ISBN {has:5,d}개 ({pct:5.1f}%) | NULL {null:5,d}개')
+        for r in rows:
+            null = r.total - r.with_isbn
+            print(f'{r.account_name:12s}: 전체 {r.total:5,d}개 | ISBN {r.with_isbn:5,d}개 ({r.pct:5.1f}%) | NULL {null:5,d}개')
 
         # 전체 통계
-        total_all = conn.execute(text('SELECT COUNT(*) FROM listings')).scalar()
-        has_all = conn.execute(text('SELECT COUNT(*) FROM listings WHERE isbn IS NOT NULL')).scalar()
-        null_all = conn.execute(text('SELECT COUNT(*) FROM listings WHERE isbn IS NULL')).scalar()
-
-        print(f'\n전체 합계   : 전체 {total_all:5,d}개 | ISBN {has_all:5,d}개 ({has_all/total_all*100:5.1f}%) | NULL {null_all:5,d}개')
+        t = coverage_totals(rows)
+        null_all = t['total'] - t['with_isbn']
+        print(f'\n전체 합계   : 전체 {t["total"]:5,d}개 | ISBN {t["with_isbn"]:5,d}개 ({t["pct"]:5.1f}%) | NULL {null_all:5,d}개')
 
 
 if __name__ == '__main__':
@@ -28,6 +28,8 @@ load_dotenv()
 from sqlalchemy import text
 from app.database import engine
 from app.api.coupang_wing_client import CoupangWingClient
+from app.services.isbn_coverage import get_coverage, refresh_coverage, with_isbn_counts
+from app.services.listing_isbns import replace_listing_isbns
 
 isbn_re = re.compile(r'97[89]\d{10}')
 
@@ -106,6 +108,7 @@ def pass1_wing_api(account_id=None, limit=0):
                         conn.execute(text(
                             'UPDATE listings SET isbn=:isbn WHERE id=:lid'
                         ), {'isbn': isbn_str, 'lid': lid})
+                        replace_listing_isbns(conn, lid, isbn_str)
                         filled += 1
                         if filled <= 5:
                             print(f"  [성공] [{acct_name}] product_id={cpid} → {isbn_str}")
@@ -187,6 +190,7 @@ def pass2_books_table(account_id=None, limit=0):
                     conn.execute(text(
                         'UPDATE listings SET isbn=:isbn WHERE id=:lid'
                     ), {'isbn': isbn_str, 'lid': lid})
+                    replace_listing_isbns(conn, lid, isbn_str)
                     filled += 1
                     if filled <= 5:
                         print(f"  [성공] {pname[:40]}... → {isbn_str}")
@@ -275,6 +279,7 @@ def pass3_aladin_api(account_id=None, limit=0):
                         conn.execute(text(
                             'UPDATE listings SET isbn=:isbn WHERE id=:lid'
                         ), {'isbn': isbn_str, 'lid': lid})
+                        replace_listing_isbns(conn, lid, isbn_str)
                         filled += 1
                         if filled <= 5:
                             print(f"  [성공] {pname[:40]}... → {isbn_str}")
@@ -298,23 +303,14 @@ def pass3_aladin_api(account_id=None, limit=0):
 
 # ─── 통계 ───
 
-def print_coverage():
-    """계정별 ISBN 커버리지 출력"""
+def print_coverage(account_name=None):
+    """계정별 ISBN 커버리지 출력 (isbn_coverage 스냅샷)"""
     with engine.connect() as conn:
-        stats = conn.execute(text("""
-            SELECT a.account_name,
-                   COUNT(*) as total,
-                   SUM(CASE WHEN l.isbn IS NOT NULL THEN 1 ELSE 0 END) as has_isbn
-            FROM listings l
-            JOIN accounts a ON l.account_id = a.id
-            WHERE a.is_active = true
-            GROUP BY a.account_name
-        """)).fetchall()
+        rows = get_coverage(conn, account_name=account_name)
 
     print("\n=== ISBN 커버리지 ===")
-    for name, total, has in stats:
-        pct = (has / total * 100) if total > 0 else 0
-        print(f"  {name}: {has}/{total} ({pct:.1f}%)")
+    for r in rows:
+        print(f"  {r.account_name}: {r.with_isbn}/{r.total} ({r.pct:.1f}%)")
 
 
 def main():
@@ -325,26 +321,41 @@ def main():
     args = parser.parse_args()
 
     print("=== 통합 ISBN 채우기 시작 ===")
-    print_coverage()
+    print_coverage(args.account)
 
     total = {"filled": 0, "failed": 0, "skipped": 0}
 
     passes = [args.pass_num] if args.pass_num else [1, 2, 3]
 
+    with engine.connect() as conn:
+        account_ids = None
+        if args.account:
+            account_ids = [r[0] for r in conn.execute(
+                text("SELECT id FROM accounts WHERE account_name = :name"), {"name": args.account})]
+        before = with_isbn_counts(conn, account_ids)
+
+    strategy_filled = {}
     for p in passes:
         if p == 1:
-            r = pass1_wing_api(args.account, args.limit)
+            name, r = "wing", pass1_wing_api(args.account, args.limit)
         elif p == 2:
-            r = pass2_books_table(args.account, args.limit)
+            name, r = "books", pass2_books_table(args.account, args.limit)
         elif p == 3:
-            r = pass3_aladin_api(args.account, args.limit)
+            name, r = "aladin", pass3_aladin_api(args.account, args.limit)
         else:
             continue
         for k in total:
             total[k] += r[k]
+        with engine.connect() as conn:
+            after = with_isbn_counts(conn, account_ids)
+        strategy_filled[name] = {aid: n - before.get(aid, 0) for aid, n in after.items()}
+        before = after
+
+    with engine.begin() as conn:
+        refresh_coverage(conn, account_ids, strategy_filled=strategy_filled)
 
     print(f"\n=== 전체 결과: {total} ===")
-    print_coverage()
+    print_coverage(args.account)
 
 
 if __name__ == "__main__":
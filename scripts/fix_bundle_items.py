@@ -40,6 +40,7 @@ from app.models.bundle_sku import BundleSKU
 from app.models.book import Book
 from app.models.account import Account
 from app.api.coupang_wing_client import CoupangWingClient, CoupangWingError
+from app.services.listing_isbns import split_isbns
 from uploaders.coupang_api_uploader import _dedupe_attributes
 
 logging.basicConfig(
@@ -61,7 +62,7 @@ def resolve_isbns(listing: Listing, db) -> List[str]:
     """
     리스팅에서 ISBN 목록 추출 (우선순위):
     1. bundle_id → BundleSKU.get_isbns()
-    2. listing.isbn (쉼표 구분)
+    2. listing_isbns / listing.isbn (쉼표 구분)
     3. raw_json의 items[].barcode / searchTags에서 추출
     """
     # 1) BundleSKU에서
@@ -72,11 +73,10 @@ def resolve_isbns(listing: Listing, db) -> List[str]:
             if isbns:
                 return isbns
 
-    # 2) listing.isbn (쉼표 구분)
-    if listing.isbn and ',' in listing.isbn:
-        isbns = [i.strip() for i in listing.isbn.split(',') if i.strip()]
-        if len(isbns) > 1:
-            return isbns
+    # 2) listing_isbns (listing.isbn 정규화, 없으면 쉼표 분리)
+    isbns = [e.isbn for e in listing.isbn_entries] or split_isbns(listing.isbn)
+    if len(isbns) > 1:
+        return isbns
 
     # 3) raw_json에서 추출
     if listing.raw_json:
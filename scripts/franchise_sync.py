@@ -10,8 +10,8 @@
 """
 import sys
 import os
-import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Any
@@ -31,8 +31,14 @@ from app.models.book import Book
 from app.models.product import Product
 from app.models.account import Account
 from app.models.listing import Listing
+from app.services.listing_isbns import rebuild_listing_isbns, replace_listing_isbns
 from app.constants import WING_ACCOUNT_ENV_MAP, CRAWL_MIN_PRICE, CRAWL_EXCLUDE_KEYWORDS
 from crawlers.aladin_api_crawler import AladinAPICrawler
+from crawlers.aladin_key_pool import AladinKeyPool, QuotaExhausted
+from app.services.crawl_watermarks import (
+    SCOPE_NEW_RELEASES, SCOPE_PUBLISHER, ensure_table as ensure_watermarks,
+    load_watermarks, newest_mark, save_watermark, since_date,
+)
 from app.api.coupang_wing_client import CoupangWingClient
 from uploaders.coupang_api_uploader import CoupangAPIUploader
 logging.basicConfig(
@@ -43,13 +49,16 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# 신간 목록(ItemNewAll, 전체 카테고리) 기준점 key
+NEW_RELEASES_KEY = "ItemNewAll"
+
+
 class FranchiseSync:
     """프랜차이즈 동기화: 신간 수집 + 갭 메우기"""
 
     def __init__(self, db=None):
         self.db = db or SessionLocal()
         self._owns_db = db is None
-        self.ttb_key = os.getenv("ALADIN_TTB_KEY", "")
 
     def close(self):
         if self._owns_db:
@@ -63,6 +72,7 @@ class FranchiseSync:
         self,
         max_results: int = 200,
         progress_callback=None,
+        incremental: bool = False,
     ) -> Dict[str, Any]:
         """
         알라딘 신간 API로 거래 출판사의 신간 수집 → DB 저장
@@ -70,12 +80,13 @@ class FranchiseSync:
         Args:
             max_results: 알라딘 API에서 가져올 최대 항목 수
             progress_callback: 진행률 콜백 fn(current, total, message)
+            incremental: True면 지난 수집 기준점(crawl_watermarks) 이후 출간분만 조회
 
         Returns:
             {"searched": int, "new": int, "skipped": int, "books": [Book]}
         """
-        if not self.ttb_key:
-            logger.error("ALADIN_TTB_KEY가 설정되지 않았습니다.")
+        if not AladinKeyPool.shared().available:
+            logger.error("ALADIN_TTB_KEY(S)가 설정되지 않았거나 모든 키가 한도 초과입니다.")
             return {"searched": 0, "new": 0, "skipped": 0, "books": []}
 
         # DB에서 활성 출판사 이름 가져오기
@@ -87,16 +98,25 @@ class FranchiseSync:
             logger.warning("활성 출판사가 없습니다.")
             return {"searched": 0, "new": 0, "skipped": 0, "books": []}
 
-        crawler = AladinAPICrawler(ttb_key=self.ttb_key)
+        crawler = AladinAPICrawler(key_pool=AladinKeyPool.shared())
+
+        ensure_watermarks(self.db)
+        mark = load_watermarks(self.db, SCOPE_NEW_RELEASES).get(NEW_RELEASES_KEY)
+        since = since_date(mark) if incremental else None
 
         if progress_callback:
             progress_callback(0, 1, "알라딘 신간 API 조회 중...")
 
         # 신간 리스트 API 호출 (출판사 필터링 포함)
-        results = crawler.fetch_new_releases(
-            max_results=max_results,
-            publisher_names=pub_names,
-        )
+        try:
+            results = crawler.fetch_new_releases(
+                max_results=max_results,
+                publisher_names=pub_names,
+                since=since,
+            )
+        except QuotaExhausted:
+            logger.error("알라딘 TTBKey 일일 한도 초과 → 신간 수집 중단")
+            results = []
 
         new_books = []
         skipped = 0
@@ -169,6 +189,7 @@ class FranchiseSync:
                 book.sales_point = sp_updates[book.isbn]
             logger.info(f"기존 도서 salesPoint 갱신: {len(sp_updates)}개")
 
+        save_watermark(self.db, SCOPE_NEW_RELEASES, NEW_RELEASES_KEY, newest_mark(results), mark)
         self.db.commit()
 
         result = {
@@ -190,24 +211,30 @@ class FranchiseSync:
         publisher_names: List[str] = None,
         progress_callback=None,
         year_filter: int = None,
+        workers: int = 4,
+        incremental: bool = False,
     ) -> Dict[str, Any]:
         """
         출판사 이름으로 알라딘 키워드 검색 → DB 저장
 
         기존 run_pipeline.py의 search_and_save_books()와 동일한 방식.
         출판사마다 개별 검색하므로 정확도가 높음.
+        검색은 workers개 스레드로 동시에, 요청 속도/키 전환은 AladinKeyPool이 담당.
 
         Args:
             max_per_publisher: 출판사당 최대 검색 수
             publisher_names: 특정 출판사만 (None이면 전체 활성 출판사)
             progress_callback: fn(current, total, message)
             year_filter: 출간 연도 필터 (예: 2025 → 2025년 이후만)
+            workers: 동시 검색 스레드 수
+            incremental: True면 기준점(crawl_watermarks)이 있는 출판사는
+                         그 이후 출간분만 최신순으로 조회 (판매량순 검색 생략)
 
         Returns:
             {"searched": int, "new": int, "skipped": int, "books": [Book]}
         """
-        if not self.ttb_key:
-            logger.error("ALADIN_TTB_KEY가 설정되지 않았습니다.")
+        if not AladinKeyPool.shared().available:
+            logger.error("ALADIN_TTB_KEY(S)가 설정되지 않았거나 모든 키가 한도 초과입니다.")
             return {"searched": 0, "new": 0, "skipped": 0, "books": []}
 
         publishers = self.db.query(Publisher).filter(Publisher.is_active == True).all()
@@ -221,7 +248,18 @@ class FranchiseSync:
         if not target_names:
             return {"searched": 0, "new": 0, "skipped": 0, "books": []}
 
-        crawler = AladinAPICrawler(ttb_key=self.ttb_key)
+        key_pool = AladinKeyPool.shared()
+
+        # 출판사별 수집 기준점 (검색 결과 반영 후 갱신)
+        ensure_watermarks(self.db)
+        marks = load_watermarks(self.db, SCOPE_PUBLISHER)
+        since_map = {
+            name: since_date(marks.get(name)) if incremental else None
+            for name in target_names
+        }
+        if incremental:
+            n_inc = sum(1 for v in since_map.values() if v)
+            logger.info(f"증분 수집: 기준점 있는 출판사 {n_inc}/{len(target_names)}곳")
 
         all_new_books = []
         total_searched = 0
@@ -235,107 +273,100 @@ class FranchiseSync:
         }
         sp_updates = {}  # {isbn: new_sales_point} 배치 업데이트용
 
-        for idx, pub_name in enumerate(target_names):
-            publisher = pub_map[pub_name]
+        # 출판사별 검색은 스레드 풀에서 동시에 (속도는 키 풀이 제한),
+        # 결과 반영(DB)은 출판사 순서대로 → 실행마다 같은 결과
+        executor = ThreadPoolExecutor(max_workers=max(1, workers))
+        futures = [
+            executor.submit(self._search_publisher, key_pool, pub_name,
+                            max_per_publisher, year_filter, since_map[pub_name])
+            for pub_name in target_names
+        ]
 
-            if progress_callback:
-                progress_callback(idx, len(target_names), f"{pub_name} 검색 중...")
+        try:
+            for idx, (pub_name, future) in enumerate(zip(target_names, futures)):
+                publisher = pub_map[pub_name]
 
-            # 원래 이름 + 별칭으로 검색 (씨톡→씨앤톡 등)
-            search_names = AladinAPICrawler.get_search_names(pub_name)
-            results = []
-            seen_isbn_batch = set()  # 정렬 간 중복 제거용
-            for sname in search_names:
-                # 최신순 크롤링
-                batch = crawler.search_by_keyword(
-                    sname, max_results=max_per_publisher,
-                    sort="PublishTime", year_filter=year_filter,
-                )
-                for b in batch:
-                    if b.get("isbn") and b["isbn"] not in seen_isbn_batch:
-                        seen_isbn_batch.add(b["isbn"])
-                        results.append(b)
-                time.sleep(0.5)
+                if progress_callback:
+                    progress_callback(idx, len(target_names), f"{pub_name} 검색 결과 반영 중...")
 
-                # 판매량순 크롤링 (잘 팔리는 책 우선 수집)
-                batch_sp = crawler.search_by_keyword(
-                    sname, max_results=max_per_publisher,
-                    sort="SalesPoint", year_filter=year_filter,
-                )
-                for b in batch_sp:
-                    if b.get("isbn") and b["isbn"] not in seen_isbn_batch:
-                        seen_isbn_batch.add(b["isbn"])
-                        results.append(b)
-                time.sleep(0.5)
-            total_searched += len(results)
+                try:
+                    results = future.result()
+                except QuotaExhausted:
+                    logger.error("알라딘 TTBKey 일일 한도 초과 → 남은 출판사 중단")
+                    break
+                total_searched += len(results)
 
-            for item in results:
                 # 출판사 매칭
-                if not AladinAPICrawler._match_publisher_name(item.get("publisher", ""), pub_name):
-                    continue
-
-                # 정가 최소 기준 필터
-                item_price = item.get("original_price", 0) or 0
-                if item_price < CRAWL_MIN_PRICE:
-                    total_skipped += 1
-                    continue
-
-                # 제외 키워드 필터 (제목 + 카테고리)
-                item_title = item.get("title", "")
-                item_category = item.get("category", "")
-                _check_text = item_title + " " + item_category
-                if any(kw in _check_text for kw in CRAWL_EXCLUDE_KEYWORDS):
-                    total_skipped += 1
-                    continue
-
-                isbn = item.get("isbn", "")
-                if not isbn:
-                    total_skipped += 1
-                    continue
-
-                # 배치 내 중복
-                if isbn in seen_isbns:
-                    total_skipped += 1
-                    continue
-                seen_isbns.add(isbn)
-
-                # DB 중복 (프리로드된 딕셔너리에서 O(1) 조회)
-                if isbn in existing_isbn_sp:
-                    # 기존 책의 salesPoint 갱신 (배치로 모아서 처리)
-                    new_sp = item.get("sales_point", 0) or 0
-                    if new_sp and new_sp != (existing_isbn_sp[isbn] or 0):
-                        sp_updates[isbn] = new_sp
-                        existing_isbn_sp[isbn] = new_sp  # 딕셔너리도 갱신
-                    total_skipped += 1
-                    continue
-
-                book = Book(
-                    isbn=isbn,
-                    title=item["title"],
-                    author=item.get("author", ""),
-                    publisher_id=publisher.id,
-                    list_price=item["original_price"],
-                    year=item.get("year"),
-                    normalized_title=item.get("normalized_title", ""),
-                    normalized_series=item.get("normalized_series", ""),
-                    sales_point=item.get("sales_point", 0),
-                    crawled_at=datetime.utcnow(),
-                )
-                book.process_metadata()
-                self.db.add(book)
-                all_new_books.append(book)
-                existing_isbn_sp[isbn] = item.get("sales_point", 0)  # 프리로드 딕셔너리에 추가
-
-            # 기존 책 sales_point 배치 업데이트
-            if sp_updates:
-                for book in self.db.query(Book).filter(Book.isbn.in_(list(sp_updates.keys()))):
-                    if book.isbn in sp_updates:
-                        book.sales_point = sp_updates[book.isbn]
-                logger.info(f"기존 도서 salesPoint 갱신: {len(sp_updates)}개")
-                sp_updates.clear()
-
-            self.db.commit()
-            time.sleep(1)  # API 부하 방지
+                matched = [
+                    item for item in results
+                    if AladinAPICrawler._match_publisher_name(item.get("publisher", ""), pub_name)
+                ]
+
+                for item in matched:
+                    # 정가 최소 기준 필터
+                    item_price = item.get("original_price", 0) or 0
+                    if item_price < CRAWL_MIN_PRICE:
+                        total_skipped += 1
+                        continue
+
+                    # 제외 키워드 필터 (제목 + 카테고리)
+                    item_title = item.get("title", "")
+                    item_category = item.get("category", "")
+                    _check_text = item_title + " " + item_category
+                    if any(kw in _check_text for kw in CRAWL_EXCLUDE_KEYWORDS):
+                        total_skipped += 1
+                        continue
+
+                    isbn = item.get("isbn", "")
+                    if not isbn:
+                        total_skipped += 1
+                        continue
+
+                    # 배치 내 중복
+                    if isbn in seen_isbns:
+                        total_skipped += 1
+                        continue
+                    seen_isbns.add(isbn)
+
+                    # DB 중복 (프리로드된 딕셔너리에서 O(1) 조회)
+                    if isbn in existing_isbn_sp:
+                        # 기존 책의 salesPoint 갱신 (배치로 모아서 처리)
+                        new_sp = item.get("sales_point", 0) or 0
+                        if new_sp and new_sp != (existing_isbn_sp[isbn] or 0):
+                            sp_updates[isbn] = new_sp
+                            existing_isbn_sp[isbn] = new_sp  # 딕셔너리도 갱신
+                        total_skipped += 1
+                        continue
+
+                    book = Book(
+                        isbn=isbn,
+                        title=item["title"],
+                        author=item.get("author", ""),
+                        publisher_id=publisher.id,
+                        list_price=item["original_price"],
+                        year=item.get("year"),
+                        normalized_title=item.get("normalized_title", ""),
+                        normalized_series=item.get("normalized_series", ""),
+                        sales_point=item.get("sales_point", 0),
+                        crawled_at=datetime.utcnow(),
+                    )
+                    book.process_metadata()
+                    self.db.add(book)
+                    all_new_books.append(book)
+                    existing_isbn_sp[isbn] = item.get("sales_point", 0)  # 프리로드 딕셔너리에 추가
+
+                # 기존 책 sales_point 배치 업데이트
+                if sp_updates:
+                    for book in self.db.query(Book).filter(Book.isbn.in_(list(sp_updates.keys()))):
+                        if book.isbn in sp_updates:
+                            book.sales_point = sp_updates[book.isbn]
+                    logger.info(f"기존 도서 salesPoint 갱신: {len(sp_updates)}개")
+                    sp_updates.clear()
+
+                save_watermark(self.db, SCOPE_PUBLISHER, pub_name, newest_mark(matched), marks.get(pub_name))
+                self.db.commit()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
 
         if progress_callback:
             progress_callback(len(target_names), len(target_names), "완료!")
@@ -349,6 +380,34 @@ class FranchiseSync:
         logger.info(f"출판사별 크롤링 완료: 검색 {total_searched}개, 신규 {len(all_new_books)}개, 스킵 {total_skipped}개")
         return result
 
+    @staticmethod
+    def _search_publisher(key_pool: AladinKeyPool, pub_name: str,
+                          max_per_publisher: int, year_filter: int = None,
+                          since=None) -> List[Dict]:
+        """
+        출판사 1곳 검색 (스레드 풀 워커에서 실행, DB 접근 없음)
+
+        원래 이름 + 별칭 × (최신순, 판매량순)으로 검색, ISBN 중복 제거.
+        since(증분 기준일)가 있으면 최신순만, 기준일 도달 시 중단.
+        결과 순서는 검색 순서 그대로라 스레드 타이밍과 무관.
+        """
+        crawler = AladinAPICrawler(key_pool=key_pool)  # 세션은 스레드별
+        results = []
+        seen_isbn_batch = set()  # 정렬 간 중복 제거용
+        # 원래 이름 + 별칭으로 검색 (씨톡→씨앤톡 등)
+        for sname in AladinAPICrawler.get_search_names(pub_name):
+            # 최신순 → 판매량순 (잘 팔리는 책 우선 수집)
+            for sort in ("PublishTime",) if since else ("PublishTime", "SalesPoint"):
+                batch = crawler.search_by_keyword(
+                    sname, max_results=max_per_publisher,
+                    sort=sort, year_filter=year_filter, since=since,
+                )
+                for b in batch:
+                    if b.get("isbn") and b["isbn"] not in seen_isbn_batch:
+                        seen_isbn_batch.add(b["isbn"])
+                        results.append(b)
+        return results
+
     # ─────────────────────────────────────────────
     # Step 2: 마진 분석 + Product 생성
     # ─────────────────────────────────────────────
@@ -412,57 +471,105 @@ class FranchiseSync:
     # Step 3: 갭 분석 (계정별 미등록 도서)
     # ─────────────────────────────────────────────
 
-    def find_gaps(self) -> Dict[str, Dict[str, Any]]:
+    def _sync_listing_isbns(self) -> int:
+        """
+        listing_isbns에 행이 없는 ISBN 보유 리스팅을 먼저 펼침
+
+        listing_isbns는 파생 테이블 — 비어 있거나(재구성 전) 밀려 있으면
+        등록된 상품이 전부 미등록으로 잡혀 sync_all이 중복 등록함.
+
+        Returns:
+            재구성한 리스팅 수
+        """
+        ids = [r[0] for r in self.db.execute(text("""
+            SELECT l.id FROM listings l
+            WHERE l.isbn IS NOT NULL AND l.isbn <> ''
+              AND NOT EXISTS (SELECT 1 FROM listing_isbns li WHERE li.listing_id = l.id)
+        """)).fetchall()]
+        if ids:
+            logger.warning(f"listing_isbns 누락 리스팅 {len(ids):,}개 → 갭 분석 전 재구성")
+            rebuild_listing_isbns(self.db, listing_ids=ids)
+            self.db.commit()
+        return len(ids)
+
+    def _missing_pairs(self) -> List[tuple]:
+        """
+        (account_id, product_id) 미등록 쌍 — 전체 계정을 쿼리 1회로 anti-join
+
+        listing_isbns(정규화 ISBN) 기준이라 세트 리스팅의 구성 ISBN도 등록된 것으로 취급.
+        """
+        sql = """
+            WITH gap_accounts AS (
+                SELECT id FROM accounts
+                WHERE is_active = true AND wing_api_enabled = true
+            ),
+            ready AS (
+                SELECT id, isbn FROM products
+                WHERE status = 'ready' AND can_upload_single = true
+            )
+            SELECT a.id AS account_id, r.id AS product_id
+            FROM gap_accounts a
+            CROSS JOIN ready r
+            WHERE NOT EXISTS (
+                SELECT 1 FROM listing_isbns li
+                JOIN listings l ON l.id = li.listing_id
+                WHERE li.isbn = r.isbn AND l.account_id = a.id
+            )
+            ORDER BY a.id, r.id
+        """
+        return self.db.execute(text(sql)).fetchall()
+
+    def find_gaps(self, load_products: bool = True) -> Dict[str, Dict[str, Any]]:
         """
         계정별 미등록 도서(갭) 분석
 
+        Args:
+            load_products: False면 Product 객체 로드 생략 (건수/ID만 필요할 때)
+
         Returns:
             {
                 "007-book": {"registered": 400, "missing": 81, "total": 481,
-                             "coverage": 83.2, "products": [Product, ...]},
+                             "coverage": 83.2, "product_ids": [int, ...],
+                             "products": [Product, ...]},
                 ...
             }
         """
-        # 업로드 가능한 전체 상품
-        all_products = self.db.query(Product).filter(
+        # 업로드 가능한 전체 상품 수
+        total_products = self.db.query(Product).filter(
             Product.status == 'ready',
             Product.can_upload_single == True,
-        ).all()
-        total_products = len(all_products)
+        ).count()
 
         if total_products == 0:
             logger.info("업로드 가능한 상품이 없습니다.")
             return {}
 
-        product_isbns = {p.isbn: p for p in all_products}
-
         # 활성 WING API 계정
         accounts = self.db.query(Account).filter(
             Account.is_active == True,
             Account.wing_api_enabled == True,
-        ).all()
+        ).order_by(Account.id).all()
+
+        self._sync_listing_isbns()
+        missing_ids: Dict[int, List[int]] = {a.id: [] for a in accounts}
+        for account_id, product_id in self._missing_pairs():
+            missing_ids[account_id].append(product_id)
+
+        # 미등록 Product는 계정 간 공유 (같은 상품은 한 번만 로드)
+        products_by_id = {}
+        if load_products:
+            wanted = sorted({pid for ids in missing_ids.values() for pid in ids})
+            for i in range(0, len(wanted), 5000):
+                chunk = wanted[i:i + 5000]
+                for p in self.db.query(Product).filter(Product.id.in_(chunk)).all():
+                    products_by_id[p.id] = p
 
         gaps = {}
 
         for account in accounts:
-            # 이미 등록된 ISBN (coupang_product_id가 있는 것만)
-            registered_isbns = set()
-            listings = self.db.query(Listing.isbn).filter(
-                Listing.account_id == account.id,
-                Listing.isbn.isnot(None),
-            ).all()
-            for (isbn,) in listings:
-                if isbn:
-                    registered_isbns.add(isbn)
-
-            # 갭 = 전체 - 이미등록
-            missing_products = [
-                p for isbn, p in product_isbns.items()
-                if isbn not in registered_isbns
-            ]
-
-            registered_count = len(registered_isbns & set(product_isbns.keys()))
-            missing_count = len(missing_products)
+            ids = missing_ids[account.id]
+            missing_count = len(ids)
+            registered_count = total_products - missing_count
             coverage = (registered_count / total_products * 100) if total_products > 0 else 0
 
             gaps[account.account_name] = {
@@ -471,7 +578,8 @@ class FranchiseSync:
                 "missing": missing_count,
                 "total": total_products,
                 "coverage": round(coverage, 1),
-                "products": missing_products,
+                "product_ids": ids,
+                "products": [products_by_id[pid] for pid in ids if pid in products_by_id],
             }
 
             logger.info(
@@ -598,6 +706,9 @@ class FranchiseSync:
                             synced_at=datetime.utcnow(),
                         )
                         self.db.add(listing)
+                        self.db.flush()
+                        # 갭 분석(listing_isbns)에 바로 반영 — 다음 sync_all에서 재업로드 방지
+                        replace_listing_isbns(self.db, listing.id, listing.isbn)
                         self.db.commit()
                     except Exception as db_e:
                         logger.warning(f"Listing 저장 실패: {db_e}")
@@ -621,6 +732,7 @@ class FranchiseSync:
         dry_run: bool = False,
         max_crawl: int = 200,
         progress_callback=None,
+        incremental: bool = False,
     ) -> Dict[str, Any]:
         """
         전체 동기화: 크롤링 → 분석 → 갭 분석 → 계정별 업로드
@@ -629,6 +741,7 @@ class FranchiseSync:
             dry_run: True면 실제 등록 안 함
             max_crawl: 신간 크롤링 최대 수
             progress_callback: fn(current, total, message)
+            incremental: 신간 수집을 지난 기준점 이후 출간분만
 
         Returns:
             전체 결과 리포트
@@ -648,6 +761,7 @@ class FranchiseSync:
         crawl_result = self.crawl_new_releases(
             max_results=max_crawl,
             progress_callback=progress_callback,
+            incremental=incremental,
         )
         report["crawl"] = {
             "searched": crawl_result["searched"],
@@ -729,6 +843,7 @@ if __name__ == "__main__":
     parser.add_argument("--dry-run", action="store_true", help="실제 등록 없이 테스트")
     parser.add_argument("--max-crawl", type=int, default=200, help="신간 크롤링 최대 수")
     parser.add_argument("--gaps-only", action="store_true", help="갭 분석만 실행")
+    parser.add_argument("--incremental", action="store_true", help="지난 수집 기준점 이후 신간만 조회")
     args = parser.parse_args()
 
     init_db()
@@ -736,14 +851,15 @@ if __name__ == "__main__":
 
     try:
         if args.gaps_only:
-            gaps = sync.find_gaps()
+            gaps = sync.find_gaps(load_products=False)
             print(f"\n{'계정':<12} {'등록':>6} {'미등록':>6} {'전체':>6} {'커버리지':>8}")
             print("-" * 42)
             for name, info in gaps.items():
                 print(f"{name:<12} {info['registered']:>6} {info['missing']:>6} "
                       f"{info['total']:>6} {info['coverage']:>7.1f}%")
         else:
-            report = sync.sync_all(dry_run=args.dry_run, max_crawl=args.max_crawl)
+            report = sync.sync_all(dry_run=args.dry_run, max_crawl=args.max_crawl,
+                                   incremental=args.incremental)
             print(f"\n크롤링: 검색 {report['crawl']['searched']}개, 신규 {report['crawl']['new']}개")
             print(f"분석: {report['analyze']['created']}개 Product 생성")
             for name, info in report["uploads"].items():
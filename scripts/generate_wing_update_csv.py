@@ -15,6 +15,7 @@ _filled.xlsx에서 판매중 + 바코드(ISBN) 있는 행 →
   python scripts/generate_wing_update_csv.py --account 007-book  # 특정 계정
   python scripts/generate_wing_update_csv.py --skip-api    # API 스킵 (캐시만)
   python scripts/generate_wing_update_csv.py --dry-run     # 테스트
+  python scripts/generate_wing_update_csv.py --workers 4   # 행 값 계산 프로세스 수
 """
 
 import os
@@ -22,8 +23,10 @@ import re
 import sys
 import io
 import json
-import time
 import argparse
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
 
 project_root = Path(__file__).resolve().parent.parent
@@ -35,9 +38,12 @@ if sys.platform == "win32":
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", line_buffering=True)
 
 import pandas as pd
-import requests
 from openpyxl import load_workbook, Workbook
 
+from crawlers.aladin_key_pool import AladinKeyPool, QuotaExhausted
+from crawlers.http_cache import DAY, HttpCache
+from crawlers import kyobo_search
+
 # ── 설정 ──
 FILLED_FILES = {
     "007-book": "C:/Users/MSI/Desktop/Coupong/007-book_filled.xlsx",
@@ -49,13 +55,26 @@ FILLED_FILES = {
 SHEET = "Template"
 TOTAL_COLS = 231
 OUTPUT_DIR = Path(project_root) / "output"
+# 조회 결과는 HttpCache(SQLite)에 저장. 아래 JSON은 예전 형식 → 있으면 한 번 이전
 CACHE_FILE = OUTPUT_DIR / "aladin_cache.json"
 SEARCH_CACHE_FILE = OUTPUT_DIR / "aladin_search_cache.json"
-TTB_KEYS = ["ttbsjrnf57491614001", "ttbsjrnf57490005001", "ttbsjrnf57490005003"]
+META_NAMESPACE = "wing_csv:meta"
+SEARCH_NAMESPACE = "wing_csv:set_search"
+SEARCH_TTL = 14 * DAY       # 알라딘 제목 검색 응답 캐시 기간
+# ALADIN_TTB_KEYS 환경변수가 없을 때 쓰는 키 (ALADIN_TTB_KEY와 함께 풀에 등록)
+DEFAULT_TTB_KEYS = ["ttbsjrnf57491614001", "ttbsjrnf57490005001", "ttbsjrnf57490005003"]
 ISBN_PATTERN = re.compile(r"^97[89]\d{10}$")
-API_INTERVAL = 0.2
+API_INTERVAL = 0.2          # 키당 요청 간격 (초)
+API_WORKERS_PER_KEY = 2     # 키당 동시 요청 수 (전체 = 남은 키 수 × 이 값)
+API_CHUNK = 500             # 이 단위로 조회 후 캐시에 한 트랜잭션으로 추가
+MEMO_SIZE = 65536          # 상품명 가공 결과 메모 (같은 상품명이 계정마다 반복됨)
+ROW_CHUNK = 2000            # 행 값 계산 단위 (프로세스 풀 작업 1개)
+MIN_PARALLEL = 5000         # 이보다 적으면 현재 프로세스에서 계산 (풀 기동 비용이 더 큼)
 SET_KEYWORDS = ["세트", "전2권", "전3권", "전4권", "전5권", "전6권", "전7권", "전8권"]
 
+# _filled.xlsx 열 위치 (0-based, header=3 기준): 등록상품명 / 판매상태 / 바코드
+COL_NAME, COL_STATUS, COL_BARCODE = 1, 9, 230
+
 # 검색옵션 코드 → 매핑 필드
 SEARCH_OPTION_MAP = {
     "728": "publisher",     # 제조사명
@@ -114,78 +133,89 @@ def normalize_isbn(val) -> str | None:
     return None
 
 
+def normalize_isbn_series(values: pd.Series) -> pd.Series:
+    """normalize_isbn의 열 단위 버전 (유효하지 않으면 None)"""
+    text = values.astype("string")
+    # 숫자 셀은 float으로 읽힘 (9788900000016.0) → 소수부 제거
+    is_float = values.map(lambda v: isinstance(v, float))
+    text = text.mask(is_float, text.str.replace(r"\.0$", "", regex=True))
+    digits = text.str.replace(r"\D", "", regex=True)
+    valid = digits.str.fullmatch(ISBN_PATTERN.pattern).fillna(False).astype(bool)
+    return digits.astype(object).where(valid, None)
+
+
 # ════════════════════════════════════════
 # 알라딘 API
 # ════════════════════════════════════════
 
-def load_cache() -> dict:
-    if CACHE_FILE.exists():
-        with open(CACHE_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return {}
+def _open_cache(namespace: str, legacy_file: Path):
+    """HttpCache namespace 뷰 (예전 JSON 캐시 파일이 있으면 가져온 뒤 .migrated로 이름 변경)"""
+    cache = HttpCache.shared().mapping(namespace)
+    if legacy_file.exists():
+        with open(legacy_file, "r", encoding="utf-8") as f:
+            moved = cache.update(json.load(f))
+        legacy_file.rename(legacy_file.with_name(legacy_file.name + ".migrated"))
+        print(f"  기존 캐시 {legacy_file.name} → {moved}건 이전")
+    return cache
 
 
-def save_cache(cache: dict):
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    with open(CACHE_FILE, "w", encoding="utf-8") as f:
-        json.dump(cache, f, ensure_ascii=False, indent=2)
+def load_cache():
+    """ISBN → 메타데이터 캐시 (값을 넣으면 바로 디스크에 기록)"""
+    return _open_cache(META_NAMESPACE, CACHE_FILE)
 
 
-class RateLimitError(Exception):
-    pass
+_crawler = None
 
 
-_current_key_idx = 0
+def get_crawler() -> "AladinAPICrawler":
+    """멀티키 풀 크롤러 (한도 초과 키 자동 전환, 키당 API_INTERVAL 간격)"""
+    global _crawler
+    if _crawler is None:
+        # app.models(DATABASE_URL 필요)를 끌어오므로 API 조회 시점에 import — 엑셀 전용 실행은 DB 불필요
+        from crawlers.aladin_api_crawler import AladinAPICrawler
+        pool = AladinKeyPool.from_env(rate_per_key=1 / API_INTERVAL, fallback_keys=DEFAULT_TTB_KEYS)
+        _crawler = AladinAPICrawler(key_pool=pool, search_ttl=SEARCH_TTL)
+    return _crawler
 
 
-def fetch_aladin_metadata(isbn: str) -> dict | None:
-    """알라딘 ItemLookUp API (멀티키, 한도초과 자동 전환)"""
-    global _current_key_idx
-
-    tried = 0
-    while tried < len(TTB_KEYS):
-        key = TTB_KEYS[_current_key_idx]
-        try:
-            r = requests.get(
-                "http://www.aladin.co.kr/ttb/api/ItemLookUp.aspx",
-                params={
-                    "ttbkey": key, "itemIdType": "ISBN", "ItemId": isbn,
-                    "output": "js", "Version": "20131101",
-                },
-                timeout=15,
-            )
-            data = r.json()
-
-            if data.get("errorCode") == 10:
-                print(f"  키 {_current_key_idx + 1}/{len(TTB_KEYS)} 한도 초과, 다음 키로 전환")
-                _current_key_idx = (_current_key_idx + 1) % len(TTB_KEYS)
-                tried += 1
-                continue
+def _item_to_meta(item: dict | None) -> dict | None:
+    """알라딘 ItemLookUp item → 캐시용 메타데이터"""
+    if not item:
+        return None
+    series_name = ""
+    si = item.get("seriesInfo")
+    if isinstance(si, dict):
+        series_name = si.get("seriesName", "")
 
-            items = data.get("item", [])
-            if not items:
-                return None
+    return {
+        "author": item.get("author", ""),
+        "publisher": item.get("publisher", ""),
+        "pubDate": item.get("pubDate", ""),
+        "seriesName": series_name,
+        "categoryName": item.get("categoryName", ""),
+    }
 
-            item = items[0]
-            series_name = ""
-            si = item.get("seriesInfo")
-            if isinstance(si, dict):
-                series_name = si.get("seriesName", "")
 
-            return {
-                "author": item.get("author", ""),
-                "publisher": item.get("publisher", ""),
-                "pubDate": item.get("pubDate", ""),
-                "seriesName": series_name,
-                "categoryName": item.get("categoryName", ""),
-            }
-        except Exception:
-            return None
+def fetch_aladin_metadata(isbn: str) -> dict | None:
+    """알라딘 ItemLookUp API (멀티키, 한도초과 자동 전환)
+
+    Raises:
+        QuotaExhausted: 모든 키 한도 초과
+    """
+    items = get_crawler().lookup_items([isbn], concurrency=1)
+    if isbn not in items:
+        raise QuotaExhausted("모든 API 키 한도 초과")
+    return _item_to_meta(items[isbn])
 
-    raise RateLimitError("모든 API 키 한도 초과")
 
+def api_concurrency() -> int:
+    """동시 요청 수 — 남은 키 수 × API_WORKERS_PER_KEY (키당 속도 제한은 키 풀이 보장)"""
+    return max(1, len(get_crawler().key_pool.available)) * API_WORKERS_PER_KEY
 
-def batch_fetch_aladin(isbns: list[str], cache: dict, skip_api: bool = False) -> dict:
+
+def batch_fetch_aladin(isbns: list[str], cache, skip_api: bool = False):
+    """ISBN 메타데이터 일괄 조회 (전 계정 ISBN을 합쳐 한 번에, 캐시에 없는 것만)"""
+    isbns = list(dict.fromkeys(isbns))
     to_fetch = [isbn for isbn in isbns if isbn not in cache]
     cached = len(isbns) - len(to_fetch)
 
@@ -199,31 +229,28 @@ def batch_fetch_aladin(isbns: list[str], cache: dict, skip_api: bool = False) ->
         print("  전부 캐시 히트!")
         return cache
 
+    crawler = get_crawler()
+    concurrency = api_concurrency()
+    print(f"  동시 요청 {concurrency}개 (키 {concurrency // API_WORKERS_PER_KEY}개 × {API_WORKERS_PER_KEY})")
     ok, fail = 0, 0
-    for i, isbn in enumerate(to_fetch, 1):
-        try:
-            meta = fetch_aladin_metadata(isbn)
-        except RateLimitError:
-            print(f"\n  모든 API 키 한도 초과! {i-1}/{len(to_fetch)}건에서 중단")
-            print(f"  내일 재실행하면 캐시된 {ok}건은 스킵됩니다")
-            break
-
-        if meta:
-            cache[isbn] = meta
-            ok += 1
-        else:
-            cache[isbn] = None
-            fail += 1
+    for start in range(0, len(to_fetch), API_CHUNK):
+        chunk = to_fetch[start:start + API_CHUNK]
+        items = crawler.lookup_items(chunk, concurrency=concurrency)
 
-        if i % 100 == 0 or i == len(to_fetch):
-            print(f"  [{i}/{len(to_fetch)}] 성공={ok} 실패={fail}")
+        # 한도 초과로 미조회된 ISBN은 캐시하지 않음 (내일 재조회)
+        metas = {isbn: _item_to_meta(items[isbn]) for isbn in chunk if isbn in items}
+        cache.update(metas)
+        ok += sum(1 for m in metas.values() if m)
+        fail += sum(1 for m in metas.values() if not m)
 
-        if i % 100 == 0:
-            save_cache(cache)
+        done = start + len(chunk)
+        print(f"  [{done}/{len(to_fetch)}] 성공={ok} 실패={fail}")
 
-        time.sleep(API_INTERVAL)
+        if len(items) < len(chunk):
+            print(f"\n  모든 API 키 한도 초과! {ok + fail}/{len(to_fetch)}건에서 중단")
+            print(f"  내일 재실행하면 캐시된 {ok}건은 스킵됩니다")
+            break
 
-    save_cache(cache)
     print(f"  API 조회 완료: 성공 {ok}, 실패 {fail}")
     return cache
 
@@ -232,78 +259,36 @@ def batch_fetch_aladin(isbns: list[str], cache: dict, skip_api: bool = False) ->
 # 세트 상품 구성품 ISBN 검색
 # ════════════════════════════════════════
 
-def load_search_cache() -> dict:
-    if SEARCH_CACHE_FILE.exists():
-        with open(SEARCH_CACHE_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return {}
-
-
-def save_search_cache(cache: dict):
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    with open(SEARCH_CACHE_FILE, "w", encoding="utf-8") as f:
-        json.dump(cache, f, ensure_ascii=False, indent=2)
-
-
-KYOBO_HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-    "Accept-Language": "ko-KR,ko;q=0.9,en;q=0.8",
-}
+def load_search_cache():
+    """세트 구성품 검색어 → ISBN 캐시 (None = 이전 검색 실패)"""
+    return _open_cache(SEARCH_NAMESPACE, SEARCH_CACHE_FILE)
 
 
 def search_kyobo(keyword: str) -> str | None:
-    """교보문고 검색 → ISBN 추출 (검색 페이지 data-bid)"""
-    from urllib.parse import quote
-    try:
-        r = requests.get(
-            f"https://search.kyobobook.co.kr/search?keyword={quote(keyword)}&target=total",
-            headers=KYOBO_HEADERS, timeout=15,
-        )
-        r.raise_for_status()
-        m = re.search(r'data-bid="(\d{13})"', r.text)
-        if m and ISBN_PATTERN.match(m.group(1)):
-            return m.group(1)
-    except Exception:
-        pass
-    return None
+    """교보문고 검색 → ISBN (HttpCache 적중 시 요청 없음, 요청 오류는 raise)"""
+    return kyobo_search.search_isbn(keyword, raise_errors=True)
 
 
 def search_aladin_by_title(query: str) -> str | None:
-    """알라딘 키워드 검색 → 첫 번째 결과 ISBN13 반환"""
-    global _current_key_idx
-    tried = 0
-    while tried < len(TTB_KEYS):
-        key = TTB_KEYS[_current_key_idx]
-        try:
-            r = requests.get(
-                "http://www.aladin.co.kr/ttb/api/ItemSearch.aspx",
-                params={
-                    "ttbkey": key, "Query": query, "QueryType": "Title",
-                    "MaxResults": 1, "output": "js", "Version": "20131101",
-                },
-                timeout=15,
-            )
-            data = r.json()
-            if data.get("errorCode") == 10:
-                _current_key_idx = (_current_key_idx + 1) % len(TTB_KEYS)
-                tried += 1
-                continue
-            items = data.get("item", [])
-            if items:
-                raw = items[0].get("isbn13", "")
-                # ISBN 정규화 (float→int→str 변환)
-                return normalize_isbn(raw)
-            return None
-        except Exception:
-            return None
-    raise RateLimitError("모든 API 키 한도 초과")
+    """알라딘 제목 검색 → 첫 번째 결과 ISBN13 반환
+
+    Raises:
+        QuotaExhausted: 모든 키 한도 초과
+        Exception: 네트워크/HTTP 오류 (None = 실제로 결과 없음)
+    """
+    items = get_crawler().search_by_keyword(query, max_results=1, sort="Accuracy", query_type="Title",
+                                            raise_errors=True)
+    if items:
+        # ISBN 정규화 (float→int→str 변환)
+        return normalize_isbn(items[0].get("isbn", ""))
+    return None
 
 
 def is_set_product(name: str) -> bool:
     return any(k in name for k in SET_KEYWORDS)
 
 
+@lru_cache(maxsize=MEMO_SIZE)
 def clean_search_query(q: str) -> str:
     """알라딘 검색 전 쿼리 정리 — 노이즈 제거 + 간결화"""
     s = q.strip()
@@ -388,6 +373,15 @@ def clean_search_query(q: str) -> str:
 
 def parse_set_components(name: str) -> list[str]:
     """세트 상품명 → 구성품 검색 쿼리 리스트"""
+    return list(_parse_set_components(name))
+
+
+@lru_cache(maxsize=MEMO_SIZE)
+def _parse_set_components(name: str) -> tuple[str, ...]:
+    return tuple(_split_set_components(name))
+
+
+def _split_set_components(name: str) -> list[str]:
     # 기본 노이즈 제거
     s = re.sub(r"\(사은품\)|\(선물\)", "", name)
     # "사은품+" 접두사 제거 (뒤에 오는 내용 보존!)
@@ -519,86 +513,112 @@ def parse_set_components(name: str) -> list[str]:
     return [cleaned] if len(cleaned) > 5 else []
 
 
-def batch_search_set_isbns(set_targets: list, search_cache: dict,
+def search_set_queries(queries: dict, search_cache) -> dict:
+    """구성품 검색어 동시 조회 (알라딘 → 교보 fallback)
+
+    queries: {검색어 키: 검색어}
+    반환: {검색어 키: ISBN 또는 None}
+    결과는 API_CHUNK건마다 캐시에 한 트랜잭션으로 추가 (중단돼도 그때까지는 보존)
+    """
+    quota_out = threading.Event()
+    counts = {"aladin": 0, "kyobo": 0, "fail": 0}
+
+    def search(comp: str) -> tuple[str | None, str]:
+        """(ISBN, 출처) — 출처: aladin / kyobo / fail
+
+        fail(None 캐시)은 양쪽 모두 "결과 없음"을 응답했을 때만.
+        요청 오류가 있었으면 raise → 캐시하지 않고 다음 실행 때 재시도
+        """
+        aladin_error = None
+        # 1차: 알라딘 검색 (모든 키 한도 초과 후에는 바로 교보)
+        if not quota_out.is_set():
+            try:
+                isbn = search_aladin_by_title(comp)
+                if isbn:
+                    return isbn, "aladin"
+            except QuotaExhausted:
+                if not quota_out.is_set():
+                    quota_out.set()
+                    print(f"\n  알라딘 API 키 한도 초과! 교보문고로 전환")
+            except Exception as e:
+                aladin_error = e
+        # 2차: 교보문고 fallback (교보는 모듈 내부에서 요청 간격 유지)
+        isbn = search_kyobo(comp)
+        if isbn:
+            return isbn, "kyobo"
+        if aladin_error is not None:
+            raise aladin_error
+        return None, "fail"
+
+    found, pending = {}, {}
+    total = len(queries)
+    with ThreadPoolExecutor(max_workers=api_concurrency()) as pool:
+        futures = {pool.submit(search, comp): key for key, comp in queries.items()}
+        for i, future in enumerate(as_completed(futures), 1):
+            key = futures[future]
+            try:
+                isbn, source = future.result()
+            except Exception as e:
+                # 캐시하지 않음 → 다음 실행 때 재시도
+                print(f"    [오류] {queries[key][:30]}: {str(e)[:60]}")
+            else:
+                found[key] = pending[key] = isbn
+                counts[source] += 1
+            if len(pending) >= API_CHUNK:
+                search_cache.update(pending)
+                pending = {}
+            if i % 50 == 0 or i == total:
+                print(f"    [{i}/{total}] 알라딘={counts['aladin']} 교보={counts['kyobo']} 실패={counts['fail']}")
+    search_cache.update(pending)
+
+    print(f"  세트 ISBN 검색 완료: 알라딘 {counts['aladin']} + 교보 {counts['kyobo']} = "
+          f"{counts['aladin'] + counts['kyobo']}건, 실패 {counts['fail']}건")
+    return found
+
+
+def batch_search_set_isbns(set_targets: list, search_cache,
                            skip_api: bool = False) -> dict:
     """세트 상품 구성품 ISBN 일괄 검색
 
-    set_targets: [(df_idx, product_name), ...]
-    반환: {df_idx: [isbn1, isbn2, ...]}
+    set_targets: [(key, product_name), ...] — key는 df_idx 또는 (계정, df_idx)
+                 여러 계정을 한 번에 넘기면 같은 검색어는 한 번만 조회
+    반환: {key: [isbn1, isbn2, ...]} (구성품 순서 유지)
     """
-    result = {}
-    queries_needed = []
-
-    for df_idx, pname in set_targets:
-        components = parse_set_components(pname)
-        isbns = []
-        for comp in components:
+    plans = []      # [(key, [검색어 키, ...])]
+    known = {}      # 검색어 키 → 캐시 값
+    queries = {}    # 검색어 키 → 검색어 (조회 필요, 중복 제거)
+
+    def cached(comp_key: str) -> bool:
+        if comp_key not in known and comp_key in search_cache:
+            known[comp_key] = search_cache[comp_key]
+        return comp_key in known
+
+    for key, pname in set_targets:
+        comp_keys = []
+        for comp in parse_set_components(pname):
             comp_key = comp.strip().lower()
-            if comp_key in search_cache and search_cache[comp_key] is not None:
-                isbns.append(search_cache[comp_key])
-            elif comp_key not in search_cache:
-                # 새 쿼리
-                queries_needed.append((df_idx, comp, comp_key))
-            else:
+            if cached(comp_key) and known[comp_key] is None:
                 # 캐시에 None (이전 실패) → clean 버전으로 재시도
                 cleaned = clean_search_query(comp)
                 cleaned_key = cleaned.strip().lower()
-                if cleaned_key != comp_key and cleaned_key not in search_cache:
-                    queries_needed.append((df_idx, cleaned, cleaned_key))
-                elif cleaned_key in search_cache and search_cache[cleaned_key] is not None:
-                    isbns.append(search_cache[cleaned_key])
-        if isbns:
-            result[df_idx] = isbns
-
-    # 중복 쿼리 제거
-    seen_keys = set()
-    unique_queries = []
-    for item in queries_needed:
-        if item[2] not in seen_keys:
-            seen_keys.add(item[2])
-            unique_queries.append(item)
-    queries_needed = unique_queries
-
-    print(f"  세트 구성품: 조회 필요 {len(queries_needed)}건")
-
-    if skip_api or not queries_needed:
-        return result
-
-    aladin_ok, kyobo_ok, fail = 0, 0, 0
-    for i, (df_idx, comp, comp_key) in enumerate(queries_needed, 1):
-        isbn = None
-        # 1차: 알라딘 검색
-        try:
-            isbn = search_aladin_by_title(comp)
-        except RateLimitError:
-            print(f"\n  알라딘 API 키 한도 초과! 교보문고로 전환")
-
-        if isbn:
-            aladin_ok += 1
-        else:
-            # 2차: 교보문고 fallback
-            isbn = search_kyobo(comp)
-            if isbn:
-                kyobo_ok += 1
-            else:
-                fail += 1
-            time.sleep(0.3)  # 교보 rate limit
-
-        search_cache[comp_key] = isbn
-        if isbn:
-            result.setdefault(df_idx, []).append(isbn)
+                if cleaned_key == comp_key:
+                    continue
+                comp, comp_key = cleaned, cleaned_key
+            comp_keys.append(comp_key)
+            if not cached(comp_key):
+                queries.setdefault(comp_key, comp)
+        plans.append((key, comp_keys))
 
-        if i % 50 == 0 or i == len(queries_needed):
-            print(f"    [{i}/{len(queries_needed)}] 알라딘={aladin_ok} 교보={kyobo_ok} 실패={fail}")
+    print(f"  세트 구성품: 조회 필요 {len(queries)}건 (중복 제거, 캐시 {len(known)}건)")
 
-        if i % 100 == 0:
-            save_search_cache(search_cache)
+    if queries and not skip_api:
+        known.update(search_set_queries(queries, search_cache))
 
-        time.sleep(API_INTERVAL)
-
-    save_search_cache(search_cache)
-    total_ok = aladin_ok + kyobo_ok
-    print(f"  세트 ISBN 검색 완료: 알라딘 {aladin_ok} + 교보 {kyobo_ok} = {total_ok}건, 실패 {fail}건")
+    result = {}
+    for key, comp_keys in plans:
+        isbns = [known[k] for k in comp_keys if known.get(k)]
+        if isbns:
+            result[key] = isbns
     return result
 
 
@@ -606,6 +626,7 @@ def batch_search_set_isbns(set_targets: list, search_cache: dict,
 # 검색어 생성
 # ════════════════════════════════════════
 
+@lru_cache(maxsize=MEMO_SIZE)
 def generate_keywords(product_name: str, brand: str = "",
                       author: str = "", series: str = "",
                       max_kw: int = 8) -> str:
@@ -672,6 +693,7 @@ def generate_keywords(product_name: str, brand: str = "",
 YEAR_PATTERN = re.compile(r"(?:^|\D)(202[3-9])(?:년|\)|$|\s|\D)")
 
 
+@lru_cache(maxsize=MEMO_SIZE)
 def extract_year(product_name: str, pub_date: str = "") -> str:
     m = YEAR_PATTERN.search(product_name)
     if m:
@@ -741,14 +763,51 @@ def clean_product_name(name: str) -> str:
 # 엑셀 생성 (원본 파일 복사 → in-place 수정)
 # ════════════════════════════════════════
 
+def build_row_values(product_name: str, brand: str, meta: dict | None) -> dict:
+    """대상 행 1건의 수정 값 (제조사/검색어/사용연도/발행언어 등)"""
+    if meta is None:
+        meta = {"author": "", "publisher": brand, "pubDate": "",
+                "seriesName": "", "categoryName": ""}
+    publisher = meta.get("publisher", "") or brand
+    author = meta.get("author", "") or ""
+    series = meta.get("seriesName", "") or ""
+    return {
+        "publisher": publisher,
+        "author": author,
+        "series": series,
+        "keywords": generate_keywords(product_name, brand=publisher, author=author, series=series),
+        "year": extract_year(product_name, meta.get("pubDate", "") or ""),
+        "language": detect_language(meta.get("categoryName", "")),
+    }
+
+
+def _build_chunk(items: list) -> list:
+    """[(product_name, brand, meta)] → [행 값] (프로세스 풀 워커, 워커별로 메모 유지)"""
+    return [build_row_values(*item) for item in items]
+
+
+def build_all_row_values(items: list, workers: int | None = None) -> list:
+    """대상 행 전체의 수정 값 (ROW_CHUNK 단위, 많으면 프로세스 풀로 분산, 입력 순서 유지)"""
+    workers = workers or os.cpu_count() or 1
+    chunks = [items[i:i + ROW_CHUNK] for i in range(0, len(items), ROW_CHUNK)]
+    if workers <= 1 or len(items) < MIN_PARALLEL:
+        return [v for chunk in chunks for v in _build_chunk(chunk)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [v for values in pool.map(_build_chunk, chunks) for v in values]
+
+
 def process_account(account: str, filled_path: str, target_rows: list,
                     cache: dict, output_dir: Path, dry_run: bool = False,
-                    set_isbns: dict = None) -> int:
+                    set_isbns: dict = None, workers: int | None = None) -> int:
     """원본 _filled.xlsx를 그대로 복사 → 판매중+바코드 행만 셀 수정
 
     서식(색상, 간격, 열너비) 100% 보존.
     target_rows: [(df_idx, isbn), ...] — pandas 인덱스(0-based)와 ISBN 쌍
     set_isbns: {df_idx: [isbn1, isbn2, ...]} — 세트상품 구성품 ISBN
+
+    1) 시트에서 대상 행의 상품명/브랜드 수집 + 메타 캐시 조회 (ISBN당 1번)
+    2) 행 값 계산 (build_all_row_values: chunk 단위, 프로세스 풀)
+    3) 셀 기록 후 저장
     """
     if not target_rows and not set_isbns:
         print(f"  {account}: 대상 없음 → 건너뜀")
@@ -779,32 +838,28 @@ def process_account(account: str, filled_path: str, target_rows: list,
     target_set = {df_idx: isbn for df_idx, isbn in target_rows}
 
     # 전체 행 col8(대량수정)을 "N"으로 초기화 (이전 스크립트의 잔여 Y 제거)
-    for r in range(DATA_START_ROW, ws.max_row + 1):
-        if ws.cell(row=r, column=8).value == "Y":
-            ws.cell(row=r, column=8, value="N")
+    for (flag_cell,) in ws.iter_rows(min_row=DATA_START_ROW, min_col=8, max_col=8):
+        if flag_cell.value == "Y":
+            flag_cell.value = "N"
 
-    # 대상 행만 수정
-    modified = 0
+    # 1) 대상 행 입력 수집 (메타는 ISBN당 한 번만 조회)
+    metas = {isbn: cache.get(isbn) for isbn in dict.fromkeys(isbn for _, isbn in target_rows)}
+    items = []
     for df_idx, isbn in target_rows:
         excel_row = DATA_START_ROW + df_idx
-
-        # 상품명 (col2)
         product_name = str(ws.cell(row=excel_row, column=2).value or "").strip()
         brand = str(ws.cell(row=excel_row, column=6).value or "").strip()
+        items.append((product_name, brand, metas[isbn]))
 
-        # 알라딘 메타
-        meta = cache.get(isbn)
-        if meta is None:
-            meta = {"author": "", "publisher": brand, "pubDate": "",
-                    "seriesName": "", "categoryName": ""}
+    # 2) 행 값 계산
+    values = build_all_row_values(items, workers=workers)
 
-        publisher = meta.get("publisher", "") or brand
-        author = meta.get("author", "")
-        series = meta.get("seriesName", "")
-        pub_date = meta.get("pubDate", "")
-        category = meta.get("categoryName", "")
-        year = extract_year(product_name, pub_date)
-        language = detect_language(category)
+    # 3) 대상 행만 수정
+    modified = 0
+    for (df_idx, isbn), v in zip(target_rows, values):
+        excel_row = DATA_START_ROW + df_idx
+        publisher, author, series = v["publisher"], v["author"], v["series"]
+        year, language = v["year"], v["language"]
 
         # ── 셀 수정 ──
         # col2(등록상품명), col3(노출상품명): 원본 유지 (건드리지 않음)
@@ -813,8 +868,7 @@ def process_account(account: str, filled_path: str, target_rows: list,
         # col6: 브랜드
         ws.cell(row=excel_row, column=6, value=publisher)
         # col7: 검색어
-        kw = generate_keywords(product_name, brand=publisher, author=author, series=series)
-        ws.cell(row=excel_row, column=7, value=kw)
+        ws.cell(row=excel_row, column=7, value=v["keywords"])
         # col8: 대량상품수정
         ws.cell(row=excel_row, column=8, value="Y")
         # col231: 바코드 (텍스트 포맷 필수 — General이면 Excel이 과학적 표기법으로 변환)
@@ -905,33 +959,34 @@ def process_account(account: str, filled_path: str, target_rows: list,
 # ════════════════════════════════════════
 
 def collect_isbns_pandas(targets: dict) -> tuple[set, dict, dict]:
-    """pandas로 빠르게 ISBN 수집 + 계정별 대상 행 인덱스 + 세트 타겟"""
+    """pandas로 빠르게 ISBN 수집 + 계정별 대상 행 인덱스 + 세트 타겟
+
+    필요한 3개 열(상품명/판매상태/바코드)만 읽고, 필터·ISBN 정규화는 열 단위로 처리.
+    """
     all_isbns = set()
     account_targets = {}  # acc → [(df_idx, isbn), ...]
     account_set_targets = {}  # acc → [(df_idx, product_name), ...]
+    set_pattern = "|".join(map(re.escape, SET_KEYWORDS))
 
     for acc, path in targets.items():
         if not os.path.exists(path):
             continue
         print(f"    {acc} 스캔 중...")
-        df = pd.read_excel(path, sheet_name=SHEET, header=3)
-        cols = df.columns.tolist()
-        # cols[9]=판매상태, cols[230]=바코드
-        rows = []
-        set_rows = []
-        for idx in df.index:
-            if df.at[idx, cols[9]] != "판매중":
-                continue
-            pname = str(df.at[idx, cols[1]]) if pd.notna(df.at[idx, cols[1]]) else ""
-            if not pname.strip():
-                continue
-            isbn = normalize_isbn(df.at[idx, cols[230]])
-            if isbn:
-                rows.append((idx, isbn))
-                all_isbns.add(isbn)
-            elif is_set_product(pname):
-                # 바코드 없는 세트상품 → ISBN 검색 대상
-                set_rows.append((idx, pname))
+        df = pd.read_excel(path, sheet_name=SHEET, header=3,
+                           usecols=[COL_NAME, COL_STATUS, COL_BARCODE])
+        name_col, status_col, barcode_col = df.columns
+        names = df[name_col].where(df[name_col].notna(), "").astype(str)
+        selling = df[(df[status_col] == "판매중") & (names.str.strip() != "")]
+        names = names[selling.index]
+        isbns = normalize_isbn_series(selling[barcode_col])
+
+        has_isbn = isbns.notna()
+        # 바코드 없는 세트상품 → ISBN 검색 대상
+        is_set = ~has_isbn & names.str.contains(set_pattern, regex=True)
+        rows = list(zip(isbns.index[has_isbn].tolist(), isbns[has_isbn].tolist()))
+        set_rows = list(zip(names.index[is_set].tolist(), names[is_set].tolist()))
+        all_isbns.update(isbn for _, isbn in rows)
+
         account_targets[acc] = rows
         account_set_targets[acc] = set_rows
         print(f"    {acc}: {len(rows)}건 (바코드), 세트 {len(set_rows)}건 (ISBN 검색 대상)")
@@ -944,6 +999,7 @@ def main():
     parser.add_argument("--account", help="특정 계정만")
     parser.add_argument("--skip-api", action="store_true", help="API 호출 스킵 (캐시만)")
     parser.add_argument("--dry-run", action="store_true", help="테스트 (파일 생성 안 함)")
+    parser.add_argument("--workers", type=int, default=None, help="행 값 계산 프로세스 수 (기본: CPU 수)")
     args = parser.parse_args()
 
     print("=" * 60)
@@ -969,20 +1025,21 @@ def main():
     miss = len(all_isbns) - hit
     print(f"  메타데이터 보유: {hit}건, 미보유(fallback): {miss}건")
 
-    # Step 3: 세트상품 구성품 ISBN 검색
+    # Step 3: 세트상품 구성품 ISBN 검색 (전 계정 한 번에 → 같은 검색어는 한 번만 조회)
     all_set_isbns = {}  # acc → {df_idx: [isbn1, isbn2, ...]}
     if total_sets > 0:
         print(f"\n[Step 3] 세트상품 구성품 ISBN 검색")
         search_cache = load_search_cache()
+        set_targets = [((acc, df_idx), pname)
+                       for acc, set_rows in account_set_targets.items()
+                       for df_idx, pname in set_rows]
+        found_isbns = batch_search_set_isbns(set_targets, search_cache, skip_api=args.skip_api)
+        for (acc, df_idx), isbns in found_isbns.items():
+            all_set_isbns.setdefault(acc, {})[df_idx] = isbns
         for acc, set_rows in account_set_targets.items():
-            if not set_rows:
-                continue
-            print(f"\n  {acc}: {len(set_rows)}건 세트상품 분석")
-            acc_set_isbns = batch_search_set_isbns(set_rows, search_cache, skip_api=args.skip_api)
-            all_set_isbns[acc] = acc_set_isbns
-            found = sum(1 for v in acc_set_isbns.values() if v)
-            print(f"    ISBN 발견: {found}/{len(set_rows)}건")
-        save_search_cache(search_cache)
+            if set_rows:
+                found = len(all_set_isbns.get(acc, {}))
+                print(f"    {acc}: ISBN 발견 {found}/{len(set_rows)}건")
     else:
         print(f"\n[Step 3] 세트상품 없음 → 건너뜀")
 
@@ -994,7 +1051,7 @@ def main():
         rows = account_targets.get(acc, [])
         set_isbns = all_set_isbns.get(acc, {})
         count = process_account(acc, path, rows, cache, OUTPUT_DIR,
-                                dry_run=args.dry_run, set_isbns=set_isbns)
+                                dry_run=args.dry_run, set_isbns=set_isbns, workers=args.workers)
         grand_total += count
 
     print(f"\n{'=' * 60}")
@@ -36,6 +36,7 @@ load_dotenv()
 from app.database import SessionLocal, init_db
 from app.models.account import Account
 from app.models.listing import Listing
+from app.services.listing_isbns import rebuild_listing_isbns
 from auto_logger import task_context
 from obsidian_logger import ObsidianLogger
 
@@ -82,13 +83,89 @@ def find_column(header, candidates):
     return None
 
 
+def _cell_str(value) -> str:
+    """Excel 셀 값 → CSV와 같은 문자열 (정수형 float는 소수점 제거)"""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _parse_product_rows(header, rows):
+    """
+    헤더 + 행(문자열 리스트) 스트림 → 상품 리스트
+
+    Returns:
+        [{isbn, product_name, sale_price}, ...] (ISBN 컬럼이 없으면 None)
+    """
+    # 컬럼 인덱스 찾기
+    isbn_idx = find_column(header, ISBN_COLUMN_CANDIDATES)
+    name_idx = find_column(header, NAME_COLUMN_CANDIDATES)
+    price_idx = find_column(header, PRICE_COLUMN_CANDIDATES)
+
+    if isbn_idx is None:
+        logger.warning(f"ISBN 컬럼을 찾을 수 없습니다. 헤더: {header[:15]}")
+        # 모든 컬럼명 출력
+        for i, col in enumerate(header):
+            logger.info(f"  [{i}] {col}")
+        return None
+
+    logger.info(f"ISBN 컬럼: [{isbn_idx}] {header[isbn_idx]}")
+    if name_idx is not None:
+        logger.info(f"상품명 컬럼: [{name_idx}] {header[name_idx]}")
+    if price_idx is not None:
+        logger.info(f"판매가 컬럼: [{price_idx}] {header[price_idx]}")
+
+    products = []
+    for row in rows:
+        if len(row) <= isbn_idx:
+            continue
+
+        isbn = row[isbn_idx].strip()
+        if not isbn:
+            continue
+
+        # ISBN 형식 검증 (숫자 10~13자리 또는 K로 시작하는 알라딘 코드)
+        if not (isbn.isdigit() and 10 <= len(isbn) <= 13) and not isbn.startswith("K"):
+            continue
+
+        product = {
+            "isbn": isbn,
+            "product_name": row[name_idx].strip() if name_idx and len(row) > name_idx else "",
+            "sale_price": 0,
+        }
+
+        if price_idx and len(row) > price_idx:
+            try:
+                product["sale_price"] = int(row[price_idx].replace(",", "").strip())
+            except (ValueError, AttributeError):
+                pass
+
+        products.append(product)
+
+    return products
+
+
 def parse_coupang_csv(filepath):
     """
-    쿠팡 상품목록 CSV 파싱
+    쿠팡 상품목록 CSV / xlsx 파싱
+
+    xlsx(WING 일괄 내보내기)는 read_only 스트리밍으로 읽어 파일 크기와 무관하게 메모리 일정.
 
     Returns:
         [{isbn, product_name, sale_price, coupang_product_id}, ...]
     """
+    if Path(filepath).suffix.lower() in (".xlsx", ".xlsm"):
+        from app.services.excel_reader import iter_rows
+        try:
+            rows = ([_cell_str(v) for v in row] for row in iter_rows(filepath))
+            header = next(rows, [])
+            return _parse_product_rows(header, rows) or []
+        except Exception as e:
+            logger.error(f"Excel 파싱 오류: {e}")
+            return []
+
     products = []
 
     # 인코딩 자동 감지 (쿠팡은 보통 cp949 또는 utf-8-sig)
@@ -98,50 +175,12 @@ def parse_coupang_csv(filepath):
                 reader = csv.reader(f)
                 header = next(reader)
 
-                # 컬럼 인덱스 찾기
-                isbn_idx = find_column(header, ISBN_COLUMN_CANDIDATES)
-                name_idx = find_column(header, NAME_COLUMN_CANDIDATES)
-                price_idx = find_column(header, PRICE_COLUMN_CANDIDATES)
-
-                if isbn_idx is None:
-                    logger.warning(f"ISBN 컬럼을 찾을 수 없습니다. 헤더: {header[:15]}")
-                    # 모든 컬럼명 출력
-                    for i, col in enumerate(header):
-                        logger.info(f"  [{i}] {col}")
+                parsed = _parse_product_rows(header, reader)
+                if parsed is None:
                     return []
 
                 logger.info(f"인코딩: {encoding}")
-                logger.info(f"ISBN 컬럼: [{isbn_idx}] {header[isbn_idx]}")
-                if name_idx is not None:
-                    logger.info(f"상품명 컬럼: [{name_idx}] {header[name_idx]}")
-                if price_idx is not None:
-                    logger.info(f"판매가 컬럼: [{price_idx}] {header[price_idx]}")
-
-                for row in reader:
-                    if len(row) <= isbn_idx:
-                        continue
-
-                    isbn = row[isbn_idx].strip()
-                    if not isbn:
-                        continue
-
-                    # ISBN 형식 검증 (숫자 10~13자리 또는 K로 시작하는 알라딘 코드)
-                    if not (isbn.isdigit() and 10 <= len(isbn) <= 13) and not isbn.startswith("K"):
-                        continue
-
-                    product = {
-                        "isbn": isbn,
-                        "product_name": row[name_idx].strip() if name_idx and len(row) > name_idx else "",
-                        "sale_price": 0,
-                    }
-
-                    if price_idx and len(row) > price_idx:
-                        try:
-                            product["sale_price"] = int(row[price_idx].replace(",", "").strip())
-                        except (ValueError, AttributeError):
-                            pass
-
-                    products.append(product)
+                products = parsed
 
             break  # 성공하면 루프 종료
 
@@ -179,6 +218,7 @@ def import_to_db(account_name, products):
 
         imported = 0
         skipped = 0
+        new_listings = []
 
         for product in products:
             isbn = product["isbn"]
@@ -201,8 +241,13 @@ def import_to_db(account_name, products):
                 coupang_status="active",    # 이미 활성 상태
             )
             db.add(listing)
+            new_listings.append(listing)
             imported += 1
 
+        # 신규 리스팅 ID 확정 → listing_isbns 같은 트랜잭션에서 반영
+        db.flush()
+        if new_listings:
+            rebuild_listing_isbns(db, listing_ids=[l.id for l in new_listings])
         db.commit()
 
         logger.info(f"\n{account_name} import 완료:")
@@ -283,7 +328,7 @@ def import_batch():
     for i, acc in enumerate(accounts, 1):
         print(f"  {i}. {acc.account_name}")
 
-    print(f"\n각 계정별로 쿠팡에서 다운로드한 CSV 파일 경로를 입력하세요.")
+    print(f"\n각 계정별로 쿠팡에서 다운로드한 CSV(xlsx) 파일 경로를 입력하세요.")
     print(f"(건너뛰려면 Enter)")
 
     for acc in accounts:
@@ -349,7 +394,7 @@ def main():
     )
     parser.add_argument(
         "--file",
-        help="쿠팡에서 다운로드한 CSV 파일 경로"
+        help="쿠팡에서 다운로드한 CSV 또는 xlsx 파일 경로"
     )
     parser.add_argument(
         "--batch",
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+listing_isbns 재구성
+====================
+listings.isbn(쉼표 구분)을 listing_isbns 행으로 다시 펼침.
+최초 생성 시, 또는 스크립트로 listings.isbn을 직접 수정한 뒤 실행.
+
+사용법:
+    python scripts/rebuild_listing_isbns.py                  # 전체
+    python scripts/rebuild_listing_isbns.py --account 007-ez # 특정 계정만
+    python scripts/rebuild_listing_isbns.py --isbn 9788961057455  # 조회만
+"""
+import argparse
+import io
+import logging
+import sys
+from pathlib import Path
+
+# Windows cp949 인코딩 대응
+if sys.platform == "win32":
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8")
+
+# 프로젝트 루트 경로 추가
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import text
+
+from app.database import engine
+from app.services.listing_isbns import ensure_table, listings_for_isbn, rebuild_listing_isbns
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="listings.isbn → listing_isbns 재구성")
+    parser.add_argument("--account", type=str, help="계정명 (없으면 전체)")
+    parser.add_argument("--isbn", type=str, help="재구성 없이 해당 ISBN이 포함된 리스팅 조회")
+    args = parser.parse_args()
+
+    with engine.begin() as conn:
+        ensure_table(conn)
+
+        if args.isbn:
+            rows = listings_for_isbn(conn, args.isbn)
+            print(f"{args.isbn}: 리스팅 {len(rows)}개")
+            for r in rows:
+                kind = f"세트 {r['isbn_count']}권 중 {r['position'] + 1}번째" if r["isbn_count"] > 1 else "단권"
+                print(f"  account={r['account_id']} listing={r['listing_id']} ({kind})")
+            return
+
+        account_id = None
+        if args.account:
+            row = conn.execute(text("SELECT id FROM accounts WHERE account_name = :n"),
+                               {"n": args.account}).first()
+            if not row:
+                print(f"계정을 찾을 수 없음: {args.account}")
+                return
+            account_id = row[0]
+
+        saved = rebuild_listing_isbns(conn, account_id=account_id)
+        print(f"listing_isbns: {saved:,}행 저장")
+
+
+if __name__ == "__main__":
+    main()
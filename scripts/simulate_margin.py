@@ -0,0 +1,100 @@
+"""
+마진 What-if 시뮬레이션 CLI
+===========================
+수수료율 / 택배비 / 출판사 공급률 변경 시 순마진 음수 전환 도서·리스팅 집계.
+
+사용법:
+    python scripts/simulate_margin.py --fee-rates 0.11,0.12,0.13
+    python scripts/simulate_margin.py --shipping-costs 2300,2500,2800 --by account
+    python scripts/simulate_margin.py --supply-rate 개념원리=0.67 --by shipping_policy
+    python scripts/simulate_margin.py --supply-deltas 0,0.01,0.02 --show-flipped 20
+"""
+import sys
+import argparse
+import logging
+from pathlib import Path
+
+import pandas as pd
+
+# Windows cp949 출력 인코딩 문제 방지
+if sys.stdout.encoding != "utf-8":
+    sys.stdout.reconfigure(encoding="utf-8")
+if sys.stderr.encoding != "utf-8":
+    sys.stderr.reconfigure(encoding="utf-8")
+
+# 프로젝트 루트
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from app.database import get_engine_for_db
+from analyzers.margin_simulator import MarginSimulator, GROUP_COLUMNS, build_grid
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def _float_list(value: str):
+    return [float(v) for v in value.split(",") if v.strip()]
+
+
+def _int_list(value: str):
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def _parse_supply_rates(items):
+    """["출판사=0.65", ...] → {"출판사": 0.65}"""
+    rates = {}
+    for item in items or []:
+        name, _, rate = item.rpartition("=")
+        if not name:
+            raise SystemExit(f"--supply-rate 형식 오류: {item} (예: 개념원리=0.67)")
+        rates[name.strip()] = float(rate)
+    return rates
+
+
+def main():
+    parser = argparse.ArgumentParser(description="마진 What-if 시뮬레이션")
+    parser.add_argument("--fee-rates", type=_float_list, help="수수료율 목록 (예: 0.11,0.12)")
+    parser.add_argument("--shipping-costs", type=_int_list, help="택배비 목록 (예: 2300,2500)")
+    parser.add_argument("--supply-deltas", type=_float_list, help="전체 공급률 가감 목록 (예: 0,0.02)")
+    parser.add_argument("--supply-rate", action="append", metavar="출판사=공급률",
+                        help="출판사 공급률 지정 (여러 번 사용 가능)")
+    parser.add_argument("--by", choices=list(GROUP_COLUMNS), default="publisher", help="집계 기준")
+    parser.add_argument("--top", type=int, default=20, help="시나리오별 표시 그룹 수")
+    parser.add_argument("--show-flipped", type=int, default=0, help="음수 전환 행 N개 출력")
+    args = parser.parse_args()
+
+    scenarios = build_grid(args.fee_rates, args.shipping_costs, args.supply_deltas,
+                           _parse_supply_rates(args.supply_rate))
+
+    simulator = MarginSimulator(get_engine_for_db())
+    result = simulator.simulate(scenarios)
+    if result.empty:
+        print("시뮬레이션 대상 도서가 없습니다.")
+        return
+
+    summary = simulator.summarize(result, by=args.by)
+    pd.set_option("display.width", 200)
+    pd.set_option("display.max_columns", 20)
+
+    for scenario in summary["scenario"].unique():
+        rows = result[result["scenario"] == scenario]
+        print("\n" + "=" * 70)
+        print(f"[{scenario}]")
+        print(f"  대상 {len(rows):,}행 | 순마진 합계 {int(rows['base_net_margin'].sum()):,} → "
+              f"{int(rows['net_margin'].sum()):,}원 | 음수 전환 {int(rows['flipped_negative'].sum()):,}행 "
+              f"| 양수 전환 {int(rows['flipped_positive'].sum()):,}행")
+        print("=" * 70)
+        group = summary[summary["scenario"] == scenario].drop(columns="scenario")
+        print(group.head(args.top).to_string(index=False))
+
+        if args.show_flipped:
+            flipped = simulator.flipped_rows(result, scenario).head(args.show_flipped)
+            if not flipped.empty:
+                print("\n  [음수 전환 상위]")
+                print(flipped[["isbn", "title", "publisher", "account_name",
+                               "base_net_margin", "net_margin"]].to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+-- 제목/상품명 trigram 유사도 검색 (app/services/trigram_search.py)
+-- Supabase Dashboard → SQL Editor에서 이 파일 전체를 붙여넣고 한 번 실행하세요.
+-- "relation ... does not exist" 나오면 public 대신 api 사용: 아래 모든 public. 을 api. 로 바꾼 뒤 다시 실행.
+-- 테이블이 크면 인덱스 생성에 수십 초 걸릴 수 있음 (CONCURRENTLY는 SQL Editor 트랜잭션에서 불가)
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- books.title: 상품명 → 도서 유사도 매칭
+CREATE INDEX IF NOT EXISTS ix_books_title_trgm ON public.books USING gin (title gin_trgm_ops);
+
+-- listings.product_name: 다른 계정 ISBN 복사, 상품 목록 검색 (LIKE '%..%' 부분일치도 이 인덱스 사용)
+CREATE INDEX IF NOT EXISTS ix_listings_product_name_trgm ON public.listings USING gin (product_name gin_trgm_ops);
@@ -1,6 +1,9 @@
 -- Coupong Supabase PostgreSQL Schema
 -- Supabase Dashboard → SQL Editor에서 실행하세요
 
+-- 0. 확장 (제목/상품명 trigram 유사도 검색)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 -- 1. 기본 테이블 (FK 없음)
 CREATE TABLE IF NOT EXISTS accounts (
     id SERIAL PRIMARY KEY,
@@ -386,6 +389,71 @@ CREATE TABLE IF NOT EXISTS ad_performances (
     CONSTRAINT uix_ad_perf_unique UNIQUE (account_id, ad_date, campaign_id, ad_group_name, coupang_product_id, keyword, report_type)
 );
 
+CREATE TABLE IF NOT EXISTS listing_scores (
+    listing_id INTEGER PRIMARY KEY REFERENCES listings(id),
+    account_id INTEGER NOT NULL REFERENCES accounts(id),
+    period_days INTEGER NOT NULL DEFAULT 14,
+    sales_velocity_score FLOAT DEFAULT 50,
+    ad_efficiency_score FLOAT DEFAULT 50,
+    stock_health_score FLOAT DEFAULT 50,
+    shipping_score FLOAT DEFAULT 50,
+    overall_score FLOAT DEFAULT 0,
+    grade VARCHAR(2),
+    top_action VARCHAR(50),
+    computed_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS listing_isbns (
+    listing_id INTEGER NOT NULL REFERENCES listings(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    isbn TEXT NOT NULL,
+    PRIMARY KEY (listing_id, position)
+);
+
+CREATE TABLE IF NOT EXISTS isbn_resolutions (
+    listing_id INTEGER PRIMARY KEY REFERENCES listings(id) ON DELETE CASCADE,
+    isbn TEXT NOT NULL,
+    confidence FLOAT NOT NULL,
+    sources VARCHAR(50),
+    candidates INTEGER DEFAULT 0,
+    applied BOOLEAN DEFAULT false,
+    resolved_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS isbn_coverage (
+    account_id INTEGER PRIMARY KEY REFERENCES accounts(id) ON DELETE CASCADE,
+    total INTEGER DEFAULT 0,
+    with_isbn INTEGER DEFAULT 0,
+    set_listings INTEGER DEFAULT 0,
+    needs_review INTEGER DEFAULT 0,
+    strategy_filled TEXT,
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS ingested_files (
+    file_hash VARCHAR(64) NOT NULL,
+    account_id INTEGER NOT NULL REFERENCES accounts(id),
+    report_type VARCHAR(30) NOT NULL,
+    file_name VARCHAR(300),
+    file_size BIGINT DEFAULT 0,
+    rows_parsed INTEGER DEFAULT 0,
+    rows_saved INTEGER DEFAULT 0,
+    period VARCHAR(50),
+    parse_seconds REAL DEFAULT 0,
+    save_seconds REAL DEFAULT 0,
+    ingested_at TIMESTAMP DEFAULT NOW(),
+    PRIMARY KEY (file_hash, account_id, report_type)
+);
+
+CREATE TABLE IF NOT EXISTS crawl_watermarks (
+    scope VARCHAR(30) NOT NULL,
+    key VARCHAR(100) NOT NULL,
+    last_pub_date DATE,
+    last_isbn VARCHAR(20),
+    updated_at TIMESTAMP DEFAULT NOW(),
+    PRIMARY KEY (scope, key)
+);
+
 -- 인덱스
 CREATE INDEX IF NOT EXISTS idx_books_isbn ON books(isbn);
 CREATE INDEX IF NOT EXISTS idx_books_publisher ON books(publisher_id);
@@ -399,3 +467,7 @@ CREATE INDEX IF NOT EXISTS idx_listings_status ON listings(coupang_status);
 CREATE INDEX IF NOT EXISTS idx_orders_account ON orders(account_id);
 CREATE INDEX IF NOT EXISTS idx_revenue_account ON revenue_history(account_id);
 CREATE INDEX IF NOT EXISTS idx_returns_account ON return_requests(account_id);
+CREATE INDEX IF NOT EXISTS ix_listing_scores_account ON listing_scores(account_id, overall_score);
+CREATE INDEX IF NOT EXISTS ix_listing_isbns_isbn ON listing_isbns(isbn, listing_id);
+CREATE INDEX IF NOT EXISTS ix_books_title_trgm ON books USING gin (title gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS ix_listings_product_name_trgm ON listings USING gin (product_name gin_trgm_ops);
@@ -23,10 +23,12 @@ import sys
 import re
 import argparse
 import logging
-from datetime import datetime, date
+import time
+from datetime import date
 from pathlib import Path
 from typing import List, Optional, Tuple, Dict
 
+import numpy as np
 import pandas as pd
 from sqlalchemy import text
 
@@ -35,6 +37,9 @@ ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(ROOT))
 
 from app.database import get_engine_for_db
+from app.services.excel_reader import iter_frames
+from app.services.ingestion_ledger import IngestionLedger, file_hash
+from app.services.parallel_ingest import ProgressFn, default_workers, run_pipeline
 
 from dotenv import load_dotenv
 load_dotenv(ROOT / ".env")
@@ -204,6 +209,38 @@ ATTRIBUTION_BASE = {
 }
 
 
+# ── 파싱 결과 컬럼 (순서 = parse_excel 결과 DataFrame 컬럼 순서) ──
+STR_FIELDS = [
+    "campaign_id", "campaign_name", "ad_group_name", "coupang_product_id", "product_name",
+    "keyword", "match_type",
+]
+METRIC_INT_FIELDS = ["impressions", "clicks", "avg_cpc", "ad_spend"]
+# 기여 기간 필드: 14일(접미사 없음) 값이 비어 있으면(0/빈 문자열) _1d 값 사용
+ATTRIBUTION_INT_FIELDS = [
+    "direct_orders", "direct_revenue", "indirect_orders", "indirect_revenue",
+    "total_orders", "total_revenue",
+]
+QUANTITY_FIELDS = ["total_quantity", "direct_quantity", "indirect_quantity"]
+EXTRA_STR_FIELDS = [
+    "bid_type", "sales_method", "ad_type", "option_id",
+    "ad_name", "placement", "creative_id", "category",
+]
+ROW_FIELDS = (
+    ["ad_date"] + STR_FIELDS
+    + ["impressions", "clicks", "ctr", "avg_cpc", "ad_spend"]
+    + ATTRIBUTION_INT_FIELDS + ["roas"] + QUANTITY_FIELDS
+    + EXTRA_STR_FIELDS + ["report_type"]
+)
+
+# 날짜 문자열 형식 (위에서부터 우선 적용)
+DATE_PATTERNS = [
+    r"^(\d{4})-(\d{1,2})-(\d{1,2})",           # YYYY-MM-DD
+    r"^(\d{4})/(\d{1,2})/(\d{1,2})",           # YYYY/MM/DD
+    r"(\d{4})년\s*(\d{1,2})월\s*(\d{1,2})일",   # YYYY년 MM월 DD일
+    r"^(\d{4})(\d{2})(\d{2})$",                # YYYYMMDD
+]
+
+
 class AdPerformanceSync:
     """광고 성과 보고서 Excel 파싱 + DB 저장"""
 
@@ -256,6 +293,9 @@ class AdPerformanceSync:
         "CREATE INDEX IF NOT EXISTS ix_adperf_product ON ad_performances(coupang_product_id)",
     ]
 
+    # Excel 스트리밍 청크 크기 (행)
+    CHUNK_SIZE = 20_000
+
     # 기존 테이블에 새 컬럼 추가 (ALTER TABLE 마이그레이션)
     MIGRATION_COLUMNS = [
         ("total_quantity", "INTEGER DEFAULT 0"),
@@ -271,8 +311,12 @@ class AdPerformanceSync:
         ("category", "VARCHAR(200) DEFAULT ''"),
     ]
 
+    # 적재 원장(ingested_files)의 보고서 종류
+    LEDGER_TYPE = "ad_performance"
+
     def __init__(self, db_path: str = None):
         self.engine = get_engine_for_db(db_path)
+        self.ledger = IngestionLedger(self.engine)
         self._ensure_table()
 
     def _ensure_table(self):
@@ -288,65 +332,87 @@ class AdPerformanceSync:
             conn.commit()
         logger.info("ad_performances 테이블 확인 완료")
 
-    def _safe_int(self, val) -> int:
-        """안전한 정수 변환"""
-        if val is None or (isinstance(val, float) and pd.isna(val)):
-            return 0
-        try:
-            # 쉼표 제거 후 변환
-            s = str(val).replace(",", "").replace("원", "").strip()
-            if not s or s == "-":
-                return 0
-            return int(float(s))
-        except (ValueError, TypeError):
-            return 0
+    # ── 컬럼 단위 변환 ──
 
-    def _safe_float(self, val) -> float:
-        """안전한 실수 변환"""
-        if val is None or (isinstance(val, float) and pd.isna(val)):
-            return 0.0
-        try:
-            s = str(val).replace(",", "").replace("%", "").strip()
-            if not s or s == "-":
-                return 0.0
-            return float(s)
-        except (ValueError, TypeError):
-            return 0.0
-
-    def _safe_str(self, val) -> str:
+    @staticmethod
+    def _text_col(s: pd.Series) -> pd.Series:
+        """NaN/None → "" 후 문자열 변환 + 공백 제거"""
+        return s.astype(object).where(s.notna(), "").astype(str).str.strip()
+
+    @classmethod
+    def _num_col(cls, s: pd.Series, strip_chars: Tuple[str, ...]) -> pd.Series:
+        """숫자 변환 (쉼표/단위 제거, 변환 불가·빈 값·"-" → 0)"""
+        if pd.api.types.is_numeric_dtype(s) and not pd.api.types.is_bool_dtype(s):
+            num = s.astype(float)
+        else:
+            txt = cls._text_col(s)
+            for ch in strip_chars:
+                txt = txt.str.replace(ch, "", regex=False)
+            num = pd.to_numeric(txt.str.strip(), errors="coerce").astype(float)
+        return num.replace([np.inf, -np.inf], np.nan).fillna(0.0)
+
+    @classmethod
+    def _int_col(cls, s: pd.Series) -> pd.Series:
+        """안전한 정수 변환 (소수점 이하 절사)"""
+        return np.trunc(cls._num_col(s, (",", "원"))).astype(np.int64)
+
+    @classmethod
+    def _float_col(cls, s: pd.Series) -> pd.Series:
+        """안전한 실수 변환 (% 제거)"""
+        return cls._num_col(s, (",", "%"))
+
+    @classmethod
+    def _str_col(cls, s: pd.Series) -> pd.Series:
         """안전한 문자열 변환 (nan 처리 포함)"""
-        if val is None or (isinstance(val, float) and pd.isna(val)):
-            return ""
-        s = str(val).strip()
-        return "" if s.lower() == "nan" else s
-
-    def _parse_date(self, val) -> Optional[date]:
-        """다양한 날짜 형식 파싱"""
-        if val is None or (isinstance(val, float) and pd.isna(val)):
-            return None
-        if isinstance(val, (datetime, date)):
-            return val if isinstance(val, date) else val.date()
-        if isinstance(val, pd.Timestamp):
-            return val.date()
-
-        s = str(val).strip()
-        # YYYY-MM-DD
-        m = re.match(r"(\d{4})-(\d{1,2})-(\d{1,2})", s)
-        if m:
-            return date(int(m.group(1)), int(m.group(2)), int(m.group(3)))
-        # YYYY/MM/DD
-        m = re.match(r"(\d{4})/(\d{1,2})/(\d{1,2})", s)
-        if m:
-            return date(int(m.group(1)), int(m.group(2)), int(m.group(3)))
-        # YYYY년 MM월 DD일
-        m = re.search(r"(\d{4})년\s*(\d{1,2})월\s*(\d{1,2})일", s)
-        if m:
-            return date(int(m.group(1)), int(m.group(2)), int(m.group(3)))
-        # YYYYMMDD
-        m = re.match(r"(\d{4})(\d{2})(\d{2})$", s)
-        if m:
-            return date(int(m.group(1)), int(m.group(2)), int(m.group(3)))
-        return None
+        # 빈 셀이 섞인 ID 컬럼(float) → "123.0"이 아닌 "123"
+        if pd.api.types.is_float_dtype(s) and ((s % 1 == 0) | s.isna()).all():
+            s = s.astype("Int64")
+        txt = cls._text_col(s)
+        return txt.mask(txt.str.lower() == "nan", "").astype(object)
+
+    @classmethod
+    def _date_col(cls, s: pd.Series) -> pd.Series:
+        """다양한 날짜 형식 파싱 → datetime64 (파싱 실패 NaT)"""
+        if pd.api.types.is_datetime64_any_dtype(s):
+            return s.dt.normalize()
+
+        obj = s.astype(object)
+        # Excel 날짜 셀 (datetime/date 객체)
+        is_dt = obj.map(lambda v: isinstance(v, date))
+        parsed = pd.to_datetime(obj.where(is_dt), errors="coerce")
+
+        # 문자열 날짜: 형식별 (년, 월, 일) 추출 → 먼저 매칭된 형식 우선
+        txt = cls._text_col(obj.where(~is_dt))
+        parts = None
+        for pattern in DATE_PATTERNS:
+            found = txt.str.extract(pattern)
+            parts = found if parts is None else parts.combine_first(found)
+        parts = parts.apply(pd.to_numeric, errors="coerce")
+        from_text = pd.to_datetime(
+            pd.DataFrame({"year": parts[0], "month": parts[1], "day": parts[2]}),
+            errors="coerce",
+        )
+        return parsed.combine_first(from_text).dt.normalize()
+
+    def _attribution_col(self, df: pd.DataFrame, field: str, convert) -> pd.Series:
+        """
+        기여 기간 필드: 14일 값 우선, 비어 있으면(0/빈 값) 1일(_1d) 값.
+
+        기존 `row.get(field) or row.get(field + "_1d")`와 같은 판정
+        (NaN 셀은 비어 있지 않은 값으로 취급되어 0).
+        """
+        fallback_col = field + "_1d"
+        if fallback_col in df.columns:
+            fallback = convert(df[fallback_col])
+        else:
+            fallback = pd.Series(0, index=df.index, dtype=float)
+
+        if field not in df.columns:
+            return fallback
+
+        primary = df[field]
+        is_empty = ~primary.astype(object).astype(bool)
+        return convert(primary).where(~is_empty).combine_first(fallback)
 
     def detect_report_type(self, columns: list) -> str:
         """컬럼명으로 보고서 유형 자동 감지"""
@@ -447,30 +513,35 @@ class AdPerformanceSync:
 
         return df
 
-    def parse_excel(self, filepath: str, account_id: int = None) -> Tuple[Optional[int], List[dict]]:
+    def parse_excel(self, filepath: str, account_id: int = None) -> Tuple[Optional[int], pd.DataFrame]:
         """
-        Excel 파싱 → (account_id, rows) 반환
+        Excel 파싱 → (account_id, rows DataFrame) 반환
 
+        rows 컬럼은 ROW_FIELDS 순서. 컬럼 단위로 한 번에 변환 (행 단위 루프 없음).
         account_id가 None이면 파일명에서 vendor_id를 추출하여 매칭 시도.
+        Excel 읽기 실패는 예외로 전달 (빈 결과로 삼키면 적재 원장에 0건으로 남아 재시도되지 않음).
         """
+        empty = pd.DataFrame(columns=ROW_FIELDS)
+
         # account_id 결정
         if account_id is None:
             account_id = self._resolve_account_id(filepath)
 
         if account_id is None:
             logger.error(f"account_id를 결정할 수 없음: {filepath}")
-            return None, []
+            return None, empty
 
-        # Excel 읽기
+        # Excel 읽기 (read_only 스트리밍, 청크 단위)
         try:
-            df = pd.read_excel(filepath, engine="openpyxl")
+            chunks = iter_frames(filepath, chunk_size=self.CHUNK_SIZE)
+            df = next(chunks, None)
         except Exception as e:
             logger.error(f"Excel 읽기 오류: {filepath} → {e}")
-            return account_id, []
+            raise
 
-        if df.empty:
+        if df is None or df.empty:
             logger.warning(f"빈 Excel: {filepath}")
-            return account_id, []
+            return account_id, empty
 
         # 컬럼 정규화
         df = self._normalize_columns(df)
@@ -495,70 +566,62 @@ class AdPerformanceSync:
             if fallback_date is None:
                 logger.warning(f"날짜 컬럼 없고 파일명에서도 기간 추출 실패: {filepath}")
 
-        rows = []
-        for _, row in df.iterrows():
-            ad_date = self._parse_date(row.get("ad_date"))
-            if ad_date is None:
-                ad_date = fallback_date
-            if ad_date is None:
-                continue
-
-            parsed = {
-                "ad_date": ad_date,
-                "campaign_id": self._safe_str(row.get("campaign_id")),
-                "campaign_name": self._safe_str(row.get("campaign_name")),
-                "ad_group_name": self._safe_str(row.get("ad_group_name")),
-                "coupang_product_id": self._safe_str(row.get("coupang_product_id")),
-                "product_name": self._safe_str(row.get("product_name")),
-                "keyword": self._safe_str(row.get("keyword")),
-                "match_type": self._safe_str(row.get("match_type")),
-                # 성과 지표
-                "impressions": self._safe_int(row.get("impressions")),
-                "clicks": self._safe_int(row.get("clicks")),
-                "ctr": self._safe_float(row.get("ctr")),
-                "avg_cpc": self._safe_int(row.get("avg_cpc")),
-                "ad_spend": self._safe_int(row.get("ad_spend")),
-                # 전환 (14일 우선, 없으면 1일, 없으면 접미사 없는 값)
-                "direct_orders": self._safe_int(
-                    row.get("direct_orders") or row.get("direct_orders_1d")),
-                "direct_revenue": self._safe_int(
-                    row.get("direct_revenue") or row.get("direct_revenue_1d")),
-                "indirect_orders": self._safe_int(
-                    row.get("indirect_orders") or row.get("indirect_orders_1d")),
-                "indirect_revenue": self._safe_int(
-                    row.get("indirect_revenue") or row.get("indirect_revenue_1d")),
-                "total_orders": self._safe_int(
-                    row.get("total_orders") or row.get("total_orders_1d")),
-                "total_revenue": self._safe_int(
-                    row.get("total_revenue") or row.get("total_revenue_1d")),
-                "roas": self._safe_float(
-                    row.get("roas") or row.get("roas_1d")),
-                # 판매수량 (14일 우선)
-                "total_quantity": self._safe_int(
-                    row.get("total_quantity") or row.get("total_quantity_1d")),
-                "direct_quantity": self._safe_int(
-                    row.get("direct_quantity") or row.get("direct_quantity_1d")),
-                "indirect_quantity": self._safe_int(
-                    row.get("indirect_quantity") or row.get("indirect_quantity_1d")),
-                # 광고 구분
-                "bid_type": self._safe_str(row.get("bid_type")),
-                "sales_method": self._safe_str(row.get("sales_method")),
-                "ad_type": self._safe_str(row.get("ad_type")),
-                "option_id": self._safe_str(row.get("option_id")),
-                # 브랜드/디스플레이 전용
-                "ad_name": self._safe_str(row.get("ad_name")),
-                "placement": self._safe_str(row.get("placement")),
-                "creative_id": self._safe_str(row.get("creative_id")),
-                "category": self._safe_str(row.get("category")),
-                # 메타
-                "report_type": report_type,
-            }
-
-            rows.append(parsed)
-
+        parts = [self._build_rows(df, report_type, fallback_date)]
+        try:
+            for chunk in chunks:
+                parts.append(self._build_rows(self._normalize_columns(chunk), report_type, fallback_date))
+        except Exception as e:
+            logger.error(f"Excel 읽기 오류: {filepath} → {e}")
+            raise
+        rows = pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0]
         logger.info(f"파싱 완료: {filepath} → {len(rows)}건 (report_type={report_type})")
         return account_id, rows
 
+    def _build_rows(self, df: pd.DataFrame, report_type: str,
+                    fallback_date: Optional[date] = None) -> pd.DataFrame:
+        """정규화된 보고서 DataFrame → ROW_FIELDS 컬럼 DataFrame (날짜 없는 행 제외)"""
+        # 중복 컬럼명(동의어 매핑 충돌)은 첫 번째 컬럼 사용
+        df = df.loc[:, ~df.columns.duplicated()].reset_index(drop=True)
+
+        def col(name):
+            return df[name] if name in df.columns else pd.Series(None, index=df.index, dtype=object)
+
+        ad_date = self._date_col(col("ad_date"))
+        if fallback_date is not None:
+            ad_date = ad_date.fillna(pd.Timestamp(fallback_date))
+        keep = ad_date.notna()
+        df = df[keep]
+        ad_date = ad_date[keep]
+
+        out = pd.DataFrame(index=df.index)
+        out["ad_date"] = ad_date.dt.date
+        for name in STR_FIELDS:
+            out[name] = self._str_col(col(name)[keep])
+        # 성과 지표
+        for name in ["impressions", "clicks"]:
+            out[name] = self._int_col(col(name)[keep])
+        out["ctr"] = self._float_col(col("ctr")[keep])
+        for name in ["avg_cpc", "ad_spend"]:
+            out[name] = self._int_col(col(name)[keep])
+        # 전환 / 판매수량 (14일 우선, 없으면 1일, 없으면 접미사 없는 값)
+        for name in ATTRIBUTION_INT_FIELDS:
+            out[name] = self._attribution_col(df, name, self._num_int_col).astype(np.int64)
+        out["roas"] = self._attribution_col(df, "roas", self._float_col).astype(float)
+        for name in QUANTITY_FIELDS:
+            out[name] = self._attribution_col(df, name, self._num_int_col).astype(np.int64)
+        # 광고 구분 / 브랜드·디스플레이 전용
+        for name in EXTRA_STR_FIELDS:
+            out[name] = self._str_col(col(name)[keep])
+        # 메타
+        out["report_type"] = report_type
+
+        return out[ROW_FIELDS].reset_index(drop=True)
+
+    @classmethod
+    def _num_int_col(cls, s: pd.Series) -> pd.Series:
+        """_int_col의 float 반환 버전 (combine_first 중 NaN 유지용)"""
+        return np.trunc(cls._num_col(s, (",", "원")))
+
     def _resolve_account_id(self, filepath: str) -> Optional[int]:
         """파일명에서 vendor_id 추출 → account_id 매칭"""
         fname = Path(filepath).stem
@@ -574,8 +637,8 @@ class AdPerformanceSync:
                     return row[0]
         return None
 
-    def match_listings(self, account_id: int, rows: List[dict]) -> List[dict]:
-        """coupang_product_id 또는 product_name으로 listing_id 매칭"""
+    def match_listings(self, account_id: int, rows: pd.DataFrame) -> pd.DataFrame:
+        """coupang_product_id 또는 product_name으로 listing_id 매칭 (listing_id 컬럼 추가)"""
         # 매칭 캐시 빌드
         with self.engine.connect() as conn:
             listings = conn.execute(
@@ -595,24 +658,22 @@ class AdPerformanceSync:
             if l["product_name"]:
                 name_map[l["product_name"]] = l["id"]
 
-        matched = 0
-        for row in rows:
-            listing_id = None
-            cpid = row.get("coupang_product_id", "")
-            if cpid and cpid in pid_map:
-                listing_id = pid_map[cpid]
-            elif row.get("product_name") and row["product_name"] in name_map:
-                listing_id = name_map[row["product_name"]]
-            row["listing_id"] = listing_id
-            if listing_id:
-                matched += 1
+        rows = rows.copy()
+        # 상품ID 우선, 없으면 상품명
+        listing_id = (
+            rows["coupang_product_id"].map(pid_map)
+            .combine_first(rows["product_name"].map(name_map))
+            .astype("Int64")
+        )
+        rows["listing_id"] = listing_id
 
+        matched = int(listing_id.notna().sum())
         logger.info(f"리스팅 매칭: {matched}/{len(rows)}건")
         return rows
 
-    def save_to_db(self, account_id: int, rows: List[dict]) -> int:
+    def save_to_db(self, account_id: int, rows: pd.DataFrame) -> int:
         """UPSERT — PostgreSQL execute_values 벌크 INSERT"""
-        if not rows:
+        if rows is None or rows.empty:
             return 0
 
         col_names = [
@@ -628,33 +689,13 @@ class AdPerformanceSync:
             "report_type",
         ]
 
-        def _to_tuple(row):
-            return (
-                account_id, row["ad_date"].isoformat(), row["campaign_id"],
-                row["campaign_name"], row["ad_group_name"],
-                row["coupang_product_id"], row["product_name"], row.get("listing_id"),
-                row["keyword"], row["match_type"],
-                row["impressions"], row["clicks"], row["ctr"], row["avg_cpc"], row["ad_spend"],
-                row["direct_orders"], row["direct_revenue"], row["indirect_orders"], row["indirect_revenue"],
-                row["total_orders"], row["total_revenue"], row["roas"],
-                row["total_quantity"], row["direct_quantity"], row["indirect_quantity"],
-                row["bid_type"], row["sales_method"], row["ad_type"], row["option_id"],
-                row["ad_name"], row["placement"], row["creative_id"], row["category"],
-                row["report_type"],
-            )
-
         # 중복 키 제거 (마지막 값 유지)
-        unique_key = lambda r: (
-            account_id, r["ad_date"].isoformat(), r["campaign_id"],
-            r["ad_group_name"], r["coupang_product_id"], r["keyword"], r["report_type"],
-        )
-        deduped = {}
-        for r in rows:
-            deduped[unique_key(r)] = r
-        rows = list(deduped.values())
+        unique_key = ["ad_date", "campaign_id", "ad_group_name",
+                      "coupang_product_id", "keyword", "report_type"]
+        rows = rows.drop_duplicates(subset=unique_key, keep="last")
         logger.info(f"중복 제거 후: {len(rows):,}건")
 
-        tuples = [_to_tuple(r) for r in rows]
+        tuples = self._to_tuples(account_id, rows, col_names)
 
         # psycopg2 execute_values — 1회 SQL로 수천 건 벌크 INSERT
         update_cols = [
@@ -697,64 +738,179 @@ class AdPerformanceSync:
         logger.info(f"저장 완료: {upserted}/{len(rows)}건")
         return upserted
 
-    def sync_file(self, filepath: str, account_id: int = None) -> dict:
-        """단일 파일 동기화 (대시보드에서도 호출)"""
-        aid, rows = self.parse_excel(filepath, account_id)
-        if aid is None:
-            return {"file": Path(filepath).name, "error": "계정 매칭 실패", "parsed": 0, "saved": 0}
-
-        # 리스팅 매칭
-        rows = self.match_listings(aid, rows)
-
-        saved = self.save_to_db(aid, rows)
+    @staticmethod
+    def _to_tuples(account_id: int, rows: pd.DataFrame, col_names: List[str]) -> List[tuple]:
+        """DataFrame → execute_values용 튜플 (컬럼 단위로 Python 기본 타입 변환)"""
+        columns = []
+        for name in col_names:
+            if name == "account_id":
+                columns.append([account_id] * len(rows))
+            elif name == "ad_date":
+                columns.append([d.isoformat() for d in rows["ad_date"]])
+            elif name == "listing_id":
+                if name in rows.columns:
+                    lid = rows[name].astype("Int64")
+                    columns.append(lid.astype(object).where(lid.notna(), None).tolist())
+                else:
+                    columns.append([None] * len(rows))
+            else:
+                columns.append(rows[name].tolist())
+        return list(zip(*columns))
+
+    def _refresh_scores(self, account_id: int):
+        """listing_scores 캐시 갱신 (실패해도 동기화 결과에는 영향 없음)"""
+        try:
+            from app.services.exposure_strategy import ExposureStrategyEngine
+            ExposureStrategyEngine(self.engine).refresh_scores([account_id])
+        except Exception as e:
+            logger.warning(f"listing_scores 갱신 실패: {e}")
 
-        # 계정명 조회
+    def _account_name(self, account_id: int) -> str:
         with self.engine.connect() as conn:
             name_row = conn.execute(
                 text("SELECT account_name FROM accounts WHERE id = :aid"),
-                {"aid": aid},
+                {"aid": account_id},
             ).fetchone()
-            account_name = name_row[0] if name_row else str(aid)
+        return name_row[0] if name_row else str(account_id)
+
+    def _check_ledger(self, filepath: str, account_id: Optional[int],
+                      force: bool) -> Tuple[Optional[int], str, Optional[dict]]:
+        """계정 결정 + 내용 해시 → (account_id, 해시, 이미 적재된 경우 skipped 결과)"""
+        aid = account_id if account_id is not None else self._resolve_account_id(filepath)
+        digest = file_hash(filepath)
+        if aid is not None and not force:
+            entry = self.ledger.lookup(digest, aid, self.LEDGER_TYPE)
+            if entry:
+                return aid, digest, self.ledger.skipped_result(entry, filepath, aid, self._account_name(aid))
+        return aid, digest, None
+
+    def _write_parsed(self, filepath: str, digest: str, aid: int,
+                      rows: pd.DataFrame, parse_sec: float) -> dict:
+        """파싱 결과 → 리스팅 매칭 + 저장 + 원장 기록 (메인 프로세스 writer)"""
+        t0 = time.perf_counter()
+        rows = self.match_listings(aid, rows)
+        saved = self.save_to_db(aid, rows)
+        save_sec = time.perf_counter() - t0
 
         # 기간 / 유형 정보
-        dates = [r["ad_date"] for r in rows]
-        date_range = f"{min(dates)} ~ {max(dates)}" if dates else "-"
-        report_types = set(r["report_type"] for r in rows)
+        date_range = f"{rows['ad_date'].min()} ~ {rows['ad_date'].max()}" if not rows.empty else "-"
+        report_types = set(rows["report_type"])
+
+        # 0건 파싱은 원장 미기록 (일시적 오류/빈 다운로드 파일도 다음 동기화에서 재시도)
+        if not rows.empty:
+            self.ledger.record(digest, aid, self.LEDGER_TYPE, filepath, len(rows), saved,
+                               period=date_range, parse_seconds=parse_sec, save_seconds=save_sec)
 
         return {
             "file": Path(filepath).name,
-            "account": account_name,
+            "account": self._account_name(aid),
             "account_id": aid,
             "period": date_range,
             "report_types": list(report_types),
             "parsed": len(rows),
             "saved": saved,
+            "parse_sec": round(parse_sec, 2),
+            "save_sec": round(save_sec, 2),
         }
 
-    def sync_dir(self, dirpath: str, account_id: int = None) -> List[dict]:
-        """폴더 내 모든 xlsx 파일 동기화"""
-        p = Path(dirpath)
-        files = sorted(p.glob("*.xlsx"))
-        results = []
-        for f in files:
-            result = self.sync_file(str(f), account_id)
-            results.append(result)
+    def sync_files(self, filepaths: List[str], account_id: int = None, force: bool = False,
+                   workers: int = None, progress: ProgressFn = None,
+                   refresh_scores: bool = True) -> List[dict]:
+        """
+        여러 파일 동기화: 프로세스 풀에서 파싱 → 메인 프로세스에서 순차 저장
+
+        Args:
+            workers: 파싱 프로세스 수 (None=자동, 1=현재 프로세스에서 순차)
+            progress: (완료 수, 전체 수, 파일 결과) 콜백
+
+        Returns:
+            filepaths 순서의 결과 리스트 (이미 적재된 파일은 skipped=True)
+        """
+        results: List[Optional[dict]] = [None] * len(filepaths)
+        pending = []  # (결과 인덱스, 경로, account_id, 해시)
+        done = 0
+        for i, fp in enumerate(filepaths):
+            aid, digest, skipped = self._check_ledger(fp, account_id, force)
+            if skipped is None and aid is not None:
+                pending.append((i, fp, aid, digest))
+                continue
+            if skipped is None:
+                logger.error(f"account_id를 결정할 수 없음: {fp}")
+            results[i] = skipped or {"file": Path(fp).name, "error": "계정 매칭 실패", "parsed": 0, "saved": 0}
+            done += 1
+            if progress:
+                progress(done, len(filepaths), results[i])
+
+        workers = workers or default_workers(len(pending))
+        # 순차 처리는 현재 인스턴스로, 병렬 처리는 워커별 파서 인스턴스로 파싱
+        parse_fn = self.parse_excel if workers <= 1 else _parse_report
+
+        def write(j, parsed, parse_sec):
+            _, fp, aid, digest = pending[j]
+            return self._write_parsed(fp, digest, aid, parsed[1], parse_sec)
+
+        def error(j, exc):
+            return {"file": Path(pending[j][1]).name, "error": str(exc), "parsed": 0, "saved": 0}
+
+        written = run_pipeline(
+            [(fp, aid) for _, fp, aid, _ in pending], parse_fn, write, error,
+            workers=workers, progress=progress, done=done, total=len(filepaths),
+        )
+        for (i, *_), result in zip(pending, written):
+            results[i] = result
+
+        # 점수 캐시는 계정별로 한 번만 갱신
+        if refresh_scores:
+            for aid in sorted({r["account_id"] for r in results if r.get("saved")}):
+                self._refresh_scores(aid)
         return results
 
+    def sync_file(self, filepath: str, account_id: int = None,
+                  refresh_scores: bool = True, force: bool = False) -> dict:
+        """
+        단일 파일 동기화
+
+        적재 원장에 같은 내용의 파일(해시+계정)이 있으면 파싱 없이 건너뜀 (force=True면 재적재).
+        """
+        return self.sync_files([filepath], account_id, force=force, workers=1,
+                               refresh_scores=refresh_scores)[0]
+
+    def sync_dir(self, dirpath: str, account_id: int = None, force: bool = False,
+                 workers: int = None, progress: ProgressFn = None) -> List[dict]:
+        """폴더 내 모든 xlsx 파일 병렬 동기화 (이미 적재된 파일은 건너뜀)"""
+        files = sorted(Path(dirpath).glob("*.xlsx"))
+        return self.sync_files([str(f) for f in files], account_id, force=force,
+                               workers=workers, progress=progress)
+
+    @classmethod
+    def parser(cls) -> "AdPerformanceSync":
+        """DB 연결 없는 파싱 전용 인스턴스 (account_id를 주면 parse_excel은 DB 미사용)"""
+        return cls.__new__(cls)
+
+
+def _parse_report(filepath: str, account_id: int) -> Tuple[Optional[int], pd.DataFrame]:
+    """프로세스 풀 워커: 보고서 파싱만 수행"""
+    return AdPerformanceSync.parser().parse_excel(filepath, account_id)
+
 
 def main():
     parser = argparse.ArgumentParser(description="광고 성과 보고서 Excel → DB 동기화")
     parser.add_argument("path", nargs="?", help="Excel 파일 또는 폴더 경로")
     parser.add_argument("--dir", type=str, help="폴더 경로 (내부 xlsx 전체)")
     parser.add_argument("--account-id", type=int, help="계정 ID (자동 감지 불가 시)")
+    parser.add_argument("--force", action="store_true", help="이미 적재된 파일도 다시 적재")
+    parser.add_argument("--workers", type=int, help="파싱 프로세스 수 (기본: 자동)")
     args = parser.parse_args()
 
     syncer = AdPerformanceSync()
 
     if args.dir:
-        results = syncer.sync_dir(args.dir, args.account_id)
+        results = syncer.sync_dir(
+            args.dir, args.account_id, force=args.force, workers=args.workers,
+            progress=lambda done, total, r: print(f"  [{done}/{total}] {r['file']}"),
+        )
     elif args.path:
-        results = [syncer.sync_file(args.path, args.account_id)]
+        results = [syncer.sync_file(args.path, args.account_id, force=args.force)]
     else:
         print("Excel 파일 경로를 지정해주세요.")
         print("  python scripts/sync_ad_performance.py report.xlsx")
@@ -768,6 +924,8 @@ def main():
     for r in results:
         if r.get("error"):
             print(f"  {r['file']:40s} | 오류: {r['error']}")
+        elif r.get("skipped"):
+            print(f"  {r['file']:40s} | {r['account']:10s} | 이미 적재됨 ({r['ingested_at']})")
         else:
             types = ", ".join(r.get("report_types", []))
             print(
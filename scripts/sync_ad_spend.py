@@ -17,6 +17,7 @@ import sys
 import re
 import argparse
 import logging
+import time
 from datetime import datetime, date
 from pathlib import Path
 from typing import List, Optional, Tuple
@@ -28,6 +29,9 @@ ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(ROOT))
 
 from app.database import get_engine_for_db
+from app.services.excel_reader import iter_rows
+from app.services.ingestion_ledger import IngestionLedger, file_hash
+from app.services.parallel_ingest import ProgressFn, default_workers, run_pipeline
 
 from dotenv import load_dotenv
 load_dotenv(ROOT / ".env")
@@ -66,8 +70,12 @@ class AdSpendSync:
         "CREATE INDEX IF NOT EXISTS ix_ad_date ON ad_spends(ad_date)",
     ]
 
+    # 적재 원장(ingested_files)의 보고서 종류
+    LEDGER_TYPE = "ad_spend"
+
     def __init__(self, db_path: str = None):
         self.engine = get_engine_for_db(db_path)
+        self.ledger = IngestionLedger(self.engine)
         self._ensure_table()
 
     def _ensure_table(self):
@@ -121,45 +129,45 @@ class AdSpendSync:
                 return row[0]
         return None
 
-    def parse_excel(self, filepath: str) -> Tuple[Optional[int], List[dict]]:
+    def parse_excel(self, filepath: str, account_id: int = None) -> Tuple[Optional[int], List[dict]]:
         """
         Excel 파싱 → (account_id, rows_list) 반환
 
+        account_id를 주면 계정 조회 생략 (DB 미사용 → 프로세스 풀 워커에서 호출 가능)
+
         Returns:
             (account_id, [{"ad_date": date, "campaign_id": str, ...}, ...])
         """
-        import openpyxl
-
         vendor_id = self._extract_vendor_id(filepath)
-        if not vendor_id:
-            logger.error(f"파일명에서 vendor_id 추출 실패: {filepath}")
-            return None, []
-
-        account_id = self._find_account_id(vendor_id)
-        if not account_id:
-            logger.error(f"vendor_id '{vendor_id}'에 해당하는 계정을 찾을 수 없음")
-            return None, []
+        if account_id is None:
+            if not vendor_id:
+                logger.error(f"파일명에서 vendor_id 추출 실패: {filepath}")
+                return None, []
 
-        wb = openpyxl.load_workbook(filepath, data_only=True)
-        ws = wb.active
+            account_id = self._find_account_id(vendor_id)
+            if not account_id:
+                logger.error(f"vendor_id '{vendor_id}'에 해당하는 계정을 찾을 수 없음")
+                return None, []
 
         rows = []
         current_date = None
         current_vat = 0       # 요약행의 VAT
         current_charge = 0    # 요약행의 총청구
 
-        for row_idx in range(2, ws.max_row + 1):  # 헤더(1행) 건너뛰기
-            col1 = ws.cell(row=row_idx, column=1).value   # 날짜
-            col2 = ws.cell(row=row_idx, column=2).value   # 배송유형
-            col4 = ws.cell(row=row_idx, column=4).value   # 광고 유형
+        # read_only 스트리밍 (헤더 1행 건너뛰기), row[n] = n+1번째 컬럼
+        for row in iter_rows(filepath, min_row=2):
+            row = tuple(row) + (None,) * (17 - len(row))
+            col1 = row[0]   # 날짜
+            col2 = row[1]   # 배송유형
+            col4 = row[3]   # 광고 유형
 
             # 날짜 요약행: col1에 날짜가 있는 행
             if col1 and str(col1).strip():
                 parsed = self._parse_korean_date(str(col1))
                 if parsed:
                     current_date = parsed
-                    current_vat = self._safe_int(ws.cell(row=row_idx, column=16).value)
-                    current_charge = self._safe_int(ws.cell(row=row_idx, column=17).value)
+                    current_vat = self._safe_int(row[15])
+                    current_charge = self._safe_int(row[16])
                 continue  # 요약행은 스킵 (상세행만 저장)
 
             # 상세행: col4(광고유형)에 값이 있는 행 (PA 등)
@@ -167,27 +175,26 @@ class AdSpendSync:
                 if current_date is None:
                     continue
 
-                campaign_id = str(ws.cell(row=row_idx, column=6).value or "").strip()
+                campaign_id = str(row[5] or "").strip()
                 if not campaign_id:
                     continue
 
                 rows.append({
                     "ad_date": current_date,
                     "campaign_id": campaign_id,
-                    "campaign_name": str(ws.cell(row=row_idx, column=7).value or "").strip(),
+                    "campaign_name": str(row[6] or "").strip(),
                     "ad_type": str(col4).strip(),
-                    "ad_objective": str(ws.cell(row=row_idx, column=5).value or "").strip(),
-                    "daily_budget": self._safe_int(ws.cell(row=row_idx, column=10).value),
-                    "spent_amount": self._safe_int(ws.cell(row=row_idx, column=11).value),
-                    "adjustment": self._safe_int(ws.cell(row=row_idx, column=12).value),
-                    "spent_after_adjust": self._safe_int(ws.cell(row=row_idx, column=13).value),
-                    "over_spend": self._safe_int(ws.cell(row=row_idx, column=14).value),
-                    "billable_cost": self._safe_int(ws.cell(row=row_idx, column=15).value),
+                    "ad_objective": str(row[4] or "").strip(),
+                    "daily_budget": self._safe_int(row[9]),
+                    "spent_amount": self._safe_int(row[10]),
+                    "adjustment": self._safe_int(row[11]),
+                    "spent_after_adjust": self._safe_int(row[12]),
+                    "over_spend": self._safe_int(row[13]),
+                    "billable_cost": self._safe_int(row[14]),
                     "vat_amount": current_vat,
                     "total_charge": current_charge,
                 })
 
-        wb.close()
         logger.info(f"파싱 완료: {filepath} → {len(rows)}건 (vendor={vendor_id}, account_id={account_id})")
         return account_id, rows
 
@@ -216,91 +223,183 @@ class AdSpendSync:
             ON CONFLICT (account_id, ad_date, campaign_id)
             DO UPDATE SET {_update_cols}"""
 
-        upserted = 0
-        with self.engine.connect() as conn:
-            for row in rows:
-                try:
-                    conn.execute(text(sql), {
-                        "account_id": account_id,
-                        "ad_date": row["ad_date"].isoformat(),
-                        "campaign_id": row["campaign_id"],
-                        "campaign_name": row["campaign_name"],
-                        "ad_type": row["ad_type"],
-                        "ad_objective": row["ad_objective"],
-                        "daily_budget": row["daily_budget"],
-                        "spent_amount": row["spent_amount"],
-                        "adjustment": row["adjustment"],
-                        "spent_after_adjust": row["spent_after_adjust"],
-                        "over_spend": row["over_spend"],
-                        "billable_cost": row["billable_cost"],
-                        "vat_amount": row["vat_amount"],
-                        "total_charge": row["total_charge"],
-                    })
-                    upserted += 1
-                except Exception as e:
-                    logger.debug(f"INSERT 스킵: {e}")
-
-            conn.commit()
+        params = [
+            {
+                "account_id": account_id,
+                "ad_date": row["ad_date"].isoformat(),
+                "campaign_id": row["campaign_id"],
+                "campaign_name": row["campaign_name"],
+                "ad_type": row["ad_type"],
+                "ad_objective": row["ad_objective"],
+                "daily_budget": row["daily_budget"],
+                "spent_amount": row["spent_amount"],
+                "adjustment": row["adjustment"],
+                "spent_after_adjust": row["spent_after_adjust"],
+                "over_spend": row["over_spend"],
+                "billable_cost": row["billable_cost"],
+                "vat_amount": row["vat_amount"],
+                "total_charge": row["total_charge"],
+            }
+            for row in rows
+        ]
+
+        # 한 번에 executemany, 실패 시 행 단위로 재시도 (문제 행만 스킵)
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(text(sql), params)
+            upserted = len(params)
+        except Exception as e:
+            logger.debug(f"일괄 INSERT 실패 → 행 단위 재시도: {e}")
+            upserted = 0
+            with self.engine.connect() as conn:
+                for p in params:
+                    try:
+                        conn.execute(text(sql), p)
+                        conn.commit()
+                        upserted += 1
+                    except Exception as e:
+                        conn.rollback()
+                        logger.debug(f"INSERT 스킵: {e}")
 
         logger.info(f"저장 완료: {upserted}/{len(rows)}건")
         return upserted
 
-    def sync_file(self, filepath: str) -> dict:
-        """단일 파일 동기화"""
-        account_id, rows = self.parse_excel(filepath)
-        if account_id is None:
-            return {"file": filepath, "error": "계정 매칭 실패", "parsed": 0, "saved": 0}
-
-        saved = self.save_to_db(account_id, rows)
-
-        # 계정명 조회
+    def _account_name(self, account_id: int) -> str:
         with self.engine.connect() as conn:
             name_row = conn.execute(
                 text("SELECT account_name FROM accounts WHERE id = :aid"),
                 {"aid": account_id}
             ).fetchone()
-            account_name = name_row[0] if name_row else str(account_id)
+        return name_row[0] if name_row else str(account_id)
+
+    def _check_ledger(self, filepath: str, force: bool) -> Tuple[Optional[int], str, Optional[dict]]:
+        """계정 결정 + 내용 해시 → (account_id, 해시, 이미 적재된 경우 skipped 결과)"""
+        vendor_id = self._extract_vendor_id(filepath)
+        aid = self._find_account_id(vendor_id) if vendor_id else None
+        digest = file_hash(filepath)
+        if aid is not None and not force:
+            entry = self.ledger.lookup(digest, aid, self.LEDGER_TYPE)
+            if entry:
+                return aid, digest, self.ledger.skipped_result(entry, filepath, aid, self._account_name(aid))
+        return aid, digest, None
+
+    def _write_parsed(self, filepath: str, digest: str, account_id: int,
+                      rows: List[dict], parse_sec: float) -> dict:
+        """파싱 결과 → 저장 + 원장 기록 (메인 프로세스 writer)"""
+        t0 = time.perf_counter()
+        saved = self.save_to_db(account_id, rows)
+        save_sec = time.perf_counter() - t0
 
         # 기간 정보
         dates = [r["ad_date"] for r in rows]
         date_range = f"{min(dates)} ~ {max(dates)}" if dates else "-"
 
+        # 0건 파싱은 원장 미기록 (일시적 오류/빈 다운로드 파일도 다음 동기화에서 재시도)
+        if rows:
+            self.ledger.record(digest, account_id, self.LEDGER_TYPE, filepath, len(rows), saved,
+                               period=date_range, parse_seconds=parse_sec, save_seconds=save_sec)
+
         return {
             "file": Path(filepath).name,
-            "account": account_name,
+            "account": self._account_name(account_id),
+            "account_id": account_id,
             "period": date_range,
             "parsed": len(rows),
             "saved": saved,
+            "parse_sec": round(parse_sec, 2),
+            "save_sec": round(save_sec, 2),
         }
 
-    def sync_dir(self, dirpath: str) -> List[dict]:
-        """폴더 내 모든 xlsx 파일 동기화"""
-        p = Path(dirpath)
-        files = sorted(p.glob("*-dailySettlement-*.xlsx"))
-        results = []
-        for f in files:
-            result = self.sync_file(str(f))
-            results.append(result)
+    def sync_files(self, filepaths: List[str], force: bool = False, workers: int = None,
+                   progress: ProgressFn = None) -> List[dict]:
+        """
+        여러 파일 동기화: 프로세스 풀에서 파싱 → 메인 프로세스에서 순차 저장
+
+        Args:
+            workers: 파싱 프로세스 수 (None=자동, 1=현재 프로세스에서 순차)
+            progress: (완료 수, 전체 수, 파일 결과) 콜백
+        """
+        results: List[Optional[dict]] = [None] * len(filepaths)
+        pending = []  # (결과 인덱스, 경로, account_id, 해시)
+        done = 0
+        for i, fp in enumerate(filepaths):
+            aid, digest, skipped = self._check_ledger(fp, force)
+            if skipped is None and aid is not None:
+                pending.append((i, fp, aid, digest))
+                continue
+            if skipped is None:
+                logger.error(f"계정 매칭 실패: {fp}")
+            results[i] = skipped or {"file": Path(fp).name, "error": "계정 매칭 실패", "parsed": 0, "saved": 0}
+            done += 1
+            if progress:
+                progress(done, len(filepaths), results[i])
+
+        workers = workers or default_workers(len(pending))
+        # 순차 처리는 현재 인스턴스로, 병렬 처리는 워커별 파서 인스턴스로 파싱
+        parse_fn = self.parse_excel if workers <= 1 else _parse_settlement
+
+        def write(j, parsed, parse_sec):
+            _, fp, aid, digest = pending[j]
+            return self._write_parsed(fp, digest, aid, parsed[1], parse_sec)
+
+        def error(j, exc):
+            return {"file": Path(pending[j][1]).name, "error": str(exc), "parsed": 0, "saved": 0}
+
+        written = run_pipeline(
+            [(fp, aid) for _, fp, aid, _ in pending], parse_fn, write, error,
+            workers=workers, progress=progress, done=done, total=len(filepaths),
+        )
+        for (i, *_), result in zip(pending, written):
+            results[i] = result
         return results
 
+    def sync_file(self, filepath: str, force: bool = False) -> dict:
+        """
+        단일 파일 동기화
+
+        적재 원장에 같은 내용의 파일(해시+계정)이 있으면 파싱 없이 건너뜀 (force=True면 재적재).
+        """
+        return self.sync_files([filepath], force=force, workers=1)[0]
+
+    def sync_dir(self, dirpath: str, force: bool = False, workers: int = None,
+                 progress: ProgressFn = None) -> List[dict]:
+        """폴더 내 모든 정산 xlsx 파일 병렬 동기화 (이미 적재된 파일은 건너뜀)"""
+        files = sorted(Path(dirpath).glob("*-dailySettlement-*.xlsx"))
+        return self.sync_files([str(f) for f in files], force=force, workers=workers, progress=progress)
+
+    @classmethod
+    def parser(cls) -> "AdSpendSync":
+        """DB 연결 없는 파싱 전용 인스턴스 (account_id를 주면 parse_excel은 DB 미사용)"""
+        return cls.__new__(cls)
+
+
+def _parse_settlement(filepath: str, account_id: int) -> Tuple[Optional[int], List[dict]]:
+    """프로세스 풀 워커: 정산 파일 파싱만 수행"""
+    return AdSpendSync.parser().parse_excel(filepath, account_id)
+
 
 def main():
     parser = argparse.ArgumentParser(description="광고비 정산 Excel → DB 동기화")
     parser.add_argument("path", nargs="?", help="Excel 파일 또는 폴더 경로")
     parser.add_argument("--dir", type=str, help="폴더 경로 (내부 xlsx 전체)")
+    parser.add_argument("--force", action="store_true", help="이미 적재된 파일도 다시 적재")
+    parser.add_argument("--workers", type=int, help="파싱 프로세스 수 (기본: 자동)")
     args = parser.parse_args()
 
     syncer = AdSpendSync()
 
     if args.dir:
-        results = syncer.sync_dir(args.dir)
+        results = syncer.sync_dir(
+            args.dir, force=args.force, workers=args.workers,
+            progress=lambda done, total, r: print(f"  [{done}/{total}] {r['file']}"),
+        )
     elif args.path:
-        results = [syncer.sync_file(args.path)]
+        results = [syncer.sync_file(args.path, force=args.force)]
     else:
         # 프로젝트 루트에서 dailySettlement 파일 찾기
         files = sorted(ROOT.glob("*-dailySettlement-*.xlsx"))
         if files:
-            results = [syncer.sync_file(str(f)) for f in files]
+            results = syncer.sync_files([str(f) for f in files], force=args.force, workers=args.workers)
         else:
             print("Excel 파일을 지정해주세요.")
             return
@@ -312,6 +411,8 @@ def main():
     for r in results:
         if "error" in r and r["error"]:
             print(f"  {r['file']:40s} | 오류: {r['error']}")
+        elif r.get("skipped"):
+            print(f"  {r['file']:40s} | {r['account']:10s} | 이미 적재됨 ({r['ingested_at']})")
         else:
             print(f"  {r['file']:40s} | {r['account']:10s} | {r['period']} | 파싱 {r['parsed']:4d} | 저장 {r['saved']:4d}")
     print("=" * 70)
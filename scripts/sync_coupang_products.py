@@ -41,6 +41,8 @@ from app.models.account import Account
 from app.models.listing import Listing
 from app.api.coupang_wing_client import CoupangWingClient, CoupangWingError
 from app.constants import WING_ACCOUNT_ENV_MAP
+from app.services.isbn_coverage import refresh_coverage
+from app.services.listing_isbns import ensure_table as ensure_listing_isbns, rebuild_listing_isbns
 from obsidian_logger import ObsidianLogger
 
 logging.basicConfig(
@@ -600,6 +602,8 @@ def run_sync(account_names=None, max_pages=0, dry_run=False,
     print("=" * 60)
 
     init_db()
+    with engine.begin() as conn:
+        ensure_listing_isbns(conn)
     db = SessionLocal()
 
     try:
@@ -642,6 +646,16 @@ def run_sync(account_names=None, max_pages=0, dry_run=False,
                 quick=quick, force=force, stale_hours=stale_hours,
             )
 
+            # listings.isbn → listing_isbns 계정 단위 재구성 + 커버리지 스냅샷 갱신
+            # (실패해도 다음 계정 동기화는 계속 — rebuild_listing_isbns.py로 재실행 가능)
+            if not dry_run:
+                try:
+                    with engine.begin() as conn:
+                        rebuild_listing_isbns(conn, account_id=account.id)
+                        refresh_coverage(conn, [account.id])
+                except Exception as e:
+                    logger.error(f"[{account.account_name}] listing_isbns/커버리지 갱신 실패: {e}")
+
             for key in total_result:
                 total_result[key] += result[key]
 
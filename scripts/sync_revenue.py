@@ -86,6 +86,14 @@ class RevenueSync:
         """계정 정보로 WING 클라이언트 생성"""
         return create_wing_client(account)
 
+    def _refresh_scores(self, account_ids: List[int]):
+        """listing_scores 캐시 갱신 (실패해도 동기화 결과에는 영향 없음)"""
+        try:
+            from app.services.exposure_strategy import ExposureStrategyEngine
+            ExposureStrategyEngine(self.engine).refresh_scores(account_ids)
+        except Exception as e:
+            logger.warning(f"listing_scores 갱신 실패: {e}")
+
     @staticmethod
     def _split_date_range(date_from: date, date_to: date, window_days: int = 29) -> List[Tuple[str, str]]:
         """날짜 범위를 window_days 단위 윈도우로 분할"""
@@ -251,6 +259,9 @@ class RevenueSync:
             result = self.sync_account(account, date_from, date_to, progress_callback)
             results.append(result)
 
+        # 매출이 바뀐 계정의 노출 점수 캐시 갱신
+        self._refresh_scores([a["id"] for a in accounts])
+
         if progress_callback:
             progress_callback(len(accounts), len(accounts), "동기화 완료!")
 
@@ -10,6 +10,7 @@ load_dotenv()
 
 from sqlalchemy import text, create_engine
 from app.api.coupang_wing_client import CoupangWingClient
+from app.services.listing_isbns import replace_listing_isbns
 
 # 백업 DB 사용
 DB_PATH = r'C:\Users\user\Desktop\Coupong\coupang_auto_backup.db'
@@ -143,6 +144,7 @@ with engine.connect() as conn:
                     conn.execute(text(
                         'UPDATE listings SET isbn=:isbn WHERE id=:lid'
                     ), {'isbn': isbn_str, 'lid': lid})
+                    replace_listing_isbns(conn, lid, isbn_str)
                     conn.commit()
 
                     filled += 1
@@ -0,0 +1,180 @@
+"""
+aladin_key_pool.py 테스트
+=========================
+TTBKey 풀의 한도 초과 키 전환, 일일 한도/날짜 변경, 키별 속도 제한, 비동기 ISBN 조회, 출판사 병렬 검색 결과 순서 확인
+"""
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+# 프로젝트 루트 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import crawlers.aladin_api_crawler as aladin_module
+import crawlers.aladin_key_pool as key_pool_module
+from crawlers.aladin_api_crawler import AladinAPICrawler
+from crawlers.aladin_key_pool import AladinKeyPool, QuotaExhausted
+from crawlers.http_cache import HttpCache
+
+
+class _FakeResponse:
+    def __init__(self, data):
+        self._data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._data
+
+
+class _FakeSession:
+    """키 'k1'은 항상 한도 초과(errorCode 10) 응답"""
+
+    def __init__(self):
+        self.keys = []
+
+    def get(self, url, params=None, timeout=None):
+        self.keys.append(params["ttbkey"])
+        if params["ttbkey"] == "k1":
+            return _FakeResponse({"errorCode": 10, "errorMessage": "quota"})
+        return _FakeResponse({"item": []})
+
+
+class TestAladinKeyPool:
+
+    def test_from_env(self, monkeypatch):
+        monkeypatch.setenv("ALADIN_TTB_KEYS", "a, b,,a")
+        assert AladinKeyPool.from_env().keys == ["a", "b"]
+        monkeypatch.delenv("ALADIN_TTB_KEYS")
+        monkeypatch.setenv("ALADIN_TTB_KEY", "single")
+        assert AladinKeyPool.from_env().keys == ["single"]
+        assert AladinKeyPool.from_env(fallback_keys=["x", "single"]).keys == ["single", "x"]
+
+    def test_daily_limit_and_day_rollover(self, monkeypatch):
+        pool = AladinKeyPool(["a", "b"], rate_per_key=0, daily_limit=2)
+        assert [pool.acquire() for _ in range(4)] == ["a", "b", "a", "b"]
+        assert pool.usage() == {"a": 2, "b": 2}
+        with pytest.raises(QuotaExhausted):
+            pool.acquire()
+
+        # 다음 날이 되면 자동 복구
+        class _Tomorrow:
+            @staticmethod
+            def today():
+                from datetime import date, timedelta
+                return date.today() + timedelta(days=1)
+
+        monkeypatch.setattr(key_pool_module, "date", _Tomorrow)
+        assert pool.available == ["a", "b"]
+        assert pool.usage() == {"a": 0, "b": 0}
+
+    def test_rotates_on_quota_error(self):
+        pool = AladinKeyPool(["k1", "k2"], rate_per_key=0)
+        crawler = AladinAPICrawler(key_pool=pool)
+        crawler.session = _FakeSession()
+
+        assert crawler._request("ItemLookUp.aspx", {}) == {"item": []}
+        assert crawler.session.keys == ["k1", "k2"]
+        assert pool.available == ["k2"]
+
+        # 남은 키도 소진되면 QuotaExhausted (검색 오류로 삼키지 않음)
+        pool.mark_exhausted("k2")
+        with pytest.raises(QuotaExhausted):
+            crawler.search_by_keyword("출판사")
+
+    def test_search_errors_raised_on_request(self):
+        class _DownSession:
+            def get(self, url, params=None, timeout=None):
+                raise ConnectionError("timeout")
+
+        crawler = AladinAPICrawler(key_pool=AladinKeyPool(["k"], rate_per_key=0))
+        crawler.session = _DownSession()
+        # 기본: 빈 결과 / raise_errors=True: "결과 없음"과 구분되도록 예외 그대로
+        assert crawler.search_by_keyword("출판사") == []
+        with pytest.raises(ConnectionError):
+            crawler.search_by_keyword("출판사", raise_errors=True)
+
+    def test_rate_limit_per_key(self):
+        pool = AladinKeyPool(["a", "b"], rate_per_key=20)   # 키당 0.05초 간격
+        t0 = time.monotonic()
+        keys = [pool.acquire() for _ in range(6)]
+        elapsed = time.monotonic() - t0
+
+        assert sorted(keys) == ["a", "a", "a", "b", "b", "b"]
+        # 키당 3회 → 최소 2 간격 대기
+        assert elapsed >= 0.09
+
+
+class TestLookupItems:
+
+    def test_async_lookup_rotates_keys(self, monkeypatch, tmp_path):
+        seen = []
+
+        def handler(request):
+            key = request.url.params["ttbkey"]
+            isbn = request.url.params["ItemId"]
+            seen.append(key)
+            if key == "k1":
+                return httpx.Response(200, json={"errorCode": 10})
+            if isbn == "none":
+                return httpx.Response(200, json={"item": []})
+            return httpx.Response(200, json={"item": [{"isbn13": isbn, "author": "저자"}]})
+
+        real_client = httpx.AsyncClient
+        monkeypatch.setattr(aladin_module.httpx, "AsyncClient",
+                            lambda: real_client(transport=httpx.MockTransport(handler)))
+
+        pool = AladinKeyPool(["k1", "k2"], rate_per_key=0)
+        crawler = AladinAPICrawler(key_pool=pool, cache=HttpCache(tmp_path / "cache.sqlite3"))
+        items = crawler.lookup_items(["a", "b", "none", "a"], concurrency=4)
+
+        assert items == {"a": {"isbn13": "a", "author": "저자"},
+                         "b": {"isbn13": "b", "author": "저자"},
+                         "none": None}
+        assert pool.available == ["k2"]
+        assert seen.count("k1") >= 1
+
+        # 두 번째 조회는 캐시에서 (결과 없음 포함) → 요청 없음
+        seen.clear()
+        assert crawler.lookup_items(["a", "b", "none"]) == items
+        assert seen == []
+
+    def test_async_lookup_stops_when_quota_exhausted(self, monkeypatch, tmp_path):
+        real_client = httpx.AsyncClient
+        monkeypatch.setattr(
+            aladin_module.httpx, "AsyncClient",
+            lambda: real_client(transport=httpx.MockTransport(
+                lambda request: httpx.Response(200, json={"errorCode": 10}))),
+        )
+        pool = AladinKeyPool(["k1"], rate_per_key=0)
+        crawler = AladinAPICrawler(key_pool=pool, cache=HttpCache(tmp_path / "cache.sqlite3"))
+        assert crawler.lookup_items(["a", "b"]) == {}
+
+
+class TestSearchPublisher:
+
+    def test_results_deduped_in_search_order(self, monkeypatch):
+        from scripts.franchise_sync import FranchiseSync
+
+        calls = []
+
+        def fake_search(self, keyword, max_results=50, sort="Accuracy", year_filter=None, **kw):
+            calls.append((keyword, sort))
+            isbns = {"PublishTime": ["1", "2"], "SalesPoint": ["2", "3"]}[sort]
+            return [{"isbn": f"{keyword}-{i}" if i == "3" else i} for i in isbns]
+
+        monkeypatch.setattr(AladinAPICrawler, "search_by_keyword", fake_search)
+        monkeypatch.setattr(AladinAPICrawler, "get_search_names", classmethod(lambda cls, n: [n, n + "2"]))
+
+        pool = AladinKeyPool(["k"], rate_per_key=0)
+        results = FranchiseSync._search_publisher(pool, "pub", 10)
+
+        assert [r["isbn"] for r in results] == ["1", "2", "pub-3", "pub2-3"]
+        assert calls == [
+            ("pub", "PublishTime"), ("pub", "SalesPoint"),
+            ("pub2", "PublishTime"), ("pub2", "SalesPoint"),
+        ]
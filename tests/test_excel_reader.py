@@ -0,0 +1,62 @@
+"""
+excel_reader.py 테스트
+======================
+read_only 스트리밍 결과가 pd.read_excel과 같은지 확인
+"""
+import sys
+from pathlib import Path
+
+import openpyxl
+import pandas as pd
+import pytest
+
+# 프로젝트 루트 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.excel_reader import iter_frames, iter_rows, read_frame
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    """제목 2행 + 헤더(빈/중복 컬럼) + 중간 빈 행 + 헤더보다 넓은 행 + 끝 빈 행"""
+    path = tmp_path / "report.xlsx"
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "data"
+    ws.append(["보고서"])
+    ws.append([])
+    ws.append(["ID", "이름", None, "이름", "가격"])
+    ws.append([1001, "가", "x", "나", 1500])
+    ws.append([None, "다", None, None, 2500.5])
+    ws.append([])
+    ws.append([1003, "라", None, "마", None, "넓음"])
+    for i in range(7):
+        ws.append([2000 + i, f"상품{i}", None, None, i * 100])
+    ws.append([])
+    ws.append([])
+    wb.save(path)
+    return path
+
+
+class TestExcelReader:
+
+    def test_iter_rows_min_row(self, workbook):
+        rows = list(iter_rows(workbook, min_row=3, backend="openpyxl"))
+        assert rows[0][:5] == ("ID", "이름", None, "이름", "가격")
+        assert rows[1][0] == 1001
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 100])
+    def test_read_frame_matches_read_excel(self, workbook, chunk_size):
+        expected = pd.read_excel(workbook, sheet_name="data", header=2)
+        frames = list(iter_frames(workbook, sheet="data", header_row=2,
+                                  chunk_size=chunk_size, backend="openpyxl"))
+        result = pd.concat(frames).infer_objects() if len(frames) > 1 else frames[0]
+
+        assert list(result.columns) == list(expected.columns)
+        assert list(result.index) == list(expected.index)
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+    def test_read_frame_sheet_index(self, workbook):
+        df = read_frame(workbook, sheet=0, header_row=2, backend="openpyxl")
+        assert df["ID"].iloc[0] == 1001
+        assert len(df) == 11
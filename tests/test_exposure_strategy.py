@@ -0,0 +1,331 @@
+"""
+exposure_strategy.py 테스트
+===========================
+벡터화된 점수 함수가 기존 행 단위(apply) 계산과 같은 결과를 내는지 확인
+"""
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# 프로젝트 루트 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine, text
+
+from app.services.exposure_strategy import ExposureStrategyEngine
+
+
+# ─── 기존 행 단위 구현 (기준값) ───
+
+def _legacy_growth_rate(curr, prev):
+    return ((curr - prev) / prev * 100) if prev > 0 else (100 if curr > 0 else 0)
+
+
+def _legacy_roas_to_score(roas):
+    if roas >= 300:
+        return min(100, 90 + (roas - 300) / 100 * 10)
+    elif roas >= 200:
+        return 70 + (roas - 200) / 100 * 20
+    elif roas >= 100:
+        return 40 + (roas - 100) / 100 * 30
+    else:
+        return max(0, roas / 100 * 40)
+
+
+def _legacy_stock_to_score(qty):
+    if qty is None:
+        qty = 0
+    if qty >= 10:
+        return 100
+    elif qty >= 5:
+        return 70
+    elif qty >= 1:
+        return 30
+    return 0
+
+
+def _legacy_shipping_to_score(charge_type):
+    if not charge_type:
+        return 50
+    ct = str(charge_type).upper()
+    if ct == "FREE":
+        return 100
+    elif ct == "CONDITIONAL_FREE":
+        return 70
+    return 30
+
+
+def _legacy_grade(score):
+    if score >= 80:
+        return "A"
+    elif score >= 60:
+        return "B"
+    elif score >= 40:
+        return "C"
+    elif score >= 20:
+        return "D"
+    return "F"
+
+
+def _legacy_top_action(row):
+    scores = {
+        "재고 보충": row["stock_health_score"],
+        "배송 정책 개선": row["shipping_score"],
+        "광고 최적화": row["ad_efficiency_score"],
+        "판매 촉진": row["sales_velocity_score"],
+    }
+    weakest = min(scores, key=scores.get)
+    return "현상 유지" if scores[weakest] >= 70 else weakest
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(42)
+
+
+class TestVectorizedScores:
+    """벡터화 점수 == 기존 apply 점수"""
+
+    def test_sales_velocity(self, rng):
+        n = 2000
+        df = pd.DataFrame({
+            "listing_id": np.arange(n),
+            "current_qty": rng.integers(0, 30, n),
+            "prev_qty": rng.integers(0, 30, n),
+        })
+        df.loc[:50, "prev_qty"] = 0
+        df.loc[:10, "current_qty"] = 0
+
+        result = ExposureStrategyEngine._score_sales_velocity(df.copy())
+
+        growth = df.apply(lambda r: _legacy_growth_rate(r["current_qty"], r["prev_qty"]), axis=1)
+        growth_score = growth.apply(lambda g: min(40, max(0, 20 + g * 0.2)))
+        qty_pct = (df["current_qty"] / df["current_qty"].max() * 60).clip(0, 60)
+        expected = (qty_pct + growth_score).clip(0, 100).round(1)
+
+        np.testing.assert_array_equal(result["growth_rate"].to_numpy(), growth.to_numpy(dtype=float))
+        np.testing.assert_array_equal(result["sales_velocity_score"].to_numpy(), expected.to_numpy())
+
+    def test_sales_velocity_no_sales(self):
+        """판매량 전부 0 → 성장률 0, 점수 20"""
+        df = pd.DataFrame({"listing_id": [1, 2], "current_qty": [0, 0], "prev_qty": [0, 0]})
+        result = ExposureStrategyEngine._score_sales_velocity(df)
+        assert result["sales_velocity_score"].tolist() == [20.0, 20.0]
+
+    def test_ad_efficiency(self, rng):
+        n = 2000
+        df = pd.DataFrame({
+            "listing_id": np.arange(n),
+            "total_spend": rng.integers(0, 50_000, n),
+            "total_revenue": rng.integers(0, 300_000, n),
+        })
+        df.loc[:20, "total_spend"] = 0
+
+        result = ExposureStrategyEngine._score_ad_efficiency(df.copy())
+
+        roas = df.apply(
+            lambda r: (r["total_revenue"] / r["total_spend"] * 100) if r["total_spend"] > 0 else 0,
+            axis=1,
+        )
+        expected = roas.apply(_legacy_roas_to_score).round(1)
+        np.testing.assert_array_equal(result["ad_efficiency_score"].to_numpy(), expected.to_numpy())
+
+    def test_roas_boundaries(self):
+        """구간 경계값 (100/200/300%) 점수"""
+        df = pd.DataFrame({
+            "listing_id": range(6),
+            "total_spend": [100, 100, 100, 100, 100, 100],
+            "total_revenue": [0, 99, 100, 200, 300, 1000],
+        })
+        result = ExposureStrategyEngine._score_ad_efficiency(df)
+        assert result["ad_efficiency_score"].tolist() == [0.0, 39.6, 40.0, 70.0, 90.0, 100.0]
+
+    def test_stock_scores(self):
+        qty = pd.Series([None, 0, 1, 4, 5, 9, 10, 500], dtype=object)
+        expected = [_legacy_stock_to_score(q) for q in qty]
+        assert ExposureStrategyEngine._stock_scores(qty).tolist() == expected
+
+    def test_shipping_scores(self):
+        types = pd.Series(["", "FREE", "free", "CONDITIONAL_FREE", "NOT_FREE", "OTHER"])
+        expected = [_legacy_shipping_to_score(t) for t in types]
+        assert ExposureStrategyEngine._shipping_scores(types).tolist() == expected
+
+    def test_shipping_scores_missing(self):
+        """NULL(None/NaN) → 정보 없음 50점 ("NAN" 문자열로 취급하지 않음)"""
+        types = pd.Series([None, np.nan, "FREE"])
+        assert ExposureStrategyEngine._shipping_scores(types).tolist() == [50, 50, 100]
+
+    def test_grades(self, rng):
+        scores = pd.Series(np.round(rng.uniform(0, 100, 1000), 1))
+        scores = pd.concat([scores, pd.Series([0.0, 19.9, 20.0, 40.0, 60.0, 80.0, 100.0])])
+        expected = [_legacy_grade(s) for s in scores]
+        assert ExposureStrategyEngine._scores_to_grades(scores).tolist() == expected
+
+    def test_top_actions(self, rng):
+        n = 2000
+        choices = [0, 30, 50, 70, 100]
+        df = pd.DataFrame({
+            col: rng.choice(choices, n).astype(float)
+            for col in ["sales_velocity_score", "ad_efficiency_score",
+                        "stock_health_score", "shipping_score"]
+        })
+        expected = df.apply(_legacy_top_action, axis=1).tolist()
+        assert ExposureStrategyEngine._determine_top_actions(df).tolist() == expected
+
+
+class TestScoreCache:
+    """listing_scores 저장/조회 (SQLite)"""
+
+    def setup_method(self):
+        self.engine = create_engine("sqlite://")
+        today = date.today()
+        with self.engine.begin() as conn:
+            conn.execute(text("""
+                CREATE TABLE accounts (
+                    id INTEGER PRIMARY KEY, account_name VARCHAR(50), is_active BOOLEAN DEFAULT 1
+                )
+            """))
+            conn.execute(text("""
+                CREATE TABLE listings (
+                    id INTEGER PRIMARY KEY, account_id INTEGER, product_name VARCHAR(500),
+                    isbn TEXT, sale_price INTEGER, stock_quantity INTEGER,
+                    delivery_charge_type VARCHAR(20), coupang_product_id BIGINT,
+                    vendor_item_id BIGINT, coupang_status VARCHAR(20)
+                )
+            """))
+            conn.execute(text("""
+                CREATE TABLE revenue_history (
+                    id INTEGER PRIMARY KEY, account_id INTEGER, listing_id INTEGER,
+                    sale_type VARCHAR(50), recognition_date DATE,
+                    quantity INTEGER, sale_amount INTEGER
+                )
+            """))
+            conn.execute(text("INSERT INTO accounts VALUES (1, 'a', 1), (2, 'b', 1)"))
+            conn.execute(text("""
+                INSERT INTO listings VALUES
+                    (1, 1, '상품1', NULL, 10000, 12, 'FREE', 11, 111, 'active'),
+                    (2, 1, '상품2', NULL, 10000, 0, 'NOT_FREE', 12, 112, 'active'),
+                    (3, 2, '상품3', NULL, 10000, 6, NULL, 13, 113, 'active'),
+                    (4, 2, '상품4', NULL, 10000, 6, NULL, 14, 114, 'paused')
+            """))
+            conn.execute(text("""
+                INSERT INTO revenue_history (account_id, listing_id, sale_type, recognition_date, quantity, sale_amount)
+                VALUES (1, 1, 'SALE', :d, 3, 30000)
+            """), {"d": (today - timedelta(days=1)).isoformat()})
+
+    def teardown_method(self):
+        self.engine.dispose()
+
+    def test_refresh_and_read(self):
+        engine = ExposureStrategyEngine(self.engine)
+        saved = engine.refresh_scores()
+        assert saved == {1: 2, 2: 1}
+
+        cached = engine.get_cached_scores()
+        live = engine.get_product_scores(1)
+        assert set(cached["listing_id"]) == {1, 2, 3}
+
+        acct1 = cached[cached["account_id"] == 1].reset_index(drop=True)
+        for col in ["listing_id", "overall_score", "grade", "top_action"]:
+            assert acct1[col].tolist() == live[col].tolist()
+
+    def test_refresh_replaces_account_rows(self):
+        engine = ExposureStrategyEngine(self.engine)
+        engine.refresh_scores([1])
+        with self.engine.begin() as conn:
+            conn.execute(text("UPDATE listings SET coupang_status = 'paused' WHERE id = 2"))
+        engine.refresh_scores([1])
+        assert engine.get_cached_scores(1)["listing_id"].tolist() == [1]
+
+    def test_cached_scores_without_table(self):
+        assert ExposureStrategyEngine(self.engine).get_cached_scores().empty
+
+
+class TestBatch:
+    """계정 일괄 메서드 == 기존 행 단위 계산 / 계정별 단일 호출"""
+
+    setup_method = TestScoreCache.setup_method
+    teardown_method = TestScoreCache.teardown_method
+
+    def test_product_scores_batch(self):
+        # 계정별 최대 판매량이 다르도록 추가 (계정1 최대 10, 계정2 최대 4)
+        today = date.today()
+        curr_day, prev_day = (today - timedelta(days=1)).isoformat(), (today - timedelta(days=20)).isoformat()
+        with self.engine.begin() as conn:
+            conn.execute(text("INSERT INTO accounts VALUES (3, 'c', 1)"))
+            conn.execute(text("""
+                INSERT INTO listings VALUES
+                    (5, 1, '상품5', NULL, 10000, 3, 'CONDITIONAL_FREE', 15, 115, 'active'),
+                    (6, 2, '상품6', NULL, 10000, 20, 'FREE', 16, 116, 'active'),
+                    (7, 3, '상품7', NULL, 10000, 8, 'FREE', 17, 117, 'active')
+            """))
+            conn.execute(text("""
+                INSERT INTO revenue_history (account_id, listing_id, sale_type, recognition_date, quantity, sale_amount)
+                VALUES (1, 1, 'SALE', :c, 7, 70000), (1, 2, 'SALE', :c, 5, 50000), (1, 2, 'SALE', :p, 8, 80000),
+                       (1, 5, 'SALE', :c, 4, 40000), (2, 3, 'SALE', :c, 2, 20000), (2, 3, 'SALE', :p, 3, 30000),
+                       (2, 6, 'SALE', :c, 4, 40000), (3, 7, 'SALE', :p, 6, 60000)
+            """), {"c": curr_day, "p": prev_day})
+
+        # 기준값: 기존 행 단위 계산 (판매량 백분위는 계정 내 최대값 기준)
+        listings = {  # listing_id: (account_id, stock, delivery_charge_type)
+            1: (1, 12, "FREE"), 2: (1, 0, "NOT_FREE"), 5: (1, 3, "CONDITIONAL_FREE"),
+            3: (2, 6, None), 6: (2, 20, "FREE"), 7: (3, 8, "FREE"),
+        }
+        sales = {1: (1, 10, 0), 2: (1, 5, 8), 5: (1, 4, 0), 3: (2, 2, 3), 6: (2, 4, 0), 7: (3, 0, 6)}
+        max_qty = {}
+        for aid, curr, _ in sales.values():
+            max_qty[aid] = max(max_qty.get(aid, 0), curr)
+
+        expected = {}
+        for lid, (aid, stock, charge) in listings.items():
+            _, curr, prev = sales[lid]
+            growth = _legacy_growth_rate(curr, prev)
+            qty_pct = min(60, max(0, curr / max_qty[aid] * 60)) if max_qty[aid] > 0 else 0
+            row = {
+                "sales_velocity_score": round(min(100, qty_pct + min(40, max(0, 20 + growth * 0.2))), 1),
+                "ad_efficiency_score": 50,   # ad_performances 테이블 없음 → 기본 점수
+                "stock_health_score": _legacy_stock_to_score(stock),
+                "shipping_score": _legacy_shipping_to_score(charge),
+            }
+            row["overall_score"] = round(
+                row["sales_velocity_score"] * 0.35 + row["ad_efficiency_score"] * 0.25
+                + row["stock_health_score"] * 0.20 + row["shipping_score"] * 0.20, 1)
+            row["grade"] = _legacy_grade(row["overall_score"])
+            row["top_action"] = _legacy_top_action(row)
+            expected[lid] = (aid, row)
+
+        engine = ExposureStrategyEngine(self.engine)
+        batch = engine.get_product_scores_batch([1, 2, 3, 4])
+        assert set(batch) == {1, 2, 3, 4}
+        assert batch[4].empty
+        for aid in (1, 2, 3):
+            df = batch[aid]
+            assert sorted(df["listing_id"]) == sorted(l for l, (a, _) in expected.items() if a == aid)
+            assert df["overall_score"].is_monotonic_decreasing
+            for rec in df.to_dict("records"):
+                for col, value in expected[rec["listing_id"]][1].items():
+                    assert rec[col] == pytest.approx(value), (rec["listing_id"], col)
+
+        # 같은 판매량(4개, 신규)이라도 계정 내 최대값이 다르면 점수가 다름
+        scores = {r["listing_id"]: r["sales_velocity_score"]
+                  for df in batch.values() if not df.empty for r in df.to_dict("records")}
+        assert (scores[5], scores[6]) == (64.0, 100.0)
+
+    def test_action_items_batch(self):
+        engine = ExposureStrategyEngine(self.engine)
+        batch = engine.get_action_items_batch([1, 2])
+        assert [i["action"] for i in batch[1]] == ["즉시 재고 보충", "무료배송 전환 검토"]
+        assert all(i["account_id"] == 1 for i in batch[1])
+        assert batch[2] == []
+
+    def test_insights_and_ad_summary_batch(self):
+        engine = ExposureStrategyEngine(self.engine)
+        insights = engine.get_insights_batch([1, 2])
+        assert insights[1][0].startswith("최근 14일간 매출 ₩30,000")
+        assert insights[1] == engine.get_insights(1)
+        # ad_performances 테이블 없음 → 빈 요약
+        assert engine.get_ad_summary_batch([1, 2])[2]["has_data"] is False
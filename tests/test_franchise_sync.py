@@ -0,0 +1,196 @@
+"""
+franchise_sync.py 테스트
+========================
+SQL anti-join(listing_isbns) 갭 분석이 세트 리스팅(쉼표 구분 ISBN)과 방금 업로드한 상품까지 반영하는지,
+출판사 증분 수집이 기준점(crawl_watermarks) 이후만 조회하는지 확인 (SQLite)
+"""
+import sys
+from datetime import date
+from pathlib import Path
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+# 프로젝트 루트 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import Base
+import app.models  # noqa: F401  (FK 대상 테이블 등록)
+from app.models.account import Account
+from app.models.book import Book
+from app.models.listing import Listing
+from app.models.product import Product
+from app.models.publisher import Publisher
+from app.services.crawl_watermarks import SCOPE_PUBLISHER, load_watermarks
+from app.services.listing_isbns import rebuild_listing_isbns
+from crawlers.aladin_api_crawler import AladinAPICrawler
+from crawlers.aladin_key_pool import AladinKeyPool
+from scripts.franchise_sync import FranchiseSync
+from uploaders.coupang_api_uploader import CoupangAPIUploader
+
+
+class TestFindGaps:
+
+    def setup_method(self):
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+
+        self.db.add_all([
+            Account(id=1, account_name="007-book", email="a@x", is_active=True, wing_api_enabled=True),
+            Account(id=2, account_name="007-ez", email="b@x", is_active=True, wing_api_enabled=True),
+            Account(id=3, account_name="off", email="c@x", is_active=True, wing_api_enabled=False),
+        ])
+        pub = Publisher(name="pub", margin_rate=65, supply_rate=0.65, min_free_shipping=0)
+        self.db.add(pub)
+        self.db.flush()
+
+        self.isbns = isbns = [f"978000000000{i}" for i in range(6)]
+        for i, isbn in enumerate(isbns):
+            book = Book(isbn=isbn, title=f"도서{i}", publisher_id=pub.id, list_price=15000)
+            self.db.add(book)
+            self.db.flush()
+            self.db.add(Product(
+                id=i + 1, book_id=book.id, isbn=isbn, list_price=15000, sale_price=13500,
+                supply_rate=0.65, margin_per_unit=1000, net_margin=1000, shipping_policy="free",
+                can_upload_single=(i != 5), status="ready",
+            ))
+
+        # 계정1: 단권 0, 세트(1,2 — 공백 포함)  / 계정2: 단권 3
+        self.db.add_all([
+            Listing(account_id=1, coupang_product_id=101, isbn=isbns[0]),
+            Listing(account_id=1, coupang_product_id=102, isbn=f"{isbns[1]}, {isbns[2]}"),
+            Listing(account_id=1, coupang_product_id=103, isbn=None),
+            Listing(account_id=2, coupang_product_id=201, isbn=isbns[3]),
+            Listing(account_id=3, coupang_product_id=301, isbn=isbns[4]),
+        ])
+        self.db.commit()
+        with self.engine.begin() as conn:
+            rebuild_listing_isbns(conn)
+
+    def teardown_method(self):
+        self.db.close()
+        self.engine.dispose()
+
+    def test_gaps_include_set_isbns(self):
+        gaps = FranchiseSync(db=self.db).find_gaps()
+
+        assert list(gaps) == ["007-book", "007-ez"]
+        book, ez = gaps["007-book"], gaps["007-ez"]
+        assert (book["registered"], book["missing"], book["total"]) == (3, 2, 5)
+        assert book["product_ids"] == [4, 5]
+        assert [p.id for p in book["products"]] == [4, 5]
+        assert book["coverage"] == 60.0
+        assert ez["product_ids"] == [1, 2, 3, 5]
+
+    def test_gaps_without_products(self):
+        gaps = FranchiseSync(db=self.db).find_gaps(load_products=False)
+        assert gaps["007-ez"]["missing"] == 4
+        assert gaps["007-ez"]["products"] == []
+
+    def test_empty_listing_isbns_rebuilt(self):
+        # 파생 테이블이 비어 있어도 (재구성 전) 등록 상품을 미등록으로 잡지 않음
+        with self.engine.begin() as conn:
+            conn.execute(text("DELETE FROM listing_isbns"))
+        gaps = FranchiseSync(db=self.db).find_gaps(load_products=False)
+        assert gaps["007-book"]["product_ids"] == [4, 5]
+        assert gaps["007-ez"]["product_ids"] == [1, 2, 3, 5]
+
+    def test_stale_listing_isbns_rebuilt(self):
+        # listing_isbns 갱신 없이 INSERT된 리스팅도 반영
+        self.db.add(Listing(account_id=2, coupang_product_id=202, isbn=self.isbns[0]))
+        self.db.commit()
+        assert FranchiseSync(db=self.db).find_gaps(load_products=False)["007-ez"]["product_ids"] == [2, 3, 5]
+
+    def test_upload_removes_gap(self, monkeypatch):
+        monkeypatch.setattr(FranchiseSync, "_create_wing_client", lambda self, account: object())
+        monkeypatch.setattr(CoupangAPIUploader, "upload_product",
+                            lambda self, data, out, ret: {"success": True, "seller_product_id": "901"})
+        sync = FranchiseSync(db=self.db)
+        ez = self.db.get(Account, 2)
+        ez.outbound_shipping_code, ez.return_center_code = "OUT", "RET"
+        self.db.commit()
+
+        gaps = sync.find_gaps()
+        result = sync.upload_to_account(ez, gaps["007-ez"]["products"][:1])
+
+        assert result["success"] == 1
+        # 업로드 직후(상품 동기화 전)에도 등록된 것으로 취급 → 다음 sync_all에서 재업로드 안 함
+        assert sync.find_gaps()["007-ez"]["product_ids"] == [2, 3, 5]
+
+    def test_no_ready_products(self):
+        self.db.query(Product).update({"status": "uploaded"})
+        self.db.commit()
+        assert FranchiseSync(db=self.db).find_gaps() == {}
+
+
+def _item(isbn: str, pub_date: date, publisher: str = "pub") -> dict:
+    return {
+        "isbn": isbn, "title": f"도서 {isbn}", "author": "저자", "publisher": publisher,
+        "original_price": 15000, "category": "국내도서>참고서", "publish_date": pub_date,
+        "sales_point": 10, "year": pub_date.year,
+    }
+
+
+class TestIncrementalCrawl:
+
+    def setup_method(self):
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine)
+        self.db = sessionmaker(bind=self.engine)()
+        self.db.add(Publisher(name="pub", margin_rate=65, supply_rate=0.65, min_free_shipping=0))
+        self.db.commit()
+
+    def teardown_method(self):
+        self.db.close()
+        self.engine.dispose()
+
+    def test_second_run_searches_only_since_watermark(self, monkeypatch):
+        calls = []
+        catalog = [
+            _item("9780000000003", date(2026, 3, 1)),
+            _item("9780000000002", date(2026, 2, 1)),
+            _item("9780000000009", date(2026, 9, 9), publisher="other"),  # 다른 출판사 → 기준점 무관
+            _item("9780000000001", date(2026, 1, 1)),
+        ]
+
+        def fake_search(self, keyword, max_results=50, sort="PublishTime", year_filter=None,
+                        query_type="Keyword", since=None):
+            calls.append((sort, since))
+            return [i for i in catalog if not since or i["publish_date"] >= since]
+
+        monkeypatch.setattr(AladinAPICrawler, "search_by_keyword", fake_search)
+        monkeypatch.setattr(AladinKeyPool, "_shared", AladinKeyPool(["k"], rate_per_key=0))
+
+        sync = FranchiseSync(db=self.db)
+        first = sync.crawl_by_publisher(publisher_names=["pub"], incremental=True, workers=1)
+        assert first["new"] == 3
+        # 기준점 없음 → 최신순 + 판매량순 전체 검색
+        assert calls == [("PublishTime", None), ("SalesPoint", None)]
+        assert load_watermarks(self.db, SCOPE_PUBLISHER) == {"pub": (date(2026, 3, 1), "9780000000003")}
+
+        calls.clear()
+        catalog.insert(0, _item("9780000000004", date(2026, 3, 5)))
+        second = sync.crawl_by_publisher(publisher_names=["pub"], incremental=True, workers=1)
+        assert calls == [("PublishTime", date(2026, 2, 22))]   # 기준일 - 7일, 판매량순 생략
+        assert second["new"] == 1
+        assert load_watermarks(self.db, SCOPE_PUBLISHER)["pub"] == (date(2026, 3, 5), "9780000000004")
+
+    def test_search_stops_paging_at_since(self, monkeypatch):
+        pages = []
+
+        def fake_request(endpoint, params, ttl=0):
+            pages.append(params["Start"])
+            n = params["Start"]
+            # 50개씩, 페이지마다 한 달씩 과거로
+            return {"item": [
+                {"isbn13": f"978{n:05d}{i:05d}", "title": "t", "pubDate": f"2026-{12 - n // 50:02d}-01"}
+                for i in range(50)
+            ]}
+
+        crawler = AladinAPICrawler(key_pool=AladinKeyPool(["k"], rate_per_key=0))
+        monkeypatch.setattr(crawler, "_request", fake_request)
+        results = crawler.search_by_keyword("pub", max_results=500, since=date(2026, 10, 15))
+
+        assert pages == [1, 51, 101]   # 3페이지째(9월)에서 중단
+        assert {r["publish_date"] for r in results} == {date(2026, 12, 1), date(2026, 11, 1)}
@@ -0,0 +1,102 @@
+"""
+http_cache.py 테스트
+====================
+요청 정규화, TTL 만료, 결과 없음(negative) 캐시, dict 뷰, 교보 검색 캐시 확인
+"""
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from crawlers import kyobo_search
+from crawlers.http_cache import HttpCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    c = HttpCache(tmp_path / "cache.sqlite3", ttl=60, negative_ttl=10)
+    yield c
+    c.close()
+
+
+class TestHttpCache:
+
+    def test_key_ignores_auth_and_whitespace(self, cache):
+        cache.set("aladin:ItemSearch.aspx", {"Query": "해리  포터", "ttbkey": "k1", "output": "js"}, {"item": [1]})
+        hit, value = cache.get("aladin:ItemSearch.aspx", {"query": "해리 포터 ", "ttbkey": "k2"})
+        assert hit and value == {"item": [1]}
+        # namespace가 다르면 별도
+        assert cache.get("kyobo:search", {"query": "해리 포터"}) == (False, None)
+
+    def test_negative_and_expiry(self, cache, monkeypatch):
+        cache.set("ns", {"k": 1}, None)
+        cache.set("ns", {"k": 2}, "value")
+        assert cache.get("ns", {"k": 1}) == (True, None)
+
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now + 30)
+        # negative(10초)는 만료, 일반(60초)은 유지
+        assert cache.get("ns", {"k": 1}) == (False, None)
+        assert cache.get("ns", {"k": 2}) == (True, "value")
+        assert cache.purge_expired() == 1
+
+    def test_get_or_fetch_skips_errors(self, cache):
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            return "978"
+
+        assert cache.get_or_fetch("ns", {"q": "a"}, fetch) == "978"
+        assert cache.get_or_fetch("ns", {"q": "a"}, fetch) == "978"
+        assert len(calls) == 1
+
+        def broken():
+            raise ConnectionError("down")
+
+        with pytest.raises(ConnectionError):
+            cache.get_or_fetch("ns", {"q": "b"}, broken)
+        assert cache.get("ns", {"q": "b"}) == (False, None)
+
+    def test_persists_across_instances(self, tmp_path):
+        path = tmp_path / "cache.sqlite3"
+        first = HttpCache(path)
+        first.mapping("m").update({"9791": {"author": "저자"}, "9792": None})
+        first.close()
+
+        m = HttpCache(path).mapping("m")
+        assert "9791" in m and "9792" in m and "9793" not in m
+        assert m["9791"] == {"author": "저자"}
+        assert m.get("9792", "default") is None
+        with pytest.raises(KeyError):
+            m["9793"]
+
+
+class TestKyoboSearch:
+
+    def test_cached_including_negative(self, cache, monkeypatch):
+        calls = []
+
+        def fake_fetch(keyword):
+            calls.append(keyword)
+            return "9791100000001" if keyword == "있음" else None
+
+        monkeypatch.setattr(kyobo_search, "fetch_isbn", fake_fetch)
+        for _ in range(2):
+            assert kyobo_search.search_isbn("있음", cache=cache) == "9791100000001"
+            assert kyobo_search.search_isbn("없음", cache=cache) is None
+        assert calls == ["있음", "없음"]
+
+    def test_errors_not_cached(self, cache, monkeypatch):
+        def failing_fetch(keyword):
+            raise ConnectionError("timeout")
+
+        monkeypatch.setattr(kyobo_search, "fetch_isbn", failing_fetch)
+        assert kyobo_search.search_isbn("오류", cache=cache) is None
+        with pytest.raises(ConnectionError):
+            kyobo_search.search_isbn("오류", cache=cache, raise_errors=True)
+        assert cache.get(kyobo_search.CACHE_NAMESPACE, {"keyword": "오류"}) == (False, None)
@@ -0,0 +1,145 @@
+"""
+ingestion_ledger.py 테스트
+==========================
+같은 내용의 보고서 파일은 한 번만 파싱/저장되고, 읽기 실패/0건 파일은 원장에 남지 않는지 확인 (SQLite)
+"""
+import sys
+from datetime import date
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, text
+
+# 프로젝트 루트 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.ingestion_ledger import IngestionLedger, file_hash
+from scripts import sync_ad_performance
+from scripts.sync_ad_performance import AdPerformanceSync
+from scripts.sync_ad_spend import AdSpendSync
+from tests.test_sync_ad_performance import HEADER, _build_report
+
+
+@pytest.fixture
+def engine():
+    eng = create_engine("sqlite://")
+    with eng.begin() as conn:
+        conn.execute(text("CREATE TABLE accounts (id INTEGER PRIMARY KEY, account_name VARCHAR(50), vendor_id VARCHAR(20))"))
+        conn.execute(text("INSERT INTO accounts VALUES (1, '007-book', 'A001'), (2, '007-ez', 'A002')"))
+    yield eng
+    eng.dispose()
+
+
+@pytest.fixture
+def syncer(engine, monkeypatch):
+    """parse_excel / save_to_db 호출 횟수를 세는 AdSpendSync"""
+    s = AdSpendSync.__new__(AdSpendSync)
+    s.engine = engine
+    s.ledger = IngestionLedger(engine)
+    s.calls = {"parse": 0, "save": 0}
+
+    def parse_excel(filepath, account_id=None):
+        s.calls["parse"] += 1
+        return account_id, [{"ad_date": date(2026, 1, 4)}, {"ad_date": date(2026, 1, 5)}]
+
+    def save_to_db(account_id, rows):
+        s.calls["save"] += 1
+        return len(rows)
+
+    monkeypatch.setattr(s, "parse_excel", parse_excel)
+    monkeypatch.setattr(s, "save_to_db", save_to_db)
+    return s
+
+
+def _write(path: Path, content: bytes) -> str:
+    path.write_bytes(content)
+    return str(path)
+
+
+class TestIngestionLedger:
+
+    def test_file_hash_is_content_based(self, tmp_path):
+        a = _write(tmp_path / "a.xlsx", b"same")
+        b = _write(tmp_path / "b.xlsx", b"same")
+        c = _write(tmp_path / "c.xlsx", b"other")
+        assert file_hash(a) == file_hash(b) != file_hash(c)
+
+    def test_record_and_lookup(self, engine, tmp_path):
+        ledger = IngestionLedger(engine)
+        path = _write(tmp_path / "r.xlsx", b"data")
+        digest = file_hash(path)
+        assert ledger.lookup(digest, 1, "ad_spend") is None
+
+        ledger.record(digest, 1, "ad_spend", path, 10, 8, period="-", parse_seconds=0.5)
+        ledger.record(digest, 1, "ad_spend", path, 10, 9, period="-", parse_seconds=0.25)
+        entry = ledger.lookup(digest, 1, "ad_spend")
+        assert entry["rows_saved"] == 9
+        assert entry["parse_seconds"] == 0.25
+        # 계정 / 보고서 종류가 다르면 별도 키
+        assert ledger.lookup(digest, 2, "ad_spend") is None
+        assert ledger.lookup(digest, 1, "ad_performance") is None
+
+    def test_sync_file_skips_ingested(self, syncer, tmp_path):
+        path = _write(tmp_path / "A001-dailySettlement-202601.xlsx", b"report")
+
+        first = syncer.sync_file(path)
+        assert first["saved"] == 2 and not first.get("skipped")
+        assert first["period"] == "2026-01-04 ~ 2026-01-05"
+
+        second = syncer.sync_file(path)
+        assert second["skipped"] is True
+        assert second["saved"] == 0
+        assert second["account"] == "007-book"
+        assert syncer.calls == {"parse": 1, "save": 1}
+
+        # 강제 재적재
+        syncer.sync_file(path, force=True)
+        assert syncer.calls == {"parse": 2, "save": 2}
+
+    def test_changed_content_is_ingested(self, syncer, tmp_path):
+        path = tmp_path / "A001-dailySettlement-202601.xlsx"
+        syncer.sync_file(_write(path, b"v1"))
+        result = syncer.sync_file(_write(path, b"v2"))
+        assert not result.get("skipped")
+        assert syncer.calls["parse"] == 2
+
+
+class TestFailedParse:
+
+    @pytest.fixture
+    def perf_syncer(self, engine, monkeypatch):
+        s = AdPerformanceSync.__new__(AdPerformanceSync)
+        s.engine = engine
+        s.ledger = IngestionLedger(engine)
+        monkeypatch.setattr(s, "match_listings", lambda aid, rows: rows)
+        monkeypatch.setattr(s, "save_to_db", lambda aid, rows: len(rows))
+        return s
+
+    def test_read_error_is_retried(self, perf_syncer, tmp_path, monkeypatch):
+        path = str(_build_report(tmp_path / "A001-report.xlsx"))
+        digest = file_hash(path)
+
+        real_iter_frames = sync_ad_performance.iter_frames
+        calls = []
+
+        def flaky(*args, **kwargs):
+            calls.append(args)
+            if len(calls) == 1:
+                raise PermissionError("다른 프로세스가 파일 사용 중")
+            return real_iter_frames(*args, **kwargs)
+
+        monkeypatch.setattr(sync_ad_performance, "iter_frames", flaky)
+        failed = perf_syncer.sync_file(path, account_id=1, refresh_scores=False)
+        assert "error" in failed and failed["saved"] == 0
+        assert perf_syncer.ledger.lookup(digest, 1, AdPerformanceSync.LEDGER_TYPE) is None
+
+        # 같은 파일 재시도 → 정상 적재 후 원장 기록
+        retried = perf_syncer.sync_file(path, account_id=1, refresh_scores=False)
+        assert not retried.get("skipped") and retried["parsed"] > 0
+        assert perf_syncer.ledger.lookup(digest, 1, AdPerformanceSync.LEDGER_TYPE)["rows_parsed"] == retried["parsed"]
+
+    def test_zero_rows_not_recorded(self, perf_syncer, tmp_path):
+        path = str(_build_report(tmp_path / "A001-empty.xlsx", rows=[], header=HEADER))
+        result = perf_syncer.sync_file(path, account_id=1, refresh_scores=False)
+        assert result["parsed"] == 0
+        assert perf_syncer.ledger.lookup(file_hash(path), 1, AdPerformanceSync.LEDGER_TYPE) is None
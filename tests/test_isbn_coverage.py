@@ -0,0 +1,125 @@
+"""
+isbn_coverage.py 테스트
+=======================
+계정별 커버리지 스냅샷 갱신/조회, 전략별 누적 채움 수, ISBNFillerService 연동 확인
+"""
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, text
+
+# 프로젝트 루트 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services import isbn_filler
+from app.services.isbn_coverage import (
+    coverage_totals, get_coverage, refresh_coverage, with_isbn_counts,
+)
+from app.services.isbn_filler import BaseISBNStrategy, FillResult, ISBNFillerService
+from app.services.isbn_resolver import save_resolutions
+from app.services.isbn_resolver import ensure_table as ensure_resolutions
+
+A, B = "9788900000016", "9788900000023"
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    with engine.begin() as c:
+        c.execute(text("CREATE TABLE accounts (id INTEGER PRIMARY KEY, account_name TEXT, is_active BOOLEAN)"))
+        c.execute(text("""
+            CREATE TABLE listings (id INTEGER PRIMARY KEY, account_id INTEGER, product_name TEXT,
+                isbn TEXT, brand TEXT, coupang_product_id INTEGER, raw_json TEXT, detail_synced_at TIMESTAMP)
+        """))
+        c.execute(text("INSERT INTO accounts VALUES (1, '007-book', 1), (2, '007-bm', 1), (3, 'old', 0)"))
+        c.execute(text("INSERT INTO listings (id, account_id, product_name, isbn) VALUES (:id, :aid, :name, :isbn)"), [
+            {"id": 1, "aid": 1, "name": "책1", "isbn": A},
+            {"id": 2, "aid": 1, "name": "세트", "isbn": f"{A},{B}"},
+            {"id": 3, "aid": 1, "name": "책3", "isbn": None},
+            {"id": 4, "aid": 1, "name": "책4", "isbn": ""},
+            {"id": 5, "aid": 2, "name": "책5", "isbn": None},
+            {"id": 6, "aid": 3, "name": "책6", "isbn": B},
+        ])
+        ensure_resolutions(c)
+        save_resolutions(c, [{"listing_id": 3, "isbn": B, "confidence": 0.4, "sources": "aladin",
+                              "candidates": 1, "applied": False}])
+    return engine
+
+
+class TestSnapshot:
+
+    def test_refresh_and_query(self, engine):
+        with engine.begin() as c:
+            assert refresh_coverage(c) == 3
+        with engine.connect() as c:
+            rows = {r.account_name: r for r in get_coverage(c)}
+            assert set(rows) == {"007-book", "007-bm"}     # 비활성 계정 제외
+            book = rows["007-book"]
+            assert (book.total, book.with_isbn, book.set_listings, book.needs_review) == (4, 2, 1, 1)
+            assert book.pct == 50.0
+            assert len(get_coverage(c, active_only=False)) == 3
+            assert [r.account_name for r in get_coverage(c, account_name="007-bm")] == ["007-bm"]
+
+    def test_strategy_counts_accumulate(self, engine):
+        with engine.begin() as c:
+            refresh_coverage(c, strategy_filled={"wing": {1: 2}})
+            baseline = with_isbn_counts(c, [2])
+            c.execute(text("UPDATE listings SET isbn = :isbn WHERE id = 5"), {"isbn": A})
+            # 한 계정만 갱신 — 다른 계정 행과 누적값은 그대로
+            refresh_coverage(c, [2], strategy="books", baseline=baseline)
+            refresh_coverage(c, [1], strategy_filled={"wing": {1: 1}})
+            refresh_coverage(c, [1])
+        with engine.connect() as c:
+            rows = {r.account_id: r for r in get_coverage(c)}
+        assert rows[1].strategy_filled == {"wing": 3}
+        assert rows[2].strategy_filled == {"books": 1} and rows[2].with_isbn == 1
+        totals = coverage_totals(rows.values())
+        assert (totals["total"], totals["with_isbn"], totals["strategy_filled"]) == (5, 3, {"wing": 3, "books": 1})
+
+
+class FillNullStrategy(BaseISBNStrategy):
+    """ISBN 없는 리스팅에 고정 ISBN을 채우는 테스트용 전략"""
+    name = "fake"
+
+    def fill(self, engine, account=None, limit=0):
+        result = FillResult(self.name)
+        with engine.begin() as c:
+            result.filled = c.execute(text(
+                "UPDATE listings SET isbn = :isbn WHERE isbn IS NULL AND account_id = 1"), {"isbn": B}).rowcount
+        return result
+
+
+class TestFillerService:
+
+    def test_run_updates_snapshot(self, engine, monkeypatch):
+        monkeypatch.setitem(isbn_filler.STRATEGY_MAP, "fake", FillNullStrategy)
+
+        ISBNFillerService(engine).run(strategies=["fake"], account="007-book")
+
+        with engine.connect() as c:
+            rows = get_coverage(c)
+        assert [(r.account_name, r.with_isbn, r.needs_review, r.strategy_filled) for r in rows] == \
+            [("007-book", 3, 0, {"fake": 1})]
+
+    def test_start_coverage_is_current(self, engine, monkeypatch, capsys):
+        monkeypatch.setitem(isbn_filler.STRATEGY_MAP, "fake", FillNullStrategy)
+        with engine.begin() as c:
+            refresh_coverage(c, [1], strategy_filled={"wing": {1: 5}})
+            # 스냅샷 갱신 없이 listings 직접 수정 → 스냅샷은 밀린 상태
+            c.execute(text("UPDATE listings SET isbn = :isbn WHERE id = 4"), {"isbn": A})
+
+        ISBNFillerService(engine).run(strategies=["fake"], account="007-book")
+
+        # 시작 시 출력도 현재 값(3/4), 끝에는 전략 실행 후 값(4/4)
+        out = capsys.readouterr().out
+        assert out.index("007-book: 3/4") < out.index("007-book: 4/4")
+        assert "007-book: 2/4" not in out
+        with engine.connect() as c:
+            assert get_coverage(c, account_name="007-book")[0].strategy_filled == {"wing": 5, "fake": 1}
+
+    def test_first_run_prints_start_coverage(self, engine, monkeypatch, capsys):
+        monkeypatch.setitem(isbn_filler.STRATEGY_MAP, "fake", FillNullStrategy)
+        ISBNFillerService(engine).run(strategies=["fake"], account="007-book")
+        out = capsys.readouterr().out
+        assert out.index("007-book: 2/4") < out.index("007-book: 3/4")
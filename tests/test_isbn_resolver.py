@@ -0,0 +1,153 @@
+"""
+isbn_resolver.py 테스트
+=======================
+후보 점수화(출판사/연도/제목/세트 구성/소스 합의)와 ResolverStrategy의 단계별 조회 확인
+"""
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, text
+
+# 프로젝트 루트 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services import isbn_resolver
+from app.services.isbn_filler import ResolverStrategy, WingAPIStrategy
+from app.services.isbn_resolver import CandidateSet, ListingInfo, expected_set_size
+from app.services.listing_isbns import ensure_table
+
+A, B, C, D = "9788900000016", "9788900000023", "9788900000030", "9791100000014"
+
+
+class TestScoring:
+
+    def test_expected_set_size(self):
+        assert expected_set_size("수학의 정석 전 3권") == 3
+        assert expected_set_size("개념원리 수학 상+하 (2025)") == 2
+        assert expected_set_size("쎈 수학 세트") == 0
+        assert expected_set_size("쎈 수학 (상)") is None
+
+    def test_year_and_publisher(self):
+        cs = CandidateSet(ListingInfo.from_listing("수학의 바이블 확률과 통계 (2025)", brand="이투스"))
+        cs.add(A, "aladin", title="2024 수학의 바이블 확률과 통계", publisher="이투스북")
+        cs.add(B, "aladin", title="2025 수학의 바이블 확률과 통계", publisher="이투스북")
+        cs.add(C, "aladin", title="2025 수학의 바이블 확률과 통계", publisher="다른출판사")
+        ranked = [c.isbn for _, c in cs.ranked()]
+        assert ranked == [B, C, A]
+        confidence, best = cs.best()
+        assert best.isbn == B and confidence >= isbn_resolver.MIN_CONFIDENCE
+
+    def test_set_component_count(self):
+        cs = CandidateSet(ListingInfo.from_listing("개념원리 수학 상+하 세트"))
+        cs.add(A, "books", title="개념원리 수학 상", title_score=0.7)
+        cs.add(f"{A},{B}", "raw_json")
+        assert cs.best()[1].isbn == f"{A},{B}"
+
+    def test_agreement_and_ambiguity(self):
+        info = ListingInfo.from_listing("비문학 독해 연습")
+        cs = CandidateSet(info)
+        cs.add(A, "books", title="비문학 독해 연습", title_score=0.7)
+        cs.add(B, "books", title="비문학 독해 연습", title_score=0.7)
+        # 동점 → 어느 판인지 모름 → 신뢰도 감점
+        assert cs.best()[0] < isbn_resolver.MIN_CONFIDENCE
+        # 다른 소스가 같은 ISBN → 합의 가점으로 확정
+        cs.add(A, "aladin", title="비문학 독해 연습")
+        confidence, best = cs.best()
+        assert best.isbn == A and best.sources == {"books", "aladin"}
+        assert confidence >= isbn_resolver.ACCEPT_CONFIDENCE
+
+
+class FakeCrawler:
+    def __init__(self, results):
+        self.results = results
+        self.keywords = []
+
+    def search_by_keyword(self, keyword, max_results=50, sort="PublishTime", **kwargs):
+        self.keywords.append(keyword)
+        return self.results.get(keyword, [])
+
+
+class FakeClient:
+    def __init__(self):
+        self.calls = []
+
+    def get_product(self, pid):
+        self.calls.append(pid)
+        return {"data": {"items": [{"barcode": D}]}}
+
+
+class TestResolverStrategy:
+
+    @pytest.fixture
+    def engine(self):
+        engine = create_engine("sqlite://")
+        raw = json.dumps({"items": [{"barcode": A}]})
+        with engine.begin() as c:
+            c.execute(text("""
+                CREATE TABLE listings (id INTEGER PRIMARY KEY, account_id INTEGER, product_name TEXT,
+                    brand TEXT, coupang_product_id INTEGER, isbn TEXT, raw_json TEXT, detail_synced_at TIMESTAMP)
+            """))
+            c.execute(text("CREATE TABLE books (isbn TEXT, title TEXT, year INTEGER)"))
+            ensure_table(c)
+            c.execute(text("""
+                INSERT INTO listings (id, account_id, product_name, brand, coupang_product_id, raw_json)
+                VALUES (:id, 1, :name, :brand, :pid, :raw)
+            """), [
+                # raw_json 바코드 → 로컬 확정
+                {"id": 1, "name": "국어 문법 완성", "brand": None, "pid": 101, "raw": raw},
+                # books 제목 일치 → 로컬 확정
+                {"id": 2, "name": "영어 독해 기본편 (2025)", "brand": None, "pid": None, "raw": None},
+                # 로컬 후보 없음 → WING + 알라딘
+                {"id": 3, "name": "과학 탐구 실험 노트", "brand": "미래엔", "pid": 103, "raw": None},
+                # 알라딘 후보가 상품명과 무관 → 신뢰도 미달 (기록만)
+                {"id": 4, "name": "역사 연표 카드", "brand": None, "pid": None, "raw": None},
+            ])
+            c.execute(text("INSERT INTO books VALUES (:isbn, :title, 2025)"), [
+                {"isbn": B, "title": "2025 영어 독해 기본편"},
+                {"isbn": "9788900000047", "title": "수학 개념 정리"},
+            ])
+        return engine
+
+    def test_external_calls_only_for_unresolved(self, engine, monkeypatch):
+        client = FakeClient()
+        monkeypatch.setattr(WingAPIStrategy, "_build_clients",
+                            lambda self, conn, account: {1: ("acct1", client)})
+        crawler = FakeCrawler({
+            "과학 탐구 실험 노트": [{"isbn": D, "title": "과학 탐구 실험 노트", "publisher": "미래엔"}],
+            "역사 연표 카드": [{"isbn": C, "title": "세계 지리 지도책", "publisher": "지학사"}],
+        })
+
+        result = ResolverStrategy(workers=1, crawler=crawler).fill(engine)
+
+        assert client.calls == [103]
+        assert sorted(crawler.keywords) == ["과학 탐구 실험 노트", "역사 연표 카드"]
+        assert (result.filled, result.failed, result.skipped) == (3, 1, 0)
+        with engine.connect() as c:
+            isbns = dict(c.execute(text("SELECT id, isbn FROM listings")).fetchall())
+            assert isbns == {1: A, 2: B, 3: D, 4: None}
+            rows = {r[0]: r[1:] for r in c.execute(text(
+                "SELECT listing_id, isbn, sources, applied, confidence FROM isbn_resolutions"))}
+        assert rows[3][:3] == (D, "aladin,wing", 1) and rows[3][3] == 1.0
+        assert rows[4][:3] == (C, "aladin", 0) and rows[4][3] < isbn_resolver.MIN_CONFIDENCE
+
+
+def test_large_bundle_resolution_saved():
+    # 15권 이상 세트의 쉼표 목록은 200자를 넘음 → isbn 컬럼은 listings.isbn과 같은 TEXT
+    from sqlalchemy import Text
+    from app.models.isbn_resolution import IsbnResolution
+
+    bundle = ",".join(f"97889000{i:05d}" for i in range(20))
+    assert len(bundle) > 200
+    assert isinstance(IsbnResolution.__table__.c.isbn.type, Text)
+    assert "isbn TEXT NOT NULL" in isbn_resolver.CREATE_TABLE_SQL
+
+    engine = create_engine("sqlite://")
+    with engine.begin() as c:
+        c.execute(text("CREATE TABLE listings (id INTEGER PRIMARY KEY)"))
+        isbn_resolver.ensure_table(c)
+        isbn_resolver.save_resolutions(c, [{"listing_id": 1, "isbn": bundle, "confidence": 0.95,
+                                            "sources": "raw_json", "candidates": 1, "applied": True}])
+        assert c.execute(text("SELECT isbn FROM isbn_resolutions")).scalar() == bundle
+    engine.dispose()
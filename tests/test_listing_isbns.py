@@ -0,0 +1,91 @@
+"""
+listing_isbns.py 테스트
+=======================
+listings.isbn(쉼표 구분) → listing_isbns 정규화 / 조회 (SQLite)
+"""
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import Text, create_engine, text
+
+# 프로젝트 루트 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.models.listing_isbn import ListingIsbn
+from app.services.isbn_filler import _bulk_update_isbns, _update_isbn
+from app.services.listing_isbns import (
+    CREATE_TABLE_SQL, ensure_table, isbns_for_listing, listings_for_isbn, listings_for_isbns,
+    rebuild_listing_isbns, split_isbns,
+)
+
+A, B, C = "9788900000001", "9788900000002", "9788900000003"
+
+
+@pytest.fixture
+def conn():
+    engine = create_engine("sqlite://")
+    with engine.begin() as c:
+        c.execute(text("CREATE TABLE listings (id INTEGER PRIMARY KEY, account_id INTEGER, isbn TEXT)"))
+        c.execute(text("INSERT INTO listings VALUES (1, 1, :a), (2, 1, :ab), (3, 2, :ba), (4, 2, NULL), (5, 3, '')"),
+                  {"a": A, "ab": f"{A},{B}", "ba": f"{B}, {A},{B}"})
+        ensure_table(c)
+        rebuild_listing_isbns(c)
+    with engine.begin() as c:
+        yield c
+    engine.dispose()
+
+
+def test_split_isbns():
+    assert split_isbns(f" {A}, {B},{A},,") == [A, B]
+    assert split_isbns(None) == []
+    assert split_isbns("") == []
+
+
+def test_rebuild(conn):
+    rows = conn.execute(text("SELECT listing_id, position, isbn FROM listing_isbns ORDER BY 1, 2")).fetchall()
+    assert [tuple(r) for r in rows] == [(1, 0, A), (2, 0, A), (2, 1, B), (3, 0, B), (3, 1, A)]
+    # 재실행해도 중복 없음
+    assert rebuild_listing_isbns(conn) == 5
+    assert rebuild_listing_isbns(conn, account_id=2) == 2
+
+
+def test_long_token(conn):
+    # listings.isbn은 자유 형식 → 20자 넘는 토큰도 그대로 저장 (VARCHAR(20)이면 PostgreSQL에서 재구성 실패)
+    long_token = "ISBN 978-89-0000-000-1 (세트 구성품)"
+    assert len(long_token) > 20
+    conn.execute(text("UPDATE listings SET isbn = :isbn WHERE id = 4"), {"isbn": f"{A},{long_token}"})
+    rebuild_listing_isbns(conn, account_id=2)
+    assert isbns_for_listing(conn, 4) == [A, long_token]
+
+    assert isinstance(ListingIsbn.__table__.c.isbn.type, Text)
+    assert "isbn TEXT NOT NULL" in CREATE_TABLE_SQL
+
+
+def test_lookups(conn):
+    found = listings_for_isbn(conn, A)
+    assert [(r["listing_id"], r["account_id"], r["position"], r["isbn_count"]) for r in found] == [
+        (1, 1, 0, 1), (2, 1, 0, 2), (3, 2, 1, 2),
+    ]
+    assert [r["listing_id"] for r in listings_for_isbn(conn, A, account_id=2)] == [3]
+
+    many = listings_for_isbns(conn, [B, C, B])
+    assert list(many) == [B, C]
+    assert [r["listing_id"] for r in many[B]] == [2, 3]
+    assert many[C] == []
+    assert isbns_for_listing(conn, 3) == [B, A]
+
+
+def test_isbn_filler_keeps_table_in_sync(conn):
+    assert _update_isbn(conn, 4, 2, f"{C},{A}")
+    assert isbns_for_listing(conn, 4) == [C, A]
+    assert [r["listing_id"] for r in listings_for_isbn(conn, C)] == [4]
+
+
+def test_bulk_update_skips_duplicates(conn):
+    # 4(계정 2): A는 계정 2에 이미 있음(3) → 건너뜀 / 5(계정 3): C 반영, 같은 배치의 두 번째 C는 건너뜀
+    filled, dup = _bulk_update_isbns(conn, [(4, 2, f"{B}, {A},{B}"), (5, 3, C), (4, 3, C)])
+    assert (filled, dup) == (1, 2)
+    assert conn.execute(text("SELECT isbn FROM listings WHERE id = 5")).scalar() == C
+    assert isbns_for_listing(conn, 5) == [C]
+    assert isbns_for_listing(conn, 4) == []
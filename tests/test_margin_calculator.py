@@ -0,0 +1,214 @@
+"""
+margin_calculator.py 테스트
+===========================
+벡터화 마진 계산이 Publisher.calculate_margin / analyze_book과 같은 결과를 내는지 확인
+(배송비 구간표 SHIPPING_FEE_BRACKETS 경계값 포함)
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# 프로젝트 루트 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.constants import SHIPPING_FEE_BRACKETS, determine_customer_shipping_fee
+from app.database import Base
+from app.models import Publisher, Book, Product
+from analyzers.margin_calculator import (
+    MarginCalculator,
+    calculate_margins,
+    customer_shipping_fees,
+)
+
+
+MARGIN_RATES = [40, 50, 55, 56, 60, 61, 62, 63, 65, 66, 67, 70, 73]
+LIST_PRICES = list(range(0, 65000, 500)) + [14999, 15000, 17999, 18000, 18499, 18500,
+                                            20000, 20001, 20500, 29000, 29001, 12345, 33333]
+
+
+class TestVectorizedMargin:
+    """배열 계산 == 기존 단건 계산"""
+
+    def test_customer_shipping_fees(self):
+        rates, prices = np.meshgrid(MARGIN_RATES, LIST_PRICES)
+        expected = [determine_customer_shipping_fee(int(r), int(p))
+                    for r, p in zip(rates.ravel(), prices.ravel())]
+        assert customer_shipping_fees(rates.ravel(), prices.ravel()).tolist() == expected
+
+    def test_bracket_rules(self):
+        # 구간표가 문서화된 규칙 그대로인지 (단건/배열 모두 이 표를 읽음)
+        cases = {
+            (55, 14999): 2300, (55, 15000): 0,
+            (60, 17999): 2300, (60, 18000): 0,
+            (62, 17999): 2000, (62, 18000): 0,
+            (65, 17999): 2300, (65, 18000): 1000, (65, 20000): 1000, (65, 20001): 2300, (65, 20500): 0,
+            (70, 14999): 2300, (70, 15000): 2000, (70, 18000): 2000, (70, 18499): 2300,
+            (70, 18500): 1000, (70, 29000): 1000, (70, 29001): 2300,
+            (73, 60000): 2300,
+        }
+        for (rate, price), fee in cases.items():
+            assert determine_customer_shipping_fee(rate, price) == fee, (rate, price)
+
+    @pytest.mark.parametrize("shipping_cost", [2300, 3000])
+    def test_bracket_boundaries_parity(self, shipping_cost):
+        rates, prices = set(), {0}
+        for max_rate, brackets in SHIPPING_FEE_BRACKETS:
+            rates.update({max_rate - 1, max_rate, max_rate + 1})
+            for low, high, _ in brackets:
+                for bound in (low, high):
+                    if bound is not None:
+                        prices.update({bound - 1, bound, bound + 1})
+        rates, prices = np.meshgrid(sorted(rates), sorted(prices))
+        rates, prices = rates.ravel(), prices.ravel()
+
+        expected = [determine_customer_shipping_fee(int(r), int(p), shipping_cost)
+                    for r, p in zip(rates, prices)]
+        assert customer_shipping_fees(rates, prices, shipping_cost).tolist() == expected
+
+        # 마진 계산식도 단건(Publisher)과 배열 버전이 경계값에서 같음
+        for rate in sorted(set(rates.tolist())):
+            publisher = Publisher(name="p", margin_rate=rate, supply_rate=rate / 100, min_free_shipping=0)
+            row_prices = sorted(set(prices.tolist()))
+            result = calculate_margins(row_prices, [publisher.supply_rate] * len(row_prices),
+                                       [rate] * len(row_prices))
+            for i, price in enumerate(row_prices):
+                assert {k: v[i].item() for k, v in result.items()} == publisher.calculate_margin(price)
+
+    def test_calculate_margins(self):
+        for margin_rate in MARGIN_RATES:
+            publisher = Publisher(name="p", margin_rate=margin_rate,
+                                  supply_rate=margin_rate / 100, min_free_shipping=0)
+            result = calculate_margins(LIST_PRICES, [publisher.supply_rate] * len(LIST_PRICES),
+                                       [margin_rate] * len(LIST_PRICES))
+            for i, price in enumerate(LIST_PRICES):
+                expected = publisher.calculate_margin(price)
+                actual = {k: v[i].item() for k, v in result.items()}
+                assert actual == expected, (margin_rate, price)
+
+
+class TestBatchAnalyze:
+    """batch_analyze_books == analyze_book (SQLite)"""
+
+    def setup_method(self):
+        self.engine = create_engine("sqlite://")
+        Base.metadata.create_all(self.engine, tables=[
+            Publisher.__table__, Book.__table__, Product.__table__,
+        ])
+        self.db = sessionmaker(bind=self.engine)()
+        rng = np.random.default_rng(7)
+        publishers = [
+            Publisher(name=f"pub{r}", margin_rate=r, supply_rate=r / 100, min_free_shipping=0)
+            for r in (55, 60, 65, 70, 73)
+        ]
+        self.db.add_all(publishers)
+        self.db.flush()
+        for i in range(200):
+            self.db.add(Book(
+                isbn=f"978{i:010d}", title=f"도서{i}",
+                publisher_id=publishers[i % len(publishers)].id,
+                list_price=int(rng.integers(20, 400)) * 100,
+            ))
+        self.db.add(Book(isbn="9780000009999", title="출판사없음", list_price=10000))
+        self.db.commit()
+
+    def teardown_method(self):
+        self.db.close()
+        self.engine.dispose()
+
+    def test_batch_matches_single(self):
+        calc = MarginCalculator(self.db)
+        results = calc.batch_analyze_books()
+        assert results["total"] == 201
+        assert results["analyzed"] == 200
+
+        books = self.db.query(Book).filter(Book.publisher_id.isnot(None)).order_by(Book.id).all()
+        expected = [calc.analyze_book(b) for b in books]
+        actual = sorted(
+            (a for group in results["by_profitability"].values() for a in group),
+            key=lambda a: a["book_id"],
+        )
+        assert actual == expected
+        assert results["summary"]["total_margin"] == sum(a["net_margin"] for a in expected)
+        assert results["summary"]["uploadable_single"] == sum(a["can_upload_single"] for a in expected)
+
+    def test_batch_create_products(self):
+        calc = MarginCalculator(self.db)
+        products = calc.batch_create_products()
+        books = {b.id: b for b in self.db.query(Book).all()}
+        assert len(products) == 200
+
+        fields = ["book_id", "isbn", "list_price", "sale_price", "supply_rate", "margin_per_unit",
+                  "shipping_cost", "net_margin", "shipping_policy", "can_upload_single",
+                  "status", "exclude_reason"]
+        for product in products:
+            expected = calc.create_product_from_analysis(books[product.book_id])
+            for field in fields:
+                assert getattr(product, field) == pytest.approx(getattr(expected, field)), field
+
+
+class TestMarginSimulator:
+    """What-if 시뮬레이션 (카탈로그 직접 주입)"""
+
+    def setup_method(self):
+        import pandas as pd
+        self.catalog = pd.DataFrame({
+            "book_id": [1, 2, 3, 3],
+            "isbn": ["a", "b", "c", "c"],
+            "title": ["t1", "t2", "t3", "t3"],
+            "list_price": [12000, 25000, 16000, 16000],
+            "publisher": ["A", "B", "A", "A"],
+            "supply_rate": [0.55, 0.65, 0.55, 0.55],
+            "margin_rate": [55, 65, 55, 55],
+            "listing_id": [None, 10, 11, 12],
+            "account_name": ["(미등록)", "acc1", "acc1", "acc2"],
+        })
+
+    def test_baseline_matches_publisher(self):
+        from analyzers.margin_simulator import MarginSimulator, Scenario
+        sim = MarginSimulator(engine=None, catalog=self.catalog)
+        result = sim.simulate([Scenario()])
+        for row in result.itertuples():
+            src = self.catalog.iloc[row.Index]
+            pub = Publisher(name=src["publisher"], margin_rate=int(src["margin_rate"]),
+                            supply_rate=src["supply_rate"], min_free_shipping=0)
+            assert row.net_margin == pub.calculate_margin(int(src["list_price"]))["net_margin"]
+        assert (result["delta"] == 0).all()
+        assert not result["flipped_negative"].any()
+
+    def test_grid_and_summary(self):
+        from analyzers.margin_simulator import MarginSimulator, build_grid
+        sim = MarginSimulator(engine=None, catalog=self.catalog)
+        scenarios = build_grid(fee_rates=[0.11, 0.2], shipping_costs=[2300, 3000],
+                               supply_rates={"B": 0.8})
+        assert len(scenarios) == 4
+        result = sim.simulate(scenarios)
+        assert len(result) == 4 * len(self.catalog)
+
+        # 공급률 0.8 → B 도서 음수 전환
+        first = result[result["scenario"] == scenarios[0].label()]
+        assert first.loc[first["publisher"] == "B", "flipped_negative"].all()
+
+        summary = sim.summarize(result, by="account")
+        assert set(summary["account_name"]) == {"(미등록)", "acc1", "acc2"}
+        totals = summary.groupby("scenario")["delta"].sum()
+        expected = result.groupby("scenario")["delta"].sum()
+        assert totals.sort_index().tolist() == expected.sort_index().tolist()
+
+        with pytest.raises(ValueError):
+            sim.summarize(result, by="unknown")
+
+    def test_summary_keeps_grid_order(self):
+        from analyzers.margin_simulator import MarginSimulator, build_grid
+        sim = MarginSimulator(engine=None, catalog=self.catalog)
+        # 라벨 문자열 순("수수료 11%" < "수수료 20%")과 그리드 순서가 다른 조합
+        scenarios = build_grid(fee_rates=[0.2, 0.11], shipping_costs=[3000, 2300])
+        labels = [s.label() for s in scenarios]
+        assert labels != sorted(labels)
+
+        summary = sim.summarize(sim.simulate(scenarios), by="publisher")
+        assert summary["scenario"].unique().tolist() == labels
@@ -0,0 +1,95 @@
+"""
+minhash_lsh.py 테스트
+=====================
+유사 상품명 후보 검출, 비유사 항목 배제, 판정 기준 유사도에서의 후보 재현율,
+다른 계정 ISBN 복사의 LSH 판정 확인
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.minhash_lsh import RECALL_TARGET, MinHashLSH, candidate_probability, choose_bands, jaccard
+from scripts.copy_isbn_from_other_accounts import find_best_lsh, name_tokens, similarity_bucket
+
+
+class TestMinHashLSH:
+
+    def test_signature_estimates_jaccard(self):
+        lsh = MinHashLSH(num_perm=256, bands=32)
+        a = {f"w{i}" for i in range(20)}
+        b = {f"w{i}" for i in range(4, 24)}      # Jaccard = 16/24
+        est = (lsh.signature(a) == lsh.signature(b)).mean()
+        assert abs(est - jaccard(a, b)) < 0.1
+
+    def test_query_finds_similar_only(self):
+        lsh = MinHashLSH()
+        lsh.add(1, "수학의 바이블 확률과 통계 고등 수학 문제집".split())
+        lsh.add(2, "해리 포터와 마법사의 돌 양장 특별판 도서".split())
+        assert not lsh.add(3, [])
+        assert len(lsh) == 2
+
+        assert lsh.query("수학의 바이블 확률과 통계 고등 수학 문제집".split()) == {1}
+        assert 1 in lsh.query("수학의 바이블 확률과 통계 고등 수학 문제집 2025".split())
+        assert lsh.query("전혀 관계없는 상품 이름".split()) == set()
+
+    def test_candidate_probability(self):
+        # 고정 16×8 banding은 J=0.8에서도 약 5%를 놓침
+        assert candidate_probability(0.8, 16, 8) == pytest.approx(0.947, abs=1e-3)
+        assert candidate_probability(0.6, 16, 8) == pytest.approx(0.237, abs=1e-3)
+        assert candidate_probability(0.6, 32, 4) == pytest.approx(0.988, abs=1e-3)
+
+    @pytest.mark.parametrize("threshold", [0.9, 0.8, 0.6])
+    def test_choose_bands_meets_recall(self, threshold):
+        bands, rows = choose_bands(threshold)
+        assert bands * rows <= 128
+        assert candidate_probability(threshold, bands, rows) >= RECALL_TARGET
+        # rows를 하나 늘리면 목표 재현율 미달 (가능한 가장 선택적인 banding)
+        assert candidate_probability(threshold, 128 // (rows + 1), rows + 1) < RECALL_TARGET
+
+    @pytest.mark.parametrize("threshold", [0.8, 0.6])
+    def test_measured_recall_at_threshold(self, threshold):
+        # |A| = |B| = 36, 교집합 k → J = k / (72 - k)가 정확히 threshold
+        k = round(72 * threshold / (1 + threshold))
+        assert jaccard(set(range(36)), set(range(36 - k, 72 - k))) == pytest.approx(threshold)
+
+        lsh = MinHashLSH.for_threshold(threshold)
+        n = 500
+        for i in range(n):
+            lsh.add(i, [f"p{i}_{t}" for t in range(36)])
+        found = sum(i in lsh.query([f"p{i}_{t}" for t in range(36 - k, 72 - k)]) for i in range(n))
+        assert found / n >= 0.98
+
+    def test_bands_must_divide(self):
+        with pytest.raises(ValueError):
+            MinHashLSH(num_perm=100, bands=16)
+        with pytest.raises(ValueError):
+            MinHashLSH(num_perm=128, bands=32, rows=8)
+
+
+class TestCopyIsbnLsh:
+
+    def test_best_match_other_account(self):
+        lsh = MinHashLSH()
+        sources = {}
+        for sid, name, isbn, acc in [
+            (10, "개념원리 수학 상 고1 2025 개정판", "9791100000001", 1),
+            (11, "개념원리 수학 상 고1 2025 개정판", "9791100000009", 2),
+            (12, "쎈 중등 수학 1-1 문제집", "9791100000002", 1),
+        ]:
+            tokens = name_tokens(name)
+            lsh.add(sid, tokens)
+            sources[sid] = (tokens, name, isbn, acc)
+
+        sim, name, isbn, checked = find_best_lsh(lsh, sources, "[사은품] 개념원리 수학 상 고1 2025 개정판", 2, 0.8)
+        assert (sim, isbn) == (1.0, "9791100000001")   # 같은 계정(2) 소스는 제외
+        assert checked >= 2
+        assert find_best_lsh(lsh, sources, "완전히 다른 상품", 2, 0.8)[2] is None
+
+    def test_similarity_bucket(self):
+        assert similarity_bucket(0.8) == "80-85%"
+        assert similarity_bucket(0.949) == "90-95%"
+        assert similarity_bucket(1.0) == "95-100%"
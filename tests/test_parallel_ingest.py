@@ -0,0 +1,126 @@
+"""
+parallel_ingest.py 테스트
+=========================
+프로세스 풀 파싱 + 단일 writer 결과가 순차 처리와 같은지 확인
+"""
+import sys
+from pathlib import Path
+
+import openpyxl
+import pytest
+from sqlalchemy import create_engine, text
+
+# 프로젝트 루트 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.ingestion_ledger import IngestionLedger
+from app.services.parallel_ingest import MIN_PARALLEL_FILES, default_workers, run_pipeline
+from scripts.sync_ad_spend import AdSpendSync
+
+
+def _square(x):
+    if x < 0:
+        raise ValueError("음수")
+    return x * x
+
+
+def _run(workers):
+    written, progress = [], []
+    results = run_pipeline(
+        [(3,), (-1,), (5,), (7,)], _square,
+        write_fn=lambda i, parsed, sec: written.append(i) or {"i": i, "value": parsed},
+        error_fn=lambda i, e: {"i": i, "error": str(e)},
+        workers=workers,
+        progress=lambda done, total, r: progress.append((done, total)),
+        done=1, total=5,
+    )
+    return results, written, progress
+
+
+class TestRunPipeline:
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_results_in_job_order(self, workers):
+        results, written, progress = _run(workers)
+        assert results == [
+            {"i": 0, "value": 9},
+            {"i": 1, "error": "음수"},
+            {"i": 2, "value": 25},
+            {"i": 3, "value": 49},
+        ]
+        assert sorted(written) == [0, 2, 3]
+        # 오프셋(앞서 건너뛴 파일 1개) 포함 진행률
+        assert progress == [(2, 5), (3, 5), (4, 5), (5, 5)]
+
+    def test_empty(self):
+        assert run_pipeline([], _square, None, None) == []
+
+    def test_default_workers_threshold(self):
+        # 파일 몇 개는 프로세스 풀 없이 순차
+        assert default_workers(MIN_PARALLEL_FILES - 1) == 1
+        assert 1 <= default_workers(100) <= 8
+
+
+def _write_settlement(path: Path, day: int, campaigns):
+    """일별 광고비 정산 Excel (요약행 + 캠페인 상세행)"""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["날짜"] + [None] * 16)
+    ws.append([f"2026년 01월 {day:02d}일"] + [None] * 14 + [100, 1100])
+    for cid, spent in campaigns:
+        ws.append([None, None, None, "PA", "매출 성장", cid, f"캠페인{cid}",
+                   None, None, 10000, spent, 0, spent, 0, spent, None, None])
+    wb.save(path)
+
+
+@pytest.fixture
+def spend_syncer(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'ads.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE accounts (id INTEGER PRIMARY KEY, account_name VARCHAR(50), vendor_id VARCHAR(20))"))
+        conn.execute(text("INSERT INTO accounts VALUES (1, '007-book', 'A001'), (2, '007-ez', 'A002')"))
+        conn.execute(text("""
+            CREATE TABLE ad_spends (
+                id INTEGER PRIMARY KEY, account_id INTEGER, ad_date DATE, campaign_id VARCHAR(50),
+                campaign_name VARCHAR(200), ad_type VARCHAR(20), ad_objective VARCHAR(50),
+                daily_budget INTEGER, spent_amount INTEGER, adjustment INTEGER,
+                spent_after_adjust INTEGER, over_spend INTEGER, billable_cost INTEGER,
+                vat_amount INTEGER, total_charge INTEGER,
+                UNIQUE(account_id, ad_date, campaign_id)
+            )
+        """))
+    s = AdSpendSync.__new__(AdSpendSync)
+    s.engine = engine
+    s.ledger = IngestionLedger(engine)
+    yield s
+    engine.dispose()
+
+
+class TestParallelSpendSync:
+
+    def test_sync_dir_parallel(self, spend_syncer, tmp_path):
+        reports = tmp_path / "reports"
+        reports.mkdir()
+        for vendor in ("A001", "A002"):
+            for day in (4, 5, 6):
+                _write_settlement(reports / f"{vendor}-dailySettlement-202601{day:02d}.xlsx",
+                                  day, [("C1", 1000 * day), ("C2", 500)])
+        (reports / "A999-dailySettlement-20260104.xlsx").write_bytes(b"unknown vendor")
+
+        progress = []
+        results = spend_syncer.sync_dir(str(reports), workers=2,
+                                        progress=lambda d, t, r: progress.append(d))
+        assert [r["file"] for r in results] == sorted(p.name for p in reports.glob("*.xlsx"))
+        assert sum(r["saved"] for r in results) == 12
+        assert results[-1]["error"] == "계정 매칭 실패"
+        assert sorted(progress) == list(range(1, 8))
+
+        with spend_syncer.engine.connect() as conn:
+            rows = conn.execute(text(
+                "SELECT account_id, SUM(spent_amount), COUNT(*) FROM ad_spends GROUP BY account_id"
+            )).fetchall()
+        assert [tuple(r) for r in rows] == [(1, 16500, 6), (2, 16500, 6)]
+
+        # 재실행 → 전부 원장에서 건너뜀
+        again = spend_syncer.sync_dir(str(reports), workers=2)
+        assert sum(1 for r in again if r.get("skipped")) == 6
@@ -0,0 +1,143 @@
+"""
+raw_json_isbn.py 테스트
+=======================
+raw_json ISBN 추출(체크섬/필드별), 프로세스 풀 분산, WingAPIStrategy의 로컬 우선 처리 확인
+"""
+import json
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, text
+
+# 프로젝트 루트 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services import raw_json_isbn
+from app.services.isbn_filler import WingAPIStrategy
+from app.services.listing_isbns import ensure_table
+from app.services.raw_json_isbn import extract_all_isbns_from_raw_json, extract_isbn_map
+
+A, B, C, D = "9788900000016", "9788900000023", "9788900000030", "9791100000014"
+
+
+def _raw(**item):
+    return json.dumps({"sellerProductName": "상품", "items": [item]}, ensure_ascii=False)
+
+
+class TestExtract:
+
+    def test_fields_and_checksum(self):
+        raw = json.dumps({
+            "sellerProductName": f"세트 {D}",
+            "items": [
+                {"barcode": A, "searchTags": [f"isbn{B}", "9788900000017"]},   # 마지막은 체크섬 오류
+                {"attributes": [{"attributeTypeName": "ISBN", "attributeValueName": "978-89-0000003-0"}]},
+            ],
+        })
+        assert extract_all_isbns_from_raw_json(raw) == [A, B, C, D]
+
+    def test_invalid_input(self):
+        assert extract_all_isbns_from_raw_json("") == []
+        assert extract_all_isbns_from_raw_json("{broken") == []
+        assert extract_all_isbns_from_raw_json("[1, 2]") == []
+
+    def test_map_parallel_matches_serial(self, monkeypatch):
+        rows = [(i, _raw(barcode=A if i % 2 else "")) for i in range(40)]
+        serial = extract_isbn_map(rows, workers=1)
+        monkeypatch.setattr(raw_json_isbn, "MIN_PARALLEL", 10)
+        assert extract_isbn_map(rows, workers=2) == serial
+        assert serial[1] == [A] and serial[2] == []
+
+
+class FakeClient:
+    def __init__(self):
+        self.calls = []
+
+    def get_product(self, pid):
+        self.calls.append(pid)
+        return {"data": {"items": [{"barcode": C}]}}
+
+
+class TestWingStrategyLocalFirst:
+
+    @pytest.fixture
+    def engine(self):
+        engine = create_engine("sqlite://")
+        now = datetime.utcnow()
+        with engine.begin() as c:
+            c.execute(text("""
+                CREATE TABLE listings (id INTEGER PRIMARY KEY, account_id INTEGER, product_name TEXT,
+                    coupang_product_id INTEGER, isbn TEXT, raw_json TEXT, detail_synced_at TIMESTAMP)
+            """))
+            ensure_table(c)
+            c.execute(text("INSERT INTO listings VALUES (:id, 1, :name, :pid, NULL, :raw, :at)"), [
+                # 캐시에 ISBN 있음 → 로컬 처리
+                {"id": 1, "name": "책1", "pid": 101, "raw": _raw(barcode=A), "at": now - timedelta(days=30)},
+                # 최신 캐시인데 ISBN 없음 → API 생략
+                {"id": 2, "name": "책2", "pid": 102, "raw": _raw(barcode="없음"), "at": now},
+                # 오래된 캐시 / 캐시 없음 → API
+                {"id": 3, "name": "책3", "pid": 103, "raw": _raw(barcode=""), "at": now - timedelta(days=30)},
+                {"id": 4, "name": "책4", "pid": 104, "raw": None, "at": None},
+            ])
+            # 다른 계정 (클라이언트 별도, 동시 조회)
+            c.execute(text("INSERT INTO listings VALUES (5, 2, '책5', 105, NULL, NULL, NULL)"))
+        return engine
+
+    def test_api_only_for_missing_or_stale(self, engine, monkeypatch):
+        client, other = FakeClient(), FakeClient()
+        monkeypatch.setattr(WingAPIStrategy, "_build_clients",
+                            lambda self, conn, account: {1: ("acct1", client), 2: ("acct2", other)})
+
+        result = WingAPIStrategy(workers=1).fill(engine)
+
+        assert sorted(client.calls) == [103, 104]
+        assert other.calls == [105]
+        # 3, 4는 같은 ISBN → 계정 내 중복으로 하나는 skipped (5는 다른 계정이라 반영)
+        assert (result.filled, result.failed, result.skipped) == (3, 1, 1)
+        with engine.connect() as c:
+            isbns = dict(c.execute(text("SELECT id, isbn FROM listings")).fetchall())
+            assert isbns[1] == A and isbns[2] is None and isbns[5] == C
+            # API 응답은 raw_json 캐시에 다시 저장
+            refreshed = c.execute(text("SELECT raw_json FROM listings WHERE id = 4")).scalar()
+            assert extract_all_isbns_from_raw_json(refreshed) == [C]
+
+
+class TestStreamingBackfill:
+
+    @pytest.fixture
+    def engine(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'backfill.db'}")
+        with engine.begin() as c:
+            # 읽기(스트리밍)/쓰기 연결 동시 사용 (PostgreSQL과 같은 조건)
+            c.execute(text("PRAGMA journal_mode=WAL"))
+            c.execute(text(
+                "CREATE TABLE listings (id INTEGER PRIMARY KEY, account_id INTEGER, isbn TEXT, raw_json TEXT)"))
+            ensure_table(c)
+            c.execute(text("INSERT INTO listings VALUES (:id, 1, NULL, :raw)"), [
+                {"id": i, "raw": _raw(barcode=A, searchTags=[B] if i % 3 == 0 else []) if i % 2 else _raw()}
+                for i in range(1, 26)
+            ])
+        return engine
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_iter_extracted_chunks_in_order(self, engine, workers):
+        with engine.connect() as conn:
+            chunks = list(raw_json_isbn.iter_extracted(
+                conn, "SELECT id, raw_json FROM listings ORDER BY id", chunk_size=10, workers=workers))
+        assert [len(c) for c in chunks] == [10, 10, 5]
+        flat = dict(pair for c in chunks for pair in c)
+        assert list(flat) == list(range(1, 26))
+        assert flat[1] == [A] and flat[2] == [] and flat[3] == [A, B]
+
+    def test_backfill_updates_in_bulk(self, engine):
+        from scripts.backfill_isbn_from_raw_json import backfill_isbn_from_raw_json
+
+        stats = backfill_isbn_from_raw_json(chunk_size=7, workers=1, engine=engine)
+        assert (stats['total'], stats['success'], stats['multiple_isbn']) == (25, 13, 4)
+        with engine.connect() as c:
+            assert c.execute(text("SELECT isbn FROM listings WHERE id = 3")).scalar() == f"{A},{B}"
+            assert c.execute(text("SELECT COUNT(*) FROM listing_isbns")).scalar() == 13 + 4
+        # 두 번째 실행: 남은 대상(ISBN 없는 12건)만
+        assert backfill_isbn_from_raw_json(workers=1, engine=engine)['total'] == 12
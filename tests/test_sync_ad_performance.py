@@ -0,0 +1,126 @@
+"""
+sync_ad_performance.py 테스트
+=============================
+광고 보고서 Excel 파싱 결과를 골든 파일(tests/fixtures/ad_report_golden.json)과 비교
+"""
+import json
+import sys
+from datetime import date, datetime
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from openpyxl import Workbook
+
+from scripts.sync_ad_performance import AdPerformanceSync, ROW_FIELDS
+
+GOLDEN = Path(__file__).parent / "fixtures" / "ad_report_golden.json"
+
+HEADER = [
+    "날짜", "캠페인 ID", "캠페인명", "광고그룹", "광고진행 옵션ID", "광고진행 상품명",
+    "키워드", "노출수", "클릭수", "클릭률", "평균CPC", "광고비",
+    "총주문수(14일)", "총주문수(1일)", "직접주문수(14일)",
+    "총전환매출액(14일)", "총전환매출액(1일)", "간접전환매출액(1일)",
+    "총광고수익률(14일)", "총광고수익률(1일)", "총판매수량(1일)", "과금방식",
+]
+
+ROWS = [
+    [datetime(2025, 1, 3), 101, "캠페인A", "그룹1", 9001, "상품 1", "수학", 1234, 10, 0.81, 120, 1200,
+     3, 5, 2, 30000, 50000, 1000, 250.5, 300.1, 4, "CPC"],
+    ["2025-01-04", 101, "캠페인A", "그룹1", 9002, "상품 2", None, "1,234", "12", "3.5%", "1,100원", "2,200원",
+     0, 7, None, 0, 12000, None, 0, 80.5, None, "CPC"],
+    ["2025년 1월 5일", 102, " 캠페인B ", "그룹2", "9003", "nan", "영어", "-", None, None, None, "-",
+     None, 2, 1, None, 3000, "500", None, 55.0, "3", None],
+    ["20250106", 103, "캠페인C", None, 9004, "상품 4", "국어", 10.7, 1.9, "-", "", "12.9",
+     "4", "9", "1", "1,000", "2,000", "300", "12.5%", "9%", "2", "CPM"],
+    ["2025/01/07", 104, "캠페인D", "그룹4", 9005, "상품 5", "과학", 500, 0, 0, 0, 0,
+     0, 0, 0, 0, 0, 0, 0, 0, 0, ""],
+    [None, 105, "날짜없음", "그룹5", 9006, "상품 6", "사회", 1, 1, 1, 1, 1,
+     1, 1, 1, 1, 1, 1, 1, 1, 1, "CPC"],
+    ["bad-date", 106, "날짜오류", "그룹6", 9007, "상품 7", "역사", 1, 1, 1, 1, 1,
+     1, 1, 1, 1, 1, 1, 1, 1, 1, "CPC"],
+]
+
+
+def _build_report(path: Path, rows=ROWS, header=HEADER):
+    wb = Workbook()
+    ws = wb.active
+    ws.append(header)
+    for row in rows:
+        ws.append(row)
+    wb.save(path)
+    return path
+
+
+def _normalize(rows):
+    """비교용: 날짜는 YYYY-MM-DD 문자열로"""
+    out = []
+    for r in rows:
+        r = dict(r)
+        d = r["ad_date"]
+        r["ad_date"] = (d.date() if isinstance(d, datetime) else d).isoformat()
+        out.append(r)
+    return out
+
+
+@pytest.fixture
+def syncer():
+    # DB 없이 파싱만 테스트
+    return AdPerformanceSync.__new__(AdPerformanceSync)
+
+
+def test_parse_matches_golden(syncer, tmp_path):
+    path = _build_report(tmp_path / "A00000001-report.xlsx")
+    aid, rows = syncer.parse_excel(str(path), account_id=1)
+    assert aid == 1
+    assert list(rows.columns) == ROW_FIELDS
+    expected = json.loads(GOLDEN.read_text(encoding="utf-8"))
+    assert _normalize(rows.to_dict("records")) == expected
+
+
+def test_period_report_without_date_column(syncer, tmp_path):
+    """날짜 컬럼 없음 → 파일명 기간의 종료일"""
+    header = [h for h in HEADER if h != "날짜"]
+    rows = [r[1:] for r in ROWS]
+    path = _build_report(tmp_path / "A00000001-report_20250101_20250131.xlsx", rows, header)
+    _, parsed = syncer.parse_excel(str(path), account_id=1)
+    assert len(parsed) == len(ROWS)
+    assert set(parsed["ad_date"]) == {date(2025, 1, 31)}
+
+
+def test_datetime_column(syncer, tmp_path):
+    """날짜 셀만 있는 컬럼 (datetime64) 처리"""
+    rows = [[datetime(2025, 2, d)] + r[1:] for d, r in enumerate(ROWS, start=1)]
+    path = _build_report(tmp_path / "A00000001-report.xlsx", rows)
+    _, parsed = syncer.parse_excel(str(path), account_id=1)
+    assert parsed["ad_date"].tolist() == [date(2025, 2, d) for d in range(1, len(ROWS) + 1)]
+
+
+def test_to_tuples_dedupes_with_native_types(syncer, tmp_path):
+    path = _build_report(tmp_path / "A00000001-report.xlsx", ROWS + [ROWS[0]])
+    _, parsed = syncer.parse_excel(str(path), account_id=1)
+    parsed["listing_id"] = [7] + [None] * (len(parsed) - 1)
+
+    deduped = parsed.drop_duplicates(
+        subset=["ad_date", "campaign_id", "ad_group_name", "coupang_product_id", "keyword", "report_type"],
+        keep="last",
+    )
+    assert len(deduped) == len(parsed) - 1
+
+    cols = ["account_id", "ad_date", "listing_id", "impressions", "ctr", "keyword"]
+    tuples = AdPerformanceSync._to_tuples(3, parsed, cols)
+    assert tuples[0] == (3, "2025-01-03", 7, 1234, 0.81, "수학")
+    assert tuples[1][2] is None
+    assert all(type(v) in (int, float, str, type(None)) for t in tuples for v in t)
+
+
+def test_chunked_parse_matches_golden(syncer, tmp_path):
+    """스트리밍 청크 경계와 무관하게 같은 결과"""
+    syncer.CHUNK_SIZE = 2
+    path = _build_report(tmp_path / "A00000001-report.xlsx")
+    _, rows = syncer.parse_excel(str(path), account_id=1)
+    expected = json.loads(GOLDEN.read_text(encoding="utf-8"))
+    assert _normalize(rows.to_dict("records")) == expected
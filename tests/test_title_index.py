@@ -0,0 +1,82 @@
+"""
+title_index.py 테스트
+=====================
+띄어쓰기/태그 차이 매칭, 연도 구분, 모호한 후보 처리, BooksMatchStrategy 연동 확인
+"""
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, text
+
+# 프로젝트 루트 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.title_index import TitleIndex, title_grams
+
+BOOKS = [
+    ("9791100000001", "개념원리 수학(상)", None),
+    ("9791100000002", "개념원리 수학(하)", None),
+    ("9791100000003", "2025 수능완성 국어영역", 2025),
+    ("9791100000004", "2026 수능완성 국어영역", 2026),
+    ("9791100000005", "수학의 바이블 확률과 통계", None),
+    ("9791100000006", "해리 포터와 마법사의 돌", None),
+]
+
+
+@pytest.fixture
+def index():
+    return TitleIndex.from_rows(BOOKS)
+
+
+class TestTitleIndex:
+
+    def test_grams_ignore_spacing(self):
+        # 붙여쓴 쪽은 경계 bigram 하나만 더 많음
+        assert title_grams("수학의바이블") - title_grams("수학의 바이블") == {"의바"}
+        assert title_grams("해리포터") >= {"해리", "포터"}
+
+    def test_spacing_and_tags(self, index):
+        match = index.best_match("[선물] 수학의바이블 확률과통계 (사은품증정)")
+        assert match.isbn == "9791100000005"
+        assert match.score > 0.9
+
+    def test_year_selects_edition(self, index):
+        assert index.best_match("2026 수능완성 국어영역").isbn == "9791100000004"
+        results = index.search("2026 수능완성 국어영역")
+        assert results[0].score > results[1].score * 1.5
+
+    def test_volume_marker_in_parentheses(self, index):
+        assert index.best_match("개념원리 수학 (상) 고1").isbn == "9791100000001"
+
+    def test_ambiguous_or_unrelated(self, index):
+        # 연도/권 구분 없이 동점인 후보 → 매칭하지 않음
+        assert index.best_match("수능완성 국어영역") is None
+        assert index.best_match("개념원리 수학") is None
+        assert index.search("전혀 관계없는 상품명입니다") == []
+
+
+class TestBooksMatchStrategy:
+
+    def test_fill_uses_index(self, monkeypatch):
+        from app.services import isbn_filler
+
+        engine = create_engine("sqlite://")
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE books (isbn TEXT, title TEXT, year INTEGER)"))
+            conn.execute(text("INSERT INTO books VALUES (:isbn, :title, :year)"),
+                         [{"isbn": i, "title": t, "year": y} for i, t, y in BOOKS])
+
+        candidates = [
+            (1, 1, "[사은품] 해리포터와 마법사의 돌", None),
+            (2, 1, "수능완성 국어영역", None),
+            (3, 1, "책", None),
+        ]
+        updated = []
+        monkeypatch.setattr(isbn_filler, "_get_candidates", lambda conn, account, limit: candidates)
+        monkeypatch.setattr(isbn_filler, "_update_isbn",
+                            lambda conn, lid, aid, isbn: updated.append((lid, isbn)) or True)
+
+        result = isbn_filler.BooksMatchStrategy().fill(engine)
+        assert updated == [(1, "9791100000006")]
+        assert (result.filled, result.failed) == (1, 2)
@@ -0,0 +1,79 @@
+"""
+trigram_search.py 테스트
+========================
+pg_trgm 호환 유사도, 상위 k 조회 필터, match_listing 유사도 fallback 확인
+(SQLite에서는 Python 계산 경로, PostgreSQL은 같은 SQL을 인덱스로 실행)
+"""
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, text
+
+# 프로젝트 루트 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.trigram_search import (
+    ensure_trgm_indexes, has_trgm, similar_books, similar_listings, trigram_similarity, trigrams,
+)
+from app.services.wing_sync_base import match_listing
+
+
+@pytest.fixture
+def conn():
+    engine = create_engine("sqlite://")
+    with engine.connect() as c:
+        c.execute(text("CREATE TABLE books (id INTEGER PRIMARY KEY, title TEXT, isbn TEXT)"))
+        c.execute(text(
+            "CREATE TABLE listings (id INTEGER PRIMARY KEY, account_id INTEGER, product_name TEXT, isbn TEXT)"
+        ))
+        c.execute(text("INSERT INTO books VALUES (:id, :title, :isbn)"), [
+            {"id": 1, "title": "수학의 바이블 확률과 통계", "isbn": "9791100000001"},
+            {"id": 2, "title": "수학의 바이블 미적분", "isbn": "9791100000002"},
+            {"id": 3, "title": "해리 포터와 마법사의 돌", "isbn": "9791100000003"},
+        ])
+        c.execute(text("INSERT INTO listings VALUES (:id, :aid, :name, :isbn)"), [
+            {"id": 1, "aid": 1, "name": "수학의 바이블 확률과 통계 (2025)", "isbn": "9791100000001"},
+            {"id": 2, "aid": 2, "name": "수학의 바이블 확률과 통계", "isbn": None},
+            {"id": 3, "aid": 2, "name": "해리 포터와 마법사의 돌", "isbn": "9791100000003"},
+        ])
+        yield c
+
+
+class TestTrigrams:
+
+    def test_matches_pg_trgm(self):
+        # SELECT show_trgm('Cat') → {"  c"," ca","at ","cat"}
+        assert trigrams("Cat") == {"  c", " ca", "cat", "at "}
+        assert trigram_similarity("cat", "CAT!") == 1.0
+        assert trigram_similarity("", "cat") == 0.0
+
+    def test_ensure_indexes_noop_on_sqlite(self, conn):
+        assert ensure_trgm_indexes(conn) is False
+        # pg_trgm 없음 → 상품 목록 검색은 LIKE만 사용
+        assert has_trgm(conn) is False
+
+
+class TestSimilarLookups:
+
+    def test_books_top_k(self, conn):
+        rows = similar_books(conn, "[선물] 수학의바이블 확률과 통계", limit=2, threshold=0.2)
+        assert [r.isbn for r in rows][0] == "9791100000001"
+        assert rows[0].score > rows[1].score
+        assert similar_books(conn, "전혀 다른 책", threshold=0.5) == []
+
+    def test_listings_filters(self, conn):
+        rows = similar_listings(conn, "수학의 바이블 확률과 통계", exclude_account_id=2, with_isbn=True)
+        assert [r.id for r in rows] == [1]
+        rows = similar_listings(conn, "수학의 바이블 확률과 통계", account_id=2)
+        assert rows[0].id == 2 and rows[0].score == 1.0
+
+
+class TestMatchListingFuzzy:
+
+    def test_fuzzy_only_when_enabled(self, conn):
+        name = "해리포터와 마법사의 돌 양장"
+        assert match_listing(conn, 2, product_name=name) is None
+        assert match_listing(conn, 2, product_name=name, fuzzy_threshold=0.5) == 3
+        # 다른 계정 리스팅은 매칭하지 않음
+        assert match_listing(conn, 1, product_name=name, fuzzy_threshold=0.5) is None
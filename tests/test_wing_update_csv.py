@@ -0,0 +1,164 @@
+"""
+generate_wing_update_csv.py 세트 구성품 검색 테스트
+===================================================
+계정 간 검색어 중복 제거, 동시 조회 결과의 구성품 순서, 캐시 저장/재사용 확인
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# 프로젝트 루트 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from crawlers.aladin_key_pool import QuotaExhausted
+from scripts import generate_wing_update_csv as gen
+
+A, B, C = "9788900000016", "9788900000023", "9788900000030"
+
+
+def _patch(monkeypatch, aladin, kyobo=None):
+    calls = []
+
+    def search_aladin(query):
+        calls.append(query)
+        result = aladin.get(query)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    monkeypatch.setattr(gen, "search_aladin_by_title", search_aladin)
+    def search_kyobo(query):
+        result = (kyobo or {}).get(query)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    monkeypatch.setattr(gen, "search_kyobo", search_kyobo)
+    monkeypatch.setattr(gen, "api_concurrency", lambda: 4)
+    return calls
+
+
+@pytest.mark.parametrize("module", ["generate_wing_update_csv", "fill_excel_barcode_search"])
+def test_import_without_database(module):
+    # 엑셀 전용 스크립트 — 알라딘 크롤러(app.models → app.database)는 조회 시점에만 import
+    env = {k: v for k, v in os.environ.items() if k != "DATABASE_URL"}
+    code = f"import sys; from scripts import {module}; assert 'app.database' not in sys.modules"
+    proc = subprocess.run([sys.executable, "-c", code], cwd=Path(__file__).parent.parent,
+                          env=env, capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr
+
+
+class TestSetSearch:
+
+    def test_dedup_across_accounts_keeps_component_order(self, monkeypatch):
+        calls = _patch(monkeypatch, {"쎈 수학 1-1": A, "쎈 수학 1-2": B})
+        cache = {}
+        targets = [(("007-book", 1), "쎈 수학 1-1+1-2 세트"),
+                   (("007-bm", 7), "쎈 수학 1-1+1-2 세트")]
+
+        result = gen.batch_search_set_isbns(targets, cache)
+
+        assert sorted(calls) == ["쎈 수학 1-1", "쎈 수학 1-2"]
+        assert result == {("007-book", 1): [A, B], ("007-bm", 7): [A, B]}
+        assert cache == {"쎈 수학 1-1": A, "쎈 수학 1-2": B}
+
+        # 두 번째 실행: 캐시만 사용
+        calls.clear()
+        assert gen.batch_search_set_isbns(targets, cache) == result
+        assert calls == []
+
+    def test_quota_falls_back_to_kyobo(self, monkeypatch):
+        _patch(monkeypatch, {"개념원리 수학 상": QuotaExhausted("한도")},
+               kyobo={"개념원리 수학 상": C})
+        cache = {}
+
+        result = gen.batch_search_set_isbns([(1, "개념원리 수학 상+하 세트")], cache)
+
+        assert result == {1: [C]}
+        # 교보에서도 못 찾은 구성품은 실패(None)로 캐시
+        assert cache == {"개념원리 수학 상": C, "개념원리 수학 하": None}
+
+    def test_request_errors_not_cached(self, monkeypatch):
+        # 알라딘 오류 + 교보 결과 없음 / 교보 오류 → 캐시 안 함 (다음 실행 때 재시도)
+        _patch(monkeypatch, {"쎈 수학 1-1": ConnectionError("timeout"), "쎈 수학 1-2": None},
+               kyobo={"쎈 수학 1-2": ConnectionError("503")})
+        cache = {}
+
+        assert gen.batch_search_set_isbns([(1, "쎈 수학 1-1+1-2 세트")], cache) == {}
+        assert cache == {}
+
+        # 알라딘 오류여도 교보에서 찾으면 캐시
+        _patch(monkeypatch, {"쎈 수학 1-1": ConnectionError("timeout")}, kyobo={"쎈 수학 1-1": A})
+        assert gen.batch_search_set_isbns([(1, "쎈 수학 1-1+1-2 세트")], cache) == {1: [A]}
+        assert cache == {"쎈 수학 1-1": A, "쎈 수학 1-2": None}
+
+    def test_skip_api_uses_cache_only(self, monkeypatch):
+        calls = _patch(monkeypatch, {})
+        cache = {"쎈 수학 1-1": A}
+
+        result = gen.batch_search_set_isbns([(1, "쎈 수학 1-1+1-2 세트")], cache, skip_api=True)
+
+        assert result == {1: [A]} and calls == []
+
+
+def _write_filled(path, rows):
+    """_filled.xlsx 형식 (4행 헤더, 5행부터 데이터, 231열)"""
+    from openpyxl import Workbook
+    wb = Workbook()
+    ws = wb.active
+    ws.title = gen.SHEET
+    for r in range(1, 5):
+        for c in range(1, gen.TOTAL_COLS + 1):
+            ws.cell(row=r, column=c, value=f"h{c}" if r == 4 else None)
+    for i, row in enumerate(rows):
+        for c, value in row.items():
+            ws.cell(row=5 + i, column=c, value=value)
+    wb.save(path)
+
+
+class TestColumnarPipeline:
+
+    def test_normalize_isbn_series_matches_scalar(self):
+        import pandas as pd
+        values = pd.Series([9788900000016.0, "978-89-0000002-3", None, "abc", 12345, 9788900000023, ""],
+                           dtype=object)
+        expected = [gen.normalize_isbn(v) for v in values]
+        assert gen.normalize_isbn_series(values).tolist() == expected
+
+    def test_collect_and_process_account(self, tmp_path, monkeypatch):
+        path = tmp_path / "acct_filled.xlsx"
+        _write_filled(path, [
+            {2: "쎈 수학 1-1 (2025)", 6: "좋은책신사고", 8: "Y", 10: "판매중", 231: float(A),
+             30: "[728]제조사", 32: "[7937]저자"},
+            {2: "쎈 수학 1-1+1-2 세트", 10: "판매중"},
+            {2: "품절 상품", 10: "판매중지", 231: B},
+            {2: "쎈 수학 1-1 (2025)", 6: "좋은책신사고", 10: "판매중", 231: B},
+        ])
+
+        all_isbns, targets, set_targets = gen.collect_isbns_pandas({"acct": str(path)})
+        assert all_isbns == {A, B}
+        assert targets["acct"] == [(0, A), (3, B)]
+        assert set_targets["acct"] == [(1, "쎈 수학 1-1+1-2 세트")]
+
+        cache = {A: {"author": "홍길동 (지은이)", "publisher": "신사고", "pubDate": "2024-11-01",
+                     "seriesName": "쎈", "categoryName": "국내도서>참고서"}}
+        monkeypatch.setattr(gen, "MIN_PARALLEL", 1)
+        count = gen.process_account("acct", str(path), targets["acct"], cache, tmp_path,
+                                    set_isbns={1: [A, B]}, workers=2)
+        assert count == 3
+
+        from openpyxl import load_workbook
+        ws = load_workbook(tmp_path / "acct_update.xlsx")[gen.SHEET]
+        assert [ws.cell(row=5, column=c).value for c in (5, 6, 8, 231, 31, 33)] == \
+            ["신사고", "신사고", "Y", A, "신사고", "홍길동 (지은이)"]
+        assert ws.cell(row=5, column=7).value == gen.build_row_values(
+            "쎈 수학 1-1 (2025)", "좋은책신사고", cache[A])["keywords"]
+        # 메타 없는 ISBN → 원래 브랜드 유지
+        assert ws.cell(row=8, column=5).value == "좋은책신사고"
+        # 세트상품 → 빈 검색옵션 슬롯에 구성품 ISBN
+        assert [ws.cell(row=6, column=c).value for c in (30, 31, 32, 33, 8)] == \
+            ["[7939]ISBN", A, "[7939]ISBN", B, "Y"]
+        assert ws.cell(row=7, column=8).value is None